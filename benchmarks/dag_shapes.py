@@ -0,0 +1,74 @@
+"""
+Workflow Shapes for Gleitzeit V4 Benchmarks
+
+Each builder returns a workflow of exactly ``size`` tasks on the
+synthetic ``bench/v1`` protocol.
+
+- fan_out: one root, every other task depends on it
+- chain: each task depends on the previous one
+- diamond: a lattice of layers, each task depending on two tasks of the
+  layer above (width ~ sqrt(size))
+- random: each task depends on up to three random earlier tasks (seeded)
+"""
+
+import math
+import random
+from typing import Callable, Dict, List
+
+from gleitzeit.core.models import Task, Workflow
+
+
+def _task(workflow_id: str, index: int, dependencies: List[int]) -> Task:
+    return Task(
+        id=f"{workflow_id}-t{index}",
+        name=f"t{index}",
+        protocol="bench/v1",
+        method="bench/run",
+        params={"index": index},
+        dependencies=[f"{workflow_id}-t{dep}" for dep in dependencies]
+    )
+
+
+def _workflow(workflow_id: str, shape: str, dependencies: List[List[int]]) -> Workflow:
+    workflow = Workflow(id=workflow_id, name=f"bench {shape} ({len(dependencies)} tasks)")
+    for index, deps in enumerate(dependencies):
+        workflow.add_task(_task(workflow_id, index, deps))
+    return workflow
+
+
+def fan_out(workflow_id: str, size: int, seed: int = 0) -> Workflow:
+    return _workflow(workflow_id, "fan_out", [[]] + [[0] for _ in range(size - 1)])
+
+
+def chain(workflow_id: str, size: int, seed: int = 0) -> Workflow:
+    return _workflow(workflow_id, "chain", [[]] + [[i - 1] for i in range(1, size)])
+
+
+def diamond(workflow_id: str, size: int, seed: int = 0) -> Workflow:
+    width = max(1, int(math.sqrt(size)))
+    dependencies = []
+    for index in range(size):
+        layer, column = divmod(index, width)
+        if layer == 0:
+            dependencies.append([])
+            continue
+        above = (layer - 1) * width
+        dependencies.append(sorted({above + column, above + (column + 1) % width}))
+    return _workflow(workflow_id, "diamond", dependencies)
+
+
+def random_dag(workflow_id: str, size: int, seed: int = 0) -> Workflow:
+    rng = random.Random(seed)
+    dependencies = [[]]
+    for index in range(1, size):
+        parents = rng.randint(0, min(3, index))
+        dependencies.append(sorted(rng.sample(range(index), parents)))
+    return _workflow(workflow_id, "random", dependencies)
+
+
+SHAPES: Dict[str, Callable[..., Workflow]] = {
+    "fan_out": fan_out,
+    "chain": chain,
+    "diamond": diamond,
+    "random": random_dag,
+}
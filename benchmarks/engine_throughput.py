@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+End-to-End Engine Throughput Benchmark for Gleitzeit V4
+
+Drives ExecutionEngine with synthetic providers over several workflow
+shapes, sizes and persistence backends, and reports throughput, per-task
+engine overhead and peak memory as JSON.
+
+Examples:
+    python benchmarks/engine_throughput.py
+    python benchmarks/engine_throughput.py --shapes fan_out,chain --sizes 10,1000,100000
+    python benchmarks/engine_throughput.py --backends memory,sqlite,redis --output bench.json
+    python benchmarks/engine_throughput.py --provider sleep --latency 0.005 --mode direct
+
+Each scenario runs in a fresh interpreter (unless --no-isolate), so peak
+RSS is per scenario and one scenario's garbage does not slow the next.
+
+Metrics:
+    tasks_per_sec: tasks / wall time from first submission to workflow completion
+    overhead_ms: per task, time inside the engine's task execution minus
+        time inside the provider (parameter resolution, routing, result
+        storage, events). In direct mode this includes waiting for a
+        concurrency slot.
+    queue_wait_ms: per task, time from becoming ready in the queue
+        (dependencies met) to being picked up for execution; not part of
+        overhead_ms. Event mode only; direct mode bypasses the queue.
+    peak_rss_mb: peak resident set size of the scenario process
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+import gleitzeit
+from gleitzeit.core.execution_engine import ExecutionEngine, ExecutionMode
+from gleitzeit.core.models import WorkflowStatus
+from gleitzeit.persistence.base import InMemoryBackend
+from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.task_queue import QueueManager, DependencyResolver
+
+from dag_shapes import SHAPES
+from providers import BENCH_PROTOCOL, NoOpProvider, SleepProvider, provider_time
+
+BACKENDS = ("memory", "sqlite", "redis")
+MODES = ("event", "direct")
+
+DEFAULTS = {
+    "shapes": "fan_out,chain,diamond,random",
+    "sizes": "10,100,1000",
+    "backends": "memory,sqlite",
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def distribution_ms(values: List[float]) -> Dict[str, float]:
+    """p50/p99/max of durations in seconds, as milliseconds"""
+    return {
+        "p50": round(percentile(values, 50) * 1000, 4),
+        "p99": round(percentile(values, 99) * 1000, 4),
+        "max": round(max(values, default=0.0) * 1000, 4),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def create_backend(config: Dict[str, Any], tmp_dir: str):
+    backend = config["backend"]
+    if backend == "memory":
+        persistence = InMemoryBackend()
+    elif backend == "sqlite":
+        from gleitzeit.persistence.sqlite_backend import SQLiteBackend
+        persistence = SQLiteBackend(
+            db_path=os.path.join(tmp_dir, "bench.db"),
+            write_behind=config.get("sqlite_write_behind", False)
+        )
+    elif backend == "redis":
+        from gleitzeit.persistence.redis_backend import RedisBackend
+        persistence = RedisBackend(
+            host=config.get("redis_host", "localhost"),
+            port=config.get("redis_port", 6379),
+            db=config.get("redis_db", 0),
+            key_prefix=f"gleitzeit-bench:{uuid4().hex[:8]}:"
+        )
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+    await persistence.initialize()
+    return persistence
+
+
+async def drop_backend(persistence) -> None:
+    """Remove benchmark keys from Redis and close the backend"""
+    client = getattr(persistence, "redis_client", None)
+    prefix = getattr(persistence, "key_prefix", "")
+    if client is not None and prefix.startswith("gleitzeit-bench:"):
+        keys = [key async for key in client.scan_iter(match=f"{prefix}*")]
+        for start in range(0, len(keys), 1000):
+            await client.delete(*keys[start:start + 1000])
+    await persistence.shutdown()
+
+
+async def run_event_driven(engine: ExecutionEngine, workflow, timeout: float) -> None:
+    """Submit a workflow to a running event-driven engine and wait for it"""
+    finished = asyncio.Event()
+
+    def on_finished(event_name, data):
+        if data.get("data", {}).get("workflow_id") == workflow.id:
+            finished.set()
+
+    engine.add_event_handler("workflow:completed", on_finished)
+    engine.add_event_handler("workflow:failed", on_finished)
+    await engine.submit_workflow(workflow)
+    await asyncio.wait_for(finished.wait(), timeout)
+
+
+async def run_direct(engine: ExecutionEngine, workflow, timeout: float) -> None:
+    """Execute a workflow level by level, as the client API does"""
+    await engine.submit_workflow(workflow)
+    await asyncio.wait_for(engine._execute_workflow(workflow), timeout)
+
+
+async def run_scenario(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one benchmark scenario
+
+    Args:
+        config: shape, size, backend, mode, provider, latency, concurrency,
+            timeout, seed (plus backend options)
+
+    Returns:
+        Scenario result with metrics, or a status explaining why it did not run
+    """
+    result = {key: config[key] for key in ("shape", "size", "backend", "mode", "provider")}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            persistence = await create_backend(config, tmp_dir)
+        except Exception as e:
+            result.update(status="skipped", reason=f"{config['backend']} unavailable: {e}")
+            return result
+
+        registry = ProtocolProviderRegistry()
+        registry.register_protocol(BENCH_PROTOCOL)
+        if config["provider"] == "sleep":
+            provider = SleepProvider(latency=config["latency"], jitter=config.get("jitter", 0.0))
+        else:
+            provider = NoOpProvider()
+        registry.register_provider(provider.provider_id, "bench/v1", provider)
+
+        engine = ExecutionEngine(
+            registry=registry,
+            queue_manager=QueueManager(),
+            dependency_resolver=DependencyResolver(),
+            persistence=persistence,
+            max_concurrent_tasks=config["concurrency"]
+        )
+
+        overheads: List[float] = []
+        queue_waits: List[float] = []
+        execute_task = engine._execute_task
+
+        async def timed_execute_task(task, ready_at=None):
+            spent = [0.0]
+            provider_time.set(spent)
+            started = time.perf_counter()
+            if ready_at is not None:
+                queue_waits.append(started - ready_at)
+            try:
+                return await execute_task(task, ready_at)
+            finally:
+                overheads.append(time.perf_counter() - started - spent[0])
+
+        engine._execute_task = timed_execute_task
+
+        build_started = time.perf_counter()
+        workflow = SHAPES[config["shape"]](f"bench-{uuid4().hex[:8]}", config["size"], seed=config.get("seed", 0))
+        build_seconds = time.perf_counter() - build_started
+
+        runner = None
+        try:
+            if config["mode"] == "event":
+                runner = asyncio.create_task(engine.start(ExecutionMode.EVENT_DRIVEN))
+                while not engine.running:
+                    await asyncio.sleep(0.001)
+
+            started = time.perf_counter()
+            if config["mode"] == "event":
+                await run_event_driven(engine, workflow, config["timeout"])
+            else:
+                await run_direct(engine, workflow, config["timeout"])
+            elapsed = time.perf_counter() - started
+        except asyncio.TimeoutError:
+            result.update(status="timeout", reason=f"did not finish within {config['timeout']}s")
+            return result
+        except Exception as e:
+            result.update(status="error", reason=f"{type(e).__name__}: {e}")
+            return result
+        finally:
+            if runner is not None:
+                await engine.stop()
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+            await drop_backend(persistence)
+
+    completed = workflow.status == WorkflowStatus.COMPLETED
+    result.update(
+        status="ok" if completed and provider.calls == config["size"] else "incomplete",
+        tasks=config["size"],
+        provider_calls=provider.calls,
+        seconds=round(elapsed, 6),
+        build_seconds=round(build_seconds, 6),
+        tasks_per_sec=round(config["size"] / elapsed, 2) if elapsed else None,
+        overhead_ms=distribution_ms(overheads),
+        queue_wait_ms=distribution_ms(queue_waits),
+        peak_rss_mb=round(peak_rss_mb(), 2),
+    )
+    return result
+
+
+def run_isolated(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter"""
+    command = [sys.executable, os.path.abspath(__file__), "--scenario", json.dumps(config)]
+    try:
+        completed = subprocess.run(
+            command, capture_output=True, text=True, timeout=config["timeout"] + 60
+        )
+    except subprocess.TimeoutExpired:
+        return {**_scenario_key(config), "status": "timeout", "reason": "scenario process did not exit"}
+    if completed.returncode != 0 or not completed.stdout.strip():
+        reason = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+        return {**_scenario_key(config), "status": "error", "reason": reason}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _scenario_key(config: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: config[key] for key in ("shape", "size", "backend", "mode", "provider")}
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Gleitzeit engine throughput benchmark")
+    parser.add_argument("--shapes", default=DEFAULTS["shapes"], help=f"Comma separated: {', '.join(SHAPES)}")
+    parser.add_argument("--sizes", default=DEFAULTS["sizes"], help="Comma separated task counts (e.g. 10,1000,100000)")
+    parser.add_argument("--backends", default=DEFAULTS["backends"], help=f"Comma separated: {', '.join(BACKENDS)}")
+    parser.add_argument("--mode", choices=MODES, default="event",
+                        help="event: queue-driven engine; direct: level-by-level workflow execution")
+    parser.add_argument("--provider", choices=("noop", "sleep"), default="noop")
+    parser.add_argument("--latency", type=float, default=0.001, help="Sleep provider latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Sleep provider random extra latency")
+    parser.add_argument("--concurrency", type=int, default=100, help="Engine max_concurrent_tasks")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random DAG")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds per scenario")
+    parser.add_argument("--sqlite-write-behind", action="store_true", help="Enable SQLite write-behind batching")
+    parser.add_argument("--redis-host", default="localhost")
+    parser.add_argument("--redis-port", type=int, default=6379)
+    parser.add_argument("--redis-db", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="Run scenarios in this process (peak RSS is then cumulative)")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def build_scenarios(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    shapes = _split(args.shapes)
+    backends = _split(args.backends)
+    for shape in shapes:
+        if shape not in SHAPES:
+            raise SystemExit(f"Unknown shape '{shape}' (choose from {', '.join(SHAPES)})")
+    for backend in backends:
+        if backend not in BACKENDS:
+            raise SystemExit(f"Unknown backend '{backend}' (choose from {', '.join(BACKENDS)})")
+
+    scenarios = []
+    for backend in backends:
+        for shape in shapes:
+            for size in (int(size) for size in _split(args.sizes)):
+                for run in range(args.repeat):
+                    scenarios.append({
+                        "shape": shape,
+                        "size": size,
+                        "backend": backend,
+                        "mode": args.mode,
+                        "provider": args.provider,
+                        "latency": args.latency,
+                        "jitter": args.jitter,
+                        "concurrency": args.concurrency,
+                        "seed": args.seed,
+                        "timeout": args.timeout,
+                        "run": run,
+                        "sqlite_write_behind": args.sqlite_write_behind,
+                        "redis_host": args.redis_host,
+                        "redis_port": args.redis_port,
+                        "redis_db": args.redis_db,
+                    })
+    return scenarios
+
+
+def format_row(result: Dict[str, Any]) -> str:
+    label = f"{result['backend']:<7} {result['shape']:<8} {result['size']:>7}"
+    if result.get("status") != "ok":
+        return f"{label}  {result.get('status')}: {result.get('reason', '')}"
+    overhead = result["overhead_ms"]
+    queue_wait = result["queue_wait_ms"]
+    return (
+        f"{label}  {result['tasks_per_sec']:>10.1f} tasks/s  "
+        f"overhead p50 {overhead['p50']:.3f}ms p99 {overhead['p99']:.3f}ms  "
+        f"queue wait p50 {queue_wait['p50']:.3f}ms p99 {queue_wait['p99']:.3f}ms  "
+        f"rss {result['peak_rss_mb']:.1f}MB"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.scenario:
+        # Child process: run one scenario and print its result
+        print(json.dumps(asyncio.run(run_scenario(json.loads(args.scenario)))))
+        return 0
+
+    results = []
+    for config in build_scenarios(args):
+        if args.no_isolate:
+            result = asyncio.run(run_scenario(config))
+        else:
+            result = run_isolated(config)
+        result["run"] = config["run"]
+        results.append(result)
+        print(format_row(result), file=sys.stderr)
+
+    report = {
+        "benchmark": "engine_throughput",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "gleitzeit_version": gleitzeit.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("scenario", "output")
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    failed = [result for result in results if result.get("status") not in ("ok", "skipped")]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Synthetic Providers for Gleitzeit V4 Benchmarks
+
+Providers that do no real work, so a benchmark measures the engine,
+queue and persistence paths rather than an LLM or Python runtime.
+Time spent inside a provider is added to the ``provider_time``
+accumulator of the current task (see ``engine_throughput.py``), which lets
+the runner subtract it from the engine's per-task time.
+"""
+
+import asyncio
+import contextvars
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from gleitzeit.core.protocol import ProtocolSpec, MethodSpec
+from gleitzeit.providers.base import ProtocolProvider
+
+BENCH_PROTOCOL = ProtocolSpec(
+    name="bench",
+    version="v1",
+    description="Synthetic protocol for throughput benchmarks",
+    methods={
+        "bench/run": MethodSpec(name="bench/run", description="Do nothing (or sleep) and return")
+    }
+)
+
+# Per-task accumulator of seconds spent in providers, set by the runner
+provider_time: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "provider_time", default=None
+)
+
+
+class NoOpProvider(ProtocolProvider):
+    """Provider that returns immediately"""
+
+    def __init__(self, provider_id: str = "bench-noop"):
+        super().__init__(provider_id=provider_id, protocol_id="bench/v1")
+        self.calls = 0
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health_check(self):
+        return {"status": "healthy"}
+
+    def get_supported_methods(self):
+        return ["bench/run"]
+
+    async def handle_request(self, method: str, params: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        self.calls += 1
+        await self.work()
+        accumulator = provider_time.get()
+        if accumulator is not None:
+            accumulator[0] += time.perf_counter() - started
+        return {"ok": True}
+
+    async def work(self) -> None:
+        pass
+
+
+class SleepProvider(NoOpProvider):
+    """Provider that simulates I/O latency with asyncio.sleep"""
+
+    def __init__(self, provider_id: str = "bench-sleep", latency: float = 0.001, jitter: float = 0.0, seed: int = 0):
+        """
+        Initialize the sleep provider
+
+        Args:
+            provider_id: Provider ID
+            latency: Seconds each request sleeps
+            jitter: Extra random sleep of up to this many seconds
+            seed: Seed for the jitter
+        """
+        super().__init__(provider_id=provider_id)
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    async def work(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        await asyncio.sleep(delay)
@@ -14,7 +14,7 @@ import tempfile
 import yaml
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, Optional
 
 # Add the parent directory to Python path for imports
 current_dir = Path(__file__).parent
@@ -25,14 +25,21 @@ from gleitzeit.core import Task, Workflow, Priority, ExecutionEngine, ExecutionM
 from gleitzeit.core.models import RetryConfig
 from gleitzeit.core.retry_manager import BackoffStrategy
 from gleitzeit.task_queue import QueueManager, DependencyResolver  
-from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.registry import ProtocolProviderRegistry, DEFAULT_SINGLE_FLIGHT_PROTOCOLS
 from gleitzeit.providers.python_function_provider import CustomFunctionProvider
+from gleitzeit.providers.python_worker_pool import PythonWorkerPool
+from gleitzeit.providers.image_prep import ImagePreparer, ImageSpec
 from gleitzeit.providers.ollama_provider import OllamaProvider
+from gleitzeit.providers.response_cache import ResponseCache
 from gleitzeit.providers.simple_mcp_provider import SimpleMCPProvider
 from gleitzeit.protocols import PYTHON_PROTOCOL_V1, LLM_PROTOCOL_V1, MCP_PROTOCOL_V1
 from gleitzeit.persistence.redis_backend import RedisBackend
 from gleitzeit.persistence.sqlite_backend import SQLiteBackend
 from gleitzeit.core.batch_processor import BatchProcessor, BatchResult
+from gleitzeit.core.result_sink import JSONLResultSink
+from gleitzeit.core.phase_timing import PhaseTimings
+from gleitzeit.core.metrics import MetricsRegistry, MetricsServer, write_metrics_file
+from gleitzeit.core.process_worker_pool import ProcessWorkerPool
 
 # Import error formatter
 from gleitzeit.core.error_formatter import set_debug_mode, get_clean_logger
@@ -48,6 +55,10 @@ class GleitzeitCLI:
         self.config = self._load_config()
         self.execution_engine = None
         self.persistence_backend = None
+        self.metrics = MetricsRegistry()
+        self.metrics_server = None
+        self.workers = 0  # engine worker processes (--workers)
+        self.worker_pool = None
         
     def _load_config(self) -> Dict[str, Any]:
         """Load CLI configuration"""
@@ -93,6 +104,12 @@ class GleitzeitCLI:
                 }
             }
     
+    def set_workers(self, workers: Optional[int]) -> None:
+        """Use worker processes for providers (None falls back to execution.workers)"""
+        if workers is None:
+            workers = self.config.get('execution', {}).get('workers', 0)
+        self.workers = max(0, workers or 0)
+    
     async def _setup_system(self) -> bool:
         """Set up the execution system"""
         try:
@@ -112,7 +129,11 @@ class GleitzeitCLI:
                 db_path = sqlite_config.get('db_path', str(Path.home() / '.gleitzeit' / 'workflows.db'))
                 # Ensure directory exists
                 Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-                self.persistence_backend = SQLiteBackend(db_path=db_path)
+                self.persistence_backend = SQLiteBackend(
+                    db_path=db_path,
+                    write_behind=sqlite_config.get('write_behind', False),
+                    read_pool_size=sqlite_config.get('read_pool_size', 0)
+                )
             
             await self.persistence_backend.initialize()
             click.echo(f"✓ {backend_type.title()} persistence initialized")
@@ -120,54 +141,50 @@ class GleitzeitCLI:
             # Set up execution components
             queue_manager = QueueManager()
             dependency_resolver = DependencyResolver()
-            registry = ProtocolProviderRegistry()
-            
             execution_config = self.config.get('execution', {})
+            registry = ProtocolProviderRegistry(
+                load_balancing=execution_config.get('load_balancing', 'least_outstanding'),
+                single_flight_protocols=execution_config.get(
+                    'single_flight_protocols', DEFAULT_SINGLE_FLIGHT_PROTOCOLS
+                )
+            )
+            
             max_concurrent = execution_config.get('max_concurrent_tasks', 5)
+            if self.workers:
+                self.worker_pool = ProcessWorkerPool(
+                    workers=self.workers,
+                    registry_factory="gleitzeit.cli.gleitzeit_cli:build_worker_registry",
+                    factory_kwargs={"config": self.config}
+                )
             self.execution_engine = ExecutionEngine(
                 registry=registry,
                 queue_manager=queue_manager,
                 dependency_resolver=dependency_resolver,
                 persistence=self.persistence_backend,
-                max_concurrent_tasks=max_concurrent
+                max_concurrent_tasks=max_concurrent,
+                metrics=self.metrics,
+                worker_pool=self.worker_pool
             )
             
-            # Register protocols and providers
-            provider_config = self.config.get('providers', {})
-            
-            # Python provider
-            python_config = provider_config.get('python', {})
-            if python_config.get('enabled', True):
-                registry.register_protocol(PYTHON_PROTOCOL_V1)
-                python_provider = CustomFunctionProvider("cli-python-provider")
-                await python_provider.initialize()
-                registry.register_provider("cli-python-provider", "python/v1", python_provider)
-                click.echo("✓ Python provider registered")
-            
-            # Ollama provider
-            ollama_config = provider_config.get('ollama', {})
-            if ollama_config.get('enabled', True):
-                try:
-                    registry.register_protocol(LLM_PROTOCOL_V1)
-                    ollama_endpoint = ollama_config.get('endpoint', 'http://localhost:11434')
-                    ollama_provider = OllamaProvider("cli-ollama-provider", ollama_endpoint)
-                    await ollama_provider.initialize()
-                    registry.register_provider("cli-ollama-provider", "llm/v1", ollama_provider)
-                    click.echo("✓ Ollama provider registered")
-                except Exception as e:
-                    click.echo(f"⚠️  Ollama provider failed to initialize: {e}")
+            # Optional OpenMetrics endpoint for scraping long runs
+            metrics_config = self.config.get('metrics', {})
+            if metrics_config.get('http_port') is not None:
+                self.metrics_server = MetricsServer(
+                    self.metrics,
+                    host=metrics_config.get('http_host', '127.0.0.1'),
+                    port=metrics_config['http_port']
+                )
+                await self.metrics_server.start()
+                click.echo(f"✓ Metrics at http://{self.metrics_server.host}:{self.metrics_server.port}/metrics")
             
-            # MCP provider
-            mcp_config = provider_config.get('mcp', {})
-            if mcp_config.get('enabled', True):
-                try:
-                    registry.register_protocol(MCP_PROTOCOL_V1)
-                    mcp_provider = SimpleMCPProvider("cli-mcp-provider")
-                    await mcp_provider.initialize()
-                    registry.register_provider("cli-mcp-provider", "mcp/v1", mcp_provider)
-                    click.echo("✓ MCP provider registered")
-                except Exception as e:
-                    click.echo(f"⚠️  MCP provider failed to initialize: {e}")
+            if self.worker_pool:
+                # Providers run in the worker processes; the protocol specs are
+                # still needed here to validate task params at submission
+                register_protocols(registry, self.config)
+                await self.worker_pool.start()
+                click.echo(f"✓ {self.worker_pool.size} engine workers started")
+            else:
+                await register_providers(registry, self.config)
             
             return True
             
@@ -207,8 +224,9 @@ class GleitzeitCLI:
             
             # Show results
             click.echo("\n✅ Workflow completed!")
+            results = await self.execution_engine.task_results.fetch_many([task.id for task in workflow.tasks])
             for task in workflow.tasks:
-                result = self.execution_engine.task_results.get(task.id)
+                result = results.get(task.id)
                 self._display_task_result(task.name, result)
             
             persistence_backend = self.config.get('persistence', {}).get('backend', 'sqlite')
@@ -255,8 +273,185 @@ class GleitzeitCLI:
     
     async def _shutdown_system(self):
         """Clean shutdown of the system"""
+        self._write_metrics_file()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+            self.metrics_server = None
+        if self.worker_pool:
+            await self.worker_pool.shutdown()
+            self.worker_pool = None
+        if self.execution_engine:
+            # Shuts down the providers and the resources they share
+            await self.execution_engine.registry.stop()
+        self._save_phase_timings()
         if self.persistence_backend:
             await self.persistence_backend.shutdown()
+    
+    def _write_metrics_file(self) -> None:
+        """Dump the run's metrics in OpenMetrics format if metrics.file is configured"""
+        metrics_file = self.config.get('metrics', {}).get('file')
+        if not metrics_file or not self.execution_engine:
+            return
+        try:
+            write_metrics_file(self.metrics, str(Path(metrics_file).expanduser()))
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {metrics_file}: {e}")
+    
+    def _phase_timings_file(self) -> Path:
+        """File accumulating task phase timings across CLI runs"""
+        metrics_config = self.config.get('metrics', {})
+        return Path(metrics_config.get(
+            'phase_timings_file', str(Path.home() / '.gleitzeit' / 'phase_timings.json')
+        ))
+    
+    def load_phase_timings(self) -> PhaseTimings:
+        """Load the accumulated phase timings (empty if none were recorded)"""
+        timings_file = self._phase_timings_file()
+        if not timings_file.exists():
+            return PhaseTimings()
+        try:
+            return PhaseTimings.from_state(json.loads(timings_file.read_text()))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable phase timings file {timings_file}: {e}")
+            return PhaseTimings()
+    
+    def _save_phase_timings(self) -> None:
+        """Merge this run's phase timings into the accumulated file"""
+        if not self.execution_engine or not len(self.execution_engine.phase_timings):
+            return
+        timings = self.load_phase_timings()
+        timings.merge(self.execution_engine.phase_timings)
+        timings_file = self._phase_timings_file()
+        try:
+            timings_file.parent.mkdir(parents=True, exist_ok=True)
+            # Replace the file atomically so a crash or a concurrent run never
+            # leaves it truncated
+            fd, tmp_path = tempfile.mkstemp(
+                dir=str(timings_file.parent), prefix=".phase_timings-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(timings.to_state(), f)
+                os.replace(tmp_path, timings_file)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not save phase timings to {timings_file}: {e}")
+        # Saved once per run
+        self.execution_engine.phase_timings.reset()
+
+
+def register_protocols(registry: ProtocolProviderRegistry, config: Dict[str, Any]) -> None:
+    """Register the protocol specs of the providers enabled in the CLI config"""
+    provider_config = config.get('providers', {})
+    if provider_config.get('python', {}).get('enabled', True):
+        registry.register_protocol(PYTHON_PROTOCOL_V1)
+    if provider_config.get('ollama', {}).get('enabled', True):
+        registry.register_protocol(LLM_PROTOCOL_V1)
+    if provider_config.get('mcp', {}).get('enabled', True):
+        registry.register_protocol(MCP_PROTOCOL_V1)
+
+
+async def register_providers(
+    registry: ProtocolProviderRegistry,
+    config: Dict[str, Any],
+    report: Callable[[str], None] = click.echo
+) -> None:
+    """
+    Register the protocols and providers enabled in the CLI config
+    
+    Shared by the CLI process and its engine workers (see build_worker_registry).
+    """
+    register_protocols(registry, config)
+    provider_config = config.get('providers', {})
+    
+    # Python provider
+    python_config = provider_config.get('python', {})
+    if python_config.get('enabled', True):
+        worker_config = python_config.get('workers', {})
+        python_provider = CustomFunctionProvider(
+            "cli-python-provider",
+            worker_pool=PythonWorkerPool(
+                size=worker_config.get('size', 2),
+                max_jobs_per_worker=worker_config.get('max_jobs_per_worker', 500),
+                max_memory_mb=worker_config.get('max_memory_mb'),
+                preload_modules=worker_config.get('preload_modules')
+            )
+        )
+        await python_provider.initialize()
+        registry.register_provider("cli-python-provider", "python/v1", python_provider)
+        report("✓ Python provider registered")
+    
+    # Ollama provider
+    ollama_config = provider_config.get('ollama', {})
+    if ollama_config.get('enabled', True):
+        try:
+            # Several endpoints share llm/v1 requests through the registry's load balancing
+            ollama_endpoints = ollama_config.get('endpoints') or [
+                ollama_config.get('endpoint', 'http://localhost:11434')
+            ]
+            # One response cache shared by all endpoints
+            cache_config = ollama_config.get('cache', {})
+            response_cache = None
+            if cache_config.get('enabled', False):
+                response_cache = ResponseCache(
+                    max_entries=cache_config.get('max_entries', 1000),
+                    ttl=cache_config.get('ttl'),
+                    disk_path=cache_config.get('disk_path'),
+                    max_disk_entries=cache_config.get('max_disk_entries', 100000)
+                )
+                registry.add_shared_cleanup(response_cache.close)
+            # Vision images are downscaled/re-encoded once and shared by all endpoints
+            image_config = ollama_config.get('images', {})
+            image_preparer = ImagePreparer(
+                spec=ImageSpec(
+                    max_edge=image_config.get('max_edge'),
+                    format=image_config.get('format'),
+                    quality=image_config.get('quality', 85)
+                ),
+                cache_size=image_config.get('cache_size', 256)
+            )
+            registry.add_shared_cleanup(image_preparer.shutdown)
+            for index, ollama_endpoint in enumerate(ollama_endpoints):
+                provider_id = "cli-ollama-provider" if index == 0 else f"cli-ollama-provider-{index + 1}"
+                ollama_provider = OllamaProvider(
+                    provider_id, ollama_endpoint,
+                    response_cache=response_cache, image_preparer=image_preparer
+                )
+                await ollama_provider.initialize()
+                registry.register_provider(
+                    provider_id, "llm/v1", ollama_provider,
+                    max_concurrent_requests=ollama_config.get('max_concurrent_requests')
+                )
+            report("✓ Ollama provider registered")
+        except Exception as e:
+            report(f"⚠️  Ollama provider failed to initialize: {e}")
+    
+    # MCP provider
+    mcp_config = provider_config.get('mcp', {})
+    if mcp_config.get('enabled', True):
+        try:
+            mcp_provider = SimpleMCPProvider("cli-mcp-provider")
+            await mcp_provider.initialize()
+            registry.register_provider("cli-mcp-provider", "mcp/v1", mcp_provider)
+            report("✓ MCP provider registered")
+        except Exception as e:
+            report(f"⚠️  MCP provider failed to initialize: {e}")
+
+
+async def build_worker_registry(config: Dict[str, Any]) -> ProtocolProviderRegistry:
+    """Registry factory for engine worker processes (``--workers``)"""
+    execution_config = config.get('execution', {})
+    registry = ProtocolProviderRegistry(
+        load_balancing=execution_config.get('load_balancing', 'least_outstanding'),
+        single_flight_protocols=execution_config.get(
+            'single_flight_protocols', DEFAULT_SINGLE_FLIGHT_PROTOCOLS
+        )
+    )
+    await register_providers(registry, config, report=logger.info)
+    return registry
 
 
 # CLI instance
@@ -300,17 +495,20 @@ def cli(verbose: bool, debug: bool):
 @click.option('--watch', '-w', is_flag=True, help='Watch execution progress')
 @click.option('--backend', type=click.Choice(['sqlite', 'redis']), 
               help='Override persistence backend')
-def run(workflow_file: str, watch: bool, backend: Optional[str]):
+@click.option('--workers', type=int, default=None,
+              help='Run providers in this many worker processes (default: execution.workers, 0 = in-process)')
+def run(workflow_file: str, watch: bool, backend: Optional[str], workers: Optional[int]):
     """Execute a workflow from a YAML or JSON file"""
-    return asyncio.run(_run_workflow(workflow_file, watch, backend))
+    return asyncio.run(_run_workflow(workflow_file, watch, backend, workers))
 
 
-async def _run_workflow(workflow_file: str, watch: bool, backend: Optional[str]):
+async def _run_workflow(workflow_file: str, watch: bool, backend: Optional[str], workers: Optional[int] = None):
     """Execute workflow implementation"""
     try:
         # Override backend if specified
         if backend:
             cli_instance.config['persistence']['backend'] = backend
+        cli_instance.set_workers(workers)
         
         # Setup system
         if not await cli_instance._setup_system():
@@ -344,8 +542,9 @@ async def _run_workflow(workflow_file: str, watch: bool, backend: Optional[str])
         
         # Show results
         click.echo("\n✅ Workflow completed!")
+        results = await cli_instance.execution_engine.task_results.fetch_many([task.id for task in workflow.tasks])
         for task in workflow.tasks:
-            result = cli_instance.execution_engine.task_results.get(task.id)
+            result = results.get(task.id)
             cli_instance._display_task_result(task.name, result)
         
         persistence_backend = cli_instance.config.get('persistence', {}).get('backend', 'sqlite')
@@ -363,12 +562,32 @@ async def _run_workflow(workflow_file: str, watch: bool, backend: Optional[str])
 @cli.command()
 @click.option('--backend', type=click.Choice(['sqlite', 'redis']), 
               help='Persistence backend to query')
-def status(backend: Optional[str]):
+@click.option('--timings', is_flag=True, help='Show per-phase task latency percentiles')
+@click.option('--reset-timings', is_flag=True, help='Clear the recorded task phase timings')
+def status(backend: Optional[str], timings: bool, reset_timings: bool):
     """Show system status and recent workflows"""
-    return asyncio.run(_show_status(backend))
+    return asyncio.run(_show_status(backend, timings, reset_timings))
 
 
-async def _show_status(backend: Optional[str]):
+def _display_phase_timings(timings: PhaseTimings):
+    """Print p50/p90/p99/max per phase for each protocol method"""
+    snapshot = timings.snapshot()
+    if not snapshot:
+        click.echo("\n⏱️  No task phase timings recorded yet")
+        return
+    
+    click.echo("\n⏱️  Task Phase Timings (ms):")
+    for method_key, phases in snapshot.items():
+        click.echo(f"\n   {method_key}")
+        click.echo(f"   {'phase':<16}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+        for phase, summary in phases.items():
+            click.echo(
+                f"   {phase:<16}{summary['count']:>8}{summary['p50_ms']:>10.2f}"
+                f"{summary['p90_ms']:>10.2f}{summary['p99_ms']:>10.2f}{summary['max_ms']:>10.2f}"
+            )
+
+
+async def _show_status(backend: Optional[str], timings: bool = False, reset_timings: bool = False):
     """Show status implementation"""
     try:
         if backend:
@@ -401,6 +620,13 @@ async def _show_status(backend: Optional[str]):
         except Exception as e:
             click.echo(f"   ⚠️  Could not load recent tasks: {e}")
         
+        # Phase timings accumulated by previous runs
+        if reset_timings:
+            cli_instance._phase_timings_file().unlink(missing_ok=True)
+            click.echo("\n⏱️  Task phase timings cleared")
+        elif timings:
+            _display_phase_timings(cli_instance.load_phase_timings())
+        
     except Exception as e:
         click.echo(f"❌ Status check failed: {e}")
     finally:
@@ -575,9 +801,17 @@ def config():
 @click.option('--model', default='llama3.2:latest', help='Model to use')
 @click.option('--vision', is_flag=True, help='Use vision model for images')
 @click.option('--output', type=click.Path(), help='Save results to file')
-def batch(directory: str, pattern: str, prompt: str, model: str, vision: bool, output: Optional[str]):
+@click.option('--chunk-size', type=int, default=None,
+              help='Stream files and submit them in chunks of this many tasks (for large directories)')
+@click.option('--results-file', type=click.Path(dir_okay=False), default=None,
+              help='Append each file result to this JSONL file as it completes')
+@click.option('--workers', type=int, default=None,
+              help='Run providers in this many worker processes (default: execution.workers, 0 = in-process)')
+def batch(directory: str, pattern: str, prompt: str, model: str, vision: bool, output: Optional[str],
+          chunk_size: Optional[int], results_file: Optional[str], workers: Optional[int]):
     """Process multiple files in batch"""
-    return asyncio.run(_batch_process(directory, pattern, prompt, model, vision, output))
+    return asyncio.run(_batch_process(directory, pattern, prompt, model, vision, output, chunk_size, results_file,
+                                      workers))
 
 
 @cli.command()
@@ -588,9 +822,12 @@ def exec(code: str, timeout: int):
     return asyncio.run(_exec_code(code, timeout))
 
 
-async def _batch_process(directory: str, pattern: str, prompt: str, model: str, vision: bool, output: Optional[str]):
+async def _batch_process(directory: str, pattern: str, prompt: str, model: str, vision: bool, output: Optional[str],
+                         chunk_size: Optional[int] = None, results_file: Optional[str] = None,
+                         workers: Optional[int] = None):
     """Process files in batch using BatchProcessor"""
     try:
+        cli_instance.set_workers(workers)
         if not await cli_instance._setup_system():
             return
         
@@ -612,6 +849,12 @@ async def _batch_process(directory: str, pattern: str, prompt: str, model: str,
             else:
                 model = default_models.get('chat', 'llama3.2:latest')
         
+        # Stream per-file results to disk if requested
+        sink = None
+        if results_file:
+            sink = JSONLResultSink(results_file)
+            click.echo(f"   Streaming results to: {results_file}")
+        
         # Process batch
         click.echo("⏳ Processing files...")
         result = await batch_processor.process_batch(
@@ -620,21 +863,24 @@ async def _batch_process(directory: str, pattern: str, prompt: str, model: str,
             pattern=pattern,
             method=method,
             prompt=prompt,
-            model=model
+            model=model,
+            chunk_size=chunk_size,
+            sink=sink
         )
         
         # Display results
         click.echo(f"\n✅ Batch processing complete!")
         click.echo(f"   Batch ID: {result.batch_id}")
         click.echo(f"   Total files: {result.total_files}")
-        click.echo(f"   Successful: {result.successful} ({result.successful/result.total_files*100:.1f}%)")
+        success_rate = result.successful / result.total_files * 100 if result.total_files else 0.0
+        click.echo(f"   Successful: {result.successful} ({success_rate:.1f}%)")
         click.echo(f"   Failed: {result.failed}")
         click.echo(f"   Processing time: {result.processing_time:.2f}s")
         
         # Show individual results
         if result.total_files <= 10:  # Show details for small batches
             click.echo("\n📊 Results:")
-            for file_path, file_result in result.results.items():
+            for file_path, file_result in result.iter_results():
                 file_name = Path(file_path).name
                 if file_result['status'] == 'success':
                     content = file_result.get('content', '')
@@ -649,7 +895,8 @@ async def _batch_process(directory: str, pattern: str, prompt: str, model: str,
         if output:
             output_path = Path(output)
             if output_path.suffix == '.md':
-                output_path.write_text(result.to_markdown())
+                with open(output_path, 'w') as f:
+                    f.writelines(result.iter_markdown())
                 click.echo(f"\n💾 Results saved to: {output_path} (Markdown)")
             else:
                 output_path.write_text(result.to_json())
@@ -686,7 +933,7 @@ async def _exec_code(code: str, timeout: int):
         await cli_instance.execution_engine.start(ExecutionMode.SINGLE_SHOT)
         
         # Show result
-        result = cli_instance.execution_engine.task_results.get(task.id)
+        result = await cli_instance.execution_engine.task_results.fetch(task.id)
         if result and result.status == "completed":
             click.echo("✅ Code executed successfully")
             if result.result and 'output' in result.result:
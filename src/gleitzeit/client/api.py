@@ -5,7 +5,7 @@ Simple Python interface for using Gleitzeit programmatically.
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncIterator, Dict, List, Any, Optional, Union
 from pathlib import Path
 import tempfile
 import yaml
@@ -14,13 +14,17 @@ import json
 from gleitzeit.core import ExecutionEngine, Task, Workflow, Priority
 from gleitzeit.core.workflow_loader import load_workflow_from_file, load_workflow_from_dict
 from gleitzeit.core.batch_processor import BatchProcessor
+from gleitzeit.core.result_sink import JSONLResultSink
+from gleitzeit.core.metrics import MetricsRegistry, MetricsServer
+from gleitzeit.core.process_worker_pool import ProcessWorkerPool
 from gleitzeit.core.error_handler import (
     ErrorHandler, get_error_handler,
     task_not_found_error, provider_not_available_error
 )
 from gleitzeit.core.errors import TaskError, ErrorCode, InvalidParameterError
+from gleitzeit.core.events import EventType
 from gleitzeit.task_queue import QueueManager, DependencyResolver
-from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.registry import ProtocolProviderRegistry, DEFAULT_SINGLE_FLIGHT_PROTOCOLS
 from gleitzeit.persistence.sqlite_backend import SQLiteBackend
 from gleitzeit.persistence.redis_backend import RedisBackend
 from gleitzeit.providers.ollama_provider import OllamaProvider
@@ -54,7 +58,9 @@ class GleitzeitClient:
         db_path: Optional[str] = None,
         redis_url: Optional[str] = None,
         ollama_url: str = "http://localhost:11434",
-        debug: bool = False
+        debug: bool = False,
+        metrics_port: Optional[int] = None,
+        workers: int = 0
     ):
         """
         Initialize Gleitzeit client.
@@ -64,13 +70,22 @@ class GleitzeitClient:
             db_path: SQLite database path (auto-generated if not provided)
             redis_url: Redis connection URL
             ollama_url: Ollama API endpoint
+            metrics_port: Serve OpenMetrics on http://127.0.0.1:<port>/metrics
+                (0 picks a free port; None disables the endpoint)
+            workers: Run providers in this many worker processes (0 runs
+                everything in this process)
         """
         self.persistence_type = persistence
         self.db_path = db_path
         self.redis_url = redis_url
         self.ollama_url = ollama_url
         self.debug = debug
+        self.metrics_port = metrics_port
+        self.workers = workers
         
+        self.metrics = MetricsRegistry()
+        self.metrics_server: Optional[MetricsServer] = None
+        self.worker_pool: Optional[ProcessWorkerPool] = None
         self.backend = None
         self.registry = None
         self.engine = None
@@ -108,28 +123,36 @@ class GleitzeitClient:
         await self.backend.initialize()
         
         # Setup registry and providers
-        self.registry = ProtocolProviderRegistry()
+        self.registry = ProtocolProviderRegistry(single_flight_protocols=DEFAULT_SINGLE_FLIGHT_PROTOCOLS)
         
         # Register protocols
         self.registry.register_protocol(PYTHON_PROTOCOL_V1)
         self.registry.register_protocol(LLM_PROTOCOL_V1)
         self.registry.register_protocol(MCP_PROTOCOL_V1)
         
-        # Register providers
-        # Python provider
-        python_provider = CustomFunctionProvider("python-1")
-        await python_provider.initialize()
-        self.registry.register_provider("python-1", "python/v1", python_provider)
-        
-        # Ollama provider
-        ollama_provider = OllamaProvider("ollama-1", self.ollama_url)
-        await ollama_provider.initialize()
-        self.registry.register_provider("ollama-1", "llm/v1", ollama_provider)
-        
-        # MCP provider
-        mcp_provider = SimpleMCPProvider("mcp-1")
-        await mcp_provider.initialize()
-        self.registry.register_provider("mcp-1", "mcp/v1", mcp_provider)
+        if self.workers:
+            # Each worker process builds the same providers
+            self.worker_pool = ProcessWorkerPool(
+                workers=self.workers,
+                factory_kwargs={"ollama_url": self.ollama_url}
+            )
+            await self.worker_pool.start()
+        else:
+            # Register providers
+            # Python provider
+            python_provider = CustomFunctionProvider("python-1")
+            await python_provider.initialize()
+            self.registry.register_provider("python-1", "python/v1", python_provider)
+            
+            # Ollama provider
+            ollama_provider = OllamaProvider("ollama-1", self.ollama_url)
+            await ollama_provider.initialize()
+            self.registry.register_provider("ollama-1", "llm/v1", ollama_provider)
+            
+            # MCP provider
+            mcp_provider = SimpleMCPProvider("mcp-1")
+            await mcp_provider.initialize()
+            self.registry.register_provider("mcp-1", "mcp/v1", mcp_provider)
         
         # Setup execution engine
         self.engine = ExecutionEngine(
@@ -137,9 +160,15 @@ class GleitzeitClient:
             queue_manager=QueueManager(),
             dependency_resolver=DependencyResolver(),
             persistence=self.backend,
-            max_concurrent_tasks=5
+            max_concurrent_tasks=5,
+            metrics=self.metrics,
+            worker_pool=self.worker_pool
         )
         
+        if self.metrics_port is not None:
+            self.metrics_server = MetricsServer(self.metrics, port=self.metrics_port)
+            await self.metrics_server.start()
+        
         # Setup batch processor
         self.batch_processor = BatchProcessor()
         
@@ -147,6 +176,12 @@ class GleitzeitClient:
     
     async def shutdown(self):
         """Shutdown and cleanup resources."""
+        if self.metrics_server:
+            await self.metrics_server.stop()
+            self.metrics_server = None
+        if self.worker_pool:
+            await self.worker_pool.shutdown()
+            self.worker_pool = None
         if self.backend:
             await self.backend.shutdown()
         if self.registry:
@@ -161,8 +196,9 @@ class GleitzeitClient:
         model: str = "llama3.2:latest",
         system: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> str:
+        max_tokens: Optional[int] = None,
+        stream: bool = False
+    ) -> Union[str, AsyncIterator[str]]:
         """
         Simple chat completion.
         
@@ -172,9 +208,19 @@ class GleitzeitClient:
             system: Optional system prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            stream: Return an async iterator of response chunks as they
+                are generated (the full response is still stored as the
+                task result)
         
         Returns:
-            Generated text response
+            Generated text response, or an async iterator of text chunks
+            if stream is True
+        
+        Example:
+            ```python
+            async for chunk in await client.chat("Tell me a story", stream=True):
+                print(chunk, end="", flush=True)
+            ```
         """
         await self.initialize()
         
@@ -192,7 +238,8 @@ class GleitzeitClient:
                 "model": model,
                 "messages": messages,
                 "temperature": temperature,
-                **({"max_tokens": max_tokens} if max_tokens else {})
+                **({"max_tokens": max_tokens} if max_tokens else {}),
+                **({"stream": True} if stream else {})
             }
         )
         
@@ -204,10 +251,14 @@ class GleitzeitClient:
         
         await self.backend.save_workflow(workflow)
         await self.backend.save_task(task)
+        
+        if stream:
+            return self._stream_workflow_output(workflow, task)
+        
         await self.engine._execute_workflow(workflow)
         
-        if task.id in self.engine.task_results:
-            result = self.engine.task_results[task.id]
+        result = await self.engine.task_results.fetch(task.id)
+        if result is not None:
             if isinstance(result, dict) and "response" in result:
                 return result["response"]
             return str(result)
@@ -218,6 +269,45 @@ class GleitzeitClient:
             task_id=task.id
         )
     
+    async def _stream_workflow_output(self, workflow: Workflow, task: Task) -> AsyncIterator[str]:
+        """Execute a workflow, yielding partial output chunks of one of its tasks"""
+        chunks: asyncio.Queue = asyncio.Queue()
+        
+        def on_partial_output(event_name: str, event: Dict[str, Any]) -> None:
+            data = event.get("data", {})
+            if data.get("task_id") == task.id:
+                chunks.put_nowait(data["chunk"])
+        
+        self.engine.add_event_handler(EventType.TASK_PARTIAL_OUTPUT.value, on_partial_output)
+        execution = asyncio.create_task(self.engine._execute_workflow(workflow))
+        try:
+            while not execution.done():
+                next_chunk = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({next_chunk, execution}, return_when=asyncio.FIRST_COMPLETED)
+                if next_chunk.done():
+                    yield next_chunk.result()
+                else:
+                    next_chunk.cancel()
+            
+            # Chunks emitted just before the workflow finished
+            await self.engine.flush_events()
+            while not chunks.empty():
+                yield chunks.get_nowait()
+            
+            await execution
+        finally:
+            self.engine.remove_event_handler(EventType.TASK_PARTIAL_OUTPUT.value, on_partial_output)
+            if not execution.done():
+                execution.cancel()
+        
+        result = await self.engine.task_results.fetch(task.id)
+        if result is None or result.error:
+            raise TaskError(
+                f"Streaming task failed - {result.error if result else 'no result returned'}",
+                ErrorCode.TASK_EXECUTION_FAILED,
+                task_id=task.id
+            )
+    
     async def vision(
         self,
         image_path: str,
@@ -259,8 +349,8 @@ class GleitzeitClient:
         await self.backend.save_task(task)
         await self.engine._execute_workflow(workflow)
         
-        if task.id in self.engine.task_results:
-            result = self.engine.task_results[task.id]
+        result = await self.engine.task_results.fetch(task.id)
+        if result is not None:
             if isinstance(result, dict) and "response" in result:
                 return result["response"]
             return str(result)
@@ -312,8 +402,8 @@ class GleitzeitClient:
         await self.backend.save_task(task)
         await self.engine._execute_workflow(workflow)
         
-        if task.id in self.engine.task_results:
-            result = self.engine.task_results[task.id]
+        result = await self.engine.task_results.fetch(task.id)
+        if result is not None:
             if isinstance(result, dict) and "result" in result:
                 return result["result"]
             return result
@@ -362,8 +452,11 @@ class GleitzeitClient:
         
         await self.engine._execute_workflow(workflow_obj)
         
-        # Return all task results
-        return dict(self.engine.task_results)
+        # Return all task results; results of this workflow may already have
+        # been evicted from memory, so read them through the store
+        results = dict(self.engine.task_results)
+        results.update(await self.engine.task_results.fetch_many([task.id for task in workflow_obj.tasks]))
+        return results
     
     async def create_workflow(
         self,
@@ -396,7 +489,9 @@ class GleitzeitClient:
         method: str = "llm/chat",
         prompt: str = "Analyze this file",
         model: str = "llama3.2:latest",
-        protocol: str = "llm/v1"
+        protocol: str = "llm/v1",
+        chunk_size: Optional[int] = None,
+        results_file: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process multiple files in batch.
@@ -404,17 +499,23 @@ class GleitzeitClient:
         Args:
             directory: Directory to scan for files
             files: List of file paths (alternative to directory)
-            pattern: Glob pattern for file matching
+            pattern: Glob pattern for file matching ("**" matches subdirectories)
             method: Processing method
             prompt: Prompt for LLM processing
             model: Model to use
             protocol: Protocol to use
+            chunk_size: Stream files and execute them in chunks of this many tasks
+            results_file: Append per-file results to this JSONL file instead of
+                keeping them in memory; the returned dict then only has the
+                summary and ``results_file``
         
         Returns:
             Batch processing results
         """
         await self.initialize()
         
+        sink = JSONLResultSink(results_file) if results_file else None
+        
         result = await self.batch_processor.process_batch(
             execution_engine=self.engine,
             files=files,
@@ -423,10 +524,12 @@ class GleitzeitClient:
             method=method,
             prompt=prompt,
             model=model,
-            protocol=protocol
+            protocol=protocol,
+            chunk_size=chunk_size,
+            sink=sink
         )
         
-        return result.to_dict()
+        return result.to_dict(include_results=sink is None)
     
     async def batch_chat(
         self,
@@ -6,6 +6,7 @@ from gleitzeit.core.models import Task, Workflow, TaskStatus, WorkflowStatus, Ta
 from gleitzeit.core.protocol import ProtocolSpec, MethodSpec
 from gleitzeit.core.jsonrpc import JSONRPCRequest, JSONRPCResponse, JSONRPCError
 from gleitzeit.core.execution_engine import ExecutionEngine, ExecutionMode
+from gleitzeit.core.result_store import ResultStore
 from gleitzeit.core.workflow_manager import WorkflowManager, WorkflowTemplate, WorkflowExecutionPolicy
 
 __all__ = [
@@ -24,6 +25,7 @@ __all__ = [
     "JSONRPCError",
     "ExecutionEngine",
     "ExecutionMode",
+    "ResultStore",
     "WorkflowManager",
     "WorkflowTemplate",
     "WorkflowExecutionPolicy"
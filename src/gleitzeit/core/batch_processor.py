@@ -8,35 +8,85 @@ creating parallel tasks for efficient processing.
 import asyncio
 import logging
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple
 from uuid import uuid4
-import glob
 import json
 
-from gleitzeit.core.models import Task, Workflow, Priority
+from gleitzeit.core.models import Task, TaskResult, TaskStatus, Workflow, Priority
 from gleitzeit.core.workflow_loader import create_task_from_dict
 from gleitzeit.core.errors import ConfigurationError, TaskValidationError
+from gleitzeit.core.file_scanner import iter_files
+from gleitzeit.core.result_sink import ResultSink, MemoryResultSink, read_jsonl_results
 
 logger = logging.getLogger(__name__)
 
 
 class BatchResult:
-    """Result of a batch processing operation"""
+    """
+    Result of a batch processing operation
+    
+    Per-file results go to a result sink as they complete; only the
+    counters are kept here. With the default in-memory sink this behaves
+    like a plain dict of results, with a JSONL sink results are streamed
+    to disk and regenerated from the file on demand.
+    """
     
-    def __init__(self, batch_id: str):
+    def __init__(self, batch_id: str, sink: Optional[ResultSink] = None):
         self.batch_id = batch_id
         self.created_at = datetime.now(timezone.utc)
         self.total_files = 0
         self.successful = 0
         self.failed = 0
-        self.results = {}
+        self.sink = sink or MemoryResultSink()
         self.parameters = {}
         self.processing_time = 0.0
     
-    def to_dict(self) -> Dict[str, Any]:
+    @classmethod
+    def from_jsonl(cls, path: str, batch_id: Optional[str] = None) -> 'BatchResult':
+        """
+        Rebuild a batch result from a JSONL results file
+        
+        Counters are recomputed from the lines, so this also recovers the
+        results of a batch that was interrupted.
+        """
+        batch_result = cls(batch_id or Path(path).stem, sink=_ReadOnlyJSONLSink(path))
+        for _, result in read_jsonl_results(path):
+            batch_result.total_files += 1
+            if result.get('status') == 'success':
+                batch_result.successful += 1
+            else:
+                batch_result.failed += 1
+        return batch_result
+    
+    @property
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        """All per-file results (read back from the sink)"""
+        if isinstance(self.sink, MemoryResultSink):
+            return self.sink.results
+        return dict(self.sink.iter_results())
+    
+    @property
+    def results_file(self) -> Optional[str]:
+        """File the per-file results are streamed to, if any"""
+        return self.sink.location
+    
+    def record(self, file_path: str, result: Dict[str, Any]) -> None:
+        """Count a file result and pass it to the sink"""
+        if result.get('status') == 'success':
+            self.successful += 1
+        else:
+            self.failed += 1
+        self.sink.write(file_path, result)
+    
+    def iter_results(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (file_path, result) pairs without loading them all"""
+        return self.sink.iter_results()
+    
+    def to_dict(self, include_results: bool = True) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        return {
+        data = {
             'batch_id': self.batch_id,
             'created_at': self.created_at.isoformat(),
             'summary': {
@@ -45,9 +95,13 @@ class BatchResult:
                 'failed': self.failed,
                 'processing_time': self.processing_time
             },
-            'parameters': self.parameters,
-            'results': self.results
+            'parameters': self.parameters
         }
+        if self.results_file:
+            data['results_file'] = self.results_file
+        if include_results:
+            data['results'] = self.results
+        return data
     
     def to_json(self) -> str:
         """Convert to JSON string"""
@@ -55,6 +109,10 @@ class BatchResult:
     
     def to_markdown(self) -> str:
         """Convert to Markdown format"""
+        return "".join(self.iter_markdown())
+    
+    def iter_markdown(self) -> Iterator[str]:
+        """Yield the Markdown report piece by piece (streams from the sink)"""
         md = f"# Batch Processing Results\n"
         md += f"**Batch ID**: {self.batch_id}\n"
         md += f"**Date**: {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
@@ -62,9 +120,11 @@ class BatchResult:
         md += f"**Processing Time**: {self.processing_time:.2f}s\n\n"
         
         md += "## Results\n\n"
-        for file_path, result in self.results.items():
+        yield md
+        
+        for file_path, result in self.iter_results():
             status_icon = "✅" if result.get('status') == 'success' else "❌"
-            md += f"### {status_icon} {Path(file_path).name}\n"
+            md = f"### {status_icon} {Path(file_path).name}\n"
             if result.get('status') == 'success':
                 content = result.get('content', '')
                 # Truncate long content
@@ -73,11 +133,19 @@ class BatchResult:
                 md += f"{content}\n\n"
             else:
                 md += f"Error: {result.get('error', 'Unknown error')}\n\n"
-        
-        return md
+            yield md
+    
+    def close(self) -> None:
+        """Flush and close the result sink"""
+        self.sink.close()
     
     def save_to_file(self, output_dir: Path = None) -> Path:
-        """Save results to file"""
+        """
+        Save results to file
+        
+        When results are streamed to a JSONL file only the summary is
+        written, pointing at that file.
+        """
         if output_dir is None:
             output_dir = Path.home() / '.gleitzeit' / 'batch_results'
         
@@ -85,12 +153,29 @@ class BatchResult:
         output_file = output_dir / f"{self.batch_id}.json"
         
         with open(output_file, 'w') as f:
-            f.write(self.to_json())
+            json.dump(self.to_dict(include_results=not self.results_file), f, indent=2)
         
         logger.info(f"Batch results saved to {output_file}")
         return output_file
 
 
+class _ReadOnlyJSONLSink(ResultSink):
+    """Sink view over an existing JSONL results file"""
+    
+    def __init__(self, path: str):
+        self.path = str(path)
+    
+    def write(self, file_path: str, result: Dict[str, Any]) -> None:
+        raise ConfigurationError(f"Results file {self.path} was opened read-only")
+    
+    def iter_results(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return read_jsonl_results(self.path)
+    
+    @property
+    def location(self) -> Optional[str]:
+        return self.path
+
+
 class BatchProcessor:
     """
     Handles batch processing of files through workflows.
@@ -107,27 +192,28 @@ class BatchProcessor:
         
         Args:
             directory: Directory path to scan
-            pattern: Glob pattern for files (e.g., "*.txt", "*.png")
+            pattern: Glob pattern for files (e.g., "*.txt", "*.png", "**/*.md")
         
         Returns:
             List of file paths
         """
-        dir_path = Path(directory)
-        if not dir_path.exists():
-            raise ConfigurationError(f"Directory not found: {directory}")
+        files = sorted(iter_files(directory, pattern))
         
-        if not dir_path.is_dir():
-            raise ConfigurationError(f"Not a directory: {directory}")
-        
-        # Use glob to find matching files
-        file_pattern = str(dir_path / pattern)
-        files = glob.glob(file_pattern)
+        logger.info(f"Found {len(files)} files matching '{pattern}' in {directory}")
+        return files
+    
+    def iter_directory(self, directory: str, pattern: str = "*") -> Iterator[str]:
+        """
+        Lazily yield files matching pattern, in file system order
         
-        # Filter out directories
-        files = [f for f in files if Path(f).is_file()]
+        Args:
+            directory: Directory path to scan
+            pattern: Glob pattern for files (e.g., "*.txt", "**/*.png")
         
-        logger.info(f"Found {len(files)} files matching '{pattern}' in {directory}")
-        return sorted(files)
+        Returns:
+            Iterator of file paths
+        """
+        return iter_files(directory, pattern)
     
     def create_batch_workflow(
         self,
@@ -136,7 +222,8 @@ class BatchProcessor:
         prompt: str,
         model: str = "llama3.2:latest",
         protocol: str = "llm/v1",
-        name: str = None
+        name: str = None,
+        start_index: int = 0
     ) -> Workflow:
         """
         Create a workflow with parallel tasks for each file
@@ -148,6 +235,8 @@ class BatchProcessor:
             model: Model to use
             protocol: Protocol to use
             name: Optional workflow name
+            start_index: Index of the first file within the whole batch (keeps
+                task IDs unique across chunks)
         
         Returns:
             Workflow with tasks for each file
@@ -162,7 +251,7 @@ class BatchProcessor:
         workflow_name = name or f"Batch Processing ({len(files)} files)"
         
         tasks = []
-        for i, file_path in enumerate(files):
+        for i, file_path in enumerate(files, start=start_index):
             file_name = Path(file_path).name
             task_id = f"process-{file_name.replace('.', '-')}-{i}"
             
@@ -230,7 +319,10 @@ class BatchProcessor:
         method: str = "llm/chat",
         prompt: str = "Analyze this file",
         model: str = "llama3.2:latest",
-        protocol: str = "llm/v1"
+        protocol: str = "llm/v1",
+        chunk_size: Optional[int] = None,
+        max_pending_chunks: int = 2,
+        sink: Optional[ResultSink] = None
     ) -> BatchResult:
         """
         Process a batch of files
@@ -244,10 +336,22 @@ class BatchProcessor:
             prompt: Prompt for processing
             model: Model to use
             protocol: Protocol to use
+            chunk_size: Stream files and submit them in workflows of this many
+                tasks instead of one workflow for the whole batch
+            max_pending_chunks: Chunk workflows executing at the same time
+                when streaming
+            sink: Where per-file results are written as they complete
+                (default: kept in memory)
         
         Returns:
             BatchResult with processing results
         """
+        if chunk_size:
+            return await self._process_batch_streaming(
+                execution_engine, files, directory, pattern, method, prompt,
+                model, protocol, chunk_size, max_pending_chunks, sink
+            )
+        
         start_time = asyncio.get_event_loop().time()
         
         # Collect files
@@ -261,7 +365,7 @@ class BatchProcessor:
         
         # Create batch result
         batch_id = f"batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        batch_result = BatchResult(batch_id)
+        batch_result = BatchResult(batch_id, sink=sink)
         batch_result.total_files = len(files)
         batch_result.parameters = {
             'method': method,
@@ -285,16 +389,173 @@ class BatchProcessor:
         # Submit workflow
         await execution_engine.submit_workflow(workflow)
         
-        # Execute workflow
+        # Execute workflow, recording each file's result as its task finishes
+        recorded: Set[str] = set()
         try:
-            await execution_engine._execute_workflow(workflow)
+            await self._execute_and_record(execution_engine, workflow, batch_result, recorded)
         except Exception as e:
             logger.error(f"Error executing batch workflow: {e}")
-            batch_result.failed = len(files)
+            # Results recorded so far stay in the sink
+            batch_result.failed = len(files) - batch_result.successful
             batch_result.processing_time = asyncio.get_event_loop().time() - start_time
+            batch_result.close()
             return batch_result
         
-        # Collect results
+        # Collect results of tasks that did not report through an event
+        await self._collect_results(execution_engine, workflow, batch_result, skip=recorded)
+        
+        return self._finish_batch(batch_result, start_time)
+    
+    async def _process_batch_streaming(
+        self,
+        execution_engine,
+        files: Optional[Iterable[str]],
+        directory: Optional[str],
+        pattern: str,
+        method: str,
+        prompt: str,
+        model: str,
+        protocol: str,
+        chunk_size: int,
+        max_pending_chunks: int,
+        sink: Optional[ResultSink] = None
+    ) -> BatchResult:
+        """
+        Discover files lazily and execute them in bounded windows of chunk workflows
+        
+        Only max_pending_chunks chunks of tasks exist at a time, so memory
+        stays flat and the first tasks start before discovery finishes.
+        """
+        start_time = asyncio.get_event_loop().time()
+        
+        if directory:
+            file_iter = self.iter_directory(directory, pattern)
+        elif files:
+            file_iter = iter(files)
+        else:
+            raise TaskValidationError(
+                "batch_task",
+                ["Either 'files' or 'directory' must be provided"]
+            )
+        
+        batch_id = f"batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        batch_result = BatchResult(batch_id, sink=sink)
+        batch_result.parameters = {
+            'method': method,
+            'prompt': prompt,
+            'model': model,
+            'protocol': protocol,
+            'directory': directory,
+            'pattern': pattern if directory else None,
+            'chunk_size': chunk_size
+        }
+        
+        async def run_chunk(workflow: Workflow) -> None:
+            recorded: Set[str] = set()
+            try:
+                await execution_engine.submit_workflow(workflow)
+                await self._execute_and_record(execution_engine, workflow, batch_result, recorded)
+            except Exception as e:
+                logger.error(f"Error executing batch chunk {workflow.id}: {e}")
+            await self._collect_results(execution_engine, workflow, batch_result, skip=recorded)
+            await execution_engine._release_workflow(workflow.id)
+        
+        loop = asyncio.get_running_loop()
+        pending: Set[asyncio.Task] = set()
+        chunk_index = 0
+        try:
+            while True:
+                # Directory reads happen off the event loop
+                chunk = await loop.run_in_executor(None, lambda: list(islice(file_iter, chunk_size)))
+                if not chunk:
+                    break
+                
+                workflow = self.create_batch_workflow(
+                    files=chunk,
+                    method=method,
+                    prompt=prompt,
+                    model=model,
+                    protocol=protocol,
+                    name=f"Batch {batch_id} chunk {chunk_index + 1}",
+                    start_index=batch_result.total_files
+                )
+                batch_result.total_files += len(chunk)
+                chunk_index += 1
+                pending.add(asyncio.create_task(run_chunk(workflow)))
+                
+                if len(pending) >= max_pending_chunks:
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            
+            if pending:
+                await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            # Keep whatever completed before the failure
+            batch_result.close()
+            raise
+        
+        logger.info(f"Batch {batch_id} streamed {batch_result.total_files} files in {chunk_index} chunks")
+        return self._finish_batch(batch_result, start_time)
+    
+    async def _execute_and_record(
+        self,
+        execution_engine,
+        workflow: Workflow,
+        batch_result: BatchResult,
+        recorded: Set[str]
+    ) -> None:
+        """
+        Execute a workflow, recording each file result as soon as its task finishes
+        
+        Results reach the sink while the batch is still running, so an
+        interrupted batch keeps everything that completed before. IDs of
+        the recorded tasks are added to ``recorded``.
+        """
+        file_tasks = {task.id: path for task, path in self._iter_file_tasks(workflow)}
+        
+        async def on_task_finished(event_type: str, event: Dict[str, Any]) -> None:
+            task_id = event.get('data', {}).get('task_id')
+            if task_id not in file_tasks or task_id in recorded:
+                return
+            result = await execution_engine.task_results.fetch(task_id)
+            # Failures that will be retried are recorded once they are final
+            if result is None or result.status not in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+                return
+            recorded.add(task_id)
+            self._record_task_result(batch_result, file_tasks[task_id], result)
+        
+        # Blocking policy: no completion may be dropped from the queue
+        event_types = ("task:completed", "task:failed")
+        for event_type in event_types:
+            execution_engine.add_event_handler(event_type, on_task_finished, policy="block")
+        try:
+            await execution_engine._execute_workflow(workflow)
+            await execution_engine.flush_events()
+        finally:
+            for event_type in event_types:
+                execution_engine.remove_event_handler(event_type, on_task_finished)
+    
+    async def _collect_results(
+        self,
+        execution_engine,
+        workflow: Workflow,
+        batch_result: BatchResult,
+        skip: Optional[Set[str]] = None
+    ) -> None:
+        """Record the outcome of each file task of a workflow not recorded yet"""
+        file_tasks = [
+            (task, path) for task, path in self._iter_file_tasks(workflow)
+            if not skip or task.id not in skip
+        ]
+        # Results of a finished workflow may have been evicted from memory
+        results = await execution_engine.task_results.fetch_many([task.id for task, _ in file_tasks])
+        for task, file_path in file_tasks:
+            self._record_task_result(batch_result, file_path, results.get(task.id))
+    
+    @staticmethod
+    def _iter_file_tasks(workflow: Workflow) -> Iterator[Tuple[Task, str]]:
+        """Yield (task, file path) for each task of a workflow that processes a file"""
         for task in workflow.tasks:
             file_path = None
             
@@ -305,37 +566,44 @@ class BatchProcessor:
                 file_path = task.params['image_path']
             
             if file_path:
-                result = execution_engine.task_results.get(task.id)
-                if result:
-                    if result.status == 'completed':
-                        batch_result.results[file_path] = {
-                            'status': 'success',
-                            'content': result.result.get('content', '') if result.result else ''
-                        }
-                        batch_result.successful += 1
-                    else:
-                        batch_result.results[file_path] = {
-                            'status': 'failed',
-                            'error': result.error or 'Unknown error'
-                        }
-                        batch_result.failed += 1
-                else:
-                    batch_result.results[file_path] = {
-                        'status': 'failed',
-                        'error': 'No result found'
-                    }
-                    batch_result.failed += 1
-        
+                yield task, file_path
+    
+    @staticmethod
+    def _record_task_result(batch_result: BatchResult, file_path: str, result: Optional[TaskResult]) -> None:
+        """Record the outcome of one file task"""
+        if result:
+            if result.status == 'completed':
+                batch_result.record(file_path, {
+                    'status': 'success',
+                    'content': result.result.get('content', '') if result.result else ''
+                })
+            else:
+                batch_result.record(file_path, {
+                    'status': 'failed',
+                    'error': result.error or 'Unknown error'
+                })
+        else:
+            batch_result.record(file_path, {
+                'status': 'failed',
+                'error': 'No result found'
+            })
+    
+    def _finish_batch(self, batch_result: BatchResult, start_time: float) -> BatchResult:
+        """Record timing, save and remember a completed batch"""
         # Calculate processing time
         batch_result.processing_time = asyncio.get_event_loop().time() - start_time
         
-        # Save results
+        # Save results (the sink is flushed first so the summary matches it)
+        batch_result.close()
         batch_result.save_to_file()
         
         # Store in history
         self.current_batch = batch_result
-        self.batch_history.append(batch_id)
+        self.batch_history.append(batch_result.batch_id)
         
-        logger.info(f"Batch {batch_id} completed: {batch_result.successful}/{batch_result.total_files} successful")
+        logger.info(
+            f"Batch {batch_result.batch_id} completed: "
+            f"{batch_result.successful}/{batch_result.total_files} successful"
+        )
         
         return batch_result
\ No newline at end of file
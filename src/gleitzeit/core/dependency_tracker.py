@@ -7,7 +7,8 @@ to prevent duplicate task submissions and handle race conditions.
 
 import asyncio
 import logging
-from typing import Set, Dict, Optional, List
+from collections import deque
+from typing import Set, Dict, Optional, List, Deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
@@ -35,13 +36,14 @@ class DependencyTracker:
     - Maintains submission history for debugging
     """
     
-    def __init__(self, max_attempts: int = 3, attempt_timeout: int = 300):
+    def __init__(self, max_attempts: int = 3, attempt_timeout: int = 300, history_size: int = 1000):
         """
         Initialize the dependency tracker
         
         Args:
             max_attempts: Maximum resolution attempts per workflow
             attempt_timeout: Timeout in seconds before allowing retry
+            history_size: Number of recent submissions kept for debugging
         """
         self.submitted_tasks: Set[str] = set()
         self.resolution_attempts: Dict[str, ResolutionAttempt] = {}
@@ -51,7 +53,7 @@ class DependencyTracker:
         self._lock = asyncio.Lock()
         
         # Track submission history for debugging
-        self.submission_history: List[Dict] = []
+        self.submission_history: Deque[Dict] = deque(maxlen=history_size)
         
         logger.info(f"Initialized DependencyTracker with max_attempts={max_attempts}")
     
@@ -188,6 +190,17 @@ class DependencyTracker:
             
             logger.info(f"Reset tracking for workflow {workflow_id}")
     
+    async def forget_tasks(self, task_ids: List[str]):
+        """
+        Forget submissions of tasks belonging to a finished workflow
+        
+        Args:
+            task_ids: Task identifiers to remove from the submitted set
+        """
+        async with self._lock:
+            for task_id in task_ids:
+                self.submitted_tasks.discard(task_id)
+    
     async def cleanup_completed_workflows(self, completed_workflow_ids: List[str]):
         """
         Clean up tracking for completed workflows to free memory
@@ -215,7 +228,7 @@ class DependencyTracker:
             "tracked_workflows": len(self.resolution_attempts),
             "pending_resolutions": len(self.pending_resolutions),
             "recent_submissions": len([
-                h for h in self.submission_history[-100:]  # Last 100
+                h for h in list(self.submission_history)[-100:]  # Last 100
                 if (datetime.utcnow() - h["timestamp"]).total_seconds() < 300
             ]),
             "failed_resolutions": sum(
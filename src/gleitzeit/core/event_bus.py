@@ -0,0 +1,312 @@
+"""
+Event Bus for Gleitzeit V4
+
+Delivers engine events to subscribers without making the publisher wait
+for them. Each subscription owns a bounded queue drained by its own
+worker task, so a slow handler only delays its own events, never task
+execution (unless it asked for backpressure with the "block" policy).
+
+- Publishing an event type nobody subscribed to is a dict lookup; callers
+  can check ``has_subscribers`` before building an event at all.
+- How to call each handler (sync or coroutine, per event or batched) is
+  decided once when subscribing.
+- A worker takes up to ``batch_size`` queued events per wakeup; batch
+  handlers receive them as one list of (event_type, data) pairs.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+class OverflowPolicy(str, Enum):
+    """What publishing does when a subscriber's queue is full"""
+    BLOCK = "block"              # wait for room (backpressure on the publisher)
+    DROP_NEWEST = "drop_newest"  # discard the event being published
+    DROP_OLDEST = "drop_oldest"  # discard the oldest queued event
+
+
+class Subscription:
+    """A handler with its own bounded event queue and delivery worker"""
+
+    def __init__(
+        self,
+        handler: Callable,
+        event_types: Tuple[str, ...],
+        max_queue: int = 1000,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        batch_size: int = 64,
+        batch: bool = False
+    ):
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be at least 1")
+        self.handler = handler
+        self.event_types = event_types
+        self.max_queue = max_queue
+        self.policy = OverflowPolicy(policy)
+        self.batch_size = batch_size
+        self.batch = batch
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue: Deque[Event] = deque()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._worker: Optional[asyncio.Task] = None
+        self._deliver = self._select_delivery()
+
+    @property
+    def name(self) -> str:
+        return getattr(self.handler, "__qualname__", None) or repr(self.handler)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def _select_delivery(self) -> Callable[[List[Event]], Any]:
+        handler = self.handler
+        is_coroutine = asyncio.iscoroutinefunction(handler) or asyncio.iscoroutinefunction(
+            getattr(handler, "__call__", None)
+        )
+
+        if self.batch:
+            if is_coroutine:
+                return handler
+            async def deliver_batch(events: List[Event]) -> None:
+                handler(events)
+            return deliver_batch
+
+        if is_coroutine:
+            async def deliver_each(events: List[Event]) -> None:
+                for event_type, data in events:
+                    try:
+                        await handler(event_type, data)
+                    except Exception as e:
+                        self.errors += 1
+                        logger.error(f"Event handler error for {event_type}: {e}")
+            return deliver_each
+
+        async def deliver_each_sync(events: List[Event]) -> None:
+            for event_type, data in events:
+                try:
+                    handler(event_type, data)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Event handler error for {event_type}: {e}")
+        return deliver_each_sync
+
+    async def put(self, event: Event) -> None:
+        """Queue an event, applying the overflow policy when the queue is full"""
+        queue = self._queue
+        if len(queue) >= self.max_queue:
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return
+            if self.policy == OverflowPolicy.DROP_OLDEST:
+                queue.popleft()
+                self.dropped += 1
+            elif asyncio.current_task() is not self._worker:
+                # Block until the worker makes room; a handler publishing to
+                # its own full queue is let through to avoid deadlocking
+                while len(queue) >= self.max_queue:
+                    self._not_full.clear()
+                    self._ensure_worker()
+                    await self._not_full.wait()
+        queue.append(event)
+        self._idle.clear()
+        self._ready.set()
+        self._ensure_worker()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            if not queue:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            count = min(len(queue), self.batch_size)
+            events = [queue.popleft() for _ in range(count)]
+            self._not_full.set()
+            try:
+                await self._deliver(events)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Event handler error for {self.name}: {e}")
+            self.delivered += count
+
+    async def wait_idle(self) -> None:
+        """Wait until every queued event has been delivered"""
+        if self._queue:
+            self._ensure_worker()
+        await self._idle.wait()
+
+    async def stop(self) -> None:
+        """Stop the worker; queued events are kept for a later restart"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        self._not_full.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "handler": self.name,
+            "event_types": list(self.event_types),
+            "policy": self.policy.value,
+            "queued": len(self._queue),
+            "max_queue": self.max_queue,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+class EventBus:
+    """
+    Publish/subscribe bus with per-subscriber bounded queues
+
+    Args:
+        max_queue: Default queue bound per subscription
+        policy: Default overflow policy
+        batch_size: Default number of events delivered per worker wakeup
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 1000,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        batch_size: int = 64
+    ):
+        self.max_queue = max_queue
+        self.policy = OverflowPolicy(policy)
+        self.batch_size = batch_size
+        self._subscriptions: List[Subscription] = []
+        # event_type -> subscriptions, rebuilt on (un)subscribe
+        self._routes: Dict[str, Tuple[Subscription, ...]] = {}
+
+    def subscribe(
+        self,
+        event_types: Union[str, Iterable[str]],
+        handler: Callable,
+        max_queue: Optional[int] = None,
+        policy: Optional[Union[OverflowPolicy, str]] = None,
+        batch_size: Optional[int] = None,
+        batch: bool = False
+    ) -> Subscription:
+        """
+        Subscribe a handler to one or more event types
+
+        Args:
+            event_types: Event type or types to receive
+            handler: ``handler(event_type, data)``, or ``handler(events)``
+                with a list of (event_type, data) pairs when batch=True;
+                sync or async
+            max_queue: Queue bound (defaults to the bus setting)
+            policy: Overflow policy (defaults to the bus setting)
+            batch_size: Maximum events delivered per wakeup
+            batch: Deliver events as lists instead of one call per event
+
+        Returns:
+            The subscription, for stats and unsubscribe
+        """
+        if isinstance(event_types, str):
+            event_types = (event_types,)
+        subscription = Subscription(
+            handler,
+            tuple(event_types),
+            max_queue=max_queue or self.max_queue,
+            policy=policy or self.policy,
+            batch_size=batch_size or self.batch_size,
+            batch=batch
+        )
+        self._subscriptions.append(subscription)
+        self._rebuild_routes()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop routing events to a subscription (queued events are discarded)"""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            self._rebuild_routes()
+            subscription._queue.clear()
+            subscription._idle.set()
+            subscription._not_full.set()
+            if subscription._worker is not None:
+                subscription._worker.cancel()
+                subscription._worker = None
+
+    def unsubscribe_handler(self, event_type: str, handler: Callable) -> bool:
+        """Remove the first subscription of a handler to an event type"""
+        for subscription in self._routes.get(event_type, ()):
+            if subscription.handler == handler:
+                self.unsubscribe(subscription)
+                return True
+        return False
+
+    def _rebuild_routes(self) -> None:
+        routes: Dict[str, List[Subscription]] = {}
+        for subscription in self._subscriptions:
+            for event_type in subscription.event_types:
+                routes.setdefault(event_type, []).append(subscription)
+        self._routes = {event_type: tuple(subs) for event_type, subs in routes.items()}
+
+    def has_subscribers(self, event_type: str) -> bool:
+        """Whether publishing this event type would reach anyone"""
+        return event_type in self._routes
+
+    async def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Queue an event for every subscriber of its type"""
+        subscriptions = self._routes.get(event_type)
+        if not subscriptions:
+            return
+        event = (event_type, data)
+        for subscription in subscriptions:
+            await subscription.put(event)
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued events have been delivered
+
+        Returns:
+            False if the timeout expired first
+        """
+        waits = [subscription.wait_idle() for subscription in self._subscriptions]
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Event delivery did not finish within {timeout}s")
+            return False
+
+    async def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Deliver what is queued (up to timeout), then stop the workers"""
+        await self.flush(timeout)
+        for subscription in self._subscriptions:
+            await subscription.stop()
+
+    @property
+    def subscriptions(self) -> List[Subscription]:
+        return list(self._subscriptions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "subscriptions": [subscription.get_stats() for subscription in self._subscriptions],
+            "queued": sum(subscription.queued for subscription in self._subscriptions),
+            "dropped": sum(subscription.dropped for subscription in self._subscriptions),
+        }
@@ -43,6 +43,7 @@ class EventType(str, Enum):
     TASK_RETRY_SCHEDULED = "task:retry_scheduled"
     TASK_RETRY_EXECUTED = "task:retry_executed"
     TASK_TIMEOUT = "task:timeout"
+    TASK_PARTIAL_OUTPUT = "task:partial_output"
     
     # Workflow Events
     WORKFLOW_SUBMITTED = "workflow:submitted"
@@ -413,6 +414,33 @@ def create_task_completed_event(
     )
 
 
+def create_task_partial_output_event(
+    task_id: str,
+    chunk: str,
+    sequence: int,
+    workflow_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    source: str = "execution_engine"
+) -> GleitzeitEvent:
+    """Create an event carrying a chunk of streamed task output"""
+    task_data = TaskEventData(
+        task_id=task_id,
+        workflow_id=workflow_id,
+        status=TaskStatus.EXECUTING
+    )
+    event = GleitzeitEvent.create_task_event(
+        EventType.TASK_PARTIAL_OUTPUT,
+        task_data,
+        severity=EventSeverity.DEBUG,
+        source=source,
+        correlation_id=workflow_id
+    )
+    event.data.update(metadata or {})
+    event.data["chunk"] = chunk
+    event.data["sequence"] = sequence
+    return event
+
+
 def create_task_failed_event(
     task_id: str,
     error_message: str,
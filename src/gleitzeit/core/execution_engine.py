@@ -7,16 +7,24 @@ the queue to protocol providers and managing workflow state progression.
 
 import asyncio
 import logging
+import time
 from typing import Dict, List, Optional, Set, Any, Callable, Union, TYPE_CHECKING
 from datetime import datetime, timedelta
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from gleitzeit.core.models import Task, Workflow, TaskStatus, TaskResult, WorkflowStatus
 from gleitzeit.core.jsonrpc import JSONRPCRequest, JSONRPCError
 from gleitzeit.core.scheduler import EventScheduler
 from gleitzeit.core.dependency_tracker import DependencyTracker
 from gleitzeit.core.retry_manager import RetryManager
+from gleitzeit.core.result_store import ResultStore
+from gleitzeit.core.parameter_substitution import ParameterPlan, compile_parameters
+from gleitzeit.core.phase_timing import PhaseTimings
+from gleitzeit.core.metrics import MetricsRegistry, engine_collector
+from gleitzeit.core.event_bus import EventBus, OverflowPolicy, Subscription
+from gleitzeit.core.process_worker_pool import ProcessWorkerPool
+from gleitzeit.core.streaming import partial_output_handler
 from gleitzeit.core.errors import (
     ErrorCode, GleitzeitError, TaskError, TaskValidationError, 
     TaskTimeoutError, TaskDependencyError, WorkflowError, 
@@ -27,8 +35,8 @@ from gleitzeit.core.events import (
     EventType, EventSeverity, GleitzeitEvent,
     TaskEventData, WorkflowEventData, EngineEventData,
     create_task_started_event, create_task_completed_event,
-    create_task_failed_event, create_workflow_started_event,
-    create_workflow_completed_event
+    create_task_failed_event, create_task_partial_output_event,
+    create_workflow_started_event, create_workflow_completed_event
 )
 from gleitzeit.registry import ProtocolProviderRegistry
 from gleitzeit.task_queue import TaskQueue, QueueManager, DependencyResolver
@@ -57,6 +65,61 @@ class ExecutionStats:
     workflows_failed: int = 0
     average_task_duration: float = 0.0
     total_execution_time: float = 0.0
+    # Per "protocol method" and phase: count, mean and p50/p90/p99/max in ms
+    phase_timings: Dict[str, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+
+
+@dataclass
+class WorkflowProgress:
+    """Incremental completion state for a workflow tracked by the engine"""
+    total_tasks: int
+    tasks_by_id: Dict[str, Task]
+    dependents: Dict[str, List[str]]  # task_id -> IDs of tasks depending on it
+    remaining_dependencies: Dict[str, int]  # task_id -> unmet dependency count
+    completed_tasks: Set[str] = field(default_factory=set)
+    finished: bool = False
+    
+    @classmethod
+    def from_workflow(cls, workflow: Workflow) -> "WorkflowProgress":
+        """Build the reverse-dependency index for a workflow"""
+        dependents: Dict[str, List[str]] = {}
+        remaining: Dict[str, int] = {}
+        
+        for task in workflow.tasks:
+            remaining[task.id] = len(task.dependencies)
+            for dep_id in task.dependencies:
+                dependents.setdefault(dep_id, []).append(task.id)
+        
+        return cls(
+            total_tasks=len(workflow.tasks),
+            tasks_by_id={task.id: task for task in workflow.tasks},
+            dependents=dependents,
+            remaining_dependencies=remaining
+        )
+    
+    def mark_completed(self, task_id: str) -> List[str]:
+        """
+        Record a completed task
+        
+        Returns:
+            IDs of dependent tasks whose dependencies are now all satisfied
+        """
+        if task_id in self.completed_tasks or task_id not in self.tasks_by_id:
+            return []
+        
+        self.completed_tasks.add(task_id)
+        
+        ready = []
+        for dependent_id in self.dependents.get(task_id, ()):
+            self.remaining_dependencies[dependent_id] -= 1
+            if self.remaining_dependencies[dependent_id] == 0:
+                ready.append(dependent_id)
+        return ready
+    
+    @property
+    def is_complete(self) -> bool:
+        """Check if every task in the workflow has completed"""
+        return len(self.completed_tasks) == self.total_tasks
 
 
 class ExecutionEngine:
@@ -78,7 +141,11 @@ class ExecutionEngine:
         dependency_resolver: DependencyResolver,
         persistence: Optional[PersistenceBackend] = None,
         max_concurrent_tasks: int = 10,
-        pooling_adapter: Optional[Any] = None
+        pooling_adapter: Optional[Any] = None,
+        result_store: Optional[ResultStore] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        event_bus: Optional[EventBus] = None,
+        worker_pool: Optional[ProcessWorkerPool] = None
     ):
         self.registry = registry
         self.queue_manager = queue_manager
@@ -86,6 +153,8 @@ class ExecutionEngine:
         self.persistence = persistence
         self.max_concurrent_tasks = max_concurrent_tasks
         self.pooling_adapter = pooling_adapter
+        # Multi-process mode: provider requests run in worker processes
+        self.worker_pool = worker_pool
         
         # Initialize event scheduler for delayed events (non-retry)
         self.scheduler = EventScheduler(emit_callback=self.emit_event)
@@ -104,15 +173,52 @@ class ExecutionEngine:
         # State management
         self.running = False
         self.active_tasks: Dict[str, Task] = {}
-        self.task_results: Dict[str, TaskResult] = {}
+        self.task_results: ResultStore = (
+            result_store if result_store is not None else ResultStore(persistence=self.persistence)
+        )
         self.workflow_states: Dict[str, Workflow] = {}
+        self.workflow_progress: Dict[str, WorkflowProgress] = {}
+        self.task_name_to_id_map: Dict[str, str] = {}
+        self._parameter_plans: Dict[str, ParameterPlan] = {}
         
         # Execution tracking
         self.stats = ExecutionStats()
         self.start_time: Optional[datetime] = None
         
-        # Event handlers
-        self.event_handlers: Dict[str, List[Callable]] = {}
+        # Phase histograms, shared with the registry so request phases
+        # (provider wait, preprocessing, validation, provider) land next to
+        # the task phases recorded here
+        registry_timings = getattr(registry, 'phase_timings', None)
+        self.phase_timings = registry_timings if registry_timings is not None else PhaseTimings()
+        if worker_pool is not None:
+            worker_pool.phase_timings = self.phase_timings
+        
+        # Optional metrics: counters updated on the hot path, everything the
+        # components already track is read by the collector at export time
+        self.metrics = metrics
+        self._tasks_metric = None
+        self._retries_metric = None
+        self._persistence_writes = None
+        if metrics is not None:
+            self._tasks_metric = metrics.counter(
+                "gleitzeit_tasks_total", "Finished task attempts", ["protocol", "method", "status"]
+            )
+            self._retries_metric = metrics.counter(
+                "gleitzeit_task_retries_total", "Task retries scheduled", ["protocol", "method"]
+            )
+            if self.persistence is not None:
+                writes = metrics.histogram(
+                    "gleitzeit_persistence_write_seconds", "Persistence write latency", ["backend", "operation"]
+                )
+                backend = type(self.persistence).__name__
+                self._persistence_writes = (
+                    writes.labels(backend, "save_task_result"),
+                    writes.labels(backend, "save_task")
+                )
+            metrics.register_collector(engine_collector(self))
+        
+        # Event handlers run from their own bounded queues, off the task path
+        self.events = event_bus or EventBus()
         
         # Concurrency control
         self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
@@ -123,11 +229,33 @@ class ExecutionEngine:
         
         logger.info(f"Initialized ExecutionEngine with max_concurrent_tasks={max_concurrent_tasks}")
     
-    def add_event_handler(self, event_type: str, handler: Callable) -> None:
-        """Add event handler for specific event type"""
-        if event_type not in self.event_handlers:
-            self.event_handlers[event_type] = []
-        self.event_handlers[event_type].append(handler)
+    def add_event_handler(
+        self,
+        event_type: str,
+        handler: Callable,
+        max_queue: Optional[int] = None,
+        policy: Optional[Union[OverflowPolicy, str]] = None,
+        batch: bool = False
+    ) -> Subscription:
+        """
+        Add event handler for specific event type
+        
+        Handlers are called asynchronously from a bounded per-handler queue
+        (see EventBus.subscribe); use flush_events() to wait for delivery.
+        """
+        return self.events.subscribe(event_type, handler, max_queue=max_queue, policy=policy, batch=batch)
+    
+    def remove_event_handler(self, event_type: str, handler: Callable) -> None:
+        """Remove a previously added event handler"""
+        self.events.unsubscribe_handler(event_type, handler)
+    
+    def has_event_handlers(self, event_type: EventType) -> bool:
+        """Whether anyone listens for an event type (skip building events otherwise)"""
+        return self.events.has_subscribers(event_type.value)
+    
+    async def flush_events(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every emitted event has been delivered to its handlers"""
+        return await self.events.flush(timeout)
     
     async def emit_event(self, event: Union[GleitzeitEvent, str], data: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -148,35 +276,19 @@ class ExecutionEngine:
             
             
             # Emit to legacy handlers
-            if event_type in self.event_handlers:
-                for handler in self.event_handlers[event_type]:
-                    try:
-                        if asyncio.iscoroutinefunction(handler):
-                            await handler(event_type, data or {})
-                        else:
-                            handler(event_type, data or {})
-                    except Exception as e:
-                        logger.error(f"Event handler error for {event_type}: {e}")
+            await self.events.publish(event_type, data or {})
             return
         
         # Handle structured GleitzeitEvent
         if isinstance(event, GleitzeitEvent):
-            event_name, event_data = event.to_socket_io()
-            
             # Handle scheduled retry events
             if event.event_type == EventType.TASK_RETRY_EXECUTED:
-                await self._handle_retry_event(event_data.get("data", {}))
+                await self._handle_retry_event(event.to_dict().get("data", {}))
             
-            # Emit to both legacy and new handlers
-            if event_name in self.event_handlers:
-                for handler in self.event_handlers[event_name]:
-                    try:
-                        if asyncio.iscoroutinefunction(handler):
-                            await handler(event_name, event_data)
-                        else:
-                            handler(event_name, event_data)
-                    except Exception as e:
-                        logger.error(f"Event handler error for {event_name}: {e}")
+            # Only serialize events someone listens for
+            event_name = event.event_type.value
+            if self.events.has_subscribers(event_name):
+                await self.events.publish(event_name, event.to_dict())
     
     async def emit_structured_event(self, event: GleitzeitEvent) -> None:
         """Emit a structured event"""
@@ -188,6 +300,9 @@ class ExecutionEngine:
             logger.warning("ExecutionEngine already running")
             return
         
+        if self.worker_pool is not None:
+            await self.worker_pool.start()
+        
         self.running = True
         self.start_time = datetime.utcnow()
         self._shutdown_event.clear()
@@ -257,6 +372,10 @@ class ExecutionEngine:
             logger.info(f"Waiting for {len(self.active_tasks)} active tasks to complete...")
             await asyncio.sleep(1.0)  # Give tasks time to finish
         
+        # Durability point for backends that buffer writes
+        if self.persistence:
+            await self.persistence.flush()
+        
         # Calculate final stats
         if self.start_time:
             self.stats.total_execution_time = (
@@ -278,6 +397,12 @@ class ExecutionEngine:
         
         await self.emit_structured_event(engine_stopped_event)
         
+        # Deliver outstanding events, then stop the handler workers
+        await self.events.close()
+        
+        if self.worker_pool is not None:
+            await self.worker_pool.shutdown()
+        
         # Stop registry and cleanup all providers
         if hasattr(self.registry, 'stop'):
             await self.registry.stop()
@@ -286,12 +411,12 @@ class ExecutionEngine:
     
     async def _execute_single_task(self) -> Optional[TaskResult]:
         """Execute a single task from the queue"""
-        task = await self.queue_manager.dequeue_next_task()
-        if not task:
+        queued_task = await self.queue_manager.dequeue_next_entry()
+        if not queued_task:
             logger.info("No tasks available in queue")
             return None
         
-        return await self._execute_task(task)
+        return await self._execute_task(queued_task.task, queued_task.ready_at)
     
     async def _process_ready_tasks(self, queue_name: Optional[str] = None) -> None:
         """Process any ready tasks up to capacity limit - used in event-driven mode"""
@@ -301,16 +426,16 @@ class ExecutionEngine:
         while len(self.active_tasks) < self.max_concurrent_tasks:
             # Try to dequeue the next ready task
             if queue_name:
-                task = await self.queue_manager.dequeue_next_task(queue_name)
+                queued_task = await self.queue_manager.dequeue_next_entry(queue_name)
             else:
-                task = await self.queue_manager.dequeue_next_task()
+                queued_task = await self.queue_manager.dequeue_next_entry()
             
-            if not task:
+            if not queued_task:
                 # No more ready tasks available
                 break
                 
             # Execute task in background
-            asyncio.create_task(self._execute_task(task))
+            asyncio.create_task(self._execute_task_with_cleanup(queued_task.task, queued_task.ready_at))
             
         logger.debug(f"Event-driven processing: {len(self.active_tasks)}/{self.max_concurrent_tasks} active tasks")
     
@@ -347,10 +472,10 @@ class ExecutionEngine:
             if workflow_tasks:
                 await asyncio.gather(*workflow_tasks, return_exceptions=True)
     
-    async def _execute_task_with_cleanup(self, task: Task) -> TaskResult:
+    async def _execute_task_with_cleanup(self, task: Task, ready_at: Optional[float] = None) -> TaskResult:
         """Execute task and handle cleanup"""
         try:
-            return await self._execute_task(task)
+            return await self._execute_task(task, ready_at)
         except Exception as exc:
             # If _execute_task raised an exception, the TaskResult should already be stored
             # Return it instead of propagating the exception
@@ -385,9 +510,20 @@ class ExecutionEngine:
             # Cleanup active task tracking
             self.active_tasks.pop(task.id, None)
     
-    async def _execute_task(self, task: Task) -> TaskResult:
-        """Execute a single task"""
+    async def _execute_task(self, task: Task, ready_at: Optional[float] = None) -> TaskResult:
+        """
+        Execute a single task
+        
+        Args:
+            task: Task to execute
+            ready_at: perf_counter time the task became ready in the queue, if dequeued
+        """
+        timer = self.phase_timings.timer(task.protocol, task.method)
+        if ready_at is not None:
+            self.phase_timings.record(task.protocol, task.method, "queue_wait", timer.started - ready_at)
+        
         async with self.semaphore:
+            timer.mark("semaphore_wait")
             task_start_time = datetime.utcnow()
             self.active_tasks[task.id] = task
             error_message = None
@@ -402,24 +538,30 @@ class ExecutionEngine:
                 current_attempt = await self.retry_manager.increment_retry_count(task.id)
                 
                 # Emit structured task started event
-                task_event = create_task_started_event(
-                    task_id=task.id,
-                    task_name=task.name,
-                    protocol=task.protocol,
-                    method=task.method,
-                    workflow_id=task.workflow_id,
-                    source="execution_engine"
-                )
-                
-                await self.emit_structured_event(task_event)
+                if self.has_event_handlers(EventType.TASK_STARTED):
+                    task_event = create_task_started_event(
+                        task_id=task.id,
+                        task_name=task.name,
+                        protocol=task.protocol,
+                        method=task.method,
+                        workflow_id=task.workflow_id,
+                        source="execution_engine"
+                    )
+                    
+                    await self.emit_structured_event(task_event)
                 
                 logger.info(f"Executing task {task.id} ({task.protocol}/{task.method})")
+                timer.mark("dispatch")
                 
                 # Perform parameter substitution if needed
                 resolved_params = await self._resolve_task_parameters(task)
+                timer.mark("substitution")
                 
-                # Route task to appropriate provider
-                provider_result = await self._route_task_to_provider(task, resolved_params)
+                # Route task to appropriate provider; streamed chunks become events
+                with partial_output_handler(self._partial_output_handler(task)):
+                    provider_result = await self._route_task_to_provider(task, resolved_params)
+                # The registry records the request phases itself
+                timer.skip()
                 
                 # Check if the provider returned a TaskResult (from pooling) or raw result
                 if isinstance(provider_result, TaskResult):
@@ -446,12 +588,15 @@ class ExecutionEngine:
                 task.status = TaskStatus.COMPLETED
                 task.completed_at = task_result.completed_at
                 self.task_results[task.id] = task_result
+                self._parameter_plans.pop(task.id, None)
                 logger.debug(f"Stored result for task {task.id}: {task_result.result}")
                 
                 # Persist the task result
                 if self.persistence:
-                    await self.persistence.save_task_result(task_result)
-                    await self.persistence.save_task(task)
+                    await self._persist_task_outcome(task, task_result)
+                timer.mark("persistence")
+                if self._tasks_metric is not None:
+                    self._tasks_metric.labels(task.protocol, task.method, "completed").inc()
                 
                 # Mark as completed in queue
                 await self.queue_manager.mark_task_completed(task.id)
@@ -461,9 +606,7 @@ class ExecutionEngine:
                     self._execution_mode == ExecutionMode.EVENT_DRIVEN and
                     len(self.active_tasks) < self.max_concurrent_tasks):
                     # Try to execute any newly available dependent tasks
-                    ready_task = await self.queue_manager.dequeue_next_task()
-                    if ready_task:
-                        asyncio.create_task(self._execute_task(ready_task))
+                    await self._process_ready_tasks()
                 
                 # Update stats
                 self.stats.tasks_processed += 1
@@ -480,21 +623,24 @@ class ExecutionEngine:
                     )
                 
                 # Emit structured task completed event
-                task_completed_event = create_task_completed_event(
-                    task_id=task.id,
-                    workflow_id=task.workflow_id,
-                    duration=duration,
-                    result_size=len(str(task_result.result)) if task_result.result else 0,
-                    source="execution_engine"
-                )
-                
-                await self.emit_structured_event(task_completed_event)
+                if self.has_event_handlers(EventType.TASK_COMPLETED):
+                    task_completed_event = create_task_completed_event(
+                        task_id=task.id,
+                        workflow_id=task.workflow_id,
+                        duration=duration,
+                        result_size=len(str(task_result.result)) if task_result.result else 0,
+                        source="execution_engine"
+                    )
+                    
+                    await self.emit_structured_event(task_completed_event)
                 
                 # Check if workflow is complete and process dependencies
                 if task.workflow_id:
-                    await self._check_workflow_completion(task.workflow_id)
+                    await self._check_workflow_completion(task.workflow_id, task.id)
                 
                 logger.info(f"Task {task.id} completed successfully in {duration:.3f}s")
+                timer.mark("completion")
+                timer.finish()
                 return task_result
                 
             except Exception as e:
@@ -520,18 +666,18 @@ class ExecutionEngine:
                 error_message = str(structured_error)
                 
                 # Emit task:failed event for event-driven retry handling
-                from gleitzeit.core.events import EventType, create_task_failed_event
-                failed_event = create_task_failed_event(
-                    task_id=task.id,
-                    workflow_id=task.workflow_id,
-                    error_message=error_message,
-                    error_type=type(structured_error).__name__,
-                    is_retryable=is_retryable_error(structured_error),
-                    source="execution_engine"
-                )
-                
-                await self.emit_structured_event(failed_event)
-                logger.debug(f"Task {task.id} failed, emitted task:failed event")
+                if self.has_event_handlers(EventType.TASK_FAILED):
+                    failed_event = create_task_failed_event(
+                        task_id=task.id,
+                        workflow_id=task.workflow_id,
+                        error_message=error_message,
+                        error_type=type(structured_error).__name__,
+                        is_retryable=is_retryable_error(structured_error),
+                        source="execution_engine"
+                    )
+                    
+                    await self.emit_structured_event(failed_event)
+                    logger.debug(f"Task {task.id} failed, emitted task:failed event")
                 
                 # Get current retry count from retry manager
                 retry_info = await self.retry_manager.get_task_retry_info(task.id)
@@ -547,6 +693,8 @@ class ExecutionEngine:
             if should_retry:
                 # Schedule retry via retry manager
                 await self.retry_manager.schedule_retry(task, error_message)
+                if self._retries_metric is not None:
+                    self._retries_metric.labels(task.protocol, task.method).inc()
                 
                 logger.info(f"Task {task.id} scheduled for retry (attempt {current_retry_count})")
                 
@@ -591,33 +739,38 @@ class ExecutionEngine:
                     }
                 )
                 
+                self._parameter_plans.pop(task.id, None)
+                
                 # Persist the failed task result
                 if self.persistence:
-                    await self.persistence.save_task_result(task_result)
-                    await self.persistence.save_task(task)
+                    await self._persist_task_outcome(task, task_result)
                 
                 # Mark as failed in queue
                 await self.queue_manager.mark_task_failed(task.id)
                 
                 # Check workflow completion if task permanently failed
                 if task.workflow_id:
-                    await self._check_workflow_completion(task.workflow_id)
+                    await self._check_workflow_completion(task.workflow_id, task.id)
             
             self.task_results[task.id] = task_result
             
             # Update stats
             self.stats.tasks_processed += 1
             self.stats.tasks_failed += 1
+            if self._tasks_metric is not None:
+                status = "retry_pending" if should_retry else "failed"
+                self._tasks_metric.labels(task.protocol, task.method, status).inc()
             
             # Emit structured task failed event
-            task_failed_event = create_task_failed_event(
-                task_id=task.id,
-                error_message=error_message,
-                workflow_id=task.workflow_id,
-                source="execution_engine"
-            )
-            
-            await self.emit_structured_event(task_failed_event)
+            if self.has_event_handlers(EventType.TASK_FAILED):
+                task_failed_event = create_task_failed_event(
+                    task_id=task.id,
+                    error_message=error_message,
+                    workflow_id=task.workflow_id,
+                    source="execution_engine"
+                )
+                
+                await self.emit_structured_event(task_failed_event)
             
             logger.error(f"Task {task.id} failed: {error_message}")
             
@@ -625,78 +778,73 @@ class ExecutionEngine:
             if task.workflow_id:
                 await self._handle_workflow_task_failure(task.workflow_id, task.id)
             
+            timer.finish()
+            
             # Return the TaskResult instead of raising for _execute_task_with_cleanup
             return task_result
     
+    async def _persist_task_outcome(self, task: Task, task_result: TaskResult) -> None:
+        """Save a finished task and its result, timing the writes when metrics are enabled"""
+        if self._persistence_writes is None:
+            await self.persistence.save_task_result(task_result)
+            await self.persistence.save_task(task)
+            return
+        started = time.perf_counter()
+        await self.persistence.save_task_result(task_result)
+        result_saved = time.perf_counter()
+        await self.persistence.save_task(task)
+        self._persistence_writes[0].observe(result_saved - started)
+        self._persistence_writes[1].observe(time.perf_counter() - result_saved)
+    
+    def _partial_output_handler(self, task: Task) -> Callable[[str, Dict[str, Any]], Any]:
+        """Create a handler emitting streamed output chunks of a task as events"""
+        sequence = 0
+        
+        async def handle(chunk: str, metadata: Dict[str, Any]) -> None:
+            nonlocal sequence
+            if self.has_event_handlers(EventType.TASK_PARTIAL_OUTPUT):
+                await self.emit_structured_event(create_task_partial_output_event(
+                    task_id=task.id,
+                    chunk=chunk,
+                    sequence=sequence,
+                    workflow_id=task.workflow_id,
+                    metadata=metadata
+                ))
+            sequence += 1
+        
+        return handle
+    
+    def _compile_task_parameters(self, task: Task) -> ParameterPlan:
+        """Compile a task's params into a substitution plan and cache it"""
+        plan = compile_parameters(task.params, self.task_name_to_id_map)
+        if not plan.has_references:
+            # Static params can be checked against the protocol once, up front
+            protocol_registry = getattr(self.registry, 'protocol_registry', None)
+            if protocol_registry is not None:
+                plan.prevalidated = protocol_registry.is_valid_task(task.protocol, task.method, task.params)
+        self._parameter_plans[task.id] = plan
+        return plan
+    
+    def _has_prevalidated_params(self, task: Task) -> bool:
+        """Check if a task's params already passed protocol validation"""
+        plan = self._parameter_plans.get(task.id)
+        return plan is not None and plan.prevalidated and plan.params is task.params
+    
     async def _resolve_task_parameters(self, task: Task) -> Dict[str, Any]:
         """Resolve parameter references in task parameters"""
-        import re
-        import json
-        
-        def substitute_parameters(obj):
-            """Recursively substitute parameter references"""
-            if isinstance(obj, str):
-                # Look for ${task-id.field} patterns
-                pattern = r'\$\{([^}]+)\}'
-                matches = re.findall(pattern, obj)
-                
-                for match in matches:
-                    parts = match.split('.')
-                    ref_task_id = parts[0]
-                    field_path = parts[1:] if len(parts) > 1 else ['result']
-                    
-                    # Try to resolve task name to task ID if it's not already an ID
-                    actual_task_id = ref_task_id
-                    if hasattr(self, 'task_name_to_id_map') and ref_task_id in self.task_name_to_id_map:
-                        actual_task_id = self.task_name_to_id_map[ref_task_id]
-                        logger.debug(f"Resolved task name '{ref_task_id}' to ID '{actual_task_id}'")
-                    
-                    # Get referenced result
-                    logger.debug(f"Looking for task {actual_task_id} in results: {list(self.task_results.keys())}")
-                    if actual_task_id in self.task_results:
-                        ref_result = self.task_results[actual_task_id]
-                        
-                        # Navigate through the field path
-                        # Start with the result field of TaskResult if it exists
-                        ref_value = ref_result.result if hasattr(ref_result, 'result') else ref_result
-                        for field in field_path:
-                            if field == 'result' and hasattr(ref_value, 'result'):
-                                ref_value = ref_value.result
-                            elif isinstance(ref_value, dict) and field in ref_value:
-                                ref_value = ref_value[field]
-                            elif hasattr(ref_value, field):
-                                ref_value = getattr(ref_value, field)
-                            else:
-                                logger.warning(f"Field {field} not found in task {actual_task_id} result")
-                                logger.warning(f"  Available fields in ref_value: {list(ref_value.keys()) if isinstance(ref_value, dict) else dir(ref_value)}")
-                                logger.warning(f"  ref_value type: {type(ref_value)}")
-                                ref_value = None
-                                break
-                        
-                        # Replace the reference
-                        if ref_value is not None:
-                            # If the entire string is just the reference, return the actual value
-                            if obj == f"${{{match}}}":
-                                return ref_value
-                            # Otherwise, do string replacement (which requires converting to string)
-                            else:
-                                replacement = str(ref_value) if not isinstance(ref_value, str) else ref_value
-                                obj = obj.replace(f"${{{match}}}", replacement)
-                    else:
-                        logger.warning(f"Referenced task {actual_task_id} not found in results")
-                
-                return obj
-            
-            elif isinstance(obj, dict):
-                return {k: substitute_parameters(v) for k, v in obj.items()}
-            
-            elif isinstance(obj, list):
-                return [substitute_parameters(item) for item in obj]
-            
-            else:
-                return obj
+        plan = self._parameter_plans.get(task.id)
+        if plan is None or plan.params is not task.params:
+            # Tasks not submitted through submit_task (or whose params were
+            # replaced since) are compiled on first execution
+            plan = self._compile_task_parameters(task)
+        
+        if not plan.has_references:
+            return dict(task.params)
         
-        return substitute_parameters(task.params.copy())
+        # Load referenced results up front; results evicted from memory are
+        # read back from persistence so substitution itself stays synchronous
+        referenced_results = await self.task_results.fetch_many(plan.task_ids)
+        return plan.apply(referenced_results)
     
     async def _route_task_to_provider(self, task: Task, params: Dict[str, Any]) -> Any:
         """Route task to appropriate protocol provider"""
@@ -723,7 +871,7 @@ class ExecutionEngine:
                 
                 # Now check if workflow is complete and process dependencies
                 if task.workflow_id:
-                    await self._check_workflow_completion(task.workflow_id)
+                    await self._check_workflow_completion(task.workflow_id, task.id)
                 
                 return task_result
             else:
@@ -744,11 +892,17 @@ class ExecutionEngine:
             id=task.id
         )
         
-        # Execute request via registry
+        # Execute request via registry, or a worker process in multi-process mode
+        executor = self.registry
+        if self.worker_pool is not None:
+            await self.worker_pool.start()
+            if self.worker_pool.handles(task.protocol):
+                executor = self.worker_pool
         try:
-            response = await self.registry.execute_request(
+            response = await executor.execute_request(
                 protocol_id=task.protocol,
-                request=jsonrpc_request
+                request=jsonrpc_request,
+                prevalidated=self._has_prevalidated_params(task)
             )
             
             # Check for JSON-RPC error
@@ -785,6 +939,7 @@ class ExecutionEngine:
         workflow.status = WorkflowStatus.RUNNING
         workflow.started_at = datetime.utcnow()
         self.workflow_states[workflow.id] = workflow
+        self.task_results.pin_workflow(workflow.id)
         
         try:
             # Add workflow to dependency resolver
@@ -900,98 +1055,74 @@ class ExecutionEngine:
         # In practice, you'd check workflow dependencies and readiness
         return []
     
-    async def _check_workflow_completion(self, workflow_id: str) -> None:
-        """Check if a workflow is complete and submit ready dependent tasks"""
+    def _get_workflow_progress(self, workflow_id: str) -> WorkflowProgress:
+        """Get completion state for a workflow, building it on first use"""
+        progress = self.workflow_progress.get(workflow_id)
+        if progress is None:
+            workflow = self.workflow_states[workflow_id]
+            progress = WorkflowProgress.from_workflow(workflow)
+            
+            # Account for tasks that already finished (e.g. workflows executed
+            # directly via _execute_workflow without submit_workflow)
+            for task in workflow.tasks:
+                result = self.task_results.get(task.id)
+                if result and result.status == TaskStatus.COMPLETED:
+                    progress.mark_completed(task.id)
+            
+            self.workflow_progress[workflow_id] = progress
+        return progress
+    
+    async def _check_workflow_completion(self, workflow_id: str, task_id: Optional[str] = None) -> None:
+        """
+        Record a finished task, submit newly ready dependents and detect workflow completion
+        
+        Only the direct dependents of ``task_id`` are re-checked, so the cost is
+        proportional to the task's out-degree rather than the workflow size.
+        """
         if workflow_id not in self.workflow_states:
             return
         
-        # Check if we should resolve (prevents duplicate concurrent resolutions)
-        if not await self.dependency_tracker.should_resolve_workflow(workflow_id):
-            logger.debug(f"Skipping duplicate resolution for workflow {workflow_id}")
-            return
+        workflow = self.workflow_states[workflow_id]
+        progress = self._get_workflow_progress(workflow_id)
         
-        try:
-            workflow = self.workflow_states[workflow_id]
-            
-            # Get completed task IDs for this workflow from both internal results and persistence
-            completed_task_ids = {
-                task_id for task_id, result in self.task_results.items()
-                if result.workflow_id == workflow_id and result.status == TaskStatus.COMPLETED
-            }
-            
-            # Also check persistence for completed tasks (needed when using pooling adapter)
-            if self.persistence:
-                for task in workflow.tasks:
-                    if task.id not in completed_task_ids:  # Don't double-check
-                        persisted_result = await self.persistence.get_task_result(task.id)
-                        if (persisted_result and 
-                            persisted_result.workflow_id == workflow_id and 
-                            persisted_result.status == TaskStatus.COMPLETED):
-                            completed_task_ids.add(task.id)
+        ready_task_ids: List[str] = []
+        if task_id is not None:
+            result = self.task_results.get(task_id)
+            if result and result.status == TaskStatus.COMPLETED:
+                ready_task_ids = progress.mark_completed(task_id)
+        
+        # Submit dependents whose dependencies are now satisfied
+        for ready_task_id in ready_task_ids:
+            # Skip if already submitted (prevents duplicate submissions)
+            if await self.dependency_tracker.is_task_submitted(ready_task_id):
+                continue
             
-            # Check for tasks that are now ready to run (dependencies satisfied)
-            ready_tasks = []
-            for task in workflow.tasks:
-                # Skip if already submitted (prevents duplicate submissions)
-                if await self.dependency_tracker.is_task_submitted(task.id):
-                    continue
-                
-                # Skip tasks that are already completed or failed
-                if task.id in completed_task_ids:
-                    continue
-                    
-                # Check if task already has a result (failed, in progress, etc.)
-                if task.id in self.task_results:
-                    continue
-                    
-                # Check if all dependencies are satisfied
-                if task.dependencies:
-                    dependencies_satisfied = all(
-                        dep_task_id in completed_task_ids 
-                        for dep_task_id in task.dependencies
-                    )
-                    if dependencies_satisfied:
-                        ready_tasks.append(task)
-                else:
-                    # Task has no dependencies, but wasn't submitted yet
-                    # This shouldn't normally happen, but handle it
-                    ready_tasks.append(task)
+            # Skip tasks that already have a result (failed, in progress, etc.)
+            if ready_task_id in self.task_results:
+                continue
             
-            # Submit ready tasks to the queue  
-            for task in ready_tasks:
-                await self.submit_task(task)
+            await self.submit_task(progress.tasks_by_id[ready_task_id])
+        
+        # Check if workflow is complete
+        if progress.is_complete and not progress.finished:
+            progress.finished = True
+            workflow.status = WorkflowStatus.COMPLETED
+            workflow.completed_at = datetime.utcnow()
             
-            # Check if workflow is complete
-            workflow_task_ids = {task.id for task in workflow.tasks}
+            self.stats.workflows_completed += 1
             
-            if completed_task_ids == workflow_task_ids:
-                workflow.status = WorkflowStatus.COMPLETED
-                workflow.completed_at = datetime.utcnow()
-                
-                self.stats.workflows_completed += 1
-                
-                # Clean up dependency tracker for completed workflow
-                await self.dependency_tracker.cleanup_completed_workflows([workflow_id])
-                
-                # Emit structured workflow completed event
-                workflow_completed_event = create_workflow_completed_event(
-                    workflow_id=workflow_id,
-                    duration=(workflow.completed_at - workflow.started_at).total_seconds() if workflow.started_at else 0.0,
-                    tasks_completed=len(workflow.tasks),
-                    source="execution_engine"
-                )
-                
-                await self.emit_structured_event(workflow_completed_event)
-                logger.info(f"Workflow {workflow_id} completed successfully")
+            # Emit structured workflow completed event
+            workflow_completed_event = create_workflow_completed_event(
+                workflow_id=workflow_id,
+                duration=(workflow.completed_at - workflow.started_at).total_seconds() if workflow.started_at else 0.0,
+                tasks_completed=len(workflow.tasks),
+                source="execution_engine"
+            )
             
-            # Mark resolution as successful
-            await self.dependency_tracker.complete_resolution(workflow_id, success=True)
+            await self.emit_structured_event(workflow_completed_event)
+            logger.info(f"Workflow {workflow_id} completed successfully")
             
-        except Exception as e:
-            # Mark resolution as failed
-            await self.dependency_tracker.complete_resolution(workflow_id, success=False, error=str(e))
-            logger.error(f"Failed to check workflow completion for {workflow_id}: {e}")
-            raise
+            await self._release_workflow(workflow_id)
     
     async def _handle_workflow_task_failure(self, workflow_id: str, failed_task_id: str) -> None:
         """Handle task failure within a workflow"""
@@ -1020,14 +1151,44 @@ class ExecutionEngine:
             )
             
             await self.emit_structured_event(workflow_failed_event)
+            
+            # Release the workflow once the failure is final (not pending a retry)
+            failed_result = self.task_results.get(failed_task_id)
+            if failed_result and failed_result.status == TaskStatus.FAILED:
+                await self._release_workflow(workflow_id)
+    
+    async def _release_workflow(self, workflow_id: str) -> None:
+        """
+        Drop per-workflow bookkeeping once a workflow has finished
+        
+        Results stay cached in the result store but become evictable; evicted
+        results remain readable through the persistence backend.
+        """
+        workflow = self.workflow_states.pop(workflow_id, None)
+        self.workflow_progress.pop(workflow_id, None)
+        self.task_results.release_workflow(workflow_id)
+        
+        if workflow is not None:
+            task_ids = [task.id for task in workflow.tasks]
+            for task in workflow.tasks:
+                # Names may have been re-mapped by a newer workflow
+                if self.task_name_to_id_map.get(task.name) == task.id:
+                    del self.task_name_to_id_map[task.name]
+            for task_id in task_ids:
+                self._parameter_plans.pop(task_id, None)
+            self.retry_manager.forget_tasks(task_ids)
+            await self.dependency_tracker.forget_tasks(task_ids)
+        
+        await self.dependency_tracker.cleanup_completed_workflows([workflow_id])
     
     def get_stats(self) -> ExecutionStats:
-        """Get execution statistics"""
+        """Get execution statistics, including per-phase latency histograms"""
+        self.stats.phase_timings = self.phase_timings.snapshot()
         return self.stats
     
     def _get_stats_dict(self) -> Dict[str, Any]:
         """Get stats as dictionary"""
-        return {
+        stats = {
             "tasks_processed": self.stats.tasks_processed,
             "tasks_succeeded": self.stats.tasks_succeeded,
             "tasks_failed": self.stats.tasks_failed,
@@ -1040,19 +1201,21 @@ class ExecutionEngine:
                 if self.stats.tasks_processed > 0 else 100.0
             ),
             "active_tasks": len(self.active_tasks),
-            "max_concurrent_tasks": self.max_concurrent_tasks
+            "max_concurrent_tasks": self.max_concurrent_tasks,
+            "phase_timings": self.phase_timings.snapshot(),
+            "events": self.events.get_stats()
         }
+        if self.worker_pool is not None:
+            stats["workers"] = self.worker_pool.get_stats()
+        return stats
     
     def get_task_result(self, task_id: str) -> Optional[TaskResult]:
         """Get result for a specific task"""
         return self.task_results.get(task_id)
     
     def get_workflow_results(self, workflow_id: str) -> List[TaskResult]:
-        """Get all results for a workflow"""
-        return [
-            result for result in self.task_results.values()
-            if result.workflow_id == workflow_id
-        ]
+        """Get all in-memory results for a workflow"""
+        return self.task_results.workflow_results(workflow_id)
     
     async def submit_task(self, task: Task, queue_name: Optional[str] = None) -> None:
         """Submit a single task for execution (idempotent)"""
@@ -1085,26 +1248,30 @@ class ExecutionEngine:
             logger.debug(f"Task {task.id} already submitted, skipping duplicate submission")
             return
         
+        # Compile parameter references once, with task names resolved to IDs
+        self._compile_task_parameters(task)
+        
         await self.queue_manager.enqueue_task(task, queue_name)
         
         # Emit structured task submitted event
-        task_data = TaskEventData(
-            task_id=task.id,
-            task_name=task.name,
-            protocol=task.protocol,
-            method=task.method,
-            priority=task.priority,
-            status=TaskStatus.QUEUED
-        )
-        
-        task_submitted_event = GleitzeitEvent.create_task_event(
-            EventType.TASK_SUBMITTED,
-            task_data,
-            source="execution_engine",
-            correlation_id=task.workflow_id
-        )
-        
-        await self.emit_structured_event(task_submitted_event)
+        if self.has_event_handlers(EventType.TASK_SUBMITTED):
+            task_data = TaskEventData(
+                task_id=task.id,
+                task_name=task.name,
+                protocol=task.protocol,
+                method=task.method,
+                priority=task.priority,
+                status=TaskStatus.QUEUED
+            )
+            
+            task_submitted_event = GleitzeitEvent.create_task_event(
+                EventType.TASK_SUBMITTED,
+                task_data,
+                source="execution_engine",
+                correlation_id=task.workflow_id
+            )
+            
+            await self.emit_structured_event(task_submitted_event)
         
         # In event-driven mode, immediately try to process ready tasks if capacity allows
         if (self.running and 
@@ -1127,12 +1294,17 @@ class ExecutionEngine:
         # Build name-to-ID mapping for parameter substitution
         self._build_name_to_id_mapping(workflow)
         
+        # Register the workflow and its completion index before any task can
+        # run, so completions of early tasks are counted
+        self.workflow_states[workflow.id] = workflow
+        self.workflow_progress.pop(workflow.id, None)
+        self._get_workflow_progress(workflow.id)
+        self.task_results.pin_workflow(workflow.id)
+        
         # Submit workflow tasks using submit_task to trigger automatic execution
         for task in workflow.tasks:
             await self.submit_task(task, queue_name)
         
-        self.workflow_states[workflow.id] = workflow
-        
         # Emit structured workflow submitted event
         workflow_data = WorkflowEventData(
             workflow_id=workflow.id,
@@ -1151,9 +1323,6 @@ class ExecutionEngine:
     
     def _build_name_to_id_mapping(self, workflow: Workflow) -> None:
         """Build mapping from task names to task IDs for parameter substitution"""
-        if not hasattr(self, 'task_name_to_id_map'):
-            self.task_name_to_id_map: Dict[str, str] = {}
-        
         for task in workflow.tasks:
             self.task_name_to_id_map[task.name] = task.id
             logger.debug(f"Mapped task name '{task.name}' to ID '{task.id}'")
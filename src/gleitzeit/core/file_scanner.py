@@ -0,0 +1,114 @@
+"""
+Streaming File Discovery for Gleitzeit V4
+
+Finds files matching a glob-style pattern with ``os.scandir``, yielding
+paths as directories are read instead of building the full list first.
+Directory entries carry their file type, so no extra stat call is needed
+per file.
+
+Pattern syntax follows ``glob``: ``*``, ``?`` and ``[...]`` match within
+one path component, and a ``**`` component matches any number of
+directories (e.g. ``**/*.txt``). Hidden entries only match components
+that start with a dot.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator, List
+
+from gleitzeit.core.errors import ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+RECURSIVE = "**"
+
+
+def validate_directory(directory: str) -> Path:
+    """Check that a directory exists"""
+    dir_path = Path(directory)
+    if not dir_path.exists():
+        raise ConfigurationError(f"Directory not found: {directory}")
+    if not dir_path.is_dir():
+        raise ConfigurationError(f"Not a directory: {directory}")
+    return dir_path
+
+
+def iter_files(directory: str, pattern: str = "*") -> Iterator[str]:
+    """
+    Lazily yield files below a directory that match a pattern
+
+    Order follows the file system; sort the results if you need a stable
+    order.
+
+    Args:
+        directory: Directory to scan
+        pattern: Glob pattern relative to the directory (e.g. "*.png", "**/*.txt")
+
+    Yields:
+        Paths of matching files (directory joined with the relative path)
+    """
+    validate_directory(directory)
+    parts = [part for part in pattern.replace(os.sep, "/").split("/") if part]
+    if not parts:
+        return
+    matchers = [None if part == RECURSIVE else _compile_component(part) for part in parts]
+    yield from _walk(directory, matchers)
+
+
+def _compile_component(part: str) -> Callable[[str], bool]:
+    """Build a matcher for one path component"""
+    if not any(c in part for c in "*?["):
+        # Literal component
+        return lambda name: name == part
+    include_hidden = part.startswith(".")
+    regex = re.compile(fnmatch.translate(part))
+    return lambda name: (include_hidden or not name.startswith(".")) and regex.match(name) is not None
+
+
+def _walk(directory: str, matchers: List) -> Iterator[str]:
+    matcher, rest = matchers[0], matchers[1:]
+
+    if matcher is None:
+        # "**": match here with the remaining components, then in every subdirectory
+        if not rest:
+            rest = [_compile_component("*")]
+        yield from _walk(directory, rest)
+        for entry in _scan(directory):
+            if not entry.name.startswith(".") and _is_dir(entry):
+                yield from _walk(entry.path, matchers)
+        return
+
+    for entry in _scan(directory):
+        if not matcher(entry.name):
+            continue
+        if rest:
+            if _is_dir(entry):
+                yield from _walk(entry.path, rest)
+        elif _is_file(entry):
+            yield entry.path
+
+
+def _scan(directory: str) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(directory) as entries:
+            yield from entries
+    except OSError as e:
+        logger.warning(f"Could not scan {directory}: {e}")
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        # Symlinked directories are not followed to avoid cycles
+        return entry.is_dir(follow_symlinks=False)
+    except OSError:
+        return False
+
+
+def _is_file(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
@@ -0,0 +1,521 @@
+"""
+Metrics for Gleitzeit V4
+
+A small in-process metrics registry (counters, gauges and histograms with
+labels) exported in the OpenMetrics text format, which Prometheus and
+compatible scrapers understand.
+
+Hot paths update metrics directly: resolve the labelled child once
+(``counter.labels("llm/v1")``) and ``inc()``/``observe()`` it, which is a
+dict lookup and an addition. State that components already track (queue
+depth, in-flight requests, cache hits) is read by collectors only when the
+metrics are exported, so it costs nothing in between.
+
+Export through an optional local HTTP endpoint (``MetricsServer``) or by
+dumping to a file (``write_metrics_file`` / ``MetricsFileWriter``).
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Seconds; suited to task phases from sub-millisecond bookkeeping to LLM calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+class _Metric(ABC):
+    """Base class of a metric family with optional labels"""
+
+    kind = "unknown"
+
+    def __init__(self, name: str, help: str = "", labelnames: Sequence[str] = ()):
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Invalid metric name: {name}")
+        for label in labelnames:
+            if not _LABEL_RE.match(label) or label.startswith("__"):
+                raise ValueError(f"Invalid label name for {name}: {label}")
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def labels(self, *values: Any, **labels: Any):
+        """Get the child for a set of label values (create it on first use)"""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        # Fast path: string label values are the key as given
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            key = tuple(str(value) for value in values)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def clear(self) -> None:
+        """Drop all labelled children"""
+        if self.labelnames:
+            self._children.clear()
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use labels() first")
+        return self._children[()]
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the value holder of one label set"""
+        pass
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        """Yield (sample name, label pairs, value)"""
+        pass
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeValue(_Value):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = "", labelnames: Sequence[str] = ()):
+        # OpenMetrics names the family without the _total suffix
+        super().__init__(name[:-6] if name.endswith("_total") else name, help, labelnames)
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._unlabelled().inc(amount)
+
+    def _new_child(self):
+        return _Value()
+
+    def samples(self):
+        for key, child in self._children.items():
+            yield f"{self.name}_total", tuple(zip(self.labelnames, key)), child.value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabelled().dec(amount)
+
+    def _new_child(self):
+        return _GaugeValue()
+
+    def samples(self):
+        for key, child in self._children.items():
+            yield self.name, tuple(zip(self.labelnames, key)), child.value
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def load(self, cumulative_counts: Sequence[int], total: float, count: int) -> None:
+        """Replace the state with precomputed cumulative bucket counts"""
+        previous = 0
+        for index, cumulative in enumerate(cumulative_counts):
+            self.counts[index] = cumulative - previous
+            previous = cumulative
+        self.counts[-1] = count - previous
+        self.sum = total
+        self.count = count
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+        if "le" in labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        super().__init__(name, help, labelnames)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def samples(self):
+        for key, child in self._children.items():
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (("le", _format_value(bound)),), cumulative
+            yield f"{self.name}_bucket", labels + (("le", "+Inf"),), child.count
+            yield f"{self.name}_count", labels, child.count
+            yield f"{self.name}_sum", labels, child.sum
+
+
+Collector = Callable[[], Iterable[_Metric]]
+
+
+class MetricsRegistry:
+    """
+    Registry of metrics and collectors
+
+    ``counter``/``gauge``/``histogram`` return the existing metric when
+    called again with the same name, so components can share a registry
+    without coordinating who creates what.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Collector) -> None:
+        """Add a callable returning metrics computed at export time"""
+        self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Collector) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def collect(self) -> List[_Metric]:
+        """All metrics: registered ones, then collector output"""
+        metrics = list(self._metrics.values())
+        for collector in list(self._collectors):
+            try:
+                metrics.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector} failed: {e}")
+        return metrics
+
+    def exposition(self) -> str:
+        """Render all metrics in the OpenMetrics text format"""
+        lines = []
+        seen = set()
+        for metric in self.collect():
+            if metric.name in seen:
+                logger.debug(f"Skipping duplicate metric family {metric.name}")
+                continue
+            seen.add(metric.name)
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {_escape_help(metric.help)}")
+            for sample_name, labels, value in metric.samples():
+                if labels:
+                    label_text = ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels)
+                    lines.append(f"{sample_name}{{{label_text}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(value)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, cls, name, help, labelnames, **kwargs):
+        family = name[:-6] if cls is Counter and name.endswith("_total") else name
+        metric = self._metrics.get(family)
+        if metric is None:
+            metric = self._metrics[family] = cls(name, help, labelnames, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} already registered as {metric.kind} with labels {metric.labelnames}")
+        return metric
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def write_metrics_file(registry: MetricsRegistry, path: str) -> None:
+    """Atomically write the current metrics to a file (e.g. for node_exporter's textfile collector)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(registry.exposition())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class MetricsFileWriter:
+    """Periodically dumps metrics to a file; writes once more on stop"""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._write()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            write_metrics_file(self.registry, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.path}: {e}")
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint serving the metrics
+
+    Binds to 127.0.0.1 by default; pass host="0.0.0.0" to expose it.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464, path: str = "/metrics"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.path = path
+        self._runner = None
+
+    async def start(self) -> None:
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get(self.path, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            # Report the port picked by the OS
+            self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}{self.path}")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        body = self.registry.exposition()
+        return web.Response(body=body.encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+
+def engine_collector(engine) -> Collector:
+    """
+    Collector exporting the state an ExecutionEngine and its components
+    already track: queue depth per priority, in-flight requests per
+    provider, pending retries, cache hits and the task phase histograms.
+    """
+
+    def collect() -> List[_Metric]:
+        metrics: List[_Metric] = []
+
+        active = Gauge("gleitzeit_engine_active_tasks", "Tasks currently executing")
+        active.set(len(engine.active_tasks))
+        capacity = Gauge("gleitzeit_engine_max_concurrent_tasks", "Configured task concurrency limit")
+        capacity.set(engine.max_concurrent_tasks)
+        workflows = Counter("gleitzeit_workflows_total", "Finished workflows", ["status"])
+        workflows.labels("completed").inc(engine.stats.workflows_completed)
+        workflows.labels("failed").inc(engine.stats.workflows_failed)
+        metrics += [active, capacity, workflows]
+
+        depth = Gauge("gleitzeit_queue_depth", "Queued tasks", ["queue", "priority"])
+        blocked = Gauge("gleitzeit_queue_blocked_tasks", "Queued tasks waiting on dependencies", ["queue"])
+        enqueued = Counter("gleitzeit_queue_enqueued_total", "Tasks enqueued", ["queue"])
+        dequeued = Counter("gleitzeit_queue_dequeued_total", "Tasks dequeued", ["queue"])
+        for name, queue in engine.queue_manager.queues.items():
+            for priority, count in queue.priority_counts().items():
+                depth.labels(name, priority).set(count)
+            blocked.labels(name).set(queue.blocked_count())
+            enqueued.labels(name).inc(queue.total_enqueued)
+            dequeued.labels(name).inc(queue.total_dequeued)
+        metrics += [depth, blocked, enqueued, dequeued]
+
+        in_flight = Gauge("gleitzeit_provider_in_flight", "Requests executing on a provider", ["provider", "protocol"])
+        healthy = Gauge("gleitzeit_provider_healthy", "1 if the provider accepts requests", ["provider", "protocol"])
+        requests = Counter("gleitzeit_provider_requests_total", "Requests handled by a provider", ["provider", "protocol", "result"])
+        for info in engine.registry.providers.values():
+            in_flight.labels(info.provider_id, info.protocol_id).set(info.in_flight)
+            healthy.labels(info.provider_id, info.protocol_id).set(1 if info.is_healthy else 0)
+            requests.labels(info.provider_id, info.protocol_id, "success").inc(info.successful_requests)
+            requests.labels(info.provider_id, info.protocol_id, "failure").inc(info.total_requests - info.successful_requests)
+        coalesced = Counter("gleitzeit_registry_coalesced_requests_total", "Requests served by an identical in-flight request")
+        coalesced.inc(engine.registry.coalesced_requests)
+        metrics += [in_flight, healthy, requests, coalesced]
+
+        retries = Gauge("gleitzeit_retries_pending", "Tasks waiting for a scheduled retry")
+        retries.set(engine.retry_manager.pending_count())
+        scheduled = Gauge("gleitzeit_scheduled_events", "Delayed events waiting in the scheduler")
+        scheduled.set(engine.scheduler.active_count())
+        metrics += [retries, scheduled]
+
+        event_queue = Gauge("gleitzeit_event_queue_depth", "Events waiting for a handler", ["handler"])
+        event_drops = Counter("gleitzeit_events_dropped_total", "Events dropped by a full handler queue", ["handler"])
+        for subscription in engine.events.subscriptions:
+            event_queue.labels(subscription.name).inc(subscription.queued)
+            event_drops.labels(subscription.name).inc(subscription.dropped)
+        metrics += [event_queue, event_drops]
+
+        worker_pool = getattr(engine, "worker_pool", None)
+        if worker_pool is not None:
+            worker_in_flight = Gauge("gleitzeit_worker_in_flight", "Requests executing in an engine worker", ["worker"])
+            worker_requests = Counter("gleitzeit_worker_requests_total", "Requests completed by an engine worker", ["worker"])
+            worker_crashes = Counter("gleitzeit_worker_crashes_total", "Engine workers that exited unexpectedly")
+            for worker in worker_pool.get_stats()["workers"]:
+                worker_in_flight.labels(worker["index"]).set(worker["in_flight"])
+                worker_requests.labels(worker["index"]).inc(worker["requests_completed"])
+            worker_crashes.inc(worker_pool.crashes)
+            metrics += [worker_in_flight, worker_requests, worker_crashes]
+
+        metrics += _cache_metrics(engine)
+        metrics.append(_phase_histogram(engine.phase_timings))
+        return metrics
+
+    return collect
+
+
+def _cache_metrics(engine) -> List[_Metric]:
+    hits = Counter("gleitzeit_cache_hits_total", "Cache lookups served from the cache", ["cache", "instance"])
+    misses = Counter("gleitzeit_cache_misses_total", "Cache lookups that missed", ["cache", "instance"])
+    evictions = Counter("gleitzeit_cache_evictions_total", "Entries evicted from a cache", ["cache", "instance"])
+
+    def add(cache: str, instance: str, hit_count: float, miss_count: float, eviction_count: float) -> None:
+        hits.labels(cache, instance).inc(hit_count)
+        misses.labels(cache, instance).inc(miss_count)
+        evictions.labels(cache, instance).inc(eviction_count)
+
+    store = engine.task_results
+    add("result_store", "engine", store.hits, store.misses, store.evictions)
+
+    # Provider caches may be shared between providers; report each once
+    seen = set()
+    for provider_id, provider in engine.registry.provider_instances.items():
+        response_cache = getattr(provider, "response_cache", None)
+        if response_cache is not None and id(response_cache) not in seen:
+            seen.add(id(response_cache))
+            add("response", provider_id, response_cache.memory_hits + response_cache.disk_hits,
+                response_cache.misses, response_cache.evictions)
+        image_preparer = getattr(provider, "image_preparer", None)
+        if image_preparer is not None and id(image_preparer) not in seen:
+            seen.add(id(image_preparer))
+            add("image", provider_id, image_preparer.hits, image_preparer.misses, image_preparer.evictions)
+    return [hits, misses, evictions]
+
+
+def _phase_histogram(phase_timings) -> Histogram:
+    histogram = Histogram(
+        "gleitzeit_task_phase_seconds",
+        "Time tasks spend in each execution phase",
+        ["protocol", "method", "phase"]
+    )
+    for (protocol, method, phase), latency in phase_timings.items():
+        histogram.labels(protocol, method, phase).load(
+            latency.cumulative_counts(histogram.buckets), latency.total, latency.count
+        )
+    return histogram
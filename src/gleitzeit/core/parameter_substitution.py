@@ -0,0 +1,191 @@
+"""
+Parameter Substitution for Gleitzeit V4
+
+Compiles task parameters containing ``${task.field}`` references into a
+substitution plan once, so executing a task only evaluates its references
+instead of re-scanning every parameter string.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from gleitzeit.core.models import TaskResult
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+
+@dataclass(frozen=True)
+class ParameterReference:
+    """A single ``${task.field}`` reference with its task ID resolved"""
+    placeholder: str
+    task_id: str
+    field_path: Tuple[str, ...]
+
+    def resolve(self, results: Mapping[str, TaskResult]) -> Any:
+        """
+        Look up the referenced value
+
+        Returns:
+            The referenced value, or None if the task or field is missing
+        """
+        ref_result = results.get(self.task_id)
+        if ref_result is None:
+            logger.warning(f"Referenced task {self.task_id} not found in results")
+            return None
+
+        # Start with the result field of TaskResult and walk the field path
+        ref_value = ref_result.result if hasattr(ref_result, 'result') else ref_result
+        for field in self.field_path:
+            if field == 'result' and hasattr(ref_value, 'result'):
+                ref_value = ref_value.result
+            elif isinstance(ref_value, dict) and field in ref_value:
+                ref_value = ref_value[field]
+            elif hasattr(ref_value, field):
+                ref_value = getattr(ref_value, field)
+            else:
+                logger.warning(f"Field {field} not found in task {self.task_id} result")
+                logger.debug(f"  Available fields: {list(ref_value.keys()) if isinstance(ref_value, dict) else type(ref_value)}")
+                return None
+        return ref_value
+
+
+@dataclass
+class _StringTemplate:
+    """String split into literal segments and references"""
+    segments: List[Union[str, ParameterReference]]
+
+    def render(self, results: Mapping[str, TaskResult]) -> Any:
+        # A string that is exactly one reference yields the raw value
+        if len(self.segments) == 1:
+            reference = self.segments[0]
+            value = reference.resolve(results)
+            return value if value is not None else reference.placeholder
+
+        parts = []
+        resolved: Dict[str, Any] = {}
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            if segment.placeholder not in resolved:
+                resolved[segment.placeholder] = segment.resolve(results)
+            value = resolved[segment.placeholder]
+            if value is None:
+                parts.append(segment.placeholder)
+            else:
+                parts.append(value if isinstance(value, str) else str(value))
+        return ''.join(parts)
+
+
+@dataclass
+class _ContainerTemplate:
+    """Dict or list with substitutions below some of its keys/indices"""
+    source: Union[Dict[str, Any], List[Any]]
+    children: Dict[Any, "_Template"]
+
+    def render(self, results: Mapping[str, TaskResult]) -> Any:
+        # Copy only this container; unchanged values are shared with the source
+        rendered = dict(self.source) if isinstance(self.source, dict) else list(self.source)
+        for key, child in self.children.items():
+            rendered[key] = child.render(results)
+        return rendered
+
+
+_Template = Union[_StringTemplate, _ContainerTemplate]
+
+
+class ParameterPlan:
+    """
+    Compiled substitution plan for one task's parameters
+
+    Holds the parameters it was compiled from; parts without references are
+    never walked again when the plan is applied.
+    """
+
+    def __init__(self, params: Dict[str, Any], template: Optional[_ContainerTemplate], task_ids: Tuple[str, ...]):
+        self.params = params
+        self._template = template
+        self.task_ids = task_ids
+        # Set by the engine once static params passed protocol validation
+        self.prevalidated = False
+
+    @property
+    def has_references(self) -> bool:
+        """Check if any parameter needs substitution"""
+        return self._template is not None
+
+    def apply(self, results: Mapping[str, TaskResult]) -> Dict[str, Any]:
+        """
+        Build the substituted parameters
+
+        Args:
+            results: Task results keyed by task ID
+
+        Returns:
+            New top-level params dict with references replaced
+        """
+        if self._template is None:
+            return dict(self.params)
+        return self._template.render(results)
+
+
+def compile_parameters(params: Dict[str, Any], name_to_id: Optional[Mapping[str, str]] = None) -> ParameterPlan:
+    """
+    Compile task parameters into a substitution plan
+
+    Args:
+        params: Task parameters
+        name_to_id: Mapping used to resolve task names in references to task IDs
+
+    Returns:
+        ParameterPlan for the parameters
+    """
+    name_to_id = name_to_id or {}
+    task_ids: Dict[str, None] = {}
+
+    def compile_reference(expression: str) -> ParameterReference:
+        parts = expression.split('.')
+        task_id = name_to_id.get(parts[0], parts[0])
+        task_ids[task_id] = None
+        return ParameterReference(
+            placeholder=f"${{{expression}}}",
+            task_id=task_id,
+            field_path=tuple(parts[1:]) if len(parts) > 1 else ('result',)
+        )
+
+    def compile_value(value: Any) -> Optional[_Template]:
+        if isinstance(value, str):
+            if '${' not in value:
+                return None
+            segments: List[Union[str, ParameterReference]] = []
+            position = 0
+            for match in REFERENCE_PATTERN.finditer(value):
+                if match.start() > position:
+                    segments.append(value[position:match.start()])
+                segments.append(compile_reference(match.group(1)))
+                position = match.end()
+            if not segments:
+                return None
+            if position < len(value):
+                segments.append(value[position:])
+            return _StringTemplate(segments)
+
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        else:
+            return None
+
+        children = {}
+        for key, item in items:
+            child = compile_value(item)
+            if child is not None:
+                children[key] = child
+        return _ContainerTemplate(value, children) if children else None
+
+    return ParameterPlan(params, compile_value(params), tuple(task_ids))
@@ -0,0 +1,251 @@
+"""
+Task Phase Timing for Gleitzeit V4
+
+Records where a task's time goes (waiting in the queue, waiting for a
+concurrency slot, parameter substitution, preprocessing, validation, the
+provider call, persistence and completion handling) in per-(protocol,
+method) latency histograms.
+
+Histograms are HDR-style: values are bucketed on a log-linear scale with
+32 sub-buckets per power of two, so any recorded value is reported within
+~3% while memory stays proportional to the value range, not the count.
+Recording is a few integer operations and a dict update.
+"""
+
+import math
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Phases in the order a task passes through them
+PHASES = (
+    "queue_wait",      # dependencies met (ready in the queue) -> picked up for execution
+    "semaphore_wait",  # waiting for a max_concurrent_tasks slot
+    "dispatch",        # retry bookkeeping and the task started event
+    "substitution",    # resolving ${...} references
+    "provider_wait",   # waiting for a provider with free capacity
+    "preprocessing",   # provider _preprocess_params (file reads, images)
+    "validation",      # protocol schema validation
+    "provider",        # the provider call itself
+    "persistence",     # saving the task and its result
+    "completion",      # queue bookkeeping, events, dependent tasks
+    "total",           # semaphore wait to completion
+)
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations with microsecond resolution"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one duration"""
+        if seconds < 0:
+            seconds = 0.0
+        value = int(seconds * 1_000_000)
+        if value < SUB_BUCKETS:
+            index = value
+        else:
+            # Log-linear bucket: top SUB_BUCKET_BITS + 1 bits of the value
+            shift = value.bit_length() - SUB_BUCKET_BITS - 1
+            index = (shift << SUB_BUCKET_BITS) + (value >> shift)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Duration in seconds below which pct percent of the values fall"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # Report the bucket's upper edge, but never above the true max
+                return min(_bucket_upper(index) / 1_000_000, self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        """
+        Number of values at or below each bound (in seconds), for export
+        to fixed-bucket histograms; values are attributed by their bucket
+        """
+        result = []
+        indexes = sorted(self.counts)
+        position = seen = 0
+        for bound in bounds:
+            limit = bound * 1_000_000
+            while position < len(indexes) and _bucket_upper(indexes[position]) <= limit:
+                seen += self.counts[indexes[position]]
+                position += 1
+            result.append(seen)
+        return result
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's values to this one"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> Dict[str, Any]:
+        """count, mean and percentiles in milliseconds"""
+        result = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+        }
+        for pct in REPORTED_PERCENTILES:
+            result[f"p{pct}_ms"] = round(self.percentile(pct) * 1000, 3)
+        result["max_ms"] = round(self.max * 1000, 3)
+        return result
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state (see from_state)"""
+        return {
+            "counts": {str(index): count for index, count in self.counts.items()},
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in state.get("counts", {}).items()}
+        histogram.count = state.get("count", 0)
+        histogram.total = state.get("total", 0.0)
+        histogram.max = state.get("max", 0.0)
+        return histogram
+
+
+def _bucket_upper(index: int) -> int:
+    if index < SUB_BUCKETS:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class PhaseTimings:
+    """Latency histograms per (protocol, method) and phase"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        # (protocol, method) -> phase -> histogram, for timers
+        self._by_method: Dict[Tuple[str, str], Dict[str, LatencyHistogram]] = {}
+
+    def record(self, protocol: str, method: str, phase: str, seconds: float) -> None:
+        """Record the duration of one phase of one task"""
+        self._phases(protocol, method, phase).record(seconds)
+
+    def _phases(self, protocol: str, method: str, phase: str) -> LatencyHistogram:
+        key = (protocol, method, phase)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+            self._by_method.setdefault((protocol, method), {})[phase] = histogram
+        return histogram
+
+    def get(self, protocol: str, method: str, phase: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get((protocol, method, phase))
+
+    def timer(self, protocol: str, method: str) -> "PhaseTimer":
+        """Start timing the phases of one task"""
+        return PhaseTimer(self, protocol, method)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Summaries as {"protocol method": {phase: {count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}}}
+
+        Phases are listed in execution order.
+        """
+        order = {phase: position for position, phase in enumerate(PHASES)}
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (protocol, method, phase) in sorted(
+            self._histograms, key=lambda key: (key[0], key[1], order.get(key[2], len(PHASES)), key[2])
+        ):
+            result.setdefault(f"{protocol} {method}", {})[phase] = self._histograms[(protocol, method, phase)].summary()
+        return result
+
+    def items(self) -> Iterator[Tuple[Tuple[str, str, str], LatencyHistogram]]:
+        """Iterate ((protocol, method, phase), histogram) pairs"""
+        return iter(list(self._histograms.items()))
+
+    def merge(self, other: "PhaseTimings") -> None:
+        for key, histogram in other._histograms.items():
+            self._phases(*key).merge(histogram)
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._by_method.clear()
+
+    def __len__(self) -> int:
+        return len(self._histograms)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state, e.g. to accumulate timings across CLI runs"""
+        return {
+            "histograms": [
+                {"protocol": protocol, "method": method, "phase": phase, **histogram.to_state()}
+                for (protocol, method, phase), histogram in self._histograms.items()
+            ]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "PhaseTimings":
+        timings = cls()
+        for entry in state.get("histograms", []):
+            timings._phases(entry["protocol"], entry["method"], entry["phase"]).merge(
+                LatencyHistogram.from_state(entry)
+            )
+        return timings
+
+
+class PhaseTimer:
+    """
+    Times consecutive phases of one task
+
+    Each ``mark(phase)`` records the time since the previous mark (or the
+    start) as that phase.
+    """
+
+    __slots__ = ("timings", "protocol", "method", "histograms", "started", "last")
+
+    def __init__(self, timings: PhaseTimings, protocol: str, method: str):
+        self.timings = timings
+        self.protocol = protocol
+        self.method = method
+        self.histograms = timings._by_method.get((protocol, method))
+        self.started = self.last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        histogram = self.histograms.get(phase) if self.histograms is not None else None
+        if histogram is None:
+            histogram = self.timings._phases(self.protocol, self.method, phase)
+            self.histograms = self.timings._by_method[(self.protocol, self.method)]
+        histogram.record(now - self.last)
+        self.last = now
+
+    def skip(self) -> None:
+        """Start the next phase without recording the time since the last mark"""
+        self.last = time.perf_counter()
+
+    def finish(self) -> None:
+        """Record the time since the timer started as the total"""
+        self.timings.record(self.protocol, self.method, "total", time.perf_counter() - self.started)
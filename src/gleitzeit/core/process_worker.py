@@ -0,0 +1,172 @@
+"""
+Engine Worker Process for Gleitzeit V4
+
+Started by ProcessWorkerPool, which runs ``main()`` in a new interpreter.
+Each worker builds its own registry and providers with the factory named
+in its init frame and executes JSON-RPC requests for the coordinator,
+many at a time, on its own event loop and CPU core.
+
+Frames are length-prefixed JSON on stdin/stdout (see worker_ipc.py, shared
+with the Python worker pool):
+
+- coordinator -> worker: ``init``, ``request``, ``cancel``; closing stdin
+  shuts the worker down
+- worker -> coordinator: ``ready``, ``chunk`` (partial output) and
+  ``response``
+
+The original stdout is reserved for frames; anything else written to it
+goes to stderr.
+"""
+
+import asyncio
+import importlib
+import inspect
+import logging
+import os
+import sys
+from typing import Any, Callable, Dict
+
+from gleitzeit.core.errors import error_to_jsonrpc
+from gleitzeit.core.jsonrpc import JSONRPCRequest
+from gleitzeit.core.streaming import partial_output_handler
+from gleitzeit.core.worker_ipc import encode_frame, read_frame, reserve_stdout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_FACTORY = "gleitzeit.core.process_worker:default_registry"
+
+
+def load_factory(path: str) -> Callable[..., Any]:
+    """Import a ``module:attribute`` registry factory"""
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        raise ValueError(f"Registry factory must be 'module:function', got {path!r}")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+async def default_registry(ollama_url: str = "http://localhost:11434"):
+    """The client's default providers: python/v1, llm/v1 (Ollama) and mcp/v1"""
+    from gleitzeit.registry import ProtocolProviderRegistry, DEFAULT_SINGLE_FLIGHT_PROTOCOLS
+    from gleitzeit.protocols import PYTHON_PROTOCOL_V1, LLM_PROTOCOL_V1, MCP_PROTOCOL_V1
+    from gleitzeit.providers.python_function_provider import CustomFunctionProvider
+    from gleitzeit.providers.ollama_provider import OllamaProvider
+    from gleitzeit.providers.simple_mcp_provider import SimpleMCPProvider
+
+    registry = ProtocolProviderRegistry(single_flight_protocols=DEFAULT_SINGLE_FLIGHT_PROTOCOLS)
+    registry.register_protocol(PYTHON_PROTOCOL_V1)
+    registry.register_protocol(LLM_PROTOCOL_V1)
+    registry.register_protocol(MCP_PROTOCOL_V1)
+
+    python_provider = CustomFunctionProvider("python-1")
+    await python_provider.initialize()
+    registry.register_provider("python-1", "python/v1", python_provider)
+
+    ollama_provider = OllamaProvider("ollama-1", ollama_url)
+    await ollama_provider.initialize()
+    registry.register_provider("ollama-1", "llm/v1", ollama_provider)
+
+    mcp_provider = SimpleMCPProvider("mcp-1")
+    await mcp_provider.initialize()
+    registry.register_provider("mcp-1", "mcp/v1", mcp_provider)
+    return registry
+
+
+class WorkerServer:
+    """Executes the coordinator's requests against a local registry"""
+
+    def __init__(self, registry, channel_out):
+        self.registry = registry
+        self.channel_out = channel_out
+        self._requests: Dict[int, asyncio.Task] = {}
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.channel_out.write(encode_frame(message))
+        self.channel_out.flush()
+
+    async def serve(self, reader: asyncio.StreamReader) -> None:
+        """Handle frames until the coordinator closes the channel"""
+        while True:
+            message = await read_frame(reader)
+            if message is None:
+                break
+            if message["type"] == "request":
+                task = asyncio.create_task(self._execute(message))
+                self._requests[message["id"]] = task
+                task.add_done_callback(lambda _, request_id=message["id"]: self._requests.pop(request_id, None))
+            elif message["type"] == "cancel":
+                task = self._requests.get(message["id"])
+                if task is not None:
+                    task.cancel()
+
+        for task in list(self._requests.values()):
+            task.cancel()
+        await asyncio.gather(*self._requests.values(), return_exceptions=True)
+
+    async def _execute(self, message: Dict[str, Any]) -> None:
+        request_id = message["id"]
+
+        async def on_chunk(chunk: str, metadata: Dict[str, Any]) -> None:
+            self.send({"type": "chunk", "id": request_id, "chunk": chunk, "metadata": metadata})
+
+        request = JSONRPCRequest(method=message["method"], params=message.get("params"), id=message.get("task_id"))
+        try:
+            with partial_output_handler(on_chunk if message.get("stream") else None):
+                response = await self.registry.execute_request(
+                    protocol_id=message["protocol"],
+                    request=request,
+                    prevalidated=message.get("prevalidated", False)
+                )
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            self.send({"type": "response", "id": request_id, "exception": error_to_jsonrpc(e)})
+            return
+
+        if getattr(response, "error", None) is not None:
+            self.send({"type": "response", "id": request_id, "error": response.error.model_dump()})
+        else:
+            self.send({"type": "response", "id": request_id, "result": response.result})
+
+
+async def run_worker(channel_out) -> None:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=2 ** 26)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    init = await read_frame(reader)
+    if init is None:
+        return
+    try:
+        factory = load_factory(init.get("factory") or DEFAULT_REGISTRY_FACTORY)
+        registry = factory(**(init.get("kwargs") or {}))
+        if inspect.isawaitable(registry):
+            registry = await registry
+    except Exception as e:
+        channel_out.write(encode_frame({"type": "ready", "error": f"{type(e).__name__}: {e}"}))
+        channel_out.flush()
+        return
+
+    server = WorkerServer(registry, channel_out)
+    server.send({
+        "type": "ready",
+        "pid": os.getpid(),
+        "protocols": sorted({info.protocol_id for info in registry.providers.values()})
+    })
+    try:
+        await server.serve(reader)
+    finally:
+        await registry.stop()
+
+
+def main() -> None:
+    """Serve requests until stdin is closed"""
+    channel_out = reserve_stdout()
+    logging.basicConfig(
+        level=os.environ.get("GLEITZEIT_WORKER_LOG_LEVEL", "WARNING"),
+        format=f"[worker {os.getpid()}] %(levelname)s %(name)s: %(message)s"
+    )
+    asyncio.run(run_worker(channel_out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Process Worker Pool for Gleitzeit V4
+
+Multi-process execution for the ExecutionEngine. The engine stays the
+coordinator: it owns the queues, dependency state, parameter substitution,
+persistence and events. Provider requests for the protocols the workers
+serve are sent to N worker processes (see process_worker.py), each with
+its own registry, providers and event loop, so validation, preprocessing,
+serialization and in-process providers use more than one core.
+
+- Requests and results travel over pipes as length-prefixed JSON frames;
+  each worker runs many requests concurrently, matched by request id
+- Requests go to the worker with the fewest outstanding requests
+- Partial output chunks are streamed back to the coordinator as they are
+  produced and handed to each request's handler by a per-request relay, so
+  a slow subscriber never stalls the pipe reader
+- A worker that exits fails its outstanding requests with a retryable
+  error and is replaced
+
+Each worker has its own registry and providers, so single-flight
+coalescing and the in-memory tier of the response cache only deduplicate
+requests within one worker; identical requests routed to different
+workers run separately.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from gleitzeit.core.errors import ErrorCode, GleitzeitError, ProviderError, ConfigurationError
+from gleitzeit.core.jsonrpc import JSONRPCError, JSONRPCRequest, JSONRPCResponse
+from gleitzeit.core.process_worker import DEFAULT_REGISTRY_FACTORY
+from gleitzeit.core.streaming import get_partial_output_handler
+from gleitzeit.core.worker_ipc import WorkerProcess, encode_frame, read_frame
+
+logger = logging.getLogger(__name__)
+
+# Not "-m gleitzeit.core.process_worker": the package imports that module first
+WORKER_COMMAND = "from gleitzeit.core.process_worker import main; main()"
+
+
+class _ChunkRelay:
+    """Hands one request's partial output to its handler, in order, off the pipe reader"""
+
+    def __init__(self, handler: Callable[[str, Dict[str, Any]], Awaitable[None]]):
+        self.handler = handler
+        self._chunks: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._deliver())
+
+    def put(self, chunk: str, metadata: Dict[str, Any]) -> None:
+        """Queue a chunk (never blocks)"""
+        self._chunks.put_nowait((chunk, metadata))
+
+    async def close(self) -> None:
+        """Wait until every queued chunk was delivered"""
+        self._chunks.put_nowait(None)
+        await self._task
+
+    def cancel(self) -> None:
+        self._task.cancel()
+
+    async def _deliver(self) -> None:
+        while True:
+            item = await self._chunks.get()
+            if item is None:
+                return
+            try:
+                await self.handler(*item)
+            except Exception as e:
+                logger.error(f"Partial output handler failed: {e}")
+
+
+class _EngineWorker(WorkerProcess):
+    """A worker process, its pipes and its outstanding requests"""
+
+    def __init__(self, index: int, process: asyncio.subprocess.Process):
+        super().__init__(process)
+        self.index = index
+        self.protocols: Set[str] = set()
+        self.pending: Dict[int, Tuple[asyncio.Future, Optional[_ChunkRelay]]] = {}
+        self.requests_completed = 0
+        self.reader_task: Optional[asyncio.Task] = None
+        # Concurrent drain() calls on one pipe are not supported before Python 3.10
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        frame = encode_frame(message)
+        async with self._send_lock:
+            self.process.stdin.write(frame)
+            await self.process.stdin.drain()
+
+    async def read_frame(self) -> Optional[Dict[str, Any]]:
+        return await read_frame(self.process.stdout)
+
+    async def stop(self, grace_period: float = 5.0) -> None:
+        """Close the channel so the worker exits, then wait for its reader"""
+        await super().stop(grace_period)
+        if self.reader_task is not None:
+            await asyncio.gather(self.reader_task, return_exceptions=True)
+
+
+class ProcessWorkerPool:
+    """
+    Pool of engine worker processes
+
+    Pass it to ExecutionEngine(worker_pool=...). Workers are started by
+    ``start()`` (or on the first request) and build their registry by
+    calling ``registry_factory(**factory_kwargs)`` in the worker process.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        registry_factory: str = DEFAULT_REGISTRY_FACTORY,
+        factory_kwargs: Optional[Dict[str, Any]] = None,
+        start_timeout: float = 60.0,
+        restart_workers: bool = True
+    ):
+        """
+        Initialize the worker pool
+
+        Args:
+            workers: Number of worker processes (default: one per CPU)
+            registry_factory: ``module:function`` returning the worker's
+                ProtocolProviderRegistry (may be async); it must be
+                importable in the worker
+            factory_kwargs: JSON serializable keyword arguments for the factory
+            start_timeout: Seconds to wait for a worker to report ready
+            restart_workers: Replace workers that exit unexpectedly
+        """
+        self.size = workers or os.cpu_count() or 1
+        self.registry_factory = registry_factory
+        self.factory_kwargs = factory_kwargs or {}
+        self.start_timeout = start_timeout
+        self.restart_workers = restart_workers
+        # Set by the engine so request round trips land in its phase timings
+        self.phase_timings = None
+
+        self.protocols: Set[str] = set()
+        self._workers: List[_EngineWorker] = []
+        self._request_ids = itertools.count(1)
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        self._stopping = False
+        self._restarts: Set[asyncio.Task] = set()
+
+        self.requests_completed = 0
+        self.crashes = 0
+        self.workers_started = 0
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def handles(self, protocol_id: str) -> bool:
+        """Whether requests for a protocol are sent to the workers"""
+        return protocol_id in self.protocols
+
+    async def start(self) -> None:
+        """Start all workers and wait until they are ready"""
+        if self._started:
+            return
+        async with self._start_lock:
+            if self._started:
+                return
+            self._stopping = False
+            results = await asyncio.gather(
+                *(self._start_worker(index) for index in range(self.size)), return_exceptions=True
+            )
+            workers = [result for result in results if isinstance(result, _EngineWorker)]
+            failures = [result for result in results if not isinstance(result, _EngineWorker)]
+            if failures:
+                self._stopping = True
+                await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
+                raise failures[0]
+            self._workers = workers
+            self.protocols = set.intersection(*(worker.protocols for worker in self._workers))
+            self._started = True
+            logger.info(f"Started {self.size} engine workers serving {sorted(self.protocols)}")
+
+    async def execute_request(
+        self,
+        protocol_id: str,
+        request: JSONRPCRequest,
+        prevalidated: bool = False
+    ) -> JSONRPCResponse:
+        """
+        Execute a JSON-RPC request in the least busy worker
+
+        Args:
+            protocol_id: Protocol to use
+            request: JSON-RPC request
+            prevalidated: Params were already validated against the protocol
+
+        Returns:
+            JSON-RPC response
+        """
+        await self.start()
+        worker = self._pick_worker()
+        request_id = next(self._request_ids)
+        chunk_handler = get_partial_output_handler()
+        relay = _ChunkRelay(chunk_handler) if chunk_handler is not None else None
+        future = asyncio.get_running_loop().create_future()
+        worker.pending[request_id] = (future, relay)
+
+        started = time.perf_counter()
+        try:
+            await worker.send({
+                "type": "request",
+                "id": request_id,
+                "task_id": request.id,
+                "protocol": protocol_id,
+                "method": request.method,
+                "params": request.params,
+                "prevalidated": prevalidated,
+                "stream": chunk_handler is not None
+            })
+            reply = await future
+            if relay is not None:
+                # Partial output is delivered before the result
+                await relay.close()
+        except asyncio.CancelledError:
+            if worker.pending.pop(request_id, None) is not None and worker.alive:
+                try:
+                    await worker.send({"type": "cancel", "id": request_id})
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            raise
+        except (BrokenPipeError, ConnectionResetError) as e:
+            worker.pending.pop(request_id, None)
+            raise self._worker_lost(worker, e)
+        finally:
+            if relay is not None:
+                relay.cancel()
+
+        if self.phase_timings is not None:
+            self.phase_timings.record(protocol_id, request.method, "provider", time.perf_counter() - started)
+
+        if "exception" in reply:
+            error = reply["exception"]
+            raise GleitzeitError(
+                message=error.get("message", "Worker request failed"),
+                code=_error_code(error.get("code")),
+                data=error.get("data")
+            )
+        if "error" in reply:
+            return JSONRPCResponse(id=request.id, error=JSONRPCError(**reply["error"]))
+        return JSONRPCResponse(id=request.id, result=reply["result"])
+
+    async def shutdown(self) -> None:
+        """Stop all workers after their outstanding requests"""
+        self._stopping = True
+        await asyncio.gather(*self._restarts, return_exceptions=True)
+        workers = self._workers
+        self._workers = []
+        self._started = False
+        await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            "size": self.size,
+            "protocols": sorted(self.protocols),
+            "workers": [
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid,
+                    "alive": worker.alive,
+                    "in_flight": len(worker.pending),
+                    "requests_completed": worker.requests_completed,
+                }
+                for worker in self._workers
+            ],
+            "requests_completed": self.requests_completed,
+            "crashes": self.crashes,
+            "workers_started": self.workers_started,
+        }
+
+    def _pick_worker(self) -> _EngineWorker:
+        best = None
+        for worker in self._workers:
+            if worker.alive and (best is None or len(worker.pending) < len(best.pending)):
+                best = worker
+        if best is None:
+            raise ProviderError("No engine worker is running", code=ErrorCode.PROVIDER_NOT_AVAILABLE)
+        return best
+
+    async def _start_worker(self, index: int) -> _EngineWorker:
+        env = dict(os.environ)
+        # Let workers import whatever the coordinator can (including the factory)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [path for path in sys.path if path and os.path.isdir(path)]
+            + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+        )
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", WORKER_COMMAND,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=env,
+            limit=2 ** 26
+        )
+        worker = _EngineWorker(index, process)
+        self.workers_started += 1
+        try:
+            await worker.send({"type": "init", "factory": self.registry_factory, "kwargs": self.factory_kwargs})
+            ready = await asyncio.wait_for(worker.read_frame(), timeout=self.start_timeout)
+        except BaseException:
+            await worker.kill()
+            raise
+        if ready is None or ready.get("error"):
+            await worker.kill()
+            reason = ready.get("error") if ready else f"exited with code {process.returncode}"
+            raise ConfigurationError(f"Engine worker {index} failed to start: {reason}")
+
+        worker.protocols = set(ready.get("protocols", []))
+        worker.reader_task = asyncio.create_task(self._read_responses(worker))
+        logger.debug(f"Started engine worker {index} pid={process.pid}")
+        return worker
+
+    async def _read_responses(self, worker: _EngineWorker) -> None:
+        while True:
+            message = await worker.read_frame()
+            if message is None:
+                break
+            entry = worker.pending.get(message.get("id"))
+            if entry is None:
+                continue  # cancelled meanwhile
+            future, relay = entry
+            if message["type"] == "chunk":
+                if relay is not None:
+                    relay.put(message["chunk"], message.get("metadata") or {})
+                continue
+            del worker.pending[message["id"]]
+            worker.requests_completed += 1
+            self.requests_completed += 1
+            if not future.done():
+                future.set_result(message)
+
+        await worker.process.wait()
+        self._fail_pending(worker)
+        if not self._stopping:
+            self.crashes += 1
+            logger.warning(f"Engine worker {worker.index} exited with code {worker.process.returncode}")
+            if self.restart_workers:
+                restart = asyncio.create_task(self._replace(worker))
+                self._restarts.add(restart)
+                restart.add_done_callback(self._restarts.discard)
+
+    def _worker_lost(self, worker: _EngineWorker, cause: Optional[Exception] = None) -> ProviderError:
+        return ProviderError(
+            f"Engine worker {worker.index} exited during the request",
+            code=ErrorCode.CONNECTION_LOST,
+            cause=cause
+        )
+
+    def _fail_pending(self, worker: _EngineWorker) -> None:
+        pending = list(worker.pending.values())
+        worker.pending.clear()
+        for future, _ in pending:
+            if not future.done():
+                future.set_exception(self._worker_lost(worker))
+
+    async def _replace(self, worker: _EngineWorker) -> None:
+        try:
+            replacement = await self._start_worker(worker.index)
+        except Exception as e:
+            logger.error(f"Could not restart engine worker {worker.index}: {e}")
+            return
+        if self._stopping:
+            await replacement.stop()
+            return
+        self._workers = [replacement if current is worker else current for current in self._workers]
+
+
+def _error_code(code: Any) -> ErrorCode:
+    try:
+        return ErrorCode(code)
+    except ValueError:
+        return ErrorCode.INTERNAL_ERROR
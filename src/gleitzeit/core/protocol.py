@@ -6,10 +6,11 @@ for JSON-RPC 2.0 compliant protocols.
 """
 
 from typing import Dict, List, Optional, Any, Union
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 from enum import Enum
 import jsonschema
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
 
 
 class ParameterType(str, Enum):
@@ -101,6 +102,9 @@ class MethodSpec(BaseModel):
     examples: List[Dict[str, Any]] = Field(default_factory=list, description="Usage examples")
     deprecated: bool = Field(False, description="Whether method is deprecated")
     
+    # Compiled params validator, built on first use or when the protocol is registered
+    _validator: Optional[Any] = PrivateAttr(default=None)
+    
     @field_validator('name')
     @classmethod
     def validate_method_name(cls, v: str) -> str:
@@ -157,7 +161,22 @@ class MethodSpec(BaseModel):
                     params_dict[param_names[i]] = value
             params = params_dict
         
-        # Build JSON schema for validation
+        # Validate against the compiled schema
+        validator = self._validator or self.compile_validator()
+        error = best_match(validator.iter_errors(params))
+        if error is not None:
+            raise error
+    
+    def compile_validator(self) -> Any:
+        """
+        Build the params JSON schema and compile a validator for it
+        
+        The schema is checked against its metaschema once here instead of
+        on every call. Call again after changing ``params_schema``.
+        
+        Returns:
+            Compiled jsonschema validator
+        """
         schema = {
             "type": "object",
             "properties": {},
@@ -170,8 +189,14 @@ class MethodSpec(BaseModel):
             if param_spec.required:
                 schema["required"].append(param_name)
         
-        # Validate against schema
-        validate(instance=params, schema=schema)
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        self._validator = validator_class(schema)
+        return self._validator
+    
+    def invalidate_validator(self) -> None:
+        """Drop the compiled validator so it is rebuilt on next use"""
+        self._validator = None
     
     def get_param_schema(self, param_name: str) -> Optional[ParameterSpec]:
         """Get schema for a specific parameter"""
@@ -223,6 +248,13 @@ class ProtocolSpec(BaseModel):
         
         method_spec.validate_params(params)
     
+    def compile_validators(self) -> None:
+        """Compile params validators for all methods, replacing cached ones"""
+        for method_spec in self.methods.values():
+            method_spec.invalidate_validator()
+            if method_spec.params_schema:
+                method_spec.compile_validator()
+    
     def list_methods(self) -> List[str]:
         """Get list of all method names"""
         return list(self.methods.keys())
@@ -318,7 +350,9 @@ class ProtocolRegistry:
         self._protocols: Dict[str, ProtocolSpec] = {}
     
     def register(self, protocol: ProtocolSpec) -> None:
-        """Register a protocol specification"""
+        """Register a protocol specification and compile its validators"""
+        # Registering again recompiles, picking up changed method specs
+        protocol.compile_validators()
         self._protocols[protocol.protocol_id] = protocol
     
     def unregister(self, protocol_id: str) -> None:
@@ -359,6 +393,14 @@ class ProtocolRegistry:
             raise ValueError(f"Protocol not found: {protocol_id}")
         
         protocol.validate_method_call(method, params)
+    
+    def is_valid_task(self, protocol_id: str, method: str, params: Union[Dict[str, Any], List[Any]]) -> bool:
+        """Check a task against its protocol specification without raising"""
+        try:
+            self.validate_task(protocol_id, method, params)
+        except (ValueError, ValidationError):
+            return False
+        return True
 
 
 # Global protocol registry instance
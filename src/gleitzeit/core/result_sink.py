@@ -0,0 +1,142 @@
+"""
+Batch Result Sinks for Gleitzeit V4
+
+A result sink receives each file's result as soon as it completes. The
+in-memory sink keeps results in a dict (the original behaviour); the JSONL
+sink appends one line per file and flushes in batches, so memory stays
+flat, a crash only loses the unflushed tail, and the file can be tailed
+while the batch runs.
+"""
+
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResultSink(ABC):
+    """Destination for per-file batch results"""
+
+    @abstractmethod
+    def write(self, file_path: str, result: Dict[str, Any]) -> None:
+        """Record the result of one file"""
+        pass
+
+    @abstractmethod
+    def iter_results(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (file_path, result) pairs in completion order"""
+        pass
+
+    def flush(self) -> None:
+        """Persist buffered results"""
+
+    def close(self) -> None:
+        """Flush and release resources"""
+        self.flush()
+
+    @property
+    def location(self) -> Optional[str]:
+        """Path results are written to, if any"""
+        return None
+
+
+class MemoryResultSink(ResultSink):
+    """Keeps all results in a dict"""
+
+    def __init__(self):
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def write(self, file_path: str, result: Dict[str, Any]) -> None:
+        self.results[file_path] = result
+
+    def iter_results(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return iter(list(self.results.items()))
+
+
+class JSONLResultSink(ResultSink):
+    """
+    Appends results to a JSON Lines file
+
+    Each line is ``{"file": <path>, "status": ..., ...}``. Lines are
+    buffered and written every ``flush_every`` results or ``flush_interval``
+    seconds, whichever comes first.
+    """
+
+    def __init__(self, path: str, flush_every: int = 50, flush_interval: float = 1.0, append: bool = False):
+        """
+        Initialize the JSONL sink
+
+        Args:
+            path: Output file (parent directories are created)
+            flush_every: Buffered results that trigger a write
+            flush_interval: Seconds after which buffered results are written anyway
+            append: Keep existing lines instead of truncating the file
+        """
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self.lines_written = 0
+
+    def write(self, file_path: str, result: Dict[str, Any]) -> None:
+        self._buffer.append(json.dumps({"file": file_path, **result}, default=str) + "\n")
+        if (
+            len(self._buffer) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is None:
+            return
+        if self._buffer:
+            self._file.writelines(self._buffer)
+            self.lines_written += len(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def iter_results(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        self.flush()
+        return read_jsonl_results(self.path)
+
+    @property
+    def location(self) -> Optional[str]:
+        return str(self.path)
+
+
+def read_jsonl_results(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Lazily read (file_path, result) pairs from a JSONL results file
+
+    A truncated last line (e.g. after a crash) is skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed result line {line_number} in {path}")
+                continue
+            file_path = record.pop("file", None)
+            if file_path is not None:
+                yield file_path, record
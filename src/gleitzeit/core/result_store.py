@@ -0,0 +1,272 @@
+"""
+Result Store for Gleitzeit V4
+
+Bounded in-memory cache of task results with LRU/TTL eviction. Results of
+running workflows are pinned; once a workflow finishes its results become
+evictable and are served from the persistence backend after eviction.
+Without a persistence backend nothing is ever evicted.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Set, Any
+
+from gleitzeit.core.models import TaskResult
+from gleitzeit.persistence.base import PersistenceBackend
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore(MutableMapping):
+    """
+    Memory-bounded store for task results
+
+    Behaves like a ``Dict[str, TaskResult]`` for results held in memory.
+    Use ``fetch()`` to read through to the persistence backend for results
+    that have been evicted.
+
+    Results are expected to be written to the persistence backend before
+    they become evictable (the execution engine persists every final
+    result), so eviction only drops the in-memory copy. Without a
+    persistence backend the memory copy is the only one, so the budgets
+    and TTL are not applied.
+    """
+
+    def __init__(
+        self,
+        persistence: Optional[PersistenceBackend] = None,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialize the result store
+
+        Args:
+            persistence: Backend used to read evicted results (None disables eviction)
+            max_entries: Maximum number of results kept in memory (None for unbounded)
+            max_bytes: Approximate memory budget for results (None for unbounded)
+            ttl: Seconds an unpinned result may stay unused in memory
+        """
+        self.persistence = persistence
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # Results of running workflows, never evicted
+        self._pinned: Dict[str, TaskResult] = {}
+        # Evictable results in least-recently-used order
+        self._lru: "OrderedDict[str, TaskResult]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+
+        self._pinned_workflows: Set[str] = set()
+        self._workflow_tasks: Dict[str, Set[str]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Mapping interface
+
+    def __getitem__(self, task_id: str) -> TaskResult:
+        result = self._pinned.get(task_id)
+        if result is not None:
+            return result
+
+        result = self._lru[task_id]
+        if self._is_expired(task_id, time.monotonic()):
+            self._discard(task_id)
+            raise KeyError(task_id)
+
+        self._touch(task_id)
+        return result
+
+    def __setitem__(self, task_id: str, result: TaskResult) -> None:
+        self._discard(task_id)
+
+        workflow_id = result.workflow_id
+        if workflow_id:
+            self._workflow_tasks.setdefault(workflow_id, set()).add(task_id)
+
+        if self.max_bytes is not None:
+            size = self._estimate_size(result)
+            self._sizes[task_id] = size
+            self._total_bytes += size
+
+        if workflow_id in self._pinned_workflows:
+            self._pinned[task_id] = result
+        else:
+            self._lru[task_id] = result
+            self._touch(task_id)
+
+        self._evict()
+
+    def __delitem__(self, task_id: str) -> None:
+        if task_id not in self._pinned and task_id not in self._lru:
+            raise KeyError(task_id)
+        self._discard(task_id)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._pinned or task_id in self._lru
+
+    def __iter__(self) -> Iterator[str]:
+        # Iterate over a snapshot so lookups during iteration can reorder the LRU
+        return iter(list(self._pinned) + list(self._lru))
+
+    def __len__(self) -> int:
+        return len(self._pinned) + len(self._lru)
+
+    # Workflow lifecycle
+
+    def pin_workflow(self, workflow_id: str) -> None:
+        """Keep results of a workflow in memory until it is released"""
+        self._pinned_workflows.add(workflow_id)
+        for task_id in self._workflow_tasks.get(workflow_id, ()):
+            result = self._lru.pop(task_id, None)
+            if result is not None:
+                self._last_used.pop(task_id, None)
+                self._pinned[task_id] = result
+
+    def release_workflow(self, workflow_id: str) -> None:
+        """Make results of a finished workflow evictable"""
+        self._pinned_workflows.discard(workflow_id)
+        for task_id in self._workflow_tasks.pop(workflow_id, ()):
+            result = self._pinned.pop(task_id, None)
+            if result is not None:
+                self._lru[task_id] = result
+                self._touch(task_id)
+        self._evict()
+
+    def workflow_results(self, workflow_id: str) -> List[TaskResult]:
+        """Get in-memory results of a workflow"""
+        task_ids = self._workflow_tasks.get(workflow_id)
+        if task_ids is not None:
+            return [self[task_id] for task_id in task_ids if task_id in self]
+        # Released workflows are no longer indexed
+        return [result for result in list(self._lru.values()) if result.workflow_id == workflow_id]
+
+    async def fetch(self, task_id: str) -> Optional[TaskResult]:
+        """
+        Get a result, reading through to persistence if it was evicted
+
+        Args:
+            task_id: Task identifier
+
+        Returns:
+            Task result or None if it is unknown
+        """
+        result = self.get(task_id)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        if self.persistence is None:
+            return None
+
+        result = await self.persistence.get_task_result(task_id)
+        if result is not None and task_id not in self:
+            self[task_id] = result
+        return result
+
+    async def fetch_many(self, task_ids: List[str]) -> Dict[str, TaskResult]:
+        """
+        Get several results, loading evicted ones with one batch lookup
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            Results keyed by task ID; unknown tasks are omitted
+        """
+        results: Dict[str, TaskResult] = {}
+        missing = []
+        for task_id in task_ids:
+            result = self.get(task_id)
+            if result is not None:
+                results[task_id] = result
+            else:
+                missing.append(task_id)
+
+        self.hits += len(results)
+        self.misses += len(missing)
+        if missing and self.persistence is not None:
+            loaded = await self.persistence.get_task_results_batch(missing)
+            for task_id, result in loaded.items():
+                if task_id not in self:
+                    self[task_id] = result
+                results[task_id] = result
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics for monitoring"""
+        return {
+            "cached_results": len(self),
+            "pinned_results": len(self._pinned),
+            "pinned_workflows": len(self._pinned_workflows),
+            "approximate_bytes": self._total_bytes if self.max_bytes is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    # Internals
+
+    def _touch(self, task_id: str) -> None:
+        self._lru.move_to_end(task_id)
+        if self.ttl is not None:
+            self._last_used[task_id] = time.monotonic()
+
+    def _is_expired(self, task_id: str, now: float) -> bool:
+        if self.ttl is None or self.persistence is None:
+            return False
+        return now - self._last_used.get(task_id, now) > self.ttl
+
+    def _discard(self, task_id: str) -> Optional[TaskResult]:
+        result = self._pinned.pop(task_id, None)
+        if result is None:
+            result = self._lru.pop(task_id, None)
+        self._last_used.pop(task_id, None)
+        self._total_bytes -= self._sizes.pop(task_id, 0)
+
+        if result is not None and result.workflow_id in self._workflow_tasks:
+            task_ids = self._workflow_tasks[result.workflow_id]
+            task_ids.discard(task_id)
+            if not task_ids and result.workflow_id not in self._pinned_workflows:
+                del self._workflow_tasks[result.workflow_id]
+        return result
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self) > self.max_entries:
+            return True
+        if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+            return True
+        return False
+
+    def _evict(self) -> None:
+        """Drop expired and least-recently-used unpinned results"""
+        if self.persistence is None:
+            # Evicted results could never be read back
+            return
+        now = time.monotonic()
+        while self._lru:
+            oldest = next(iter(self._lru))
+            if not (self._over_budget() or self._is_expired(oldest, now)):
+                break
+            self._discard(oldest)
+            self.evictions += 1
+            logger.debug(f"Evicted result for task {oldest} from memory")
+
+    @staticmethod
+    def _estimate_size(result: TaskResult) -> int:
+        """Rough size of a result in bytes"""
+        size = 256  # Fixed overhead for the model and its metadata
+        if result.result is not None:
+            size += len(str(result.result))
+        if result.error:
+            size += len(result.error)
+        return size
@@ -197,6 +197,10 @@ class RetryManager:
         
         return False
     
+    def pending_count(self) -> int:
+        """Get number of tasks waiting for a scheduled retry"""
+        return len(self._retry_tasks)
+    
     async def get_retry_stats(self) -> Dict[str, int]:
         """Get retry statistics"""
         async with self._lock:
@@ -259,6 +263,14 @@ class RetryManager:
         logger.debug(f"Incremented retry count for task {task_id} to {current_attempt}")
         return current_attempt
     
+    def forget_tasks(self, task_ids: List[str]) -> None:
+        """Drop attempt counters for tasks that will not run again"""
+        if not hasattr(self, '_task_attempts'):
+            return
+        
+        for task_id in task_ids:
+            self._task_attempts.pop(task_id, None)
+    
     async def get_task_retry_info(self, task_id: str) -> Dict[str, int]:
         """Get retry information for a task"""
         if not hasattr(self, '_task_attempts'):
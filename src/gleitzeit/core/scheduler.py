@@ -15,6 +15,9 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Rebuild the heap once cancelled entries outnumber live ones (and at least this many)
+COMPACTION_THRESHOLD = 64
+
 
 class ScheduledEventType(str, Enum):
     """Types of events that can be scheduled"""
@@ -44,6 +47,11 @@ class EventScheduler:
     Instead of running separate background processes, this scheduler
     emits events through the main event coordination system when
     their scheduled time arrives.
+    
+    The scheduler loop sleeps until the earliest scheduled event and is
+    woken early when an earlier event is scheduled or the head is
+    cancelled. Cancelled events stay in the heap until they reach the
+    head or until the heap is compacted.
     """
     
     def __init__(self, emit_callback: Callable[[str, Dict[str, Any]], Any]):
@@ -60,6 +68,8 @@ class EventScheduler:
         self._running = False
         self._scheduler_task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._cancelled_entries = 0
         
         logger.info("Initialized EventScheduler")
     
@@ -116,8 +126,14 @@ class EventScheduler:
         )
         
         async with self._lock:
+            if event_id in self._event_lookup:
+                # Rescheduling replaces the pending event with the same ID
+                self._cancelled_entries += 1
             heapq.heappush(self._scheduled_events, event)
             self._event_lookup[event_id] = event
+            
+            if self._scheduled_events[0] is event:
+                self._wakeup.set()
         
         logger.debug(f"Scheduled {event_type} event {event_id} for {scheduled_at}")
         return event_id
@@ -133,13 +149,32 @@ class EventScheduler:
             True if event was cancelled, False if not found
         """
         async with self._lock:
-            if event_id in self._event_lookup:
-                # Remove from lookup (heap entry will be ignored)
-                del self._event_lookup[event_id]
-                logger.debug(f"Cancelled scheduled event: {event_id}")
-                return True
+            event = self._event_lookup.pop(event_id, None)
+            if event is None:
+                return False
+            
+            # Heap entry is skipped when it reaches the head or compacted away
+            self._cancelled_entries += 1
+            if self._scheduled_events and self._scheduled_events[0] is event:
+                self._wakeup.set()
+            self._maybe_compact()
         
-        return False
+        logger.debug(f"Cancelled scheduled event: {event_id}")
+        return True
+    
+    def _is_active(self, event: ScheduledEvent) -> bool:
+        """Check whether a heap entry is still the pending event for its ID"""
+        return self._event_lookup.get(event.event_id) is event
+    
+    def _maybe_compact(self) -> None:
+        """Drop cancelled entries once they make up most of the heap"""
+        if (self._cancelled_entries < COMPACTION_THRESHOLD or
+                self._cancelled_entries * 2 < len(self._scheduled_events)):
+            return
+        
+        self._scheduled_events = [e for e in self._scheduled_events if self._is_active(e)]
+        heapq.heapify(self._scheduled_events)
+        self._cancelled_entries = 0
     
     async def schedule_task_retry(self, 
                                 task_id: str,
@@ -180,7 +215,7 @@ class EventScheduler:
         async with self._lock:
             pending = []
             for event in self._scheduled_events:
-                if event.event_id in self._event_lookup:
+                if self._is_active(event):
                     pending.append({
                         "event_id": event.event_id,
                         "event_type": event.event_type,
@@ -190,6 +225,10 @@ class EventScheduler:
             
             return sorted(pending, key=lambda x: x["scheduled_at"])
     
+    def active_count(self) -> int:
+        """Get number of scheduled events that have not fired or been cancelled"""
+        return len(self._event_lookup)
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Get scheduler statistics"""
         async with self._lock:
@@ -199,13 +238,14 @@ class EventScheduler:
             # Count by event type
             type_counts = {}
             for event in self._scheduled_events:
-                if event.event_id in self._event_lookup:
+                if self._is_active(event):
                     event_type = event.event_type
                     type_counts[event_type] = type_counts.get(event_type, 0) + 1
             
             return {
                 "total_scheduled": total_scheduled,
                 "active_events": active_events,
+                "cancelled_entries": self._cancelled_entries,
                 "type_breakdown": type_counts,
                 "running": self._running
             }
@@ -214,8 +254,15 @@ class EventScheduler:
         """Main scheduler loop that processes due events"""
         while self._running:
             try:
+                # Clear before processing so events scheduled meanwhile wake us again
+                self._wakeup.clear()
                 await self._process_due_events()
-                await asyncio.sleep(0.01)  # Check every 10ms for better precision
+                
+                # Sleep until the earliest event is due or the head changes
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._time_until_next_event())
+                except asyncio.TimeoutError:
+                    pass
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}")
                 await asyncio.sleep(0.1)  # Shorter sleep on error
@@ -228,13 +275,14 @@ class EventScheduler:
         async with self._lock:
             # Find all due events
             while self._scheduled_events:
-                if self._scheduled_events[0].scheduled_at <= now:
-                    event = heapq.heappop(self._scheduled_events)
-                    
-                    # Only process if event hasn't been cancelled
-                    if event.event_id in self._event_lookup:
-                        due_events.append(event)
-                        del self._event_lookup[event.event_id]
+                head = self._scheduled_events[0]
+                if not self._is_active(head):
+                    # Lazily drop cancelled entries that reached the head
+                    heapq.heappop(self._scheduled_events)
+                    self._cancelled_entries = max(0, self._cancelled_entries - 1)
+                elif head.scheduled_at <= now:
+                    due_events.append(heapq.heappop(self._scheduled_events))
+                    del self._event_lookup[head.event_id]
                 else:
                     break
         
@@ -246,6 +294,13 @@ class EventScheduler:
                 logger.error(f"Failed to emit scheduled event {event.event_id}: {e}")
                 # Continue processing other events even if one fails
     
+    def _time_until_next_event(self) -> Optional[float]:
+        """Seconds until the earliest event is due, or None if nothing is scheduled"""
+        if not self._scheduled_events:
+            return None
+        delay = (self._scheduled_events[0].scheduled_at - datetime.utcnow()).total_seconds()
+        return max(0.0, delay)
+    
     async def _emit_scheduled_event(self, event: ScheduledEvent) -> None:
         """Emit a scheduled event through the callback"""
         logger.debug(f"Emitting scheduled event: {event.event_type} ({event.event_id})")
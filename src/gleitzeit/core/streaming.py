@@ -0,0 +1,62 @@
+"""
+Partial output streaming for Gleitzeit V4
+
+Providers that produce output incrementally (e.g. LLM tokens) report each
+chunk with ``emit_partial_output``. The execution engine installs a handler
+for the task it is executing, so chunks become ``task:partial_output``
+events without providers knowing about the engine.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+PartialOutputHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+_partial_output_handler: ContextVar[Optional[PartialOutputHandler]] = ContextVar(
+    "gleitzeit_partial_output_handler", default=None
+)
+
+
+@contextmanager
+def partial_output_handler(handler: Optional[PartialOutputHandler]) -> Iterator[None]:
+    """
+    Route partial output emitted in this context to a handler
+
+    Args:
+        handler: Async callable receiving (chunk, metadata)
+    """
+    token = _partial_output_handler.set(handler)
+    try:
+        yield
+    finally:
+        _partial_output_handler.reset(token)
+
+
+def get_partial_output_handler() -> Optional[PartialOutputHandler]:
+    """The handler installed for the current context, if any"""
+    return _partial_output_handler.get()
+
+
+async def emit_partial_output(chunk: str, **metadata: Any) -> None:
+    """
+    Report a chunk of output for the task currently being executed
+
+    Does nothing when no handler is installed. Handler errors are logged
+    and never interrupt the provider.
+
+    Args:
+        chunk: Newly produced output
+        **metadata: Extra fields included with the event (e.g. model)
+    """
+    handler = _partial_output_handler.get()
+    if handler is None:
+        return
+
+    try:
+        await handler(chunk, metadata)
+    except Exception as e:
+        logger.error(f"Partial output handler failed: {e}")
@@ -0,0 +1,96 @@
+"""
+Worker IPC for Gleitzeit V4
+
+Shared by the engine worker pool (process_worker_pool.py and
+process_worker.py) and the Python worker pool (python_worker_pool.py and
+python_worker.py):
+
+- Length-prefixed JSON frames on a worker's stdin/stdout
+- Reserving the worker's original stdout for frames
+- Stopping and killing a worker process
+
+Only the standard library is used: python_worker.py runs as a plain
+script without gleitzeit on its path and loads this file directly.
+"""
+
+import asyncio
+import json
+import os
+import struct
+import sys
+from typing import Any, BinaryIO, Dict, Optional
+
+HEADER = struct.Struct(">I")
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Encode one frame; values JSON cannot represent are sent as strings"""
+    payload = json.dumps(message, default=str).encode("utf-8")
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Read one frame, or None at end of input"""
+    try:
+        header = await reader.readexactly(HEADER.size)
+        (length,) = HEADER.unpack(header)
+        return json.loads(await reader.readexactly(length))
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        return None
+
+
+def read_frame_blocking(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read one frame from a blocking stream, or None at end of input"""
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    (length,) = HEADER.unpack(header)
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_frame_blocking(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    """Write one frame to a blocking stream"""
+    stream.write(encode_frame(message))
+    stream.flush()
+
+
+def reserve_stdout() -> BinaryIO:
+    """
+    Take over the process's stdout for frames (call once, in the worker)
+
+    Returns:
+        Binary stream writing to the original stdout
+    """
+    # Keep the real stdout for frames; stray fd-level writes go to stderr
+    channel_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return channel_out
+
+
+class WorkerProcess:
+    """A worker subprocess talking frames over its stdin/stdout"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def stop(self, grace_period: float = 5.0) -> None:
+        """Close the channel so the worker exits, killing it if it does not"""
+        if self.alive:
+            try:
+                self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), timeout=grace_period)
+            except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError):
+                await self.kill()
+
+    async def kill(self) -> None:
+        """Terminate the worker immediately"""
+        if self.alive:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+        await self.process.wait()
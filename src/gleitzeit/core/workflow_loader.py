@@ -9,13 +9,13 @@ across CLI, tests, and other parts of the system.
 import yaml
 import json
 import logging
-import glob
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from uuid import uuid4
 
 from gleitzeit.core.models import Task, Workflow, Priority, RetryConfig
 from gleitzeit.core.errors import WorkflowValidationError, ConfigurationError
+from gleitzeit.core.file_scanner import iter_files
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +52,7 @@ def load_workflow_from_dict(data: Dict[str, Any]) -> Workflow:
     - Retry configuration
     - Priority parsing
     - Batch workflows with dynamic file discovery
+    - Response cache opt-in (``cache_responses: true``) for LLM tasks
     """
     # Check if this is a batch workflow
     if data.get('type') == 'batch' or 'batch' in data:
@@ -98,9 +99,25 @@ def load_workflow_from_dict(data: Dict[str, Any]) -> Workflow:
     if 'providers' in data:
         workflow.metadata['required_providers'] = data['providers']
     
+    if data.get('cache_responses'):
+        apply_response_cache_opt_in(workflow)
+    
     return workflow
 
 
+def apply_response_cache_opt_in(workflow: Workflow) -> None:
+    """
+    Opt all LLM tasks of a workflow into the provider response cache.
+    
+    Tasks that set ``cache`` explicitly keep their own setting, so single
+    tasks can still opt out with ``cache: false``.
+    """
+    workflow.metadata['cache_responses'] = True
+    for task in workflow.tasks:
+        if task.protocol.startswith('llm/'):
+            task.params.setdefault('cache', True)
+
+
 def create_task_from_dict(data: Dict[str, Any], workflow_id: str, 
                           resolve_dependencies: bool = True) -> Task:
     """
@@ -202,20 +219,8 @@ def create_batch_workflow_from_dict(data: Dict[str, Any]) -> Workflow:
             validation_errors=["Batch workflow requires 'template' section to define task parameters"]
         )
     
-    # Discover files
-    dir_path = Path(directory)
-    if not dir_path.exists():
-        raise ConfigurationError(f"Directory not found: {directory}")
-    
-    if not dir_path.is_dir():
-        raise ConfigurationError(f"Not a directory: {directory}")
-    
-    # Use glob to find matching files
-    file_pattern = str(dir_path / pattern)
-    files = glob.glob(file_pattern)
-    
-    # Filter out directories
-    files = [f for f in files if Path(f).is_file()]
+    # Discover files (scandir entries know their type, no stat per file)
+    files = list(iter_files(directory, pattern))
     
     if not files:
         logger.warning(f"No files found matching '{pattern}' in {directory}")
@@ -246,10 +251,8 @@ def create_batch_workflow_from_dict(data: Dict[str, Any]) -> Workflow:
         # Add file path based on protocol/method
         protocol = data.get('protocol', 'llm/v1')
         if protocol == 'python/v1':
-            # For Python, file path goes in context
-            if 'context' not in params:
-                params['context'] = {}
-            params['context']['file_path'] = file_path
+            # For Python, file path goes in context (copied, the template's is shared)
+            params['context'] = {**params.get('context', {}), 'file_path': file_path}
         elif is_image and template.get('method') == 'llm/vision':
             params['image_path'] = file_path
         else:
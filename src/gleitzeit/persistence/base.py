@@ -26,6 +26,10 @@ class PersistenceBackend(ABC):
         """Shutdown the persistence backend"""
         pass
     
+    async def flush(self) -> None:
+        """Make buffered writes durable (no-op for backends that write through)"""
+        pass
+    
     # Task operations
     @abstractmethod
     async def save_task(self, task: Task) -> None:
@@ -63,6 +67,15 @@ class PersistenceBackend(ABC):
         """Get task result by task ID"""
         pass
     
+    async def get_task_results_batch(self, task_ids: List[str]) -> Dict[str, TaskResult]:
+        """Get results for many tasks; missing results are omitted"""
+        results = {}
+        for task_id in task_ids:
+            result = await self.get_task_result(task_id)
+            if result is not None:
+                results[task_id] = result
+        return results
+    
     # Workflow operations
     @abstractmethod
     async def save_workflow(self, workflow: Workflow) -> None:
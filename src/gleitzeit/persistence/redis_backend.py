@@ -8,12 +8,12 @@ Ideal for multi-node deployments and real-time coordination.
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
 import redis.asyncio as redis
 
 from gleitzeit.persistence.base import PersistenceBackend
-from gleitzeit.core.models import Task, Workflow, TaskResult, WorkflowExecution
+from gleitzeit.core.models import Task, TaskStatus, Workflow, TaskResult, WorkflowExecution
 from gleitzeit.core.errors import (
     ErrorCode, PersistenceError, PersistenceConnectionError,
     SystemError
@@ -21,6 +21,90 @@ from gleitzeit.core.errors import (
 
 logger = logging.getLogger(__name__)
 
+FINISHED_TASK_TTL = int(timedelta(days=7).total_seconds())
+TASK_RESULT_TTL = int(timedelta(days=30).total_seconds())
+
+# Keys per pipeline round trip for bulk reads
+BULK_READ_CHUNK_SIZE = 1000
+
+# Keys per batch for SCAN cursors and cleanup UNLINKs
+SCAN_BATCH_SIZE = 500
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+def _utc_timestamp(value: datetime) -> float:
+    """POSIX timestamp of a datetime; naive values are UTC (as datetime.utcnow())"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+# Every status a task can be indexed under; their index sets are declared
+# as script KEYS so the script only touches keys it was given
+TASK_STATUSES = tuple(status.value for status in TaskStatus)
+
+# Save a task and move it between status indexes in one atomic round trip.
+# The previous status is read from the task hash ('status' field, or the
+# JSON data for tasks written before the field existed). Finished tasks are
+# indexed by completion time so cleanup never has to scan every task.
+#
+# KEYS[1]: task hash, KEYS[2]: completion time index,
+# KEYS[3..2+n]: status index sets, in TASK_STATUSES order (n = #TASK_STATUSES),
+# KEYS[3+n]: workflow task set (only if the task has a workflow)
+# ARGV[1]: task JSON, ARGV[2]: new status, ARGV[3]: number of status keys (n),
+# ARGV[4]: task ID, ARGV[5]: TTL in seconds (0 for none), ARGV[6]: events channel,
+# ARGV[7]: task created event JSON, ARGV[8]: status changed event JSON,
+# ARGV[9]: completion timestamp ('' while the task is not finished),
+# ARGV[10]: workflow ID ('' for none), ARGV[11..10+n]: status names for the status keys
+SAVE_TASK_SCRIPT = """
+local status_count = tonumber(ARGV[3])
+local status_keys = {}
+for i = 1, status_count do
+    status_keys[ARGV[10 + i]] = KEYS[2 + i]
+end
+
+local old_status = redis.call('HGET', KEYS[1], 'status')
+if not old_status then
+    local data = redis.call('HGET', KEYS[1], 'data')
+    if data then
+        old_status = cjson.decode(data)['status']
+    end
+end
+
+redis.call('HSET', KEYS[1], 'data', ARGV[1], 'status', ARGV[2], 'workflow_id', ARGV[10])
+
+if old_status and old_status ~= ARGV[2] and status_keys[old_status] then
+    redis.call('SREM', status_keys[old_status], ARGV[4])
+end
+if status_keys[ARGV[2]] then
+    redis.call('SADD', status_keys[ARGV[2]], ARGV[4])
+end
+
+if #KEYS > 2 + status_count then
+    redis.call('SADD', KEYS[3 + status_count], ARGV[4])
+end
+
+if ARGV[9] ~= '' then
+    redis.call('ZADD', KEYS[2], ARGV[9], ARGV[4])
+else
+    redis.call('ZREM', KEYS[2], ARGV[4])
+end
+
+if tonumber(ARGV[5]) > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+end
+
+if not old_status then
+    redis.call('PUBLISH', ARGV[6], ARGV[7])
+elseif old_status ~= ARGV[2] then
+    local event = cjson.decode(ARGV[8])
+    event['old_status'] = old_status
+    redis.call('PUBLISH', ARGV[6], cjson.encode(event))
+end
+
+return old_status
+"""
+
 
 class RedisBackend(PersistenceBackend):
     """Redis-based persistence backend with pub/sub support"""
@@ -30,14 +114,29 @@ class RedisBackend(PersistenceBackend):
                  port: int = 6379, 
                  db: int = 0,
                  password: Optional[str] = None,
-                 key_prefix: str = "gleitzeit:"):
+                 key_prefix: str = "gleitzeit:",
+                 redis_client: Optional[redis.Redis] = None):
+        """
+        Initialize the Redis backend
+        
+        Args:
+            host: Redis host
+            port: Redis port
+            db: Redis database number
+            password: Optional Redis password
+            key_prefix: Prefix for all keys written by the backend
+            redis_client: Pre-configured client (decode_responses=True) to use
+                instead of connecting to host/port
+        """
         self.host = host
         self.port = port
         self.db = db
         self.password = password
         self.key_prefix = key_prefix
-        self.redis_client: Optional[redis.Redis] = None
+        self.redis_client: Optional[redis.Redis] = redis_client
         self._initialized = False
+        self._save_task_script = None
+        self._completion_index_backfilled = False
     
     def _key(self, suffix: str) -> str:
         """Generate prefixed Redis key"""
@@ -48,13 +147,16 @@ class RedisBackend(PersistenceBackend):
         if self._initialized:
             return
         
-        self.redis_client = redis.Redis(
-            host=self.host,
-            port=self.port,
-            db=self.db,
-            password=self.password,
-            decode_responses=True
-        )
+        if self.redis_client is None:
+            self.redis_client = redis.Redis(
+                host=self.host,
+                port=self.port,
+                db=self.db,
+                password=self.password,
+                decode_responses=True
+            )
+        
+        self._save_task_script = self.redis_client.register_script(SAVE_TASK_SCRIPT)
         
         # Test connection
         try:
@@ -78,10 +180,12 @@ class RedisBackend(PersistenceBackend):
     
     # Task operations
     async def save_task(self, task: Task) -> None:
-        """Save or update a task"""
-        # Get existing task to handle status changes
-        existing_task = await self.get_task(task.id)
-        
+        """Save or update a task in a single atomic round trip"""
+        keys, args = self._save_task_call(task)
+        await self._save_task_script(keys=keys, args=args)
+    
+    def _save_task_call(self, task: Task) -> Tuple[List[str], List[Any]]:
+        """Build keys and arguments for the save task script"""
         task_data = task.dict()
         
         # Convert datetime objects to ISO strings
@@ -89,70 +193,56 @@ class RedisBackend(PersistenceBackend):
             if task_data.get(field):
                 task_data[field] = task_data[field].isoformat()
         
-        # Save task data
-        await self.redis_client.hset(
-            self._key(f"task:{task.id}"),
-            mapping={"data": json.dumps(task_data)}
-        )
-        
-        # Handle status index updates with event-driven approach
         current_status = task.status.value if hasattr(task.status, 'value') else str(task.status)
+        timestamp = datetime.utcnow().isoformat()
+        
+        # New task created
+        created_event = {
+            "event_type": "task:created",
+            "task_id": task.id,
+            "timestamp": timestamp,
+            "status": current_status,
+            "workflow_id": task.workflow_id,
+            "protocol": task.protocol,
+            "method": task.method,
+            "priority": str(task.priority),
+            "event_source": "persistence"
+        }
+        # Status transition; old_status is filled in by the script
+        status_changed_event = {
+            "event_type": "task:status_changed",
+            "task_id": task.id,
+            "timestamp": timestamp,
+            "new_status": current_status,
+            "workflow_id": task.workflow_id,
+            "retry_attempt": getattr(task, 'attempt_count', 0),
+            "event_source": "persistence"
+        }
         
-        if existing_task and str(existing_task.status) != str(task.status):
-            # Remove from old status index
-            old_status = existing_task.status.value if hasattr(existing_task.status, 'value') else str(existing_task.status)
-            await self.redis_client.srem(
-                self._key(f"tasks:status:{old_status}"),
-                task.id
-            )
-        
-        # Add to current status index
-        await self.redis_client.sadd(
-            self._key(f"tasks:status:{current_status}"),
-            task.id
-        )
+        completed_at = ""
+        if current_status in FINISHED_STATUSES:
+            completed_at = _utc_timestamp(task.completed_at or datetime.utcnow())
         
-        # Add to workflow index if applicable
+        keys = [self._key(f"task:{task.id}"), self._key("tasks:completed_at")]
+        keys.extend(self._key(f"tasks:status:{status}") for status in TASK_STATUSES)
         if task.workflow_id:
-            await self.redis_client.sadd(
-                self._key(f"workflow:{task.workflow_id}:tasks"),
-                task.id
-            )
-        
-        # Set TTL for completed/failed tasks (optional cleanup)
-        if current_status in ["completed", "failed"]:
-            await self.redis_client.expire(
-                self._key(f"task:{task.id}"),
-                int(timedelta(days=7).total_seconds())  # Keep for 7 days
-            )
-        
-        # Publish task state change event for event-driven coordination
-        if existing_task and str(existing_task.status) != str(task.status):
-            await self.publish_task_event(
-                f"task:status_changed",
-                task.id,
-                {
-                    "old_status": str(existing_task.status),
-                    "new_status": current_status,
-                    "workflow_id": task.workflow_id,
-                    "retry_attempt": getattr(task, 'attempt_count', 0),
-                    "event_source": "persistence"
-                }
-            )
-        elif not existing_task:
-            # New task created
-            await self.publish_task_event(
-                f"task:created", 
-                task.id,
-                {
-                    "status": current_status,
-                    "workflow_id": task.workflow_id,
-                    "protocol": task.protocol,
-                    "method": task.method,
-                    "priority": str(task.priority),
-                    "event_source": "persistence"
-                }
-            )
+            keys.append(self._key(f"workflow:{task.workflow_id}:tasks"))
+        
+        args = [
+            json.dumps(task_data),
+            current_status,
+            len(TASK_STATUSES),
+            task.id,
+            # Set TTL for completed/failed tasks (optional cleanup)
+            FINISHED_TASK_TTL if current_status in FINISHED_STATUSES else 0,
+            self._key("events:tasks"),
+            json.dumps(created_event),
+            json.dumps(status_changed_event),
+            completed_at,
+            task.workflow_id or "",
+            *TASK_STATUSES
+        ]
+        return keys, args
     
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID"""
@@ -173,36 +263,29 @@ class RedisBackend(PersistenceBackend):
         if not task:
             return False
         
+        pipe = self.redis_client.pipeline(transaction=True)
+        
         # Remove from status index
         status_key = task.status.value if hasattr(task.status, 'value') else str(task.status)
-        await self.redis_client.srem(
-            self._key(f"tasks:status:{status_key}"),
-            task_id
-        )
+        pipe.srem(self._key(f"tasks:status:{status_key}"), task_id)
         
         # Remove from workflow index
         if task.workflow_id:
-            await self.redis_client.srem(
-                self._key(f"workflow:{task.workflow_id}:tasks"),
-                task_id
-            )
+            pipe.srem(self._key(f"workflow:{task.workflow_id}:tasks"), task_id)
+        
+        pipe.zrem(self._key("tasks:completed_at"), task_id)
         
         # Delete task data
-        result = await self.redis_client.delete(self._key(f"task:{task_id}"))
-        return result > 0
+        pipe.delete(self._key(f"task:{task_id}"))
+        results = await pipe.execute()
+        return results[-1] > 0
     
     async def get_tasks_by_status(self, status: str) -> List[Task]:
         """Get all tasks with a specific status"""
         task_ids = await self.redis_client.smembers(
             self._key(f"tasks:status:{status}")
         )
-        
-        tasks = []
-        for task_id in task_ids:
-            task = await self.get_task(task_id)
-            if task:
-                tasks.append(task)
-        
+        tasks = await self.get_tasks_batch(task_ids)
         return sorted(tasks, key=lambda t: t.created_at)
     
     async def get_tasks_by_workflow(self, workflow_id: str) -> List[Task]:
@@ -210,15 +293,36 @@ class RedisBackend(PersistenceBackend):
         task_ids = await self.redis_client.smembers(
             self._key(f"workflow:{workflow_id}:tasks")
         )
-        
-        tasks = []
-        for task_id in task_ids:
-            task = await self.get_task(task_id)
-            if task:
-                tasks.append(task)
-        
+        tasks = await self.get_tasks_batch(task_ids)
         return sorted(tasks, key=lambda t: t.created_at)
     
+    async def get_tasks_batch(self, task_ids: Iterable[str]) -> List[Task]:
+        """Get many tasks with pipelined reads; missing tasks are skipped"""
+        values = await self._hget_many(
+            [self._key(f"task:{task_id}") for task_id in task_ids], "data"
+        )
+        return [self._dict_to_task(json.loads(data)) for data in values if data]
+    
+    async def _hmget_many(self, keys: List[str], fields: List[str]) -> List[List[Optional[str]]]:
+        """Read several fields from many hashes, one pipeline round trip per chunk"""
+        values: List[List[Optional[str]]] = []
+        for start in range(0, len(keys), BULK_READ_CHUNK_SIZE):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys[start:start + BULK_READ_CHUNK_SIZE]:
+                pipe.hmget(key, fields)
+            values.extend(await pipe.execute())
+        return values
+    
+    async def _hget_many(self, keys: List[str], field: str) -> List[Optional[str]]:
+        """Read one field from many hashes, one pipeline round trip per chunk"""
+        values: List[Optional[str]] = []
+        for start in range(0, len(keys), BULK_READ_CHUNK_SIZE):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys[start:start + BULK_READ_CHUNK_SIZE]:
+                pipe.hget(key, field)
+            values.extend(await pipe.execute())
+        return values
+    
     def _dict_to_task(self, task_data: Dict[str, Any]) -> Task:
         """Convert dict to Task object"""
         from gleitzeit.core.models import RetryConfig
@@ -244,16 +348,15 @@ class RedisBackend(PersistenceBackend):
         if result_data.get('completed_at'):
             result_data['completed_at'] = result_data['completed_at'].isoformat()
         
-        await self.redis_client.hset(
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.hset(
             self._key(f"result:{task_result.task_id}"),
             mapping={"data": json.dumps(result_data)}
         )
         
-        # Set TTL for cleanup
-        await self.redis_client.expire(
-            self._key(f"result:{task_result.task_id}"),
-            int(timedelta(days=30).total_seconds())  # Keep results longer
-        )
+        # Set TTL for cleanup (keep results longer than tasks)
+        pipe.expire(self._key(f"result:{task_result.task_id}"), TASK_RESULT_TTL)
+        await pipe.execute()
     
     async def get_task_result(self, task_id: str) -> Optional[TaskResult]:
         """Get task result by task ID"""
@@ -264,6 +367,21 @@ class RedisBackend(PersistenceBackend):
         if not data:
             return None
         
+        return self._json_to_task_result(data)
+    
+    async def get_task_results_batch(self, task_ids: List[str]) -> Dict[str, TaskResult]:
+        """Get results for many tasks with pipelined reads"""
+        task_ids = list(task_ids)
+        values = await self._hget_many(
+            [self._key(f"result:{task_id}") for task_id in task_ids], "data"
+        )
+        return {
+            task_id: self._json_to_task_result(data)
+            for task_id, data in zip(task_ids, values) if data
+        }
+    
+    def _json_to_task_result(self, data: str) -> TaskResult:
+        """Convert stored JSON to TaskResult object"""
         result_data = json.loads(data)
         # Convert ISO format strings back to datetime objects
         if result_data.get('started_at'):
@@ -359,78 +477,160 @@ class RedisBackend(PersistenceBackend):
         if not tasks:
             return
         
-        pipe = self.redis_client.pipeline()
-        
+        # Each save stays atomic; the pipeline sends them in one round trip
+        pipe = self.redis_client.pipeline(transaction=False)
         for task in tasks:
-            task_data = task.dict()
-            
-            # Convert datetime objects
-            for field in ['created_at', 'started_at', 'completed_at']:
-                if task_data.get(field):
-                    task_data[field] = task_data[field].isoformat()
-            
-            # Save task
-            pipe.hset(
-                self._key(f"task:{task.id}"),
-                mapping={"data": json.dumps(task_data)}
-            )
-            
-            # Add to status index
-            pipe.sadd(self._key(f"tasks:status:{task.status.value}"), task.id)
-            
-            # Add to workflow index
-            if task.workflow_id:
-                pipe.sadd(
-                    self._key(f"workflow:{task.workflow_id}:tasks"),
-                    task.id
-                )
+            keys, args = self._save_task_call(task)
+            await self._save_task_script(keys=keys, args=args, client=pipe)
         
         await pipe.execute()
     
     async def get_all_queued_tasks(self) -> List[Task]:
         """Get all tasks that should be in queues on startup"""
         statuses = ["queued", "retry_pending", "executing"]
-        all_tasks = []
         
+        pipe = self.redis_client.pipeline(transaction=False)
         for status in statuses:
-            tasks = await self.get_tasks_by_status(status)
-            all_tasks.extend(tasks)
+            pipe.smembers(self._key(f"tasks:status:{status}"))
+        task_ids = set().union(*await pipe.execute())
         
+        all_tasks = await self.get_tasks_batch(task_ids)
         return sorted(all_tasks, key=lambda t: t.created_at)
     
     # Statistics
     async def get_task_count_by_status(self) -> Dict[str, int]:
         """Get count of tasks by status"""
-        counts = {}
-        
-        # Get all status keys
-        status_keys = await self.redis_client.keys(self._key("tasks:status:*"))
+        # SCAN walks the keyspace incrementally instead of blocking the
+        # server the way KEYS does on large shared instances
+        prefix = self._key("tasks:status:")
+        status_keys = [
+            key async for key in self.redis_client.scan_iter(
+                match=f"{prefix}*", count=SCAN_BATCH_SIZE
+            )
+        ]
         
+        pipe = self.redis_client.pipeline(transaction=False)
         for key in status_keys:
-            status = key.split(":")[-1]  # Extract status from key
-            count = await self.redis_client.scard(key)
-            counts[status] = count
+            pipe.scard(key)
+        counts = await pipe.execute() if status_keys else []
         
-        return counts
+        return {
+            key[len(prefix):]: count
+            for key, count in zip(status_keys, counts)
+        }
     
-    async def cleanup_old_data(self, cutoff_date: datetime) -> int:
-        """Remove old completed tasks and results before cutoff date"""
+    async def cleanup_old_data(
+        self,
+        cutoff_date: datetime,
+        batch_size: int = SCAN_BATCH_SIZE,
+        progress_callback: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Remove old completed tasks and results before cutoff date
+        
+        Works through the completion time index in batches so the server is
+        never blocked for long, and frees memory with UNLINK. Finished tasks
+        saved before the index existed are added to it once, on first use.
+        
+        Args:
+            cutoff_date: Finished tasks completed before this time are removed
+            batch_size: Number of tasks removed per round trip
+            progress_callback: Called with the running total after each batch
+        
+        Returns:
+            Number of tasks removed
+        """
+        index_key = self._key("tasks:completed_at")
+        cutoff = _utc_timestamp(cutoff_date)
         deleted_count = 0
         
-        # Get completed and failed tasks
-        for status in ["completed", "failed"]:
-            tasks = await self.get_tasks_by_status(status)
+        await self._backfill_completion_index(batch_size)
+        
+        while True:
+            # Always read from the start: the previous batch was removed
+            task_ids = await self.redis_client.zrangebyscore(
+                index_key, "-inf", f"({cutoff}", start=0, num=batch_size
+            )
+            if not task_ids:
+                break
+            
+            fields = await self._hmget_many(
+                [self._key(f"task:{task_id}") for task_id in task_ids],
+                ["status", "workflow_id"]
+            )
             
-            for task in tasks:
-                if task.completed_at and task.completed_at < cutoff_date:
-                    await self.delete_task(task.id)
-                    
-                    # Delete result too
-                    await self.redis_client.delete(self._key(f"result:{task.id}"))
-                    deleted_count += 1
+            pipe = self.redis_client.pipeline(transaction=False)
+            unlink_keys = []
+            for task_id, (status, workflow_id) in zip(task_ids, fields):
+                # The task hash may already have expired; clear both finished sets
+                for finished_status in ([status] if status else FINISHED_STATUSES):
+                    pipe.srem(self._key(f"tasks:status:{finished_status}"), task_id)
+                if workflow_id:
+                    pipe.srem(self._key(f"workflow:{workflow_id}:tasks"), task_id)
+                unlink_keys.append(self._key(f"task:{task_id}"))
+                unlink_keys.append(self._key(f"result:{task_id}"))
+            pipe.unlink(*unlink_keys)
+            pipe.zrem(index_key, *task_ids)
+            await pipe.execute()
+            
+            deleted_count += len(task_ids)
+            if progress_callback:
+                progress_callback(deleted_count)
         
+        if deleted_count:
+            logger.info(f"Cleaned up {deleted_count} tasks completed before {cutoff_date.isoformat()}")
         return deleted_count
     
+    async def _backfill_completion_index(self, batch_size: int = SCAN_BATCH_SIZE) -> None:
+        """
+        Index finished tasks that were saved before the completion time index existed
+        
+        Runs once per database (a marker key records that it is done). The
+        finished status sets are walked with SSCAN; tasks whose hash already
+        expired are indexed at time 0 so cleanup drops their index entries.
+        """
+        if self._completion_index_backfilled:
+            return
+        marker_key = self._key("tasks:completed_at:backfilled")
+        if not await self.redis_client.exists(marker_key):
+            for status in FINISHED_STATUSES:
+                task_ids: List[str] = []
+                async for task_id in self.redis_client.sscan_iter(
+                    self._key(f"tasks:status:{status}"), count=batch_size
+                ):
+                    task_ids.append(task_id)
+                    if len(task_ids) >= batch_size:
+                        await self._index_completed_tasks(task_ids)
+                        task_ids = []
+                if task_ids:
+                    await self._index_completed_tasks(task_ids)
+            await self.redis_client.set(marker_key, datetime.now(timezone.utc).isoformat())
+            logger.info("Backfilled the task completion time index")
+        self._completion_index_backfilled = True
+    
+    async def _index_completed_tasks(self, task_ids: List[str]) -> None:
+        """Add finished tasks missing from the completion time index"""
+        index_key = self._key("tasks:completed_at")
+        pipe = self.redis_client.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.zscore(index_key, task_id)
+        unindexed = [task_id for task_id, score in zip(task_ids, await pipe.execute()) if score is None]
+        if not unindexed:
+            return
+        
+        values = await self._hget_many([self._key(f"task:{task_id}") for task_id in unindexed], "data")
+        scores: Dict[str, float] = {}
+        for task_id, data in zip(unindexed, values):
+            if data is None:
+                scores[task_id] = 0
+                continue
+            completed_at = json.loads(data).get("completed_at")
+            # Like before the index, tasks without a completion time are kept
+            if completed_at:
+                scores[task_id] = _utc_timestamp(datetime.fromisoformat(completed_at))
+        if scores:
+            await self.redis_client.zadd(index_key, scores)
+    
     # Redis-specific features
     async def publish_task_event(self, event_type: str, task_id: str, data: Dict[str, Any]) -> None:
         """Publish task event for real-time updates"""
@@ -9,7 +9,8 @@ import asyncio
 import aiosqlite
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -22,14 +23,110 @@ from gleitzeit.core.errors import (
 
 logger = logging.getLogger(__name__)
 
+TASK_COLUMNS = (
+    "id", "name", "protocol", "method", "params", "priority", "dependencies",
+    "timeout", "retry_config", "status", "attempt_count", "workflow_id",
+    "created_at", "started_at", "completed_at", "assigned_provider",
+    "execution_node", "error_message", "tags", "metadata"
+)
+
+TASK_RESULT_COLUMNS = (
+    "task_id", "status", "result", "error_message", "execution_time", "created_at"
+)
+
+SAVE_TASK_SQL = f"""
+    INSERT OR REPLACE INTO tasks ({", ".join(TASK_COLUMNS)})
+    VALUES ({", ".join("?" * len(TASK_COLUMNS))})
+"""
+
+SAVE_TASK_RESULT_SQL = f"""
+    INSERT OR REPLACE INTO task_results ({", ".join(TASK_RESULT_COLUMNS)})
+    VALUES ({", ".join("?" * len(TASK_RESULT_COLUMNS))})
+"""
+
+SAVE_QUEUE_STATE_SQL = """
+    INSERT OR REPLACE INTO queue_states (queue_name, state, updated_at)
+    VALUES (?, ?, ?)
+"""
+
+# Hot lookups use constant SQL text so sqlite3's per-connection statement
+# cache reuses the prepared statement instead of re-parsing it
+GET_TASK_SQL = "SELECT * FROM tasks WHERE id = ?"
+GET_TASK_RESULT_SQL = "SELECT * FROM task_results WHERE task_id = ?"
+
+# Stay well below SQLite's host parameter limit for IN (...) lookups
+MAX_BATCH_PARAMETERS = 500
+
+STATEMENT_CACHE_SIZE = 256
+
 
 class SQLiteBackend(PersistenceBackend):
-    """SQLite-based persistence backend"""
+    """
+    SQLite-based persistence backend
+    
+    By default every write is committed before the call returns. With
+    ``write_behind=True`` task, task result and queue state writes are
+    buffered and committed together in one transaction every
+    ``flush_interval`` seconds or once ``max_batch_size`` rows are pending,
+    and the database runs in WAL mode with ``synchronous=NORMAL``.
+    
+    Crash guarantees in write-behind mode:
+    - Reads through this backend always see buffered writes.
+    - Writes acknowledged since the last flush are lost if the process
+      crashes; at most ``flush_interval`` seconds or ``max_batch_size``
+      rows. Tasks whose final status was lost are recovered as queued or
+      executing and run again (at-least-once execution).
+    - Once ``flush()`` returns, writes survive a process crash. A power
+      loss or OS crash may still roll back the most recent transactions
+      (``synchronous=NORMAL``), but never corrupts the database.
+    - Workflow, workflow execution and delete operations are not buffered;
+      they flush pending writes first and then commit immediately, so
+      they are never reordered with earlier writes.
     
-    def __init__(self, db_path: str = "gleitzeit.db"):
+    With ``read_pool_size > 0`` reads run on a pool of read-only
+    connections next to the single writer connection (WAL mode), so
+    lookups are not serialized behind writes.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "gleitzeit.db",
+        write_behind: bool = False,
+        flush_interval: float = 0.05,
+        max_batch_size: int = 500,
+        read_pool_size: int = 0
+    ):
+        """
+        Initialize the SQLite backend
+        
+        Args:
+            db_path: Path to the database file
+            write_behind: Buffer hot writes and commit them in batches
+            flush_interval: Seconds a buffered write may wait before commit
+            max_batch_size: Number of buffered rows that triggers a commit
+            read_pool_size: Number of read-only connections (0 reads on the writer)
+        """
         self.db_path = db_path
         self.db: Optional[aiosqlite.Connection] = None
         self._initialized = False
+        
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        
+        # (table, key) -> (sql, row); latest write per key wins
+        self._pending: Dict[Tuple[str, str], Tuple[str, tuple]] = {}
+        # Batch currently being committed, still visible to reads
+        self._flushing: Dict[Tuple[str, str], Tuple[str, tuple]] = {}
+        self._write_lock = asyncio.Lock()
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # In-memory databases are private to one connection and cannot be pooled
+        self.read_pool_size = read_pool_size if db_path != ":memory:" else 0
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
     
     async def initialize(self) -> None:
         """Initialize SQLite database and create tables"""
@@ -41,13 +138,25 @@ class SQLiteBackend(PersistenceBackend):
             Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
             
             # Connect to database
-            self.db = await aiosqlite.connect(self.db_path)
+            self.db = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
             self.db.row_factory = aiosqlite.Row
             
+            if self.write_behind or self.read_pool_size:
+                await self.db.execute("PRAGMA journal_mode=WAL")
+            if self.write_behind:
+                await self.db.execute("PRAGMA synchronous=NORMAL")
+            
             # Create tables
             await self._create_tables()
+            
+            if self.read_pool_size:
+                await self._open_read_pool()
+            
             self._initialized = True
             
+            if self.write_behind:
+                self._flush_task = asyncio.create_task(self._flush_loop())
+            
             logger.info(f"SQLite backend initialized: {self.db_path}")
             
         except Exception as e:
@@ -58,12 +167,164 @@ class SQLiteBackend(PersistenceBackend):
             )
     
     async def shutdown(self) -> None:
-        """Close database connection"""
+        """Flush buffered writes and close database connection"""
+        if self._flush_task:
+            # Stop the flusher between batches, never in the middle of one
+            async with self._write_lock:
+                self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        
         if self.db:
+            await self.flush()
             await self.db.close()
             self.db = None
+        
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._idle_readers = None
         self._initialized = False
     
+    # Read connections
+    async def _open_read_pool(self) -> None:
+        """Open the read-only connection pool"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        self._idle_readers = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            reader = await aiosqlite.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+            reader.row_factory = aiosqlite.Row
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+    
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read connection (the writer connection when there is no pool)"""
+        if self._idle_readers is None:
+            yield self.db
+            return
+        
+        reader = await self._idle_readers.get()
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
+    
+    async def _fetchone(self, sql: str, params: tuple = ()) -> Optional[aiosqlite.Row]:
+        """Run a query and return its first row"""
+        async with self._reader() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+    
+    async def _fetchall(self, sql: str, params: tuple = ()) -> List[aiosqlite.Row]:
+        """Run a query and return all rows"""
+        async with self._reader() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchall()
+    
+    # Write-behind buffering
+    async def flush(self) -> None:
+        """Commit all buffered writes; they are durable once this returns"""
+        if not self._pending and not self._flushing:
+            return
+        
+        async with self._write_lock:
+            await self._flush_pending()
+    
+    async def _flush_pending(self) -> None:
+        """Commit buffered writes in one transaction (caller holds the write lock)"""
+        if not self._pending:
+            return
+        
+        batch = self._pending
+        self._pending = {}
+        self._flushing = batch
+        self._has_pending.clear()
+        self._batch_full.clear()
+        
+        # Group rows by statement so each table is written with one executemany
+        grouped: Dict[str, List[tuple]] = {}
+        for sql, row in batch.values():
+            grouped.setdefault(sql, []).append(row)
+        
+        try:
+            for sql, rows in grouped.items():
+                await self.db.executemany(sql, rows)
+            await self.db.commit()
+        except asyncio.CancelledError:
+            # Rows are idempotent upserts, the next flush rewrites them
+            self._requeue(batch)
+            raise
+        except Exception as e:
+            await self.db.rollback()
+            self._requeue(batch)
+            raise PersistenceError(
+                message=f"Failed to flush {len(batch)} buffered writes: {e}",
+                code=ErrorCode.PERSISTENCE_WRITE_FAILED,
+                backend="SQLite",
+                cause=e
+            )
+        finally:
+            self._flushing = {}
+        
+        logger.debug(f"Flushed {len(batch)} buffered writes")
+    
+    def _requeue(self, batch: Dict[Tuple[str, str], Tuple[str, tuple]]) -> None:
+        """Put an uncommitted batch back without overwriting newer writes"""
+        for key, value in batch.items():
+            self._pending.setdefault(key, value)
+        self._has_pending.set()
+    
+    async def _flush_loop(self) -> None:
+        """Background task committing buffered writes in batches"""
+        while True:
+            await self._has_pending.wait()
+            
+            # Let more writes join the batch unless it is already full
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            
+            try:
+                await self.flush()
+            except PersistenceError as e:
+                logger.error(f"Write-behind flush failed, will retry: {e}")
+                await asyncio.sleep(self.flush_interval)
+    
+    def _buffer_write(self, table: str, key: str, sql: str, row: tuple) -> None:
+        """Buffer a write, replacing any pending write for the same key"""
+        self._pending.pop((table, key), None)
+        self._pending[(table, key)] = (sql, row)
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+    
+    def _buffered_row(self, table: str, key: str) -> Optional[tuple]:
+        """Get a buffered row that has not been committed yet"""
+        entry = self._pending.get((table, key)) or self._flushing.get((table, key))
+        return entry[1] if entry else None
+    
+    async def _write(self, table: str, key: str, sql: str, row: tuple) -> None:
+        """Write a row, buffered in write-behind mode or committed immediately"""
+        if self.write_behind:
+            self._buffer_write(table, key, sql, row)
+            return
+        
+        await self.db.execute(sql, row)
+        await self.db.commit()
+    
+    async def _execute_write(self, sql: str, params: tuple = ()) -> aiosqlite.Cursor:
+        """Commit an unbuffered write after any buffered writes before it"""
+        async with self._write_lock:
+            await self._flush_pending()
+            cursor = await self.db.execute(sql, params)
+            await self.db.commit()
+            return cursor
+    
     async def _create_tables(self) -> None:
         """Create database tables"""
         
@@ -159,14 +420,19 @@ class SQLiteBackend(PersistenceBackend):
             )
         
         try:
-            await self.db.execute("""
-            INSERT OR REPLACE INTO tasks (
-                id, name, protocol, method, params, priority, dependencies,
-                timeout, retry_config, status, attempt_count, workflow_id,
-                created_at, started_at, completed_at, assigned_provider,
-                execution_node, error_message, tags, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+            await self._write("tasks", task.id, SAVE_TASK_SQL, self._task_to_row(task))
+            
+        except Exception as e:
+            raise PersistenceError(
+                message=f"Failed to save task {task.id}: {e}",
+                code=ErrorCode.PERSISTENCE_WRITE_FAILED,
+                backend="SQLite",
+                cause=e
+            )
+    
+    def _task_to_row(self, task: Task) -> tuple:
+        """Convert Task object to database row values"""
+        return (
             task.id,
             task.name,
             task.protocol,
@@ -187,23 +453,15 @@ class SQLiteBackend(PersistenceBackend):
             task.error_message,
             json.dumps(task.tags) if task.tags else None,
             json.dumps(task.metadata) if task.metadata else None
-        ))
-            await self.db.commit()
-            
-        except Exception as e:
-            raise PersistenceError(
-                message=f"Failed to save task {task.id}: {e}",
-                code=ErrorCode.PERSISTENCE_WRITE_FAILED,
-                backend="SQLite",
-                cause=e
-            )
+        )
     
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID"""
-        cursor = await self.db.execute(
-            "SELECT * FROM tasks WHERE id = ?", (task_id,)
-        )
-        row = await cursor.fetchone()
+        buffered = self._buffered_row("tasks", task_id)
+        if buffered:
+            return self._row_to_task(dict(zip(TASK_COLUMNS, buffered)))
+        
+        row = await self._fetchone(GET_TASK_SQL, (task_id,))
         
         if not row:
             return None
@@ -212,26 +470,25 @@ class SQLiteBackend(PersistenceBackend):
     
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task"""
-        cursor = await self.db.execute(
+        cursor = await self._execute_write(
             "DELETE FROM tasks WHERE id = ?", (task_id,)
         )
-        await self.db.commit()
         return cursor.rowcount > 0
     
     async def get_tasks_by_status(self, status: str) -> List[Task]:
         """Get all tasks with a specific status"""
-        cursor = await self.db.execute(
+        await self.flush()
+        rows = await self._fetchall(
             "SELECT * FROM tasks WHERE status = ? ORDER BY created_at", (status,)
         )
-        rows = await cursor.fetchall()
         return [self._row_to_task(row) for row in rows]
     
     async def get_tasks_by_workflow(self, workflow_id: str) -> List[Task]:
         """Get all tasks for a workflow"""
-        cursor = await self.db.execute(
+        await self.flush()
+        rows = await self._fetchall(
             "SELECT * FROM tasks WHERE workflow_id = ? ORDER BY created_at", (workflow_id,)
         )
-        rows = await cursor.fetchall()
         return [self._row_to_task(row) for row in rows]
     
     def _row_to_task(self, row) -> Task:
@@ -264,11 +521,7 @@ class SQLiteBackend(PersistenceBackend):
     # Task results
     async def save_task_result(self, task_result: TaskResult) -> None:
         """Save a task result"""
-        await self.db.execute("""
-            INSERT OR REPLACE INTO task_results (
-                task_id, status, result, error_message, execution_time, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        await self._write("task_results", task_result.task_id, SAVE_TASK_RESULT_SQL, (
             task_result.task_id,
             task_result.status,
             json.dumps(task_result.result) if task_result.result is not None else None,
@@ -276,18 +529,44 @@ class SQLiteBackend(PersistenceBackend):
             task_result.duration_seconds,
             datetime.utcnow().isoformat()
         ))
-        await self.db.commit()
     
     async def get_task_result(self, task_id: str) -> Optional[TaskResult]:
         """Get task result by task ID"""
-        cursor = await self.db.execute(
-            "SELECT * FROM task_results WHERE task_id = ?", (task_id,)
-        )
-        row = await cursor.fetchone()
+        buffered = self._buffered_row("task_results", task_id)
+        if buffered:
+            return self._row_to_task_result(dict(zip(TASK_RESULT_COLUMNS, buffered)))
+        
+        row = await self._fetchone(GET_TASK_RESULT_SQL, (task_id,))
         
         if not row:
             return None
         
+        return self._row_to_task_result(row)
+    
+    async def get_task_results_batch(self, task_ids: Iterable[str]) -> Dict[str, TaskResult]:
+        """Get results for many tasks with one IN (...) query per chunk"""
+        results: Dict[str, TaskResult] = {}
+        missing = []
+        for task_id in dict.fromkeys(task_ids):
+            buffered = self._buffered_row("task_results", task_id)
+            if buffered:
+                results[task_id] = self._row_to_task_result(dict(zip(TASK_RESULT_COLUMNS, buffered)))
+            else:
+                missing.append(task_id)
+        
+        for start in range(0, len(missing), MAX_BATCH_PARAMETERS):
+            chunk = missing[start:start + MAX_BATCH_PARAMETERS]
+            rows = await self._fetchall(
+                f"SELECT * FROM task_results WHERE task_id IN ({', '.join('?' * len(chunk))})",
+                tuple(chunk)
+            )
+            for row in rows:
+                results[row['task_id']] = self._row_to_task_result(row)
+        
+        return results
+    
+    def _row_to_task_result(self, row) -> TaskResult:
+        """Convert database row to TaskResult object"""
         return TaskResult(
             task_id=row['task_id'],
             status=row['status'],
@@ -310,7 +589,7 @@ class SQLiteBackend(PersistenceBackend):
                     task_dict[field] = task_dict[field].isoformat()
             tasks_data.append(task_dict)
         
-        await self.db.execute("""
+        await self._execute_write("""
             INSERT OR REPLACE INTO workflows (
                 id, name, description, tasks, metadata, created_at
             ) VALUES (?, ?, ?, ?, ?, ?)
@@ -322,14 +601,12 @@ class SQLiteBackend(PersistenceBackend):
             json.dumps(workflow.metadata) if workflow.metadata else None,
             workflow.created_at.isoformat() if workflow.created_at else datetime.utcnow().isoformat()
         ))
-        await self.db.commit()
     
     async def get_workflow(self, workflow_id: str) -> Optional[Workflow]:
         """Get a workflow by ID"""
-        cursor = await self.db.execute(
+        row = await self._fetchone(
             "SELECT * FROM workflows WHERE id = ?", (workflow_id,)
         )
-        row = await cursor.fetchone()
         
         if not row:
             return None
@@ -354,7 +631,7 @@ class SQLiteBackend(PersistenceBackend):
     
     async def save_workflow_execution(self, execution: WorkflowExecution) -> None:
         """Save workflow execution state"""
-        await self.db.execute("""
+        await self._execute_write("""
             INSERT OR REPLACE INTO workflow_executions (
                 execution_id, workflow_id, status, started_at, completed_at,
                 error_message, progress
@@ -372,14 +649,12 @@ class SQLiteBackend(PersistenceBackend):
                 "total_tasks": execution.total_tasks
             })
         ))
-        await self.db.commit()
     
     async def get_workflow_execution(self, execution_id: str) -> Optional[WorkflowExecution]:
         """Get workflow execution by ID"""
-        cursor = await self.db.execute(
+        row = await self._fetchone(
             "SELECT * FROM workflow_executions WHERE execution_id = ?", (execution_id,)
         )
-        row = await cursor.fetchone()
         
         if not row:
             return None
@@ -401,18 +676,19 @@ class SQLiteBackend(PersistenceBackend):
     # Queue state operations
     async def save_queue_state(self, queue_name: str, state: Dict[str, Any]) -> None:
         """Save queue state for recovery"""
-        await self.db.execute("""
-            INSERT OR REPLACE INTO queue_states (queue_name, state, updated_at)
-            VALUES (?, ?, ?)
-        """, (queue_name, json.dumps(state), datetime.utcnow().isoformat()))
-        await self.db.commit()
+        await self._write("queue_states", queue_name, SAVE_QUEUE_STATE_SQL, (
+            queue_name, json.dumps(state), datetime.utcnow().isoformat()
+        ))
     
     async def get_queue_state(self, queue_name: str) -> Optional[Dict[str, Any]]:
         """Get saved queue state"""
-        cursor = await self.db.execute(
+        buffered = self._buffered_row("queue_states", queue_name)
+        if buffered:
+            return json.loads(buffered[1])
+        
+        row = await self._fetchone(
             "SELECT state FROM queue_states WHERE queue_name = ?", (queue_name,)
         )
-        row = await cursor.fetchone()
         
         if not row:
             return None
@@ -421,84 +697,67 @@ class SQLiteBackend(PersistenceBackend):
     
     async def delete_queue_state(self, queue_name: str) -> bool:
         """Delete queue state"""
-        cursor = await self.db.execute(
+        cursor = await self._execute_write(
             "DELETE FROM queue_states WHERE queue_name = ?", (queue_name,)
         )
-        await self.db.commit()
         return cursor.rowcount > 0
     
     # Bulk operations
     async def save_tasks_batch(self, tasks: List[Task]) -> None:
         """Save multiple tasks in a single transaction"""
-        data = []
-        for task in tasks:
-            data.append((
-                task.id, task.name, task.protocol, task.method,
-                json.dumps(task.params), task.priority,
-                json.dumps(task.dependencies) if task.dependencies else None,
-                task.timeout,
-                json.dumps(task.retry_config.dict()) if task.retry_config else None,
-                task.status, task.attempt_count, task.workflow_id,
-                task.created_at.isoformat() if task.created_at else None,
-                task.started_at.isoformat() if task.started_at else None,
-                task.completed_at.isoformat() if task.completed_at else None,
-                task.assigned_provider, task.execution_node, task.error_message,
-                json.dumps(task.tags) if task.tags else None,
-                json.dumps(task.metadata) if task.metadata else None
-            ))
-        
-        await self.db.executemany("""
-            INSERT OR REPLACE INTO tasks (
-                id, name, protocol, method, params, priority, dependencies,
-                timeout, retry_config, status, attempt_count, workflow_id,
-                created_at, started_at, completed_at, assigned_provider,
-                execution_node, error_message, tags, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, data)
+        if self.write_behind:
+            for task in tasks:
+                self._buffer_write("tasks", task.id, SAVE_TASK_SQL, self._task_to_row(task))
+            return
+        
+        await self.db.executemany(SAVE_TASK_SQL, [self._task_to_row(task) for task in tasks])
         await self.db.commit()
     
     async def get_all_queued_tasks(self) -> List[Task]:
         """Get all tasks that should be in queues on startup"""
-        cursor = await self.db.execute("""
+        await self.flush()
+        rows = await self._fetchall("""
             SELECT * FROM tasks 
             WHERE status IN ('queued', 'retry_pending', 'executing')
             ORDER BY created_at
         """)
-        rows = await cursor.fetchall()
         return [self._row_to_task(row) for row in rows]
     
     # Statistics
     async def get_task_count_by_status(self) -> Dict[str, int]:
         """Get count of tasks by status"""
-        cursor = await self.db.execute("""
+        await self.flush()
+        rows = await self._fetchall("""
             SELECT status, COUNT(*) as count 
             FROM tasks 
             GROUP BY status
         """)
-        rows = await cursor.fetchall()
         return {row['status']: row['count'] for row in rows}
     
     async def cleanup_old_data(self, cutoff_date: datetime) -> int:
         """Remove old completed tasks and results before cutoff date"""
-        # Delete old task results first (foreign key constraint)
-        await self.db.execute("""
-            DELETE FROM task_results 
-            WHERE task_id IN (
-                SELECT id FROM tasks 
+        async with self._write_lock:
+            await self._flush_pending()
+            
+            # Delete old task results first (foreign key constraint)
+            await self.db.execute("""
+                DELETE FROM task_results 
+                WHERE task_id IN (
+                    SELECT id FROM tasks 
+                    WHERE status IN ('completed', 'failed') 
+                    AND completed_at < ?
+                )
+            """, (cutoff_date.isoformat(),))
+            
+            # Delete old tasks
+            cursor = await self.db.execute("""
+                DELETE FROM tasks 
                 WHERE status IN ('completed', 'failed') 
                 AND completed_at < ?
-            )
-        """, (cutoff_date.isoformat(),))
-        
-        # Delete old tasks
-        cursor = await self.db.execute("""
-            DELETE FROM tasks 
-            WHERE status IN ('completed', 'failed') 
-            AND completed_at < ?
-        """, (cutoff_date.isoformat(),))
-        
-        deleted_count = cursor.rowcount
-        await self.db.commit()
+            """, (cutoff_date.isoformat(),))
+            
+            deleted_count = cursor.rowcount
+            await self.db.commit()
         
         # Vacuum to reclaim space
         await self.db.execute("VACUUM")
@@ -67,6 +67,19 @@ MAX_TOKENS_PARAM = ParameterSpec(
     maximum=4096
 )
 
+STREAM_PARAM = ParameterSpec(
+    type=ParameterType.BOOLEAN,
+    description="Stream output incrementally as task:partial_output events",
+    required=False,
+    default=False
+)
+
+CACHE_PARAM = ParameterSpec(
+    type=ParameterType.BOOLEAN,
+    description="Answer from the provider response cache (default: only when temperature is 0)",
+    required=False
+)
+
 # Response schema for chat completion
 CHAT_RESPONSE_SCHEMA = ParameterSpec(
     type=ParameterType.OBJECT,
@@ -139,6 +152,8 @@ LLM_CHAT_METHOD = MethodSpec(
         "messages": MESSAGES_PARAM,
         "temperature": TEMPERATURE_PARAM,
         "max_tokens": MAX_TOKENS_PARAM,
+        "stream": STREAM_PARAM,
+        "cache": CACHE_PARAM,
         "file_path": ParameterSpec(
             type=ParameterType.STRING,
             description="Path to text file to include in the conversation",
@@ -206,7 +221,8 @@ LLM_COMPLETE_METHOD = MethodSpec(
             min_length=1
         ),
         "temperature": TEMPERATURE_PARAM,
-        "max_tokens": MAX_TOKENS_PARAM
+        "max_tokens": MAX_TOKENS_PARAM,
+        "cache": CACHE_PARAM
     },
     returns_schema=COMPLETION_RESPONSE_SCHEMA,
     examples=[
@@ -321,6 +337,7 @@ LLM_VISION_METHOD = MethodSpec(
         "messages": VISION_MESSAGES_PARAM,
         "temperature": TEMPERATURE_PARAM,
         "max_tokens": MAX_TOKENS_PARAM,
+        "cache": CACHE_PARAM,
         "images": ParameterSpec(
             type=ParameterType.ARRAY,
             description="Array of base64 encoded images (alternative to embedding in messages)",
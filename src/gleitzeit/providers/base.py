@@ -7,10 +7,14 @@ JSON-RPC 2.0 compliant interfaces.
 
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Set
+from pathlib import Path
 import asyncio
+import glob
 import logging
+import os
 from datetime import datetime
 
+from gleitzeit.providers.image_prep import read_file_base64
 from gleitzeit.core.errors import (
     ErrorCode, GleitzeitError, ProviderError, ProviderNotFoundError,
     ProviderTimeoutError, SystemError, ConnectionTimeoutError,
@@ -19,6 +23,15 @@ from gleitzeit.core.errors import (
 
 logger = logging.getLogger(__name__)
 
+# Params that _preprocess_params rewrites; requests without them pass through untouched
+PREPROCESSED_KEYS = ('directory', 'file_path', 'image_path')
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
+
+
+def _read_text_file(file_path: str) -> str:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
 
 class ProtocolProvider(ABC):
     """
@@ -51,6 +64,9 @@ class ProtocolProvider(ABC):
         self.request_count = 0
         self.error_count = 0
         
+        # Optional ImagePreparer used when image files are inlined as base64
+        self.image_preparer = None
+        
         logger.info(f"Initialized {self.__class__.__name__}: {provider_id}")
     
     @abstractmethod
@@ -166,6 +182,10 @@ class ProtocolProvider(ABC):
         - Reading image data from image_path parameter
         - Converting images array if needed
         
+        File system access and base64 encoding run in worker threads so large
+        files do not stall the event loop. Only the keys that are rewritten
+        are copied; the original params are never modified.
+        
         Args:
             method: The method being called
             params: Original parameters
@@ -173,12 +193,13 @@ class ProtocolProvider(ABC):
         Returns:
             Processed parameters with file contents included
         """
-        import copy
-        import glob
-        from pathlib import Path
+        if not any(key in params for key in PREPROCESSED_KEYS):
+            return params
         
-        # Create a copy to avoid modifying original params
-        processed = copy.deepcopy(params)
+        # Shallow copy; nested values are replaced, never mutated
+        processed = dict(params)
+        # Filesystem access runs in the default executor, off the event loop
+        loop = asyncio.get_running_loop()
         
         # Handle directory + file_pattern for batch processing
         if 'directory' in processed and 'file_pattern' in processed:
@@ -187,13 +208,11 @@ class ProtocolProvider(ABC):
             
             # Discover files matching the pattern
             pattern_path = Path(directory) / file_pattern
-            matching_files = glob.glob(str(pattern_path))
+            matching_files = await loop.run_in_executor(None, glob.glob, str(pattern_path))
             
             if matching_files:
                 # Add discovered files to the files list
-                if 'files' not in processed:
-                    processed['files'] = []
-                processed['files'].extend(matching_files)
+                processed['files'] = list(processed.get('files') or []) + matching_files
                 logger.debug(f"Discovered {len(matching_files)} files matching {pattern_path}")
             else:
                 logger.warning(f"No files found matching pattern: {pattern_path}")
@@ -201,34 +220,30 @@ class ProtocolProvider(ABC):
         # Handle file_path for text files
         if 'file_path' in processed:
             file_path = processed['file_path']
-            if file_path and Path(file_path).exists():
+            if file_path and await loop.run_in_executor(None, os.path.exists, file_path):
                 try:
                     # Check if it's an image file
-                    image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
-                    if Path(file_path).suffix.lower() in image_extensions:
+                    if Path(file_path).suffix.lower() in IMAGE_EXTENSIONS:
                         # For images, keep the file_path as is (provider will handle it)
                         # Or optionally read and convert to base64
                         if 'image_data' not in processed and 'images' not in processed:
-                            import base64
-                            with open(file_path, 'rb') as f:
-                                image_data = base64.b64encode(f.read()).decode('utf-8')
-                            processed['image_data'] = image_data
-                    else:
-                        # For text files, read content and append to prompt/messages
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            file_content = f.read()
-                        
-                        # Append to messages if present
-                        if 'messages' in processed and processed['messages']:
-                            last_msg = processed['messages'][-1]
-                            if last_msg.get('role') == 'user':
-                                original_content = last_msg.get('content', '')
-                                last_msg['content'] = f"{original_content}\n\nFile content from {file_path}:\n{file_content}"
-                        # Or append to prompt if present
-                        elif 'prompt' in processed:
-                            original_prompt = processed.get('prompt', '')
-                            processed['prompt'] = f"{original_prompt}\n\nFile content from {file_path}:\n{file_content}"
-                        
+                            processed['image_data'] = await self._encode_image(file_path)
+                    elif processed.get('messages'):
+                        # For text files, append content to the last user message
+                        last_msg = processed['messages'][-1]
+                        if last_msg.get('role') == 'user':
+                            file_content = await loop.run_in_executor(None, _read_text_file, file_path)
+                            original_content = last_msg.get('content', '')
+                            processed['messages'] = processed['messages'][:-1] + [{
+                                **last_msg,
+                                'content': f"{original_content}\n\nFile content from {file_path}:\n{file_content}"
+                            }]
+                            logger.debug(f"Read file content from {file_path} ({len(file_content)} chars)")
+                    elif 'prompt' in processed:
+                        # Or append it to the prompt
+                        file_content = await loop.run_in_executor(None, _read_text_file, file_path)
+                        original_prompt = processed.get('prompt', '')
+                        processed['prompt'] = f"{original_prompt}\n\nFile content from {file_path}:\n{file_content}"
                         logger.debug(f"Read file content from {file_path} ({len(file_content)} chars)")
                         
                 except Exception as e:
@@ -237,11 +252,9 @@ class ProtocolProvider(ABC):
         # Handle image_path for vision tasks
         if 'image_path' in processed and not processed.get('image_data') and not processed.get('images'):
             image_path = processed.pop('image_path')  # Remove image_path after reading
-            if image_path and Path(image_path).exists():
+            if image_path and await loop.run_in_executor(None, os.path.exists, image_path):
                 try:
-                    import base64
-                    with open(image_path, 'rb') as f:
-                        image_data = base64.b64encode(f.read()).decode('utf-8')
+                    image_data = await self._encode_image(image_path)
                     # Only add to images array (not image_data) to avoid validation issues
                     processed['images'] = [image_data]
                     logger.debug(f"Read image from {image_path} and converted to base64")
@@ -252,6 +265,13 @@ class ProtocolProvider(ABC):
         
         return processed
     
+    async def _encode_image(self, image_path: str) -> str:
+        """Base64 encode an image file, prepared and cached by image_preparer if set"""
+        if self.image_preparer is not None:
+            return await self.image_preparer.prepare(image_path)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, read_file_base64, image_path)
+    
     def get_info(self) -> Dict[str, Any]:
         """Get provider information"""
         return {
@@ -272,18 +292,23 @@ class ProtocolProvider(ABC):
             )
         }
     
-    async def execute_with_stats(self, method: str, params: Dict[str, Any]) -> Any:
+    async def execute_with_stats(self, method: str, params: Dict[str, Any], preprocessed: bool = False) -> Any:
         """
         Execute request with automatic statistics tracking
         
         This is the main entry point used by the registry.
+        
+        Args:
+            method: The method being called
+            params: Method parameters
+            preprocessed: params already went through _preprocess_params
         """
         self.request_count += 1
         start_time = asyncio.get_event_loop().time()
         
         try:
             # Pre-process params to handle file reading
-            processed_params = await self._preprocess_params(method, params)
+            processed_params = params if preprocessed else await self._preprocess_params(method, params)
             
             result = await self.handle_request(method, processed_params)
             
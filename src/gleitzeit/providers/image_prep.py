@@ -0,0 +1,235 @@
+"""
+Image Preparation for Gleitzeit V4
+
+Prepares images for vision requests: optionally downscales them to a
+maximum edge and re-encodes them, then base64 encodes the result. Work
+runs in a dedicated thread pool and results are kept in a bounded LRU
+keyed by (path, mtime, size, spec), so an image analyzed by several
+prompts is only read and encoded once.
+
+Downscaling and re-encoding need Pillow (``pip install gleitzeit[vision]``).
+Without it images are passed through unchanged, still cached. Unchanged
+images are encoded by ``read_file_base64``, the same reader providers use
+without a preparer.
+"""
+
+import asyncio
+import base64
+import io
+import logging
+import mmap
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+# Files above this size are encoded from a memory map instead of a read copy
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def read_file_base64(file_path: str) -> str:
+    """Base64 encode a file (blocking; run it in a worker thread)"""
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return base64.b64encode(f.read()).decode('ascii')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return base64.b64encode(mapped).decode('ascii')
+
+
+@dataclass(frozen=True)
+class ImageSpec:
+    """Target for prepared images"""
+    max_edge: Optional[int] = None  # Longest side in pixels (None keeps the size)
+    format: Optional[str] = None  # e.g. "JPEG", "PNG", "WEBP" (None keeps the format)
+    quality: int = 85  # Encoder quality for lossy formats
+
+    @property
+    def is_passthrough(self) -> bool:
+        return self.max_edge is None and self.format is None
+
+
+def prepare_image(path: str, spec: ImageSpec) -> Tuple[str, int, int]:
+    """
+    Downscale/re-encode an image and base64 encode it (blocking)
+
+    Returns:
+        (base64 data, original size in bytes, prepared size in bytes)
+    """
+    if spec.is_passthrough or Image is None:
+        size = os.path.getsize(path)
+        return read_file_base64(path), size, size
+
+    with open(path, "rb") as f:
+        original = f.read()
+
+    with Image.open(io.BytesIO(original)) as image:
+        source_format = image.format
+        target_format = (spec.format or source_format or "PNG").upper()
+        too_large = spec.max_edge is not None and max(image.size) > spec.max_edge
+
+        if not too_large and target_format == source_format:
+            # Nothing to change; avoid a lossy round trip
+            return base64.b64encode(original).decode("ascii"), len(original), len(original)
+
+        prepared = ImageOps.exif_transpose(image)
+        if too_large:
+            prepared.thumbnail((spec.max_edge, spec.max_edge), Image.LANCZOS)
+        if target_format == "JPEG" and prepared.mode not in ("RGB", "L"):
+            prepared = prepared.convert("RGB")
+
+        buffer = io.BytesIO()
+        save_options = {"quality": spec.quality} if target_format in ("JPEG", "WEBP") else {}
+        prepared.save(buffer, format=target_format, **save_options)
+        data = buffer.getvalue()
+
+    return base64.b64encode(data).decode("ascii"), len(original), len(data)
+
+
+class ImagePreparer:
+    """
+    Cached, pooled image preparation
+
+    Concurrent requests for the same image share one preparation.
+    """
+
+    def __init__(
+        self,
+        spec: Optional[ImageSpec] = None,
+        cache_size: int = 256,
+        max_cache_bytes: Optional[int] = 256 * 1024 * 1024,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize the image preparer
+
+        Args:
+            spec: Target size and format (default: unchanged)
+            cache_size: Prepared images kept in memory
+            max_cache_bytes: Total base64 size kept in memory (None for no limit)
+            max_workers: Threads preparing images (default: min(4, CPU count))
+        """
+        self.spec = spec or ImageSpec()
+        self.cache_size = cache_size
+        self.max_cache_bytes = max_cache_bytes
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+
+        if Image is None and not self.spec.is_passthrough:
+            logger.warning("Pillow is not installed; images are sent without downscaling")
+
+        # (path, mtime_ns, size, spec) -> base64 data
+        self._cache: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+        self._cache_bytes = 0
+        self._pending: Dict[Tuple[Any, ...], asyncio.Future] = {}  # In-flight preparations
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def prepare(self, path: str, spec: Optional[ImageSpec] = None) -> str:
+        """
+        Get the prepared base64 data of an image
+
+        Args:
+            path: Image file path
+            spec: Target overriding the default spec
+
+        Returns:
+            Base64 encoded image
+        """
+        spec = spec or self.spec
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        stat = await loop.run_in_executor(executor, os.stat, path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, spec)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        job = self._pending.get(key)
+        if job is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            # The job is owned by no caller: a caller being cancelled (e.g. by
+            # a task timeout) must not fail the others waiting for it
+            job = loop.run_in_executor(executor, prepare_image, path, spec)
+            self._pending[key] = job
+            job.add_done_callback(partial(self._on_prepared, key))
+
+        data, _, _ = await asyncio.shield(job)
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache and size reduction statistics"""
+        return {
+            "spec": {"max_edge": self.spec.max_edge, "format": self.spec.format},
+            "resizing_available": Image is not None,
+            "cached_images": len(self._cache),
+            "cached_bytes": self._cache_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out
+        }
+
+    def clear(self) -> None:
+        """Drop all cached images"""
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    def shutdown(self) -> None:
+        """Release the worker threads and cache"""
+        # Preparations that have not started yet are dropped
+        for job in list(self._pending.values()):
+            job.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.clear()
+
+    def _on_prepared(self, key: Tuple[Any, ...], job: asyncio.Future) -> None:
+        """Cache a finished preparation (runs before waiting callers resume)"""
+        del self._pending[key]
+        if job.cancelled() or job.exception() is not None:
+            return
+        data, size_in, size_out = job.result()
+        self.bytes_in += size_in
+        self.bytes_out += size_out
+        self._remember(key, data)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="gleitzeit-image"
+            )
+        return self._executor
+
+    def _remember(self, key: Tuple[Any, ...], data: str) -> None:
+        self._cache[key] = data
+        self._cache_bytes += len(data)
+        while self._cache and (
+            len(self._cache) > self.cache_size
+            or (self.max_cache_bytes is not None and self._cache_bytes > self.max_cache_bytes)
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+            self.evictions += 1
@@ -6,11 +6,14 @@ Protocol-based Ollama LLM provider that implements the "llm/v1" protocol.
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 import aiohttp
 import json
 
 from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.providers.image_prep import ImagePreparer
+from gleitzeit.providers.response_cache import ResponseCache
+from gleitzeit.core.streaming import emit_partial_output
 from gleitzeit.core.errors import (
     ProviderError, MethodNotSupportedError, InvalidParameterError,
     ErrorCode
@@ -18,6 +21,8 @@ from gleitzeit.core.errors import (
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TEMPERATURE = 0.7
+
 
 class OllamaProvider(ProtocolProvider):
     """
@@ -28,13 +33,24 @@ class OllamaProvider(ProtocolProvider):
     - chat: Chat completions 
     - vision: Image analysis
     - embed: Text embeddings
+    
+    generate and chat accept ``stream: true`` to read Ollama's NDJSON
+    stream; each chunk is reported as partial output while the assembled
+    response is returned as the usual result.
+    
+    With a ``ResponseCache`` configured, repeated requests are answered
+    from the cache (see ``ResponseCache.is_cacheable`` for which requests
+    qualify). The cache and the ``ImagePreparer`` may be shared by several
+    providers, so they are closed by whoever created them, not by ``shutdown``.
     """
     
     def __init__(
         self,
         provider_id: str,
         ollama_url: str = "http://localhost:11434",
-        timeout: int = 60
+        timeout: int = 60,
+        response_cache: Optional[ResponseCache] = None,
+        image_preparer: Optional[ImagePreparer] = None
     ):
         super().__init__(
             provider_id=provider_id,
@@ -46,6 +62,10 @@ class OllamaProvider(ProtocolProvider):
         self.timeout = timeout
         self.available_models = []
         self.session = None
+        self.response_cache = response_cache
+        # Images analyzed by several prompts are read and encoded once when
+        # a preparer is given; without one images are encoded directly
+        self.image_preparer = image_preparer
         
         logger.info(f"Initialized OllamaProvider: {provider_id}")
     
@@ -85,7 +105,9 @@ class OllamaProvider(ProtocolProvider):
                 "details": {
                     "ollama_url": self.ollama_url,
                     "models_available": len(self.available_models),
-                    "available_models": self.available_models[:5] if self.available_models else []
+                    "available_models": self.available_models[:5] if self.available_models else [],
+                    "response_cache": self.get_cache_stats(),
+                    "image_preparation": self.image_preparer.get_stats() if self.image_preparer else None
                 }
             }
             
@@ -108,6 +130,31 @@ class OllamaProvider(ProtocolProvider):
         if method.startswith("llm/"):
             method = method[4:]  # Remove "llm/" prefix
         
+        # Embeddings are deterministic; generation defaults to sampling
+        default_temperature = 0.0 if method == "embed" else DEFAULT_TEMPERATURE
+        if self.response_cache is None or not ResponseCache.is_cacheable(params, default_temperature):
+            return await self._dispatch(method, params)
+        
+        key = ResponseCache.make_key(method, params)
+        cached = await self.response_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Response cache hit for {method} ({key[:12]})")
+            if params.get('stream') and cached.get('response'):
+                # Streaming callers still receive the output, as one chunk
+                await emit_partial_output(cached['response'], model=cached.get('model'),
+                                          provider_id=self.provider_id, cached=True)
+            return {**cached, "cached": True}
+        
+        result = await self._dispatch(method, params)
+        await self.response_cache.put(key, result)
+        return result
+    
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get response cache hit/miss statistics (None if caching is off)"""
+        return self.response_cache.get_stats() if self.response_cache else None
+    
+    async def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        """Call the Ollama API for a method without the prefix"""
         if method == "generate":
             return await self._generate_text(params)
         elif method == "chat":
@@ -123,7 +170,7 @@ class OllamaProvider(ProtocolProvider):
         """Generate text using Ollama"""
         prompt = params.get('prompt', '')
         model = params.get('model', 'llama3')
-        temperature = params.get('temperature', 0.7)
+        temperature = params.get('temperature', DEFAULT_TEMPERATURE)
         max_tokens = params.get('max_tokens', 500)
         # Note: file_path is now handled by base class in _preprocess_params
         
@@ -141,10 +188,11 @@ class OllamaProvider(ProtocolProvider):
         
         logger.info(f"Generating text with model {model} (prompt length: {len(prompt)} chars)")
         
+        stream = bool(params.get('stream', False))
         payload = {
             'model': model,
             'prompt': prompt,
-            'stream': False,
+            'stream': stream,
             'options': {
                 'temperature': temperature,
                 'num_predict': max_tokens
@@ -157,7 +205,10 @@ class OllamaProvider(ProtocolProvider):
             timeout=aiohttp.ClientTimeout(total=self.timeout)
         ) as response:
             if response.status == 200:
-                result = await response.json()
+                if stream:
+                    result = await self._read_stream(response, model, lambda chunk: chunk.get('response', ''))
+                else:
+                    result = await response.json()
                 return {
                     "response": result.get('response', ''),  # Standard field for workflow compatibility
                     "content": result.get('response', ''),  # Keep for backward compatibility
@@ -178,7 +229,7 @@ class OllamaProvider(ProtocolProvider):
         """Chat using Ollama"""
         messages = params.get('messages', [])
         model = params.get('model', 'llama3')
-        temperature = params.get('temperature', 0.7)
+        temperature = params.get('temperature', DEFAULT_TEMPERATURE)
         max_tokens = params.get('max_tokens', 500)
         # Note: file_path is now handled by base class in _preprocess_params
         
@@ -188,10 +239,11 @@ class OllamaProvider(ProtocolProvider):
         
         logger.info(f"Chat with model {model} ({len(messages)} messages)")
         
+        stream = bool(params.get('stream', False))
         payload = {
             'model': model,
             'messages': messages,
-            'stream': False,
+            'stream': stream,
             'options': {
                 'temperature': temperature,
                 'num_predict': max_tokens
@@ -204,7 +256,13 @@ class OllamaProvider(ProtocolProvider):
             timeout=aiohttp.ClientTimeout(total=self.timeout)
         ) as response:
             if response.status == 200:
-                result = await response.json()
+                if stream:
+                    result = await self._read_stream(
+                        response, model, lambda chunk: chunk.get('message', {}).get('content', '')
+                    )
+                    result['message'] = {'role': 'assistant', 'content': result.pop('response')}
+                else:
+                    result = await response.json()
                 message = result.get('message', {})
                 return {
                     "response": message.get('content', ''),  # Standard field for workflow compatibility
@@ -226,9 +284,56 @@ class OllamaProvider(ProtocolProvider):
                     'prompt': prompt,
                     'model': model,
                     'temperature': temperature,
-                    'max_tokens': max_tokens
+                    'max_tokens': max_tokens,
+                    'stream': stream
                 })
     
+    async def _read_stream(
+        self,
+        response: aiohttp.ClientResponse,
+        model: str,
+        extract_text: Callable[[Dict[str, Any]], str]
+    ) -> Dict[str, Any]:
+        """
+        Read an Ollama NDJSON stream, reporting each chunk as partial output
+        
+        Args:
+            response: Streaming HTTP response
+            model: Model name included with partial output
+            extract_text: Returns the text contained in one stream object
+            
+        Returns:
+            Final stream object (with timing/token counts) whose 'response'
+            is the assembled text
+        """
+        parts = []
+        final: Dict[str, Any] = {}
+        
+        async for line in response.content:
+            line = line.strip()
+            if not line:
+                continue
+            
+            chunk = json.loads(line)
+            if chunk.get('error'):
+                raise ProviderError(
+                    f"Ollama stream error: {chunk['error']}",
+                    code=ErrorCode.PROVIDER_NOT_AVAILABLE,
+                    provider_id=self.provider_id
+                )
+            
+            text = extract_text(chunk)
+            if text:
+                parts.append(text)
+                await emit_partial_output(text, model=model, provider_id=self.provider_id)
+            
+            if chunk.get('done'):
+                final = chunk
+                break
+        
+        final['response'] = ''.join(parts)
+        return final
+    
     async def _analyze_vision(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze image using Ollama vision model"""
         # Support both 'prompt' and 'messages' format
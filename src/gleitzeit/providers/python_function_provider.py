@@ -13,12 +13,17 @@ import sys
 import json
 import pickle
 import base64
-import tempfile
-from typing import Dict, List, Any, Callable, Optional
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Dict, List, Any, Callable, Optional, Set, Union
 from pathlib import Path
 from datetime import datetime
 
 from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.providers.python_worker_pool import PythonWorkerPool
 from gleitzeit.core.errors import (
     ProviderError, InvalidParameterError, MethodNotSupportedError,
     ConfigurationError, ErrorCode
@@ -27,6 +32,39 @@ from gleitzeit.core.errors import (
 logger = logging.getLogger(__name__)
 
 
+class ExecutionClass(str, Enum):
+    """Where a registered function runs"""
+    INLINE = "inline"  # On the event loop (only for trivial functions)
+    THREAD = "thread"  # Dedicated bounded thread pool (I/O or GIL-releasing code)
+    PROCESS = "process"  # Process pool sized to cores (CPU-bound, picklable functions)
+
+
+class _PoolMetrics:
+    """Queue depth tracking for one executor"""
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.peak_queue_depth = 0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker"""
+        return max(0, self.in_flight - self.max_workers)
+    
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+
 class PythonFunctionProvider(ProtocolProvider):
     """
     Provider that executes Python functions as protocol methods
@@ -40,7 +78,14 @@ class PythonFunctionProvider(ProtocolProvider):
     - Function serialization/deserialization
     """
     
-    def __init__(self, provider_id: str = "python-function-1", allowed_modules: Optional[List[str]] = None):
+    def __init__(
+        self,
+        provider_id: str = "python-function-1",
+        allowed_modules: Optional[List[str]] = None,
+        worker_pool: Optional[PythonWorkerPool] = None,
+        thread_pool_size: int = 8,
+        process_pool_size: Optional[int] = None
+    ):
         super().__init__(
             provider_id=provider_id,
             protocol_id="python/v1",
@@ -50,6 +95,17 @@ class PythonFunctionProvider(ProtocolProvider):
         
         # Registry of available functions
         self.functions: Dict[str, Callable] = {}
+        # Execution class per sync function (async functions always run inline)
+        self.execution_classes: Dict[str, ExecutionClass] = {}
+        
+        # Executors for sync functions, created on first use
+        self._executors: Dict[ExecutionClass, Executor] = {}
+        # Calls submitted to the executors, cancelled on shutdown
+        self._pending_calls: Set[asyncio.Future] = set()
+        self._pool_metrics = {
+            ExecutionClass.THREAD: _PoolMetrics(thread_pool_size),
+            ExecutionClass.PROCESS: _PoolMetrics(process_pool_size or os.cpu_count() or 1)
+        }
         
         # Security: List of allowed modules to import from
         self.allowed_modules = allowed_modules or [
@@ -58,6 +114,9 @@ class PythonFunctionProvider(ProtocolProvider):
             "urllib.parse", "hashlib", "base64", "uuid"
         ]
         
+        # Warm worker processes for file execution (started on first use)
+        self.worker_pool = worker_pool or PythonWorkerPool()
+        
         # Register built-in functions
         self._register_builtin_functions()
     
@@ -95,26 +154,55 @@ class PythonFunctionProvider(ProtocolProvider):
     
     async def shutdown(self) -> None:
         """Shutdown the Python function provider"""
+        await self.worker_pool.shutdown()
+        # Calls that have not started yet are dropped (running ones finish)
+        for future in list(self._pending_calls):
+            future.cancel()
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        self._executors.clear()
         logger.info(f"Python function provider {self.provider_id} shutdown")
     
-    def register_function(self, name: str, func: Callable) -> None:
+    def register_function(
+        self,
+        name: str,
+        func: Callable,
+        execution_class: Union[ExecutionClass, str] = ExecutionClass.THREAD
+    ) -> None:
         """
         Register a Python function to be available as a method
         
         Args:
             name: Method name to register as
             func: Python function to execute
+            execution_class: Where sync calls run - inline, thread or process
         """
+        execution_class = ExecutionClass(execution_class)
+        if execution_class == ExecutionClass.PROCESS:
+            try:
+                pickle.dumps(func)
+            except Exception as e:
+                raise ConfigurationError(
+                    f"Function {name} cannot run in a process pool, it is not picklable: {e}"
+                )
+        
         self.functions[name] = func
-        logger.info(f"Registered function: {name}")
+        self.execution_classes[name] = execution_class
+        logger.info(f"Registered function: {name} ({execution_class.value})")
     
-    def register_module_functions(self, module_name: str, function_names: Optional[List[str]] = None) -> None:
+    def register_module_functions(
+        self,
+        module_name: str,
+        function_names: Optional[List[str]] = None,
+        execution_class: Union[ExecutionClass, str] = ExecutionClass.THREAD
+    ) -> None:
         """
         Register functions from a Python module
         
         Args:
             module_name: Name of the module to import from
             function_names: Specific functions to register (None = all)
+            execution_class: Where sync calls run - inline, thread or process
         """
         if module_name not in self.allowed_modules:
             raise ConfigurationError(
@@ -130,16 +218,14 @@ class PythonFunctionProvider(ProtocolProvider):
                     if hasattr(module, func_name):
                         func = getattr(module, func_name)
                         if callable(func):
-                            self.functions[f"{module_name}.{func_name}"] = func
-                            logger.info(f"Registered {module_name}.{func_name}")
+                            self.register_function(f"{module_name}.{func_name}", func, execution_class)
             else:
                 # Register all callable attributes
                 for attr_name in dir(module):
                     if not attr_name.startswith('_'):
                         attr = getattr(module, attr_name)
                         if callable(attr):
-                            self.functions[f"{module_name}.{attr_name}"] = attr
-                            logger.info(f"Registered {module_name}.{attr_name}")
+                            self.register_function(f"{module_name}.{attr_name}", attr, execution_class)
         
         except ImportError as e:
             logger.error(f"Failed to import module {module_name}: {e}")
@@ -205,7 +291,8 @@ class PythonFunctionProvider(ProtocolProvider):
                     "name": func_name,
                     "doc": func.__doc__,
                     "signature": str(inspect.signature(func)) if hasattr(func, '__code__') else "N/A",
-                    "is_async": inspect.iscoroutinefunction(func)
+                    "is_async": inspect.iscoroutinefunction(func),
+                    "execution_class": self.execution_classes.get(func_name, ExecutionClass.THREAD).value
                 }
             else:
                 raise InvalidParameterError(
@@ -226,11 +313,7 @@ class PythonFunctionProvider(ProtocolProvider):
             raise MethodNotSupportedError(method, self.provider_id)
     
     async def _execute_file(self, params: Dict[str, Any]) -> Any:
-        """Execute a Python file"""
-        import subprocess
-        import sys
-        from pathlib import Path
-        
+        """Execute a Python file in a warm worker process"""
         # Get file path (support both 'file' and 'file_path' parameters)
         file_path = params.get('file') or params.get('file_path')
         if not file_path:
@@ -250,83 +333,7 @@ class PythonFunctionProvider(ProtocolProvider):
         context = params.get('context', {})
         
         try:
-            # Execute the Python file
-            # Create a temporary script that sets up context and executes the file
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                # Write context setup
-                temp_file.write("import json\n")
-                # Use repr to preserve the actual Python objects
-                temp_file.write(f"context = {repr(context)}\n")
-                temp_file.write("result = None\n")
-                temp_file.write(f"exec(open('{file_path}').read())\n")
-                temp_file.write("if 'result' in locals():\n")
-                temp_file.write("    if isinstance(result, (dict, list)):\n")
-                temp_file.write("        print(json.dumps(result))\n")
-                temp_file.write("    else:\n")
-                temp_file.write("        print(result)\n")
-                temp_file_path = temp_file.name
-            
-            # Run the script
-            process = await asyncio.create_subprocess_exec(
-                sys.executable, temp_file_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            # Wait for completion with timeout
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(), 
-                    timeout=timeout
-                )
-            finally:
-                # Clean up temp file
-                Path(temp_file_path).unlink(missing_ok=True)
-            
-            # Parse result
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Python execution failed"
-                logger.error(f"Python file execution failed: {error_msg}")
-                return {
-                    "file": file_path,
-                    "error": error_msg,
-                    "success": False,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            
-            # Parse stdout
-            stdout_text = stdout.decode().strip()
-            
-            # Split stdout into output lines and potential JSON result
-            output_lines = []
-            json_result = None
-            
-            for line in stdout_text.split('\n'):
-                if line.strip().startswith('{') or line.strip().startswith('['):
-                    try:
-                        json_result = json.loads(line.strip())
-                        break  # Found JSON result, stop looking
-                    except json.JSONDecodeError:
-                        output_lines.append(line)
-                else:
-                    output_lines.append(line)
-            
-            # Determine the result value
-            if json_result:
-                # Return the actual object, not a string representation
-                result = json_result
-            else:
-                # Use the last non-empty line as result if no JSON found
-                result = output_lines[-1] if output_lines else ""
-            
-            return {
-                "result": result,  # Primary result (actual object if JSON, string otherwise)
-                "output": '\n'.join(output_lines),  # Full stdout
-                "success": True,
-                "execution_time": timeout  # Will be replaced with actual time later
-            }
-            
+            response = await self.worker_pool.execute(str(Path(file_path).resolve()), context, timeout)
         except asyncio.TimeoutError:
             logger.error(f"Python file execution timed out after {timeout} seconds: {file_path}")
             return {
@@ -343,6 +350,23 @@ class PythonFunctionProvider(ProtocolProvider):
                 "success": False,
                 "timestamp": datetime.utcnow().isoformat()
             }
+        
+        if not response["success"]:
+            logger.error(f"Python file execution failed: {response['error']}")
+            return {
+                "file": file_path,
+                "error": response["error"],
+                "output": response["output"],
+                "success": False,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        
+        return {
+            "result": response["result"],  # Actual object for dict/list results, string otherwise
+            "output": response["output"],  # Everything the file printed
+            "success": True,
+            "execution_time": response["execution_time"]
+        }
     
     async def _execute_function(self, params: Dict[str, Any]) -> Any:
         """Execute a registered function"""
@@ -370,12 +394,8 @@ class PythonFunctionProvider(ProtocolProvider):
             if inspect.iscoroutinefunction(func):
                 result = await func(*args, **kwargs)
             else:
-                # Run sync function in executor to avoid blocking
-                loop = asyncio.get_event_loop()
-                # Create a wrapper function that properly handles args and kwargs
-                from functools import partial
-                func_with_args = partial(func, *args, **kwargs)
-                result = await loop.run_in_executor(None, func_with_args)
+                execution_class = self.execution_classes.get(func_name, ExecutionClass.THREAD)
+                result = await self._run_sync(execution_class, partial(func, *args, **kwargs))
             
             return {
                 "function": func_name,
@@ -393,6 +413,53 @@ class PythonFunctionProvider(ProtocolProvider):
                 "timestamp": datetime.utcnow().isoformat()
             }
     
+    async def _run_sync(self, execution_class: ExecutionClass, call: Callable[[], Any]) -> Any:
+        """Run a sync call according to its execution class"""
+        if execution_class == ExecutionClass.INLINE:
+            return call()
+        
+        metrics = self._pool_metrics[execution_class]
+        metrics.in_flight += 1
+        metrics.peak_queue_depth = max(metrics.peak_queue_depth, metrics.queue_depth)
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(execution_class), call)
+            self._pending_calls.add(future)
+            future.add_done_callback(self._pending_calls.discard)
+            result = await future
+        except BaseException:
+            # Raised and cancelled calls
+            metrics.failed += 1
+            raise
+        finally:
+            metrics.in_flight -= 1
+        metrics.completed += 1
+        return result
+    
+    def _get_executor(self, execution_class: ExecutionClass) -> Executor:
+        executor = self._executors.get(execution_class)
+        if executor is None:
+            max_workers = self._pool_metrics[execution_class].max_workers
+            if execution_class == ExecutionClass.PROCESS:
+                # Forking a process that runs an event loop and holds
+                # locks, sockets and threads is unsafe; start clean workers
+                executor = ProcessPoolExecutor(
+                    max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=f"{self.provider_id}-fn"
+                )
+            self._executors[execution_class] = executor
+        return executor
+    
+    def get_execution_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get queue depth metrics per executor pool"""
+        return {
+            execution_class.value: metrics.to_dict()
+            for execution_class, metrics in self._pool_metrics.items()
+        }
+    
     async def _register_dynamic_function(self, params: Dict[str, Any]) -> Any:
         """Dynamically register a new function"""
         func_name = params.get("name")
@@ -408,7 +475,9 @@ class PythonFunctionProvider(ProtocolProvider):
             if module_name in self.allowed_modules:
                 module = importlib.import_module(module_name)
                 func = getattr(module, function_name)
-                self.register_function(func_name, func)
+                self.register_function(
+                    func_name, func, params.get("execution_class", ExecutionClass.THREAD)
+                )
             else:
                 raise ConfigurationError(
                     f"Module {module_name} not allowed"
@@ -484,6 +553,8 @@ class PythonFunctionProvider(ProtocolProvider):
             "status": "healthy",
             "details": f"Python function provider with {len(self.functions)} registered functions",
             "provider_id": self.provider_id,
+            "worker_pool": self.worker_pool.get_stats(),
+            "executors": self.get_execution_stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
     
@@ -500,8 +571,9 @@ class CustomFunctionProvider(PythonFunctionProvider):
     """
     
     def __init__(self, provider_id: str = "custom-python-1", 
-                 functions_dir: Optional[Path] = None):
-        super().__init__(provider_id=provider_id)
+                 functions_dir: Optional[Path] = None,
+                 worker_pool: Optional[PythonWorkerPool] = None):
+        super().__init__(provider_id=provider_id, worker_pool=worker_pool)
         
         self.functions_dir = functions_dir or Path.home() / ".gleitzeit" / "functions"
         self.functions_dir.mkdir(parents=True, exist_ok=True)
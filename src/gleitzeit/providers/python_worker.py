@@ -0,0 +1,145 @@
+"""
+Python Worker Process for Gleitzeit V4
+
+Long-lived worker started by PythonWorkerPool. It only uses the standard
+library, so it runs as a plain script without gleitzeit on its path; the
+frame helpers in gleitzeit/core/worker_ipc.py are loaded from their file
+without importing the gleitzeit package.
+
+Jobs and responses are length-prefixed JSON frames on stdin/stdout. The
+original stdout is reserved for frames; anything a job prints is captured
+per job and returned in the response.
+
+Jobs share a process, so isolation between them is partial: the working
+directory, os.environ and sys.path are restored after every job, but
+module-level state persists. Modules imported by one job stay loaded for
+the next, along with their globals and any monkeypatches a job applied.
+"""
+
+import builtins
+import contextlib
+import importlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+WORKER_IPC_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "core", "worker_ipc.py"
+)
+
+
+def load_worker_ipc():
+    """Load gleitzeit/core/worker_ipc.py without importing the gleitzeit package"""
+    spec = importlib.util.spec_from_file_location("_gleitzeit_worker_ipc", WORKER_IPC_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def max_rss_kb():
+    """Peak resident set size of this process in KB (None if unknown)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, KB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@contextlib.contextmanager
+def restored_process_state():
+    """Undo a job's changes to the working directory, environment and sys.path"""
+    cwd = os.getcwd()
+    environ = dict(os.environ)
+    path = list(sys.path)
+    try:
+        yield
+    finally:
+        try:
+            os.chdir(cwd)
+        except OSError as e:
+            print(f"Could not restore working directory {cwd}: {e}", file=sys.stderr)
+        if os.environ != environ:
+            os.environ.clear()
+            os.environ.update(environ)
+        sys.path[:] = path
+
+
+def run_job(job):
+    """
+    Execute a Python file with a context and collect its result
+
+    The job's working directory, environment and sys.path changes are
+    undone afterwards; module-level state it changes is not.
+    """
+    file_path = job["file"]
+    namespace = {
+        "__name__": "__main__",
+        "__file__": file_path,
+        "__builtins__": builtins,
+        "json": json,
+        "context": job.get("context") or {},
+        "result": None
+    }
+    output = io.StringIO()
+    success = True
+    error = None
+
+    start = time.perf_counter()
+    with restored_process_state(), contextlib.redirect_stdout(output):
+        try:
+            with open(file_path) as f:
+                code = compile(f.read(), file_path, "exec")
+            exec(code, namespace)
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                success = False
+                error = f"SystemExit: {e.code}"
+        except Exception:
+            success = False
+            error = traceback.format_exc()
+    execution_time = time.perf_counter() - start
+
+    result = namespace.get("result")
+    if not isinstance(result, (dict, list)):
+        result = str(result)
+
+    return {
+        "success": success,
+        "result": result if success else None,
+        "output": output.getvalue(),
+        "error": error,
+        "execution_time": execution_time,
+        "max_rss_kb": max_rss_kb()
+    }
+
+
+def main():
+    """Serve jobs until stdin is closed"""
+    worker_ipc = load_worker_ipc()
+    channel_in = sys.stdin.buffer
+    channel_out = worker_ipc.reserve_stdout()
+
+    for module_name in sys.argv[1:]:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"Failed to preload {module_name}: {e}", file=sys.stderr)
+
+    while True:
+        job = worker_ipc.read_frame_blocking(channel_in)
+        if job is None:
+            break
+        worker_ipc.write_frame_blocking(channel_out, run_job(job))
+
+
+if __name__ == "__main__":
+    main()
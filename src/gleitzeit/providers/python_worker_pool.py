@@ -0,0 +1,191 @@
+"""
+Python Worker Pool for Gleitzeit V4
+
+Keeps long-lived Python worker processes (see python_worker.py) ready for
+python/v1 file execution, so interpreter startup and module imports are
+paid once per worker instead of once per task.
+
+- Jobs are sent over pipes as length-prefixed JSON frames (see
+  gleitzeit/core/worker_ipc.py, shared with the engine worker pool)
+- A job exceeding its timeout kills its worker; a fresh one replaces it
+- Workers are recycled after a number of jobs or above a memory ceiling
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from gleitzeit.core.worker_ipc import WorkerProcess, encode_frame, read_frame
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = str(Path(__file__).with_name("python_worker.py"))
+
+
+class WorkerCrashedError(Exception):
+    """Worker process exited while running a job"""
+
+
+class _Worker(WorkerProcess):
+    """A single worker process and its pipes"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        super().__init__(process)
+        self.jobs_done = 0
+        self.max_rss_kb: Optional[int] = None
+
+    async def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a job and wait for its response"""
+        try:
+            self.process.stdin.write(encode_frame(job))
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise WorkerCrashedError(f"Python worker exited unexpectedly: {e}") from e
+        response = await read_frame(self.process.stdout)
+        if response is None:
+            raise WorkerCrashedError(
+                f"Python worker exited unexpectedly (exit code {await self.process.wait()})"
+            )
+
+        self.jobs_done += 1
+        self.max_rss_kb = response.pop("max_rss_kb", None)
+        return response
+
+    async def stop(self, grace_period: float = 1.0) -> None:
+        """Ask the worker to exit, killing it if it does not"""
+        await super().stop(grace_period)
+
+
+class PythonWorkerPool:
+    """
+    Pool of warm Python worker processes
+
+    Workers are started on demand up to ``size`` and reused across jobs.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs_per_worker: Optional[int] = 500,
+        max_memory_mb: Optional[float] = None,
+        preload_modules: Optional[List[str]] = None
+    ):
+        """
+        Initialize the worker pool
+
+        Args:
+            size: Maximum number of worker processes
+            max_jobs_per_worker: Jobs after which a worker is replaced (None for no limit)
+            max_memory_mb: Peak RSS above which a worker is replaced (None for no limit)
+            preload_modules: Modules imported when a worker starts (e.g. "pandas")
+        """
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_memory_mb = max_memory_mb
+        self.preload_modules = preload_modules or []
+
+        self._idle: List[_Worker] = []
+        self._workers: Set[_Worker] = set()
+        self._slots = asyncio.Semaphore(size)
+
+        self.jobs_completed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.workers_started = 0
+        self.workers_recycled = 0
+
+    async def execute(self, file_path: str, context: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Run a Python file in a worker
+
+        Args:
+            file_path: Python file to execute
+            context: JSON serializable variables exposed as ``context``
+            timeout: Seconds before the worker is killed
+
+        Returns:
+            Worker response with success, result, output, error and execution_time
+
+        Raises:
+            asyncio.TimeoutError: The job exceeded its timeout
+            WorkerCrashedError: The worker died during the job
+        """
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else await self._start_worker()
+            try:
+                response = await asyncio.wait_for(
+                    worker.run({"file": file_path, "context": context}),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                await self._discard(worker)
+                raise
+            except WorkerCrashedError:
+                self.crashes += 1
+                await self._discard(worker)
+                raise
+            except BaseException:
+                # Cancelled mid-job: the worker's pipe state is unknown
+                await self._discard(worker)
+                raise
+
+            self.jobs_completed += 1
+            if self._should_recycle(worker):
+                self.workers_recycled += 1
+                await self._discard(worker, graceful=True)
+            else:
+                self._idle.append(worker)
+            return response
+
+    async def shutdown(self) -> None:
+        """Stop all workers"""
+        workers = list(self._workers)
+        self._idle.clear()
+        self._workers.clear()
+        await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            "size": self.size,
+            "workers": len(self._workers),
+            "idle_workers": len(self._idle),
+            "jobs_completed": self.jobs_completed,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "workers_started": self.workers_started,
+            "workers_recycled": self.workers_recycled
+        }
+
+    def _should_recycle(self, worker: _Worker) -> bool:
+        if not worker.alive:
+            return True
+        if self.max_jobs_per_worker is not None and worker.jobs_done >= self.max_jobs_per_worker:
+            return True
+        return (
+            self.max_memory_mb is not None
+            and worker.max_rss_kb is not None
+            and worker.max_rss_kb / 1024 > self.max_memory_mb
+        )
+
+    async def _start_worker(self) -> _Worker:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, WORKER_SCRIPT, *self.preload_modules,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE
+        )
+        worker = _Worker(process)
+        self._workers.add(worker)
+        self.workers_started += 1
+        logger.debug(f"Started Python worker pid={process.pid}")
+        return worker
+
+    async def _discard(self, worker: _Worker, graceful: bool = False) -> None:
+        self._workers.discard(worker)
+        if graceful:
+            await worker.stop()
+        else:
+            await worker.kill()
@@ -0,0 +1,290 @@
+"""
+Response Cache for Gleitzeit V4
+
+Content-addressed cache for provider responses. Requests are keyed by a
+canonical hash of the method and its (preprocessed) parameters, so file
+contents inlined by ``_preprocess_params`` are part of the key.
+
+Two tiers:
+- Memory: bounded LRU of recently used responses
+- Disk (optional): SQLite table surviving restarts, bounded by entry count
+
+The disk tier is best effort: SQLite errors (a locked database, a full
+disk, a corrupt file) are logged and count as a miss or a skipped write,
+never as a failed request.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+# Params that change how a response is delivered or cached, not its content
+NON_CONTENT_PARAMS = frozenset({"stream", "cache"})
+
+# Disk hits whose access times are written in one batch
+ACCESS_FLUSH_EVERY = 100
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache for provider responses
+
+    Sampling at temperature > 0 is non-deterministic, so such requests are
+    only cached when they opt in with ``cache: true``; ``cache: false``
+    disables caching for a request entirely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        max_disk_entries: Optional[int] = 100000
+    ):
+        """
+        Initialize the response cache
+
+        Args:
+            max_entries: Responses kept in memory
+            ttl: Seconds a response stays valid (None for no expiry)
+            disk_path: SQLite file for the disk tier (None for memory only)
+            max_disk_entries: Responses kept on disk (None for unbounded)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.max_disk_entries = max_disk_entries
+
+        # key -> (stored_at, response)
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._db: Optional[aiosqlite.Connection] = None
+        self._disk_writes = 0
+        # key -> last access time of disk hits, written in batches
+        self._pending_access: Dict[str, float] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def is_cacheable(params: Dict[str, Any], default_temperature: float = 0.0) -> bool:
+        """
+        Check if a request may be answered from the cache
+
+        Args:
+            params: Method parameters
+            default_temperature: Temperature the provider uses when none is given
+        """
+        opt_in = params.get("cache")
+        if opt_in is not None:
+            return bool(opt_in)
+        return not params.get("temperature", default_temperature)
+
+    @staticmethod
+    def make_key(method: str, params: Dict[str, Any]) -> str:
+        """
+        Build the content address of a request
+
+        Args:
+            method: Method name
+            params: Preprocessed method parameters
+
+        Returns:
+            SHA-256 hex digest of the canonical request
+        """
+        content = {k: v for k, v in params.items() if k not in NON_CONTENT_PARAMS}
+        canonical = json.dumps(
+            {"method": method, "params": content},
+            sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a response
+
+        Args:
+            key: Request key from make_key
+
+        Returns:
+            Cached response or None
+        """
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if not self._is_expired(entry[0], now):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            del self._memory[key]
+
+        if self.disk_path:
+            try:
+                db = await self._connect()
+                async with db.execute(
+                    "SELECT stored_at, response FROM response_cache WHERE key = ?", (key,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+                if row and not self._is_expired(row[0], now):
+                    response = json.loads(row[1])
+                    self._remember(key, row[0], response)
+                    self.disk_hits += 1
+                    # Access times only order the size trim; batch them
+                    # instead of committing on every hit
+                    self._pending_access[key] = now
+                    if len(self._pending_access) >= ACCESS_FLUSH_EVERY:
+                        await self._flush_access_times()
+                        await db.commit()
+                    return response
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache read failed, treating as a miss: {e}")
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, response: Any) -> None:
+        """
+        Store a response in both tiers
+
+        Args:
+            key: Request key from make_key
+            response: JSON serializable response
+        """
+        now = time.time()
+        self._remember(key, now, response)
+
+        if self.disk_path:
+            try:
+                db = await self._connect()
+                await db.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, response, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(response, default=str), now, now)
+                )
+                self._pending_access.pop(key, None)
+                await self._flush_access_times()
+                self._disk_writes += 1
+                # Trim the disk tier periodically rather than on every write
+                if self._disk_writes % 100 == 0:
+                    await self._trim_disk(now)
+                await db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache write skipped: {e}")
+
+    async def clear(self) -> None:
+        """Remove all cached responses"""
+        self._memory.clear()
+        self._pending_access.clear()
+        if self.disk_path:
+            try:
+                db = await self._connect()
+                await db.execute("DELETE FROM response_cache")
+                await db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache disk tier could not be cleared: {e}")
+
+    async def close(self) -> None:
+        """Close the disk tier"""
+        if self._db:
+            try:
+                await self._flush_access_times()
+                await self._trim_disk(time.time())
+                await self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache disk tier not trimmed on close: {e}")
+            finally:
+                await self._db.close()
+                self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "disk_path": self.disk_path
+        }
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _remember(self, key: str, stored_at: float, response: Any) -> None:
+        """Add a response to the memory tier, evicting least recently used"""
+        self._memory[key] = (stored_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open the disk tier on first use (raises sqlite3.Error if it cannot be opened)"""
+        if self._db is None:
+            try:
+                Path(self.disk_path).parent.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                raise sqlite3.OperationalError(f"cannot create {self.disk_path}: {e}") from e
+            db = await aiosqlite.connect(self.disk_path)
+            try:
+                await self._init_db(db)
+            except sqlite3.Error:
+                await db.close()
+                raise
+            self._db = db
+        return self._db
+
+    @staticmethod
+    async def _init_db(db: aiosqlite.Connection) -> None:
+        """Create the cache table"""
+        # Several worker processes may share the file; wait for their locks
+        await db.execute("PRAGMA busy_timeout=5000")
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_accessed ON response_cache(accessed_at)"
+        )
+        await db.commit()
+
+    async def _flush_access_times(self) -> None:
+        """Write batched access times of disk hits (committed by the caller)"""
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
+        await self._db.executemany(
+            "UPDATE response_cache SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in pending.items()]
+        )
+
+    async def _trim_disk(self, now: float) -> None:
+        """Apply TTL and size limits to the disk tier"""
+        if self.ttl is not None:
+            await self._db.execute(
+                "DELETE FROM response_cache WHERE stored_at < ?", (now - self.ttl,)
+            )
+        if self.max_disk_entries is not None:
+            await self._db.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
@@ -5,19 +5,35 @@ Centralized registry for protocols and their providers,
 with discovery, validation, and routing capabilities.
 """
 
-from typing import Dict, List, Set, Optional, Any, Type
+from typing import Callable, Dict, Iterable, List, Set, Optional, Any, Tuple, Type
 from dataclasses import dataclass, field
 from datetime import datetime
+import copy
+import hashlib
+import json
 import logging
 import asyncio
+import random
+import time
 from enum import Enum
 
 from gleitzeit.core.protocol import ProtocolSpec, get_protocol_registry
 from gleitzeit.core.jsonrpc import JSONRPCRequest, JSONRPCResponse
 from gleitzeit.core.errors import ErrorCode, ProtocolError, ProviderNotFoundError
+from gleitzeit.core.phase_timing import PhaseTimings
 
 logger = logging.getLogger(__name__)
 
+# Protocols whose methods are free of side effects, so identical concurrent
+# requests can safely share one execution
+DEFAULT_SINGLE_FLIGHT_PROTOCOLS = frozenset({"llm/v1", "mcp/v1"})
+
+# Requests carrying an inline payload (e.g. base64 images) larger than this
+# run on their own; keying them would cost more than the coalescing saves
+SINGLE_FLIGHT_MAX_PAYLOAD_CHARS = 64 * 1024
+
+_SINGLE_FLIGHT_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
 
 class ProviderStatus(str, Enum):
     """Provider status states"""
@@ -28,6 +44,12 @@ class ProviderStatus(str, Enum):
     DISCONNECTED = "disconnected"
 
 
+class LoadBalancingStrategy(str, Enum):
+    """Provider selection strategies"""
+    LEAST_OUTSTANDING = "least_outstanding"  # Fewest in-flight requests
+    POWER_OF_TWO = "power_of_two"  # Less loaded of two random candidates
+
+
 @dataclass
 class ProviderInfo:
     """Information about a registered protocol provider"""
@@ -48,13 +70,24 @@ class ProviderInfo:
     average_response_time: float = 0.0
     
     # Configuration
-    max_concurrent_requests: int = 10
+    max_concurrent_requests: Optional[int] = None  # None for unlimited
     timeout_seconds: int = 30
     
     # Health check
     health_check_interval: int = 60
     consecutive_failures: int = 0
     
+    # Load balancing
+    in_flight: int = 0
+    
+    # Called with the provider ID when the status changes (set by the registry)
+    status_listener: Optional[Callable[[str], None]] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def has_capacity(self) -> bool:
+        """Check if provider can accept another request"""
+        return self.max_concurrent_requests is None or self.in_flight < self.max_concurrent_requests
+    
     @property
     def success_rate(self) -> float:
         """Calculate success rate as percentage"""
@@ -87,14 +120,83 @@ class ProviderInfo:
         )
 
 
+def _get_provider_status(info: ProviderInfo) -> ProviderStatus:
+    return info._status
+
+
+def _set_provider_status(info: ProviderInfo, value: ProviderStatus) -> None:
+    changed = info.__dict__.get("_status") != value
+    info._status = value
+    # The listener is not set yet while the dataclass __init__ runs
+    listener = info.__dict__.get("status_listener")
+    if changed and listener:
+        listener(info.provider_id)
+
+
+# A property (installed after the dataclass is built, so ``status`` stays an
+# init field) notifies the registry of status changes without intercepting
+# the hot-path counter writes
+ProviderInfo.status = property(_get_provider_status, _set_provider_status)
+
+
+def _has_large_payload(params: Any, limit: int = SINGLE_FLIGHT_MAX_PAYLOAD_CHARS) -> bool:
+    """Check if params carry inline strings (e.g. base64 images) totalling more than limit characters"""
+    pending = [params]
+    total = 0
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (str, bytes)):
+            total += len(value)
+            if total > limit:
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
 class ProtocolProviderRegistry:
     """Registry for protocol providers with health monitoring and load balancing"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        load_balancing: LoadBalancingStrategy = LoadBalancingStrategy.LEAST_OUTSTANDING,
+        single_flight_protocols: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize the registry
+        
+        Args:
+            load_balancing: How requests are spread across providers of a protocol
+            single_flight_protocols: Protocols whose identical concurrent requests
+                share one execution (e.g. DEFAULT_SINGLE_FLIGHT_PROTOCOLS)
+        """
         self.protocol_registry = get_protocol_registry()
         self.providers: Dict[str, ProviderInfo] = {}  # provider_id -> info
         self.protocol_providers: Dict[str, Set[str]] = {}  # protocol_id -> set of provider_ids
         self.provider_instances: Dict[str, Any] = {}  # provider_id -> instance
+        self.load_balancing = LoadBalancingStrategy(load_balancing)
+        
+        # (protocol_id, method) -> healthy providers supporting the method;
+        # rebuilt lazily after register/unregister or a status change
+        self._candidate_cache: Dict[Tuple[str, Optional[str]], List[ProviderInfo]] = {}
+        # Requests waiting for a provider with free capacity
+        self._capacity_available = asyncio.Condition()
+        self._capacity_waiters = 0
+        
+        # Single-flight coalescing: request key -> response future of the leader
+        self.single_flight_protocols: Set[str] = set(single_flight_protocols or ())
+        self._in_flight_requests: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self.coalesced_requests = 0
+        
+        # Per-(protocol, method) histograms of request phases; shared with the
+        # execution engine, which adds the task-level phases
+        self.phase_timings = PhaseTimings()
+        
+        # Resources shared by several providers (response caches, image
+        # preparers) are closed once, after every provider has been cleaned up
+        self._shared_cleanups: List[Callable[[], Any]] = []
         
         # Health monitoring
         # Event-driven health tracking instead of polling task
@@ -125,8 +227,29 @@ class ProtocolProviderRegistry:
         
         # Clear the instances after cleanup
         self.provider_instances.clear()
+        
+        cleanups, self._shared_cleanups = self._shared_cleanups, []
+        for cleanup in cleanups:
+            try:
+                result = cleanup()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"❌ Failed to release shared provider resource: {e}")
         logger.info("Provider cleanup completed")
     
+    def add_shared_cleanup(self, cleanup: Callable[[], Any]) -> None:
+        """
+        Release a resource shared by several providers when the registry stops
+        
+        Providers do not close resources they were handed, so whoever creates
+        a shared resource registers its close/shutdown here to run exactly once.
+        
+        Args:
+            cleanup: Callable (sync or async) releasing the resource
+        """
+        self._shared_cleanups.append(cleanup)
+    
     def register_protocol(self, protocol: ProtocolSpec) -> None:
         """Register a protocol specification"""
         self.protocol_registry.register(protocol)
@@ -142,7 +265,8 @@ class ProtocolProviderRegistry:
         provider_id: str,
         protocol_id: str,
         provider_instance: Any,
-        supported_methods: Optional[Set[str]] = None
+        supported_methods: Optional[Set[str]] = None,
+        max_concurrent_requests: Optional[int] = None
     ) -> None:
         """
         Register a protocol provider instance
@@ -152,6 +276,7 @@ class ProtocolProviderRegistry:
             protocol_id: Protocol this provider implements
             provider_instance: The actual provider instance
             supported_methods: Methods this provider supports (auto-detected if None)
+            max_concurrent_requests: Requests this provider may run at once (None for unlimited)
         """
         # Validate protocol exists
         protocol = self.protocol_registry.get(protocol_id)
@@ -172,8 +297,10 @@ class ProtocolProviderRegistry:
             protocol_id=protocol_id,
             provider_class=provider_instance.__class__.__name__,
             supported_methods=supported_methods,
-            status=ProviderStatus.HEALTHY  # Start as healthy for now
+            status=ProviderStatus.HEALTHY,  # Start as healthy for now
+            max_concurrent_requests=max_concurrent_requests
         )
+        provider_info.status_listener = self._on_provider_status_change
         
         # Register provider
         self.providers[provider_id] = provider_info
@@ -183,6 +310,7 @@ class ProtocolProviderRegistry:
         if protocol_id not in self.protocol_providers:
             self.protocol_providers[protocol_id] = set()
         self.protocol_providers[protocol_id].add(provider_id)
+        self._invalidate_candidates(protocol_id)
         
         logger.info(f"Registered provider: {provider_id} for protocol {protocol_id}")
     
@@ -202,9 +330,16 @@ class ProtocolProviderRegistry:
         # Remove from mappings
         del self.providers[provider_id]
         self.provider_instances.pop(provider_id, None)
+        provider_info.status_listener = None
         
         if protocol_id in self.protocol_providers:
             self.protocol_providers[protocol_id].discard(provider_id)
+        self._invalidate_candidates(protocol_id)
+        
+        # Let waiting requests re-evaluate the remaining providers
+        if self._capacity_waiters:
+            async with self._capacity_available:
+                self._capacity_available.notify_all()
         
         logger.info(f"Unregistered provider: {provider_id}")
     
@@ -235,23 +370,7 @@ class ProtocolProviderRegistry:
         Returns:
             List of healthy providers that support the protocol/method
         """
-        provider_ids = self.protocol_providers.get(protocol_id, set())
-        providers = []
-        
-        for provider_id in provider_ids:
-            provider_info = self.providers.get(provider_id)
-            if not provider_info:
-                continue
-            
-            # Check if provider is healthy
-            if not provider_info.is_healthy:
-                continue
-            
-            # Check if provider supports the specific method
-            if method and method not in provider_info.supported_methods:
-                continue
-            
-            providers.append(provider_info)
+        providers = list(self._get_candidates(protocol_id, method))
         
         # Sort by success rate and response time
         providers.sort(key=lambda p: (-p.success_rate, p.average_response_time))
@@ -260,23 +379,103 @@ class ProtocolProviderRegistry:
     
     def select_provider(self, protocol_id: str, method: str) -> Optional[ProviderInfo]:
         """
-        Select the best provider for a protocol/method using load balancing
+        Select a provider for a protocol/method using load balancing
         
         Args:
             protocol_id: Protocol identifier
             method: Method name
             
         Returns:
-            Selected provider info or None if no providers available
+            Selected provider info or None if no provider has free capacity
         """
-        providers = self.get_providers_for_protocol(protocol_id, method)
+        candidates = self._get_candidates(protocol_id, method)
+        if not candidates:
+            return None
+        
+        if len(candidates) == 1:
+            provider = candidates[0]
+            return provider if provider.has_capacity else None
         
-        if not providers:
+        if self.load_balancing == LoadBalancingStrategy.POWER_OF_TWO and len(candidates) > 2:
+            first, second = random.sample(candidates, 2)
+            provider = min((first, second), key=self._load_key)
+            if provider.has_capacity:
+                return provider
+            # Both samples are saturated; fall back to a full scan
+        
+        available = [p for p in candidates if p.has_capacity]
+        if not available:
             return None
+        return min(available, key=self._load_key)
+    
+    @staticmethod
+    def _load_key(provider: ProviderInfo) -> Tuple[float, int]:
+        """Least outstanding requests first, spreading ties by request count"""
+        if provider.max_concurrent_requests:
+            load = provider.in_flight / provider.max_concurrent_requests
+        else:
+            load = float(provider.in_flight)
+        return (load, provider.total_requests)
+    
+    def _get_candidates(self, protocol_id: str, method: Optional[str]) -> List[ProviderInfo]:
+        """Get cached healthy providers supporting a protocol/method"""
+        key = (protocol_id, method)
+        candidates = self._candidate_cache.get(key)
+        if candidates is None:
+            candidates = [
+                provider_info
+                for provider_info in (
+                    self.providers.get(provider_id)
+                    for provider_id in sorted(self.protocol_providers.get(protocol_id, ()))
+                )
+                if provider_info and provider_info.is_healthy and
+                (not method or method in provider_info.supported_methods)
+            ]
+            self._candidate_cache[key] = candidates
+        return candidates
+    
+    def _invalidate_candidates(self, protocol_id: str) -> None:
+        """Drop cached candidate lists for a protocol"""
+        for key in [key for key in self._candidate_cache if key[0] == protocol_id]:
+            del self._candidate_cache[key]
+    
+    def _on_provider_status_change(self, provider_id: str) -> None:
+        """Invalidate cached candidates when a provider's health changes"""
+        provider_info = self.providers.get(provider_id)
+        if provider_info:
+            self._invalidate_candidates(provider_info.protocol_id)
+    
+    async def _acquire_provider(self, protocol_id: str, method: str) -> Optional[ProviderInfo]:
+        """
+        Reserve a provider slot, waiting while all providers are at capacity
         
-        # Simple load balancing: select provider with best performance
-        # In production, could use more sophisticated algorithms
-        return providers[0]
+        Returns:
+            Provider with its in-flight counter incremented, or None if no
+            healthy provider supports the method
+        """
+        provider_info = self.select_provider(protocol_id, method)
+        if provider_info is None and self._get_candidates(protocol_id, method):
+            self._capacity_waiters += 1
+            try:
+                async with self._capacity_available:
+                    while True:
+                        provider_info = self.select_provider(protocol_id, method)
+                        if provider_info or not self._get_candidates(protocol_id, method):
+                            break
+                        await self._capacity_available.wait()
+            finally:
+                self._capacity_waiters -= 1
+        
+        if provider_info:
+            provider_info.in_flight += 1
+        return provider_info
+    
+    async def _release_provider(self, provider_info: ProviderInfo) -> None:
+        """Release a provider slot and wake requests waiting for capacity"""
+        provider_info.in_flight -= 1
+        if self._capacity_waiters:
+            async with self._capacity_available:
+                self._capacity_available.notify_all()
     
     def get_provider_instance(self, provider_id: str) -> Optional[Any]:
         """Get provider instance by ID"""
@@ -285,7 +484,8 @@ class ProtocolProviderRegistry:
     async def execute_request(
         self, 
         protocol_id: str,
-        request: JSONRPCRequest
+        request: JSONRPCRequest,
+        prevalidated: bool = False
     ) -> JSONRPCResponse:
         """
         Execute a JSON-RPC request using the best available provider
@@ -293,19 +493,107 @@ class ProtocolProviderRegistry:
         Args:
             protocol_id: Protocol to use
             request: JSON-RPC request
+            prevalidated: Params were already validated against the protocol;
+                validation is skipped unless preprocessing rewrites them
             
         Returns:
             JSON-RPC response
         """
-        # Select provider
-        provider_info = self.select_provider(protocol_id, request.method)
+        key = self._single_flight_key(protocol_id, request)
+        if key is None:
+            return await self._execute_request(protocol_id, request, prevalidated)
+        
+        leader = self._in_flight_requests.get(key)
+        if leader is not None:
+            self.coalesced_requests += 1
+            logger.debug(f"Coalescing {request.method} request {request.id} with an identical in-flight request")
+            try:
+                response = await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise
+                # The leader was cancelled, not us - execute on our own
+                return await self._execute_request(protocol_id, request, prevalidated)
+            return JSONRPCResponse(
+                id=request.id,
+                result=copy.deepcopy(response.result),
+                error=response.error
+            )
+        
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; mark exceptions as retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight_requests[key] = future
+        try:
+            response = await self._execute_request(protocol_id, request, prevalidated)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._in_flight_requests[key]
+    
+    def set_single_flight(self, protocol_id: str, enabled: bool = True) -> None:
+        """
+        Enable or disable coalescing of identical concurrent requests for a protocol
+        
+        Only enable it for protocols whose methods have no side effects.
+        """
+        if enabled:
+            self.single_flight_protocols.add(protocol_id)
+        else:
+            self.single_flight_protocols.discard(protocol_id)
+    
+    def _single_flight_key(self, protocol_id: str, request: JSONRPCRequest) -> Optional[Tuple[str, str, str]]:
+        """Get the coalescing key of a request, or None if it must run on its own"""
+        if protocol_id not in self.single_flight_protocols:
+            return None
+        params = request.params or {}
+        # Streamed output is delivered to the requesting task only
+        if isinstance(params, dict) and params.get('stream'):
+            return None
+        if _has_large_payload(params):
+            return None
+        digest = hashlib.sha256()
+        for chunk in _SINGLE_FLIGHT_ENCODER.iterencode(params):
+            digest.update(chunk.encode("utf-8"))
+        return (protocol_id, request.method, digest.hexdigest())
+    
+    async def _execute_request(
+        self,
+        protocol_id: str,
+        request: JSONRPCRequest,
+        prevalidated: bool = False
+    ) -> JSONRPCResponse:
+        """Execute a request on the best available provider"""
+        # Select provider, waiting for a free slot if all are busy
+        wait_started = time.perf_counter()
+        provider_info = await self._acquire_provider(protocol_id, request.method)
         if not provider_info:
             return JSONRPCResponse.create_error(
                 request_id=request.id,
                 error_code=ErrorCode.PROVIDER_NOT_AVAILABLE,
                 error_message=f"No providers available for {protocol_id}::{request.method}"
             )
+        self.phase_timings.record(protocol_id, request.method, "provider_wait", time.perf_counter() - wait_started)
         
+        try:
+            return await self._execute_with_provider(protocol_id, request, provider_info, prevalidated)
+        finally:
+            await self._release_provider(provider_info)
+    
+    async def _execute_with_provider(
+        self,
+        protocol_id: str,
+        request: JSONRPCRequest,
+        provider_info: ProviderInfo,
+        prevalidated: bool = False
+    ) -> JSONRPCResponse:
+        """Execute a request on a selected provider and record its stats"""
         # Get provider instance
         provider_instance = self.get_provider_instance(provider_info.provider_id)
         if not provider_instance:
@@ -317,23 +605,28 @@ class ProtocolProviderRegistry:
         
         # Execute request
         start_time = asyncio.get_event_loop().time()
+        timer = self.phase_timings.timer(protocol_id, request.method)
         try:
             # Preprocess parameters first (handles directory/file_pattern -> files conversion)
             processed_params = request.params or {}
             if hasattr(provider_instance, '_preprocess_params'):
                 processed_params = await provider_instance._preprocess_params(request.method, processed_params)
+            timer.mark("preprocessing")
             
             # Validate processed parameters against protocol
             protocol = self.protocol_registry.get(protocol_id)
-            if protocol:
+            if protocol and not (prevalidated and processed_params == (request.params or {})):
                 protocol.validate_method_call(request.method, processed_params)
+            timer.mark("validation")
             
             # Execute via provider with processed parameters
-            # Note: execute_with_stats will also call _preprocess_params, but it's idempotent
             if hasattr(provider_instance, 'execute_with_stats'):
-                result = await provider_instance.execute_with_stats(request.method, request.params or {})
+                result = await provider_instance.execute_with_stats(
+                    request.method, processed_params, preprocessed=True
+                )
             else:
                 result = await provider_instance.handle_request(request.method, processed_params)
+            timer.mark("provider")
             
             # Update success stats
             response_time = asyncio.get_event_loop().time() - start_time
@@ -432,6 +725,8 @@ class ProtocolProviderRegistry:
                 "success_rate": info.success_rate,
                 "avg_response_time": info.average_response_time,
                 "total_requests": info.total_requests,
+                "in_flight": info.in_flight,
+                "max_concurrent_requests": info.max_concurrent_requests,
                 "supported_methods": list(info.supported_methods),
                 "last_seen": info.last_seen.isoformat(),
                 "consecutive_failures": info.consecutive_failures
@@ -493,6 +788,10 @@ class ProtocolProviderRegistry:
             }
         
         return {
+            "load_balancing": self.load_balancing.value,
+            "single_flight_protocols": sorted(self.single_flight_protocols),
+            "coalesced_requests": self.coalesced_requests,
+            "phase_timings": self.phase_timings.snapshot(),
             "total_protocols": len(self.protocol_providers),
             "total_providers": total_providers,
             "healthy_providers": healthy_providers,
@@ -504,7 +803,8 @@ class ProtocolProviderRegistry:
                     "status": info.status.value,
                     "success_rate": info.success_rate,
                     "avg_response_time": info.average_response_time,
-                    "total_requests": info.total_requests
+                    "total_requests": info.total_requests,
+                    "in_flight": info.in_flight
                 }
                 for info in self.providers.values()
             ]
@@ -7,6 +7,7 @@ Priority-based task queuing with dependency management and workflow orchestratio
 import asyncio
 import heapq
 import logging
+import time
 from typing import Dict, List, Optional, Set, Tuple, Any
 from datetime import datetime, timedelta
 from enum import IntEnum
@@ -32,6 +33,8 @@ class QueuedTask:
     priority: int
     queued_at: datetime
     task: Task
+    # perf_counter when the task entered the ready heap (dependencies met)
+    ready_at: Optional[float] = None
     
     def __lt__(self, other):
         """Define ordering for heapq"""
@@ -53,13 +56,24 @@ class TaskQueue:
     - Dependency checking before task dequeue
     - Workflow-aware task management
     - Persistent storage with recovery on restart
+    
+    Tasks whose dependencies are all completed live in a per-priority
+    "ready" heap. Tasks still waiting on dependencies are parked in a
+    "blocked" index keyed by their number of unmet dependencies and are
+    promoted to the ready heap when their last dependency completes, so
+    dequeue is O(log n) and enqueue/completion are O(number of deps).
     """
     
     def __init__(self, name: str = "default", persistence: Optional[PersistenceBackend] = None):
         self.name = name
         self.persistence = persistence or InMemoryBackend()
         
-        self._heap: List[QueuedTask] = []
+        # Ready tasks, one heap per priority level (entries removed lazily)
+        self._ready: Dict[int, List[QueuedTask]] = {priority.value: [] for priority in QueuePriority}
+        # Blocked tasks: task_id -> number of unmet dependencies
+        self._blocked: Dict[str, int] = {}
+        # Reverse dependency index: dependency task_id -> blocked task_ids waiting on it
+        self._dependents: Dict[str, Set[str]] = {}
         self._task_lookup: Dict[str, QueuedTask] = {}  # task_id -> QueuedTask
         self._workflow_tasks: Dict[str, Set[str]] = {}  # workflow_id -> set of task_ids
         self._completed_tasks: Set[str] = set()
@@ -88,6 +102,13 @@ class TaskQueue:
     async def _recover_from_persistence(self) -> None:
         """Recover queue state from persistence"""
         try:
+            # Completed tasks must be known before re-enqueueing so that
+            # recovered tasks are indexed as ready or blocked correctly
+            queue_state = await self.persistence.get_queue_state(self.name)
+            if queue_state:
+                self._completed_tasks = set(queue_state.get('completed_tasks', []))
+                self._failed_tasks = set(queue_state.get('failed_tasks', []))
+            
             # Recover tasks that should be queued
             queued_tasks = await self.persistence.get_all_queued_tasks()
             
@@ -101,12 +122,9 @@ class TaskQueue:
                 await self._enqueue_in_memory(task)
             
             # Recover queue statistics from persistence
-            queue_state = await self.persistence.get_queue_state(self.name)
             if queue_state:
                 self.total_enqueued = queue_state.get('total_enqueued', 0)
                 self.total_dequeued = queue_state.get('total_dequeued', 0)
-                self._completed_tasks = set(queue_state.get('completed_tasks', []))
-                self._failed_tasks = set(queue_state.get('failed_tasks', []))
             
             logger.info(f"Recovered {len(queued_tasks)} tasks for queue {self.name}")
             
@@ -169,10 +187,18 @@ class TaskQueue:
             task=task
         )
         
-        # Add to heap and lookup
-        heapq.heappush(self._heap, queued_task)
         self._task_lookup[task.id] = queued_task
         
+        # Index as ready or blocked depending on unmet dependencies
+        unmet = [dep_id for dep_id in task.dependencies if dep_id not in self._completed_tasks]
+        if unmet:
+            self._blocked[task.id] = len(unmet)
+            for dep_id in unmet:
+                self._dependents.setdefault(dep_id, set()).add(task.id)
+        else:
+            queued_task.ready_at = time.perf_counter()
+            heapq.heappush(self._ready[queued_task.priority], queued_task)
+        
         # Track workflow tasks
         if task.workflow_id:
             if task.workflow_id not in self._workflow_tasks:
@@ -181,6 +207,61 @@ class TaskQueue:
         
         self.total_enqueued += 1
     
+    def _is_live(self, queued_task: QueuedTask) -> bool:
+        """Check whether a heap entry still refers to a queued task"""
+        return self._task_lookup.get(queued_task.task.id) is queued_task
+    
+    def _peek_ready(self) -> Optional[QueuedTask]:
+        """Return the highest-priority ready entry, discarding stale heap entries"""
+        for heap in self._ready.values():
+            while heap and not self._is_live(heap[0]):
+                heapq.heappop(heap)
+            if heap:
+                return heap[0]
+        return None
+    
+    def _iter_ready(self):
+        """Yield live ready entries in dequeue order without mutating the heaps"""
+        for heap in self._ready.values():
+            if not heap:
+                continue
+            # Walk the heap in order via a frontier of child indices
+            frontier = [(heap[0].queued_at, 0)]
+            while frontier:
+                _, index = heapq.heappop(frontier)
+                queued_task = heap[index]
+                if self._is_live(queued_task):
+                    yield queued_task
+                for child in (2 * index + 1, 2 * index + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child].queued_at, child))
+    
+    def _promote_dependents(self, task_id: str) -> None:
+        """Move tasks whose last unmet dependency was task_id to the ready heap"""
+        for dependent_id in self._dependents.pop(task_id, ()):
+            remaining = self._blocked.get(dependent_id)
+            if remaining is None:
+                continue  # Removed or dequeued while blocked
+            
+            if remaining > 1:
+                self._blocked[dependent_id] = remaining - 1
+                continue
+            
+            del self._blocked[dependent_id]
+            queued_task = self._task_lookup.get(dependent_id)
+            if queued_task:
+                queued_task.ready_at = time.perf_counter()
+                heapq.heappush(self._ready[queued_task.priority], queued_task)
+    
+    def _take(self, queued_task: QueuedTask) -> QueuedTask:
+        """Remove a dequeued entry from the lookup and update statistics"""
+        task = queued_task.task
+        del self._task_lookup[task.id]
+        self.total_dequeued += 1
+        
+        logger.debug(f"Dequeued task {task.id}")
+        return queued_task
+    
     async def dequeue(self, check_dependencies: bool = True) -> Optional[Task]:
         """
         Get the next available task from the queue
@@ -191,46 +272,38 @@ class TaskQueue:
         Returns:
             Next available task or None if queue is empty or no tasks ready
         """
+        queued_task = await self.dequeue_entry(check_dependencies)
+        return queued_task.task if queued_task else None
+    
+    async def dequeue_entry(self, check_dependencies: bool = True) -> Optional[QueuedTask]:
+        """
+        Like dequeue, but return the queue entry (with its ready_at time)
+        
+        Args:
+            check_dependencies: Whether to check task dependencies
+        """
         async with self._lock:
-            if not self._heap:
-                return None
+            queued_task = self._peek_ready()
             
-            # Find first task with satisfied dependencies
-            available_tasks = []
-            
-            while self._heap:
-                queued_task = heapq.heappop(self._heap)
-                
-                # Check if task still exists in lookup (might have been removed)
-                if queued_task.task.id not in self._task_lookup:
-                    continue
-                
-                # Check dependencies
-                if check_dependencies and not self._are_dependencies_satisfied(queued_task.task):
-                    available_tasks.append(queued_task)
-                    continue
-                
-                # Found available task
-                task = queued_task.task
-                
-                # Remove from lookup
-                del self._task_lookup[task.id]
-                
-                # Re-queue tasks that weren't selected
-                for queued in available_tasks:
-                    heapq.heappush(self._heap, queued)
-                
-                # Update statistics
-                self.total_dequeued += 1
-                
-                logger.debug(f"Dequeued task {task.id}")
-                return task
+            if not check_dependencies and self._blocked:
+                # Blocked tasks compete on priority too; this path is rare so a
+                # linear scan of the blocked index is acceptable
+                blocked = min(self._task_lookup[task_id] for task_id in self._blocked)
+                if queued_task is None or blocked < queued_task:
+                    del self._blocked[blocked.task.id]
+                    return self._take(blocked)
             
-            # No available tasks, re-queue all
-            for queued in available_tasks:
-                heapq.heappush(self._heap, queued)
+            if queued_task is None:
+                return None
             
-            return None
+            heapq.heappop(self._ready[queued_task.priority])
+            return self._take(queued_task)
+    
+    async def peek(self) -> Optional[Task]:
+        """Get the next ready task without removing it from the queue"""
+        async with self._lock:
+            queued_task = self._peek_ready()
+            return queued_task.task if queued_task else None
     
     def _are_dependencies_satisfied(self, task: Task) -> bool:
         """Check if all task dependencies are completed"""
@@ -253,8 +326,9 @@ class TaskQueue:
             if task_id not in self._task_lookup:
                 return False
             
-            # Remove from lookup (heap entry will be ignored during dequeue)
+            # Remove from lookup (heap and dependents entries are ignored lazily)
             del self._task_lookup[task_id]
+            self._blocked.pop(task_id, None)
             
             # Remove from workflow tracking
             for workflow_id, task_ids in self._workflow_tasks.items():
@@ -268,6 +342,7 @@ class TaskQueue:
         async with self._lock:
             self._completed_tasks.add(task_id)
             self._failed_tasks.discard(task_id)  # Remove from failed if it was there
+            self._promote_dependents(task_id)
             
             # Update task status in persistence
             task = await self.persistence.get_task(task_id)
@@ -306,13 +381,10 @@ class TaskQueue:
         async with self._lock:
             ready_tasks = []
             
-            for queued_task in sorted(self._heap):
+            for queued_task in self._iter_ready():
                 if limit and len(ready_tasks) >= limit:
                     break
-                
-                if queued_task.task.id in self._task_lookup:  # Still in queue
-                    if self._are_dependencies_satisfied(queued_task.task):
-                        ready_tasks.append(queued_task.task)
+                ready_tasks.append(queued_task.task)
             
             return ready_tasks
     
@@ -320,6 +392,22 @@ class TaskQueue:
         """Get current queue size"""
         return len(self._task_lookup)
     
+    def ready_count(self) -> int:
+        """Get number of queued tasks whose dependencies are satisfied"""
+        return len(self._task_lookup) - len(self._blocked)
+    
+    def blocked_count(self) -> int:
+        """Get number of queued tasks still waiting on dependencies"""
+        return len(self._blocked)
+    
+    def priority_counts(self) -> Dict[str, int]:
+        """Get number of queued tasks per priority"""
+        counts = {priority.name.lower(): 0 for priority in Priority}
+        for queued_task in self._task_lookup.values():
+            # Priority is already a string due to use_enum_values=True
+            counts[queued_task.task.priority] += 1
+        return counts
+    
     def is_empty(self) -> bool:
         """Check if queue is empty"""
         return len(self._task_lookup) == 0
@@ -327,12 +415,7 @@ class TaskQueue:
     async def get_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
         async with self._lock:
-            priority_counts = {priority.name.lower(): 0 for priority in Priority}
-            
-            for queued_task in self._task_lookup.values():
-                task_priority = queued_task.task.priority
-                # Priority is already a string due to use_enum_values=True
-                priority_counts[task_priority] += 1
+            priority_counts = self.priority_counts()
             
             return {
                 "name": self.name,
@@ -363,7 +446,10 @@ class TaskQueue:
         async with self._lock:
             cleared_count = len(self._task_lookup)
             
-            self._heap.clear()
+            for heap in self._ready.values():
+                heap.clear()
+            self._blocked.clear()
+            self._dependents.clear()
             self._task_lookup.clear()
             self._workflow_tasks.clear()
             self._completed_tasks.clear()
@@ -433,37 +519,46 @@ class QueueManager:
         Returns:
             Next available task with highest priority across all queues
         """
+        queued_task = await self.dequeue_next_entry(queue_names)
+        return queued_task.task if queued_task else None
+    
+    async def dequeue_next_entry(self, queue_names: Optional[List[str]] = None) -> Optional[QueuedTask]:
+        """
+        Like dequeue_next_task, but return the queue entry (with its ready_at time)
+        
+        Args:
+            queue_names: List of queue names to check (all queues if None)
+        """
+        if isinstance(queue_names, str):
+            queue_names = [queue_names]
         target_queues = queue_names or list(self.queues.keys())
-        available_tasks = []
+        best_task = None
+        best_queue = None
         
-        # Collect available tasks from all target queues
+        # Compare the head of each target queue
         for queue_name in target_queues:
             queue = self.get_queue(queue_name)
-            if queue:
-                ready_tasks = await queue.get_ready_tasks(limit=5)  # Get top 5 from each
-                for task in ready_tasks:
-                    available_tasks.append((task, queue_name))
+            if not queue:
+                continue
+            
+            task = await queue.peek()
+            if task is None:
+                continue
+            
+            if best_task is None or self._ordering_key(task) < self._ordering_key(best_task):
+                best_task = task
+                best_queue = queue
         
-        if not available_tasks:
+        if best_queue is None:
             return None
         
-        # Sort by priority and queue time
-        available_tasks.sort(key=lambda x: (
-            QueuePriority[x[0].priority.upper()].value,
-            x[0].created_at
-        ))
-        
-        # Dequeue the highest priority task
-        best_task, best_queue_name = available_tasks[0]
-        queue = self.get_queue(best_queue_name)
-        
-        if queue:
-            # Try to dequeue the specific task
-            dequeued_task = await queue.dequeue()
-            if dequeued_task and dequeued_task.id == best_task.id:
-                return dequeued_task
-        
-        return None
+        # The queue head is the task we just compared
+        return await best_queue.dequeue_entry()
+    
+    @staticmethod
+    def _ordering_key(task: Task) -> Tuple[int, datetime]:
+        """Sort key used to pick between queue heads (priority, then age)"""
+        return (QueuePriority[task.priority.upper()].value, task.created_at)
     
     async def mark_task_completed(self, task_id: str, queue_name: Optional[str] = None) -> None:
         """Mark a task as completed across all queues or specific queue"""
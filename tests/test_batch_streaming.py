@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Test streaming file discovery and chunked batch submission
+"""
+
+import asyncio
+import glob
+import os
+import sys
+import tempfile
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.batch_processor import BatchProcessor
+from gleitzeit.core.errors import ConfigurationError
+from gleitzeit.core.execution_engine import ExecutionEngine
+from gleitzeit.core.file_scanner import iter_files
+from gleitzeit.core.result_sink import JSONLResultSink, read_jsonl_results
+from gleitzeit.core.result_store import ResultStore
+from gleitzeit.core.workflow_loader import load_workflow_from_dict
+from gleitzeit.persistence.base import InMemoryBackend
+from gleitzeit.protocols.llm_protocol import LLM_PROTOCOL_V1
+from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.task_queue import QueueManager, DependencyResolver
+
+
+class FakeLLMProvider(ProtocolProvider):
+    """Provider answering llm/chat with the inlined file content"""
+
+    def __init__(self, engine_ref):
+        super().__init__(provider_id="fake-llm", protocol_id="llm/v1")
+        self.engine_ref = engine_ref
+        self.calls = 0
+        self.peak_workflows = 0
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health_check(self):
+        return {"status": "healthy"}
+
+    def get_supported_methods(self):
+        return ["llm/chat"]
+
+    async def handle_request(self, method, params):
+        self.calls += 1
+        self.peak_workflows = max(self.peak_workflows, len(self.engine_ref[0].workflow_states))
+        await asyncio.sleep(0)
+        content = params["messages"][-1]["content"].rsplit("\n", 1)[-1]
+        return {"response": content, "content": content, "model": "fake", "done": True}
+
+
+class SinkWatchingProvider(FakeLLMProvider):
+    """Fake provider noting how many results were already in the sink file per call"""
+
+    def __init__(self, engine_ref, sink_path):
+        super().__init__(engine_ref)
+        self.sink_path = sink_path
+        self.lines_seen = []
+
+    async def handle_request(self, method, params):
+        lines = 0
+        if os.path.exists(self.sink_path):
+            with open(self.sink_path) as f:
+                lines = sum(1 for _ in f)
+        self.lines_seen.append(lines)
+        return await super().handle_request(method, params)
+
+
+def make_tree(root: str) -> None:
+    os.makedirs(os.path.join(root, "a", "b"))
+    os.makedirs(os.path.join(root, ".hidden"))
+    for relative in ["x.txt", "y.md", ".h.txt", "a/z.txt", "a/b/w.txt", ".hidden/q.txt"]:
+        with open(os.path.join(root, relative), "w") as f:
+            f.write(f"content of {os.path.basename(relative)}")
+
+
+async def test_scanner_matches_glob():
+    """Test scandir discovery agrees with glob, including recursive patterns"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        for pattern in ["*", "*.txt", "**/*.txt", "a/*.txt", "**", "*/b/*", ".*"]:
+            expected = sorted(
+                path for path in glob.glob(os.path.join(tmp, pattern), recursive=True)
+                if os.path.isfile(path)
+            )
+            assert sorted(iter_files(tmp, pattern)) == expected, pattern
+
+        assert BatchProcessor().scan_directory(tmp, "**/*.txt") == sorted(iter_files(tmp, "**/*.txt"))
+        try:
+            list(iter_files(os.path.join(tmp, "missing")))
+            assert False, "Expected ConfigurationError"
+        except ConfigurationError:
+            pass
+    print("✅ Scanner glob compatibility test passed")
+
+
+async def test_chunked_batch_execution():
+    """Test files are submitted in bounded windows of chunk workflows"""
+    engine_ref = []
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(LLM_PROTOCOL_V1)
+    provider = FakeLLMProvider(engine_ref)
+    registry.register_provider("fake-llm", "llm/v1", provider)
+    engine = ExecutionEngine(
+        registry=registry,
+        queue_manager=QueueManager(),
+        dependency_resolver=DependencyResolver(),
+        persistence=InMemoryBackend(),
+        max_concurrent_tasks=10
+    )
+    engine_ref.append(engine)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        os.makedirs(os.path.join(docs, "nested"))
+        for i in range(23):
+            subdir = "nested" if i % 2 else ""
+            with open(os.path.join(docs, subdir, f"doc{i}.txt"), "w") as f:
+                f.write(f"body {i}")
+
+        with mock.patch.dict(os.environ, {"HOME": tmp}):
+            result = await BatchProcessor().process_batch(
+                engine, directory=docs, pattern="**/*.txt",
+                chunk_size=5, max_pending_chunks=2
+            )
+
+    assert result.total_files == 23
+    assert result.successful == 23 and result.failed == 0
+    assert provider.calls == 23
+    assert result.results[os.path.join(docs, "nested", "doc7.txt")]["content"] == "body 7"
+    # Never more than two chunk workflows alive, and all released afterwards
+    assert provider.peak_workflows <= 2
+    assert not engine.workflow_states
+    print("✅ Chunked batch execution test passed")
+
+
+async def test_batch_results_read_back_after_eviction():
+    """Test a batch larger than the result store budget reports every file"""
+    engine_ref = []
+    persistence = InMemoryBackend()
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(LLM_PROTOCOL_V1)
+    registry.register_provider("fake-llm", "llm/v1", FakeLLMProvider(engine_ref))
+    engine = ExecutionEngine(
+        registry=registry,
+        queue_manager=QueueManager(),
+        dependency_resolver=DependencyResolver(),
+        persistence=persistence,
+        max_concurrent_tasks=10,
+        result_store=ResultStore(persistence=persistence, max_entries=3)
+    )
+    engine_ref.append(engine)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(8):
+            path = os.path.join(tmp, f"doc{i}.txt")
+            with open(path, "w") as f:
+                f.write(f"body {i}")
+            files.append(path)
+
+        with mock.patch.dict(os.environ, {"HOME": tmp}):
+            result = await BatchProcessor().process_batch(engine, files=files)
+
+    assert result.successful == 8 and result.failed == 0
+    assert result.results[files[0]]["content"] == "body 0"
+    assert engine.task_results.evictions > 0
+    print("✅ Batch results after eviction test passed")
+
+
+async def test_batch_streams_results_to_jsonl():
+    """Test a non-chunked batch writes each file's result as its task completes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sink_path = os.path.join(tmp, "results.jsonl")
+        engine_ref = []
+        registry = ProtocolProviderRegistry()
+        registry.register_protocol(LLM_PROTOCOL_V1)
+        provider = SinkWatchingProvider(engine_ref, sink_path)
+        registry.register_provider("fake-llm", "llm/v1", provider)
+        engine = ExecutionEngine(
+            registry=registry,
+            queue_manager=QueueManager(),
+            dependency_resolver=DependencyResolver(),
+            persistence=InMemoryBackend(),
+            max_concurrent_tasks=1
+        )
+        engine_ref.append(engine)
+
+        files = []
+        for i in range(6):
+            path = os.path.join(tmp, f"doc{i}.txt")
+            with open(path, "w") as f:
+                f.write(f"body {i}")
+            files.append(path)
+
+        with mock.patch.dict(os.environ, {"HOME": tmp}):
+            result = await BatchProcessor().process_batch(
+                engine, files=files, sink=JSONLResultSink(sink_path, flush_every=1)
+            )
+        results = dict(read_jsonl_results(result.results_file))
+
+    # Earlier results were on disk before the last file was processed
+    assert provider.lines_seen[0] == 0 and provider.lines_seen[-1] > 0
+    assert len(results) == 6
+    assert result.successful == 6 and result.failed == 0
+    assert results[files[3]]["content"] == "body 3"
+    print("✅ Batch JSONL streaming test passed")
+
+
+async def test_batch_workflow_context_per_file():
+    """Test python batch tasks each get their own file path in context"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        workflow = load_workflow_from_dict({
+            "name": "Python batch",
+            "protocol": "python/v1",
+            "batch": {"directory": tmp, "pattern": "**/*.txt"},
+            "template": {"method": "python/execute", "file": "script.py", "context": {"mode": "fast"}}
+        })
+        expected = sorted(iter_files(tmp, "**/*.txt"))
+
+    paths = sorted(task.params["context"]["file_path"] for task in workflow.tasks)
+    assert paths == expected and len(paths) == 3
+    assert all(task.params["context"]["mode"] == "fast" for task in workflow.tasks)
+    print("✅ Batch workflow context test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Streaming Batch Processing")
+    print("=" * 50)
+
+    try:
+        await test_scanner_matches_glob()
+        await test_chunked_batch_execution()
+        await test_batch_results_read_back_after_eviction()
+        await test_batch_streams_results_to_jsonl()
+        await test_batch_workflow_context_per_file()
+
+        print("\n✅ All streaming batch tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
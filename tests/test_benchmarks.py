@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the engine throughput benchmark on small workflows
+"""
+
+import asyncio
+import os
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from dag_shapes import SHAPES
+from engine_throughput import percentile, run_scenario
+from gleitzeit.task_queue import DependencyResolver
+
+
+def scenario(**overrides):
+    config = {
+        "shape": "fan_out", "size": 20, "backend": "memory", "mode": "event",
+        "provider": "noop", "latency": 0.0, "concurrency": 10, "timeout": 30.0
+    }
+    config.update(overrides)
+    return config
+
+
+async def test_shapes_are_valid_dags():
+    """Test every shape builds exactly the requested number of acyclic tasks"""
+    for name, build in SHAPES.items():
+        for size in (1, 10, 50):
+            workflow = build(f"{name}-{size}", size)
+            assert len(workflow.tasks) == size, name
+            resolver = DependencyResolver()
+            assert not resolver.validate_workflow_dependencies(workflow), name
+            resolver.add_workflow(workflow)
+            levels = resolver.get_execution_order(workflow.id)
+            assert sum(len(level) for level in levels) == size, name
+
+    chain = SHAPES["chain"]("c", 5)
+    assert [task.dependencies for task in chain.tasks][1:] == [[f"c-t{i}"] for i in range(4)]
+    print("✅ DAG shapes test passed")
+
+
+async def test_scenarios_report_metrics():
+    """Test scenarios run to completion and report throughput and overhead"""
+    for shape in SHAPES:
+        for mode in ("event", "direct"):
+            result = await run_scenario(scenario(shape=shape, mode=mode))
+            assert result["status"] == "ok", result
+            assert result["provider_calls"] == 20
+            assert result["tasks_per_sec"] > 0
+            assert 0 <= result["overhead_ms"]["p50"] <= result["overhead_ms"]["p99"] <= result["overhead_ms"]["max"]
+            queue_wait = result["queue_wait_ms"]
+            assert 0 <= queue_wait["p50"] <= queue_wait["p99"] <= queue_wait["max"]
+            if mode == "event":
+                assert queue_wait["max"] > 0
+            assert result["peak_rss_mb"] > 0
+
+    result = await run_scenario(scenario(backend="sqlite", provider="sleep", latency=0.001))
+    assert result["status"] == "ok", result
+
+    assert percentile([3.0, 1.0, 2.0, 4.0], 50) == 2.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 99) == 4.0
+    print("✅ Benchmark scenario test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Engine Benchmarks")
+    print("=" * 50)
+
+    try:
+        await test_shapes_are_valid_dags()
+        await test_scenarios_report_metrics()
+
+        print("\n✅ All benchmark tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
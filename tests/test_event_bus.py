@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Test the asynchronous, bounded event bus
+"""
+
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.event_bus import EventBus, OverflowPolicy
+from gleitzeit.core.execution_engine import ExecutionEngine, ExecutionMode
+from gleitzeit.core.models import Task, Workflow
+from gleitzeit.core.protocol import ProtocolSpec, MethodSpec
+from gleitzeit.persistence.base import InMemoryBackend
+from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.task_queue import QueueManager, DependencyResolver
+
+
+ECHO_PROTOCOL = ProtocolSpec(
+    name="echo",
+    version="v1",
+    description="Protocol for event bus tests",
+    methods={"echo/run": MethodSpec(name="echo/run", description="Echo params")}
+)
+
+
+class EchoProvider(ProtocolProvider):
+    """Provider that returns its params"""
+
+    def __init__(self):
+        super().__init__(provider_id="echo-1", protocol_id="echo/v1")
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health_check(self):
+        return {"status": "healthy"}
+
+    def get_supported_methods(self):
+        return ["echo/run"]
+
+    async def handle_request(self, method, params):
+        return dict(params)
+
+
+async def test_delivery_and_batching():
+    """Test events are delivered in order, in batches, to sync and async handlers"""
+    bus = EventBus(batch_size=10)
+    assert not bus.has_subscribers("tick")
+
+    received = []
+    batches = []
+
+    async def on_tick(event_type, data):
+        received.append(data["n"])
+
+    bus.subscribe("tick", on_tick)
+    bus.subscribe(["tick", "tock"], lambda events: batches.append([data["n"] for _, data in events]), batch=True)
+    assert bus.has_subscribers("tick") and bus.has_subscribers("tock")
+
+    for n in range(25):
+        await bus.publish("tick", {"n": n})
+    await bus.publish("tock", {"n": 25})
+    # Publishing only queues
+    assert received == []
+
+    assert await bus.flush(timeout=5)
+    assert received == list(range(25))
+    assert [n for batch in batches for n in batch] == list(range(26))
+    assert max(len(batch) for batch in batches) == 10 and len(batches) == 3
+
+    # Failing handlers are logged and counted, the worker keeps going
+    def broken(event_type, data):
+        raise RuntimeError("boom")
+
+    subscription = bus.subscribe("tick", broken)
+    await bus.publish("tick", {"n": 26})
+    await bus.flush(timeout=5)
+    assert subscription.errors == 1 and received[-1] == 26
+
+    bus.unsubscribe(subscription)
+    assert bus.unsubscribe_handler("tick", on_tick)
+    await bus.close()
+    print("✅ Delivery and batching test passed")
+
+
+async def test_overflow_policies():
+    """Test drop_newest/drop_oldest discard and block applies backpressure"""
+    gate = asyncio.Event()
+
+    def make_handler(received):
+        async def handler(event_type, data):
+            await gate.wait()
+            received.append(data["n"])
+        return handler
+
+    bus = EventBus(max_queue=3, batch_size=1)
+    newest, oldest, blocked = [], [], []
+    drop_newest = bus.subscribe("e", make_handler(newest), policy=OverflowPolicy.DROP_NEWEST)
+    drop_oldest = bus.subscribe("e", make_handler(oldest), policy="drop_oldest")
+
+    # The first event is taken by the worker, three more fill each queue
+    await bus.publish("e", {"n": 0})
+    await asyncio.sleep(0)
+    for n in range(1, 7):
+        await bus.publish("e", {"n": n})
+    assert drop_newest.dropped == 3 and drop_oldest.dropped == 3
+
+    blocking_bus = EventBus(max_queue=3, batch_size=1)
+    block = blocking_bus.subscribe("e", make_handler(blocked), policy="block")
+    await blocking_bus.publish("e", {"n": 0})
+    await asyncio.sleep(0)
+    for n in range(1, 4):
+        await blocking_bus.publish("e", {"n": n})
+    publisher = asyncio.create_task(blocking_bus.publish("e", {"n": 4}))
+    await asyncio.sleep(0.05)
+    assert not publisher.done()
+
+    gate.set()
+    await asyncio.wait_for(publisher, 5)
+    for flushed in [bus, blocking_bus]:
+        await flushed.flush(timeout=5)
+        await flushed.close()
+    assert newest == [0, 1, 2, 3]
+    assert oldest == [0, 4, 5, 6]
+    assert blocked == [0, 1, 2, 3, 4] and block.dropped == 0
+    assert bus.get_stats()["dropped"] == 6
+    print("✅ Overflow policy test passed")
+
+
+async def test_engine_decoupled_from_handlers():
+    """Test a slow handler no longer slows task execution and unheard events are not built"""
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(ECHO_PROTOCOL)
+    registry.register_provider("echo-1", "echo/v1", EchoProvider())
+    engine = ExecutionEngine(
+        registry=registry,
+        queue_manager=QueueManager(),
+        dependency_resolver=DependencyResolver(),
+        persistence=InMemoryBackend(),
+        max_concurrent_tasks=4
+    )
+
+    built = []
+    original = engine.emit_structured_event
+
+    async def counting_emit(event):
+        built.append(event.event_type.value)
+        await original(event)
+
+    engine.emit_structured_event = counting_emit
+
+    seen = []
+
+    async def slow_monitor(event_type, data):
+        await asyncio.sleep(0.05)
+        seen.append(data["data"]["task_id"])
+
+    engine.add_event_handler("task:completed", slow_monitor, policy="drop_newest", max_queue=100)
+    finished = asyncio.Event()
+    engine.add_event_handler("workflow:completed", lambda name, data: finished.set())
+
+    workflow = Workflow(id="quiet", name="quiet")
+    for i in range(20):
+        workflow.add_task(Task(id=f"t{i}", name=f"t{i}", protocol="echo/v1", method="echo/run", params={"i": i}))
+
+    runner = asyncio.create_task(engine.start(ExecutionMode.EVENT_DRIVEN))
+    while not engine.running:
+        await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await engine.submit_workflow(workflow)
+    await asyncio.wait_for(finished.wait(), 10)
+    elapsed = time.perf_counter() - started
+
+    # Inline delivery would take 20 x 50ms
+    assert elapsed < 0.5, elapsed
+    assert "task:started" not in built and "task:submitted" not in built
+    assert "task:completed" in built
+
+    await engine.stop()
+    await runner
+    # Stopping delivers what was queued
+    assert sorted(seen) == sorted(f"t{i}" for i in range(20))
+    assert engine._get_stats_dict()["events"]["dropped"] == 0
+    print("✅ Engine event decoupling test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Event Bus")
+    print("=" * 50)
+
+    try:
+        await test_delivery_and_batching()
+        await test_overflow_policies()
+        await test_engine_decoupled_from_handlers()
+
+        print("\n✅ All event bus tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
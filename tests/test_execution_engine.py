@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Test Execution Engine workflow progression
+"""
+
+import asyncio
+import sys
+import os
+from typing import Dict
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.execution_engine import ExecutionEngine, ExecutionMode
+from gleitzeit.core.models import Task, Workflow, TaskStatus, WorkflowStatus
+from gleitzeit.core.protocol import ProtocolSpec, MethodSpec, ParameterSpec, ParameterType
+from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.task_queue import QueueManager, DependencyResolver
+from gleitzeit.persistence.base import InMemoryBackend
+
+
+ECHO_PROTOCOL = ProtocolSpec(
+    name="echo",
+    version="v1",
+    description="Echo protocol for engine tests",
+    methods={
+        "echo/run": MethodSpec(name="echo/run", description="Return params as result")
+    }
+)
+
+
+class EchoProvider(ProtocolProvider):
+    """Provider that returns its params"""
+
+    def __init__(self, provider_id: str = "echo-1"):
+        super().__init__(provider_id=provider_id, protocol_id="echo/v1")
+        self.calls = 0
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health_check(self):
+        return {"status": "healthy"}
+
+    def get_supported_methods(self):
+        return ["echo/run"]
+
+    async def handle_request(self, method, params):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return dict(params)
+
+
+class CountingBackend(InMemoryBackend):
+    """In-memory backend that counts result lookups"""
+
+    def __init__(self):
+        super().__init__()
+        self.result_lookups = 0
+
+    async def get_task_result(self, task_id):
+        self.result_lookups += 1
+        return await super().get_task_result(task_id)
+
+
+def make_engine(persistence=None, max_concurrent_tasks: int = 10):
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(ECHO_PROTOCOL)
+    provider = EchoProvider()
+    registry.register_provider("echo-1", "echo/v1", provider)
+
+    engine = ExecutionEngine(
+        registry=registry,
+        queue_manager=QueueManager(),
+        dependency_resolver=DependencyResolver(),
+        persistence=persistence or InMemoryBackend(),
+        max_concurrent_tasks=max_concurrent_tasks
+    )
+    return engine, provider
+
+
+def echo_task(task_id: str, dependencies=None, **params) -> Task:
+    return Task(
+        id=task_id,
+        name=task_id,
+        protocol="echo/v1",
+        method="echo/run",
+        params=params or {"value": task_id},
+        dependencies=dependencies or []
+    )
+
+
+def fan_out_workflow(workflow_id: str, width: int) -> Workflow:
+    workflow = Workflow(id=workflow_id, name=workflow_id)
+    workflow.add_task(echo_task(f"{workflow_id}-root"))
+    for i in range(width):
+        workflow.add_task(echo_task(f"{workflow_id}-leaf-{i}", dependencies=[f"{workflow_id}-root"]))
+    workflow.add_task(echo_task(
+        f"{workflow_id}-join",
+        dependencies=[f"{workflow_id}-leaf-{i}" for i in range(width)]
+    ))
+    return workflow
+
+
+async def run_event_driven(engine: ExecutionEngine, *workflows: Workflow, timeout: float = 30.0) -> None:
+    """Submit workflows one after another to a running engine and wait for each to finish"""
+    finished: Dict[str, asyncio.Event] = {workflow.id: asyncio.Event() for workflow in workflows}
+
+    def on_finished(event_name, data):
+        workflow_id = data.get("data", {}).get("workflow_id")
+        if workflow_id in finished:
+            finished[workflow_id].set()
+
+    engine.add_event_handler("workflow:completed", on_finished)
+    engine.add_event_handler("workflow:failed", on_finished)
+
+    runner = asyncio.create_task(engine.start(ExecutionMode.EVENT_DRIVEN))
+    while not engine.running:
+        await asyncio.sleep(0.01)
+
+    for workflow in workflows:
+        await engine.submit_workflow(workflow)
+        await asyncio.wait_for(finished[workflow.id].wait(), timeout)
+
+    await engine.stop()
+    await runner
+
+
+async def test_fan_out_workflow_completes_once():
+    """Test a fan-out workflow completes exactly once without result lookups"""
+    persistence = CountingBackend()
+    engine, provider = make_engine(persistence)
+    workflow = fan_out_workflow("fan", 200)
+
+    completed_events = []
+    engine.add_event_handler("workflow:completed", lambda name, data: completed_events.append(data))
+
+    await run_event_driven(engine, workflow)
+
+    assert provider.calls == 202
+    assert workflow.status == WorkflowStatus.COMPLETED
+    assert len(completed_events) == 1
+    assert engine.stats.workflows_completed == 1
+    assert persistence.result_lookups == 0
+
+    # Per-workflow bookkeeping is released once the workflow finishes
+    assert "fan" not in engine.workflow_progress
+    assert "fan" not in engine.workflow_states
+    assert len(engine.get_workflow_results("fan")) == 202
+    print("✅ Fan-out workflow completion test passed")
+
+
+async def test_dependents_submitted_incrementally():
+    """Test only direct dependents are released when a task completes"""
+    engine, _ = make_engine()
+    workflow = Workflow(id="chain", name="chain")
+    workflow.add_task(echo_task("a"))
+    workflow.add_task(echo_task("b", dependencies=["a"]))
+    workflow.add_task(echo_task("c", dependencies=["b"]))
+
+    engine.workflow_states[workflow.id] = workflow
+    progress = engine._get_workflow_progress(workflow.id)
+
+    assert progress.remaining_dependencies == {"a": 0, "b": 1, "c": 1}
+    assert progress.mark_completed("a") == ["b"]
+    assert progress.mark_completed("a") == []  # idempotent
+    assert progress.mark_completed("b") == ["c"]
+    assert not progress.is_complete
+    progress.mark_completed("c")
+    assert progress.is_complete
+    print("✅ Incremental dependent release test passed")
+
+
+async def test_direct_workflow_execution():
+    """Test workflows executed via _execute_workflow are tracked to completion"""
+    engine, _ = make_engine()
+    workflow = fan_out_workflow("direct", 5)
+
+    completed_events = []
+    engine.add_event_handler("workflow:completed", lambda name, data: completed_events.append(data))
+
+    await engine.submit_workflow(workflow)
+    await engine._execute_workflow(workflow)
+    await engine.flush_events()
+
+    assert all(engine.task_results[t.id].status == TaskStatus.COMPLETED for t in workflow.tasks)
+    assert workflow.status == WorkflowStatus.COMPLETED
+    # One completion from progress tracking, one from _execute_workflow itself
+    assert len(completed_events) == 2
+    assert "direct" not in engine.workflow_progress
+    print("✅ Direct workflow execution test passed")
+
+
+async def test_evicted_results_resolved_from_persistence():
+    """Test finished workflows are released and evicted results are read back"""
+    persistence = CountingBackend()
+    engine, _ = make_engine(persistence)
+    engine.task_results.max_entries = 2
+
+    first = Workflow(id="first", name="first")
+    first.add_task(echo_task("producer", message="hello"))
+
+    # Pinned filler results push the released producer result out of memory
+    second = Workflow(id="second", name="second")
+    for i in range(3):
+        second.add_task(echo_task(f"filler-{i}"))
+    second.add_task(echo_task("consumer", dependencies=["filler-0"], value="${producer.message}"))
+
+    await run_event_driven(engine, first, second)
+
+    assert engine.workflow_states == {}
+    assert engine.task_name_to_id_map == {}
+    assert engine.dependency_tracker.submitted_tasks == set()
+    assert engine.retry_manager._task_attempts == {}
+    assert "producer" not in engine.task_results
+    assert persistence.result_lookups == 1
+    assert (await engine.task_results.fetch("consumer")).result == {"value": "hello"}
+    assert engine.task_results.evictions > 0
+    print("✅ Evicted result resolution test passed")
+
+
+class CountingValidator:
+    """Wraps a compiled validator and counts validations"""
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.calls = 0
+
+    def iter_errors(self, instance):
+        self.calls += 1
+        return self.validator.iter_errors(instance)
+
+
+async def test_static_params_validated_once_at_submission():
+    """Test static params skip validation at execution after passing at submission"""
+    engine, _ = make_engine()
+    method = MethodSpec(
+        name="checked/run",
+        params_schema={"value": ParameterSpec(type=ParameterType.STRING)}
+    )
+    engine.registry.register_protocol(ProtocolSpec(name="checked", version="v1", methods={"checked/run": method}))
+    engine.registry.register_provider("checked-1", "checked/v1", EchoProvider("checked-1"), supported_methods={"checked/run"})
+    validator = CountingValidator(method._validator)
+    method._validator = validator
+
+    workflow = Workflow(id="checked", name="checked")
+    for task_id, value in [("static", "plain"), ("derived", "${static.value}")]:
+        workflow.add_task(Task(
+            id=task_id, name=task_id, protocol="checked/v1", method="checked/run",
+            params={"value": value}, dependencies=["static"] if task_id == "derived" else []
+        ))
+
+    await run_event_driven(engine, workflow)
+
+    assert (await engine.task_results.fetch("derived")).result == {"value": "plain"}
+    # Once at submission for "static", once at execution for "derived"
+    assert validator.calls == 2
+    print("✅ Submission-time validation test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Execution Engine")
+    print("=" * 50)
+
+    try:
+        await test_fan_out_workflow_completes_once()
+        await test_dependents_submitted_incrementally()
+        await test_direct_workflow_execution()
+        await test_evicted_results_resolved_from_persistence()
+        await test_static_params_validated_once_at_submission()
+
+        print("\n✅ All execution engine tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test vision image preparation (downscaling, re-encoding and the keyed cache)
+"""
+
+import asyncio
+import base64
+import io
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.providers import image_prep
+from gleitzeit.providers.image_prep import ImagePreparer, ImageSpec
+from gleitzeit.providers.ollama_provider import OllamaProvider
+
+
+async def test_cache_keyed_on_file_state():
+    """Test images are encoded once per (path, mtime, size, spec)"""
+    calls = []
+    original_prepare = image_prep.prepare_image
+
+    def counting_prepare(path, spec):
+        calls.append((path, spec))
+        return original_prepare(path, spec)
+
+    image_prep.prepare_image = counting_prepare
+    preparer = ImagePreparer(cache_size=2)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "image.png")
+            with open(path, "wb") as f:
+                f.write(b"first version")
+
+            results = await asyncio.gather(*[preparer.prepare(path) for _ in range(5)])
+            assert set(results) == {base64.b64encode(b"first version").decode()}
+            assert len(calls) == 1
+
+            # A changed file is a different key
+            with open(path, "wb") as f:
+                f.write(b"second version, longer")
+            assert await preparer.prepare(path) == base64.b64encode(b"second version, longer").decode()
+            assert len(calls) == 2
+
+            # So is a different spec; the LRU keeps only two entries
+            await preparer.prepare(path, ImageSpec(quality=50))
+            assert len(calls) == 3
+            assert preparer.get_stats()["evictions"] == 1
+            assert preparer.get_stats()["hits"] == 4
+    finally:
+        image_prep.prepare_image = original_prepare
+        preparer.shutdown()
+    print("✅ Keyed image cache test passed")
+
+
+async def test_cancelled_caller_does_not_fail_others():
+    """Test cancelling the first caller leaves the shared preparation running"""
+    original_prepare = image_prep.prepare_image
+
+    def slow_prepare(path, spec):
+        import time
+        time.sleep(0.1)
+        return original_prepare(path, spec)
+
+    image_prep.prepare_image = slow_prepare
+    preparer = ImagePreparer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "image.png")
+            with open(path, "wb") as f:
+                f.write(b"shared")
+
+            first = asyncio.ensure_future(preparer.prepare(path))
+            await asyncio.sleep(0.02)
+            second = asyncio.ensure_future(preparer.prepare(path))
+            await asyncio.sleep(0.02)
+            first.cancel()
+
+            assert await second == base64.b64encode(b"shared").decode()
+            assert first.cancelled()
+            assert preparer.get_stats()["cached_images"] == 1
+    finally:
+        image_prep.prepare_image = original_prepare
+        preparer.shutdown()
+    print("✅ Cancelled caller test passed")
+
+
+async def test_downscale_and_reencode():
+    """Test large images are downscaled and converted to the target format"""
+    if image_prep.Image is None:
+        print("⚠️  Pillow not installed, skipping downscale test")
+        return
+    from PIL import Image
+
+    preparer = ImagePreparer(spec=ImageSpec(max_edge=256, format="JPEG"))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            large = os.path.join(tmp, "large.png")
+            Image.new("RGBA", (2048, 1024), (200, 30, 30, 255)).save(large)
+            small = os.path.join(tmp, "small.jpg")
+            Image.new("RGB", (64, 64), (0, 0, 255)).save(small, format="JPEG")
+
+            prepared = await preparer.prepare(large)
+            with Image.open(io.BytesIO(base64.b64decode(prepared))) as image:
+                assert image.format == "JPEG"
+                assert image.size == (256, 128)
+
+            # Already within the spec: original bytes are kept
+            with open(small, "rb") as f:
+                assert await preparer.prepare(small) == base64.b64encode(f.read()).decode()
+
+        stats = preparer.get_stats()
+        assert stats["bytes_out"] < stats["bytes_in"]
+    finally:
+        preparer.shutdown()
+    print("✅ Downscale and re-encode test passed")
+
+
+async def test_provider_uses_preparer():
+    """Test vision params are encoded through the provider's preparer"""
+    preparer = ImagePreparer()
+    provider = OllamaProvider("image-test", image_preparer=preparer)
+    direct = OllamaProvider("image-direct")
+    assert direct.image_preparer is None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "photo.png")
+            with open(path, "wb") as f:
+                f.write(b"pixels")
+            params = {"image_path": path, "messages": [{"role": "user", "content": "Describe"}]}
+            for _ in range(3):
+                processed = await provider._preprocess_params("llm/vision", params)
+                assert processed["images"] == [base64.b64encode(b"pixels").decode()]
+            processed = await direct._preprocess_params("llm/vision", params)
+            assert processed["images"] == [base64.b64encode(b"pixels").decode()]
+
+            # The preparer belongs to its creator and outlives the provider
+            await provider.shutdown()
+            assert await preparer.prepare(path) == base64.b64encode(b"pixels").decode()
+    finally:
+        await direct.shutdown()
+        preparer.shutdown()
+    assert preparer.misses == 1 and preparer.hits == 3
+    print("✅ Provider image preparation test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Image Preparation")
+    print("=" * 50)
+
+    try:
+        await test_cache_keyed_on_file_state()
+        await test_cancelled_caller_does_not_fail_others()
+        await test_downscale_and_reencode()
+        await test_provider_uses_preparer()
+
+        print("\n✅ All image preparation tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test the metrics registry and OpenMetrics exposition
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import aiohttp
+
+from gleitzeit.core.execution_engine import ExecutionEngine, ExecutionMode
+from gleitzeit.core.metrics import CONTENT_TYPE, MetricsRegistry, MetricsServer, write_metrics_file
+from gleitzeit.core.models import Task, Workflow, Priority
+from gleitzeit.core.protocol import ProtocolSpec, MethodSpec
+from gleitzeit.persistence.base import InMemoryBackend
+from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.task_queue import QueueManager, DependencyResolver
+
+
+ECHO_PROTOCOL = ProtocolSpec(
+    name="echo",
+    version="v1",
+    description="Protocol for metrics tests",
+    methods={"echo/run": MethodSpec(name="echo/run", description="Echo params")}
+)
+
+
+class EchoProvider(ProtocolProvider):
+    """Provider that returns its params"""
+
+    def __init__(self):
+        super().__init__(provider_id="echo-1", protocol_id="echo/v1")
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health_check(self):
+        return {"status": "healthy"}
+
+    def get_supported_methods(self):
+        return ["echo/run"]
+
+    async def handle_request(self, method, params):
+        return dict(params)
+
+
+def parse_samples(text):
+    """Map 'name{labels}' -> value for every sample line"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+async def test_exposition_format():
+    """Test counters, gauges and histograms render as OpenMetrics text"""
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests\nhandled", ["route"])
+    requests.labels("/a").inc()
+    requests.labels(route='say "hi"').inc(2)
+    assert registry.counter("demo_requests", "Requests", ["route"]) is requests
+
+    depth = registry.gauge("demo_depth", "Depth")
+    depth.set(5)
+    depth.dec()
+
+    latency = registry.histogram("demo_seconds", "Latency", buckets=[0.1, 1.0])
+    for value in [0.05, 0.1, 0.5, 3.0]:
+        latency.observe(value)
+
+    text = registry.exposition()
+    assert text.endswith("# EOF\n")
+    assert "# TYPE demo_requests counter\n# HELP demo_requests Requests\\nhandled" in text
+    samples = parse_samples(text)
+    assert samples['demo_requests_total{route="/a"}'] == 1
+    assert samples['demo_requests_total{route="say \\"hi\\""}'] == 2
+    assert samples["demo_depth"] == 4
+    # Buckets are cumulative and le is inclusive
+    assert samples['demo_seconds_bucket{le="0.1"}'] == 2
+    assert samples['demo_seconds_bucket{le="1"}'] == 3
+    assert samples['demo_seconds_bucket{le="+Inf"}'] == 4
+    assert samples["demo_seconds_count"] == 4
+    assert samples["demo_seconds_sum"] == 3.65
+
+    for bad in [lambda: registry.gauge("demo_depth", labelnames=["x"]),
+                lambda: requests.labels("a", "b"),
+                lambda: requests.inc(),
+                lambda: registry.counter("bad name")]:
+        try:
+            bad()
+        except ValueError:
+            continue
+        raise AssertionError("expected ValueError")
+    print("✅ Exposition format test passed")
+
+
+async def test_engine_metrics():
+    """Test engine counters and collected component state after a run"""
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(ECHO_PROTOCOL)
+    registry.register_provider("echo-1", "echo/v1", EchoProvider())
+    queue_manager = QueueManager()
+    metrics = MetricsRegistry()
+    engine = ExecutionEngine(
+        registry=registry,
+        queue_manager=queue_manager,
+        dependency_resolver=DependencyResolver(),
+        persistence=InMemoryBackend(),
+        max_concurrent_tasks=2,
+        metrics=metrics
+    )
+
+    workflow = Workflow(id="metered", name="metered")
+    workflow.add_task(Task(id="a", name="a", protocol="echo/v1", method="echo/run", params={"v": 1}))
+    workflow.add_task(Task(id="b", name="b", protocol="echo/v1", method="echo/run",
+                           params={"v": "${a.v}"}, dependencies=["a"]))
+
+    finished = asyncio.Event()
+    engine.add_event_handler("workflow:completed", lambda name, data: finished.set())
+    runner = asyncio.create_task(engine.start(ExecutionMode.EVENT_DRIVEN))
+    while not engine.running:
+        await asyncio.sleep(0.01)
+    await engine.submit_workflow(workflow)
+    await asyncio.wait_for(finished.wait(), 10)
+    await engine.stop()
+    await runner
+
+    # A queued task shows up under its priority
+    await queue_manager.enqueue_task(Task(id="later", name="later", protocol="echo/v1",
+                                          method="echo/run", priority=Priority.HIGH))
+
+    samples = parse_samples(metrics.exposition())
+    assert samples['gleitzeit_tasks_total{protocol="echo/v1",method="echo/run",status="completed"}'] == 2
+    assert samples['gleitzeit_workflows_total{status="completed"}'] == 1
+    assert samples['gleitzeit_queue_depth{queue="default",priority="high"}'] == 1
+    assert samples['gleitzeit_queue_depth{queue="default",priority="normal"}'] == 0
+    assert samples['gleitzeit_provider_in_flight{provider="echo-1",protocol="echo/v1"}'] == 0
+    assert samples['gleitzeit_provider_requests_total{provider="echo-1",protocol="echo/v1",result="success"}'] == 2
+    assert samples["gleitzeit_retries_pending"] == 0
+    assert samples['gleitzeit_persistence_write_seconds_count{backend="InMemoryBackend",operation="save_task"}'] == 2
+    assert 'gleitzeit_cache_hits_total{cache="result_store",instance="engine"}' in samples
+    phase = 'gleitzeit_task_phase_seconds_bucket{protocol="echo/v1",method="echo/run",phase="total",le="+Inf"}'
+    assert samples[phase] == 2
+    # Collected histograms stay cumulative
+    buckets = [value for name, value in samples.items()
+               if name.startswith('gleitzeit_task_phase_seconds_bucket{protocol="echo/v1",method="echo/run",phase="total"')]
+    assert buckets == sorted(buckets)
+    print("✅ Engine metrics test passed")
+
+
+async def test_http_endpoint_and_file_dump():
+    """Test the metrics endpoint and the file dump serve the same exposition"""
+    metrics = MetricsRegistry()
+    metrics.counter("demo_events_total", "Events").inc(3)
+
+    server = MetricsServer(metrics, port=0)
+    await server.start()
+    try:
+        assert server.port != 0
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                assert response.status == 200
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                body = await response.text()
+    finally:
+        await server.stop()
+    assert parse_samples(body)["demo_events_total"] == 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "nested", "gleitzeit.prom")
+        write_metrics_file(metrics, path)
+        with open(path) as f:
+            assert f.read() == metrics.exposition()
+        assert os.listdir(os.path.dirname(path)) == ["gleitzeit.prom"]
+    print("✅ Metrics endpoint and file dump test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Metrics")
+    print("=" * 50)
+
+    try:
+        await test_exposition_format()
+        await test_engine_metrics()
+        await test_http_endpoint_and_file_dump()
+
+        print("\n✅ All metrics tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
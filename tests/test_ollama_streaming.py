@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test streamed Ollama output against a local fake Ollama server
+"""
+
+import asyncio
+import json
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from aiohttp import web
+
+from gleitzeit.client import GleitzeitClient
+from gleitzeit.core.streaming import partial_output_handler
+from gleitzeit.providers.ollama_provider import OllamaProvider
+
+CHUNKS = ["Once", " upon", " a", " time"]
+
+
+async def fake_chat(request: web.Request) -> web.StreamResponse:
+    payload = await request.json()
+    assert payload["stream"] is True
+
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    for chunk in CHUNKS:
+        line = {"model": payload["model"], "message": {"role": "assistant", "content": chunk}, "done": False}
+        await response.write((json.dumps(line) + "\n").encode())
+        await asyncio.sleep(0.01)
+    done = {"model": payload["model"], "message": {"role": "assistant", "content": ""},
+            "done": True, "eval_count": len(CHUNKS), "total_duration": 123}
+    await response.write((json.dumps(done) + "\n").encode())
+    await response.write_eof()
+    return response
+
+
+async def fake_tags(request: web.Request) -> web.Response:
+    return web.json_response({"models": [{"name": "fake:latest"}]})
+
+
+async def start_fake_ollama():
+    app = web.Application()
+    app.router.add_post("/api/chat", fake_chat)
+    app.router.add_get("/api/tags", fake_tags)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def test_provider_reads_ndjson_stream():
+    """Test the provider reports chunks and returns the assembled response"""
+    runner, url = await start_fake_ollama()
+    provider = OllamaProvider("stream-test", url)
+    await provider.initialize()
+    received = []
+
+    async def on_chunk(chunk, metadata):
+        received.append((chunk, metadata["model"]))
+
+    try:
+        with partial_output_handler(on_chunk):
+            result = await provider.handle_request("llm/chat", {
+                "model": "fake:latest",
+                "messages": [{"role": "user", "content": "story"}],
+                "stream": True
+            })
+    finally:
+        await provider.shutdown()
+        await runner.cleanup()
+
+    assert [chunk for chunk, _ in received] == CHUNKS
+    assert received[0][1] == "fake:latest"
+    assert result["response"] == "Once upon a time"
+    assert result["role"] == "assistant"
+    assert result["tokens_used"] == len(CHUNKS)
+    print("✅ NDJSON stream reading test passed")
+
+
+async def test_client_chat_stream():
+    """Test GleitzeitClient.chat yields chunks and stores the final result"""
+    runner, url = await start_fake_ollama()
+    client = GleitzeitClient(persistence="memory", ollama_url=url)
+
+    try:
+        stream = await client.chat("story", model="fake:latest", stream=True)
+        chunks = [chunk async for chunk in stream]
+
+        task_ids = [task_id for task_id in client.engine.task_results if task_id.startswith("chat-")]
+        assert len(task_ids) == 1
+        stored = client.engine.task_results[task_ids[0]]
+    finally:
+        await client.shutdown()
+        await runner.cleanup()
+
+    assert chunks == CHUNKS
+    assert stored.result["response"] == "Once upon a time"
+    print("✅ Client chat streaming test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Ollama Streaming")
+    print("=" * 50)
+
+    try:
+        await test_provider_reads_ndjson_stream()
+        await test_client_chat_stream()
+
+        print("\n✅ All Ollama streaming tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
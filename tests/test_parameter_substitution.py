@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test compiled parameter substitution plans
+"""
+
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.models import TaskResult, TaskStatus
+from gleitzeit.core.parameter_substitution import compile_parameters
+
+
+def make_result(task_id: str, result) -> TaskResult:
+    return TaskResult(task_id=task_id, status=TaskStatus.COMPLETED, result=result)
+
+
+async def test_static_params_have_no_plan():
+    """Test params without references compile to a no-op plan"""
+    params = {"prompt": "plain text", "options": {"n": 1}, "items": [1, 2, "$ not a ref"]}
+    plan = compile_parameters(params)
+
+    assert not plan.has_references
+    assert plan.task_ids == ()
+    applied = plan.apply({})
+    assert applied == params
+    assert applied is not params
+    print("✅ Static params test passed")
+
+
+async def test_segments_and_raw_values():
+    """Test literal segments, embedded references and whole-string references"""
+    params = {
+        "prompt": "Summarize ${fetch.text} for ${user.name}, again: ${fetch.text}",
+        "count": "${stats.count}",
+        "nested": [{"value": "${stats.count}"}, "static"],
+        "static": {"keep": "me"}
+    }
+    plan = compile_parameters(params, {"fetch": "task-fetch"})
+    assert set(plan.task_ids) == {"task-fetch", "user", "stats"}
+
+    results = {
+        "task-fetch": make_result("task-fetch", {"text": "news"}),
+        "user": make_result("user", {"name": "Ada"}),
+        "stats": make_result("stats", {"count": 3})
+    }
+    applied = plan.apply(results)
+
+    assert applied["prompt"] == "Summarize news for Ada, again: news"
+    assert applied["count"] == 3  # whole-string references keep their type
+    assert applied["nested"] == [{"value": 3}, "static"]
+    assert applied["static"] is params["static"]  # untouched subtrees are shared
+    assert params["count"] == "${stats.count}"  # source params are not modified
+    print("✅ Segment substitution test passed")
+
+
+async def test_unresolved_references_are_kept():
+    """Test missing tasks or fields leave the placeholder in place"""
+    plan = compile_parameters({"a": "${missing.field}", "b": "x ${known.nope} y", "c": "${known}"})
+    results = {"known": make_result("known", {"value": 1})}
+
+    applied = plan.apply(results)
+    assert applied["a"] == "${missing.field}"
+    assert applied["b"] == "x ${known.nope} y"
+    assert applied["c"] == "${known}"  # default path is result.result
+
+    results["known"] = make_result("known", {"result": "inner"})
+    assert plan.apply(results)["c"] == "inner"
+    print("✅ Unresolved reference test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Parameter Substitution")
+    print("=" * 50)
+
+    try:
+        await test_static_params_have_no_plan()
+        await test_segments_and_raw_values()
+        await test_unresolved_references_are_kept()
+
+        print("\n✅ All parameter substitution tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
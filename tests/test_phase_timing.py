@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test per-phase task timing histograms
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.execution_engine import ExecutionEngine, ExecutionMode
+from gleitzeit.core.models import Task, Workflow
+from gleitzeit.core.phase_timing import LatencyHistogram, PhaseTimings
+from gleitzeit.core.protocol import ProtocolSpec, MethodSpec
+from gleitzeit.persistence.base import InMemoryBackend
+from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.task_queue import QueueManager, DependencyResolver
+
+
+SLOW_PROTOCOL = ProtocolSpec(
+    name="slow",
+    version="v1",
+    description="Protocol for phase timing tests",
+    methods={"slow/run": MethodSpec(name="slow/run", description="Sleep, then echo params")}
+)
+
+
+class SlowProvider(ProtocolProvider):
+    """Provider that takes a fixed time per request"""
+
+    def __init__(self, delay: float):
+        super().__init__(provider_id="slow-1", protocol_id="slow/v1")
+        self.delay = delay
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health_check(self):
+        return {"status": "healthy"}
+
+    def get_supported_methods(self):
+        return ["slow/run"]
+
+    async def handle_request(self, method, params):
+        await asyncio.sleep(self.delay)
+        return dict(params)
+
+
+async def test_histogram_percentiles():
+    """Test percentiles stay within the bucket precision and survive merge/serialization"""
+    histogram = LatencyHistogram()
+    for micros in range(1, 10001):
+        histogram.record(micros / 1_000_000)
+
+    for pct, exact in [(50, 0.005), (90, 0.009), (99, 0.0099)]:
+        assert abs(histogram.percentile(pct) - exact) / exact < 0.035, (pct, histogram.percentile(pct))
+    assert histogram.percentile(100) == histogram.max == 0.01
+    assert histogram.summary()["count"] == 10000
+
+    other = LatencyHistogram()
+    other.record(2.0)
+    histogram.merge(other)
+    assert histogram.max == 2.0 and histogram.count == 10001
+
+    restored = LatencyHistogram.from_state(json.loads(json.dumps(histogram.to_state())))
+    assert restored.summary() == histogram.summary()
+    # Memory is bounded by the value range, not the number of samples
+    assert len(histogram.counts) < 400
+    print("✅ Histogram percentile test passed")
+
+
+async def test_engine_records_phases():
+    """Test task and request phases are recorded per (protocol, method)"""
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(SLOW_PROTOCOL)
+    registry.register_provider("slow-1", "slow/v1", SlowProvider(delay=0.02))
+    engine = ExecutionEngine(
+        registry=registry,
+        queue_manager=QueueManager(),
+        dependency_resolver=DependencyResolver(),
+        persistence=InMemoryBackend(),
+        max_concurrent_tasks=2
+    )
+    assert engine.phase_timings is registry.phase_timings
+
+    workflow = Workflow(id="timed", name="timed")
+    workflow.add_task(Task(id="first", name="first", protocol="slow/v1", method="slow/run", params={"value": 1}))
+    for i in range(3):
+        workflow.add_task(Task(
+            id=f"next-{i}", name=f"next-{i}", protocol="slow/v1", method="slow/run",
+            params={"value": "${first.value}"}, dependencies=["first"]
+        ))
+
+    finished = asyncio.Event()
+    engine.add_event_handler("workflow:completed", lambda name, data: finished.set())
+    runner = asyncio.create_task(engine.start(ExecutionMode.EVENT_DRIVEN))
+    while not engine.running:
+        await asyncio.sleep(0.01)
+    await engine.submit_workflow(workflow)
+    await asyncio.wait_for(finished.wait(), 10)
+    await engine.stop()
+    await runner
+
+    phases = engine.get_stats().phase_timings["slow/v1 slow/run"]
+    assert list(phases)[:2] == ["queue_wait", "semaphore_wait"]
+    for phase in ["queue_wait", "semaphore_wait", "dispatch", "substitution", "provider_wait",
+                  "preprocessing", "validation", "provider", "persistence", "completion", "total"]:
+        assert phases[phase]["count"] == 4, phase
+    assert 20 <= phases["provider"]["p50_ms"] < 200
+    assert phases["total"]["p99_ms"] >= phases["provider"]["p99_ms"]
+    # Queue wait starts when dependencies are met, so the dependents'
+    # wait for "first" (a >= 20ms provider call) is not counted
+    assert phases["queue_wait"]["max_ms"] < 20
+    assert engine._get_stats_dict()["phase_timings"] == engine.get_stats().phase_timings
+    print("✅ Engine phase recording test passed")
+
+
+async def test_timings_accumulate_across_runs():
+    """Test the CLI merges each run's timings into one file"""
+    from gleitzeit.cli.gleitzeit_cli import GleitzeitCLI
+
+    class EngineStub:
+        def __init__(self):
+            self.phase_timings = PhaseTimings()
+            self.phase_timings.record("llm/v1", "llm/chat", "provider", 0.5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cli = GleitzeitCLI()
+        cli.config['metrics'] = {'phase_timings_file': os.path.join(tmp, 'timings.json')}
+        for _ in range(2):
+            cli.execution_engine = EngineStub()
+            cli._save_phase_timings()
+
+        summary = cli.load_phase_timings().snapshot()["llm/v1 llm/chat"]["provider"]
+        assert summary["count"] == 2
+        assert summary["p50_ms"] == 500.0
+        # Written through a temp file that replaced the original
+        assert os.listdir(tmp) == ['timings.json']
+    print("✅ Phase timing accumulation test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Phase Timing")
+    print("=" * 50)
+
+    try:
+        await test_histogram_percentiles()
+        await test_engine_records_phases()
+        await test_timings_accumulate_across_runs()
+
+        print("\n✅ All phase timing tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
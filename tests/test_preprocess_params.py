@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test provider parameter preprocessing (file reads, image encoding, single pass)
+"""
+
+import asyncio
+import base64
+import copy
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.jsonrpc import JSONRPCRequest
+from gleitzeit.core.protocol import ProtocolSpec, MethodSpec
+from gleitzeit.providers.image_prep import MMAP_THRESHOLD
+from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.registry import ProtocolProviderRegistry
+
+
+class RecordingProvider(ProtocolProvider):
+    """Provider that records preprocessing passes and received params"""
+
+    def __init__(self):
+        super().__init__("recording", "prep/v1")
+        self.preprocess_calls = 0
+        self.received: List[Dict[str, Any]] = []
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def health_check(self) -> Dict[str, Any]:
+        return {"status": "healthy"}
+
+    def get_supported_methods(self) -> List[str]:
+        return ["prep/run"]
+
+    async def _preprocess_params(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.preprocess_calls += 1
+        return await super()._preprocess_params(method, params)
+
+    async def handle_request(self, method: str, params: Dict[str, Any]) -> Any:
+        self.received.append(params)
+        return {"ok": True}
+
+
+async def test_rewrites_without_mutating_input():
+    """Test file content is inlined into copies of only the rewritten keys"""
+    provider = RecordingProvider()
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "notes.txt")
+        with open(text_path, "w") as f:
+            f.write("file body")
+        for name in ("a.md", "b.md"):
+            open(os.path.join(tmp, name), "w").close()
+
+        system = {"role": "system", "content": "be brief"}
+        params = {
+            "messages": [system, {"role": "user", "content": "Summarize"}],
+            "file_path": text_path,
+            "directory": tmp,
+            "file_pattern": "*.md",
+            "files": ["given.md"],
+            "options": {"nested": [1, 2]}
+        }
+        original = copy.deepcopy(params)
+        processed = await provider._preprocess_params("prep/run", params)
+
+    assert params == original
+    assert processed["messages"][-1]["content"] == f"Summarize\n\nFile content from {text_path}:\nfile body"
+    # Untouched values are shared, not copied
+    assert processed["messages"][0] is system
+    assert processed["options"] is params["options"]
+    assert processed["files"][0] == "given.md" and len(processed["files"]) == 3
+    assert "directory" not in processed and "file_pattern" not in processed
+
+    plain = {"prompt": "hi"}
+    assert await provider._preprocess_params("prep/run", plain) is plain
+    print("✅ Copy-on-write preprocessing test passed")
+
+
+async def test_large_image_encoding():
+    """Test images above the mmap threshold encode identically"""
+    provider = RecordingProvider()
+    payload = os.urandom(MMAP_THRESHOLD + 12345)
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = os.path.join(tmp, "big.png")
+        with open(image_path, "wb") as f:
+            f.write(payload)
+        processed = await provider._preprocess_params("prep/run", {"image_path": image_path})
+        empty_path = os.path.join(tmp, "empty.jpg")
+        open(empty_path, "wb").close()
+        empty = await provider._preprocess_params("prep/run", {"file_path": empty_path})
+
+    assert processed["images"] == [base64.b64encode(payload).decode("ascii")]
+    assert "image_path" not in processed
+    assert empty["image_data"] == ""
+    print("✅ Large image encoding test passed")
+
+
+async def test_registry_preprocesses_once():
+    """Test a request through the registry is preprocessed exactly once"""
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(ProtocolSpec(
+        name="prep", version="v1",
+        methods={"prep/run": MethodSpec(name="prep/run", params_schema={})}
+    ))
+    provider = RecordingProvider()
+    registry.register_provider("recording", "prep/v1", provider)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "notes.txt")
+        with open(text_path, "w") as f:
+            f.write("file body")
+        response = await registry.execute_request("prep/v1", JSONRPCRequest(
+            id="1", method="prep/run", params={"prompt": "Read", "file_path": text_path}
+        ))
+
+    assert response.error is None
+    assert provider.preprocess_calls == 1
+    assert provider.received[0]["prompt"].endswith("file body")
+    assert provider.request_count == 1
+    print("✅ Single preprocessing pass test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Parameter Preprocessing")
+    print("=" * 50)
+
+    try:
+        await test_rewrites_without_mutating_input()
+        await test_large_image_encoding()
+        await test_registry_preprocesses_once()
+
+        print("\n✅ All parameter preprocessing tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
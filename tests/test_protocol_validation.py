@@ -197,6 +197,34 @@ def test_parameter_types():
     except Exception as e:
         assert False, f"Optional parameter test failed: {e}"
 
+def test_compiled_validator_cache():
+    """Test validators are compiled on registration and rebuilt on re-registration"""
+    from gleitzeit.core.protocol import ProtocolRegistry
+    
+    method = MethodSpec(
+        name="cache/run",
+        params_schema={"text": ParameterSpec(type=ParameterType.STRING, required=True)}
+    )
+    protocol = ProtocolSpec(name="cache", version="v1", methods={"cache/run": method})
+    registry = ProtocolRegistry()
+    registry.register(protocol)
+    
+    validator = method._validator
+    assert validator is not None
+    registry.validate_task("cache/v1", "cache/run", {"text": "hi"})
+    registry.validate_task("cache/v1", "cache/run", {"text": "again"})
+    assert method._validator is validator
+    assert not registry.is_valid_task("cache/v1", "cache/run", {"text": 1})
+    assert not registry.is_valid_task("cache/v1", "cache/missing", {})
+    
+    # Changing the spec and registering again picks up the new schema
+    method.params_schema["count"] = ParameterSpec(type=ParameterType.INTEGER, required=True)
+    registry.register(protocol)
+    assert method._validator is not validator
+    assert not registry.is_valid_task("cache/v1", "cache/run", {"text": "hi"})
+    assert registry.is_valid_task("cache/v1", "cache/run", {"text": "hi", "count": 2})
+    print("✅ Compiled validator cache test passed")
+
 def main():
     """Run all tests"""
     print("🧪 Testing Protocol Validation & Method Routing")
@@ -207,6 +235,7 @@ def main():
         test_method_routing()
         test_protocol_validation()
         test_parameter_types()
+        test_compiled_validator_cache()
         
         print("\n✅ All protocol validation tests PASSED")
         return 0
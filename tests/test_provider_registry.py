@@ -9,8 +9,9 @@ import os
 from typing import Dict, Any
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 
-from gleitzeit.registry import ProtocolProviderRegistry, ProviderInfo, ProviderStatus
+from gleitzeit.registry import ProtocolProviderRegistry, ProviderInfo, ProviderStatus, LoadBalancingStrategy, SINGLE_FLIGHT_MAX_PAYLOAD_CHARS
 from gleitzeit.core.protocol import ProtocolSpec, MethodSpec, ParameterSpec, ParameterType
+from gleitzeit.core.jsonrpc import JSONRPCRequest
 
 class TestProvider:
     """Test provider implementation"""
@@ -230,6 +231,125 @@ async def test_provider_status():
     assert provider.provider_id == "healthy-provider"
     print("✅ Provider status test passed")
 
+class SlowProvider(TestProvider):
+    """Test provider that tracks its peak concurrency"""
+    
+    def __init__(self, provider_id: str):
+        super().__init__(provider_id)
+        self.active = 0
+        self.peak = 0
+    
+    async def handle_request(self, method: str, params: Dict[str, Any]) -> Any:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            return await super().handle_request(method, params)
+        finally:
+            self.active -= 1
+
+def make_echo_registry(strategy=LoadBalancingStrategy.LEAST_OUTSTANDING, single_flight_protocols=None) -> ProtocolProviderRegistry:
+    registry = ProtocolProviderRegistry(load_balancing=strategy, single_flight_protocols=single_flight_protocols)
+    registry.register_protocol(ProtocolSpec(
+        name="test",
+        version="v1",
+        methods={
+            "test/echo": MethodSpec(name="test/echo", params_schema={}),
+            "test/ping": MethodSpec(name="test/ping", params_schema={})
+        }
+    ))
+    return registry
+
+async def test_least_outstanding_with_concurrency_limits():
+    """Test concurrent requests spread evenly and respect per-provider limits"""
+    for strategy in LoadBalancingStrategy:
+        registry = make_echo_registry(strategy)
+        providers = [SlowProvider(f"provider-{i}") for i in range(3)]
+        for provider in providers:
+            registry.register_provider(
+                provider.provider_id, "test/v1", provider,
+                supported_methods={"test/echo"}, max_concurrent_requests=2
+            )
+        
+        responses = await asyncio.gather(*[
+            registry.execute_request("test/v1", JSONRPCRequest(id=str(i), method="test/echo", params={}))
+            for i in range(30)
+        ])
+        
+        assert all(r.error is None for r in responses)
+        assert all(p.peak <= 2 for p in providers)
+        assert [p.call_count for p in providers] == [10, 10, 10]
+        assert all(info.in_flight == 0 for info in registry.providers.values())
+    print("✅ Least outstanding balancing test passed")
+
+async def test_candidate_cache_invalidation():
+    """Test cached candidates follow registration and health changes"""
+    registry = make_echo_registry()
+    registry.register_provider("a", "test/v1", TestProvider("a"), supported_methods={"test/echo"})
+    registry.register_provider("b", "test/v1", TestProvider("b"), supported_methods={"test/echo", "test/ping"})
+    
+    assert {p.provider_id for p in registry.get_providers_for_protocol("test/v1", "test/echo")} == {"a", "b"}
+    assert [p.provider_id for p in registry.get_providers_for_protocol("test/v1", "test/ping")] == ["b"]
+    
+    registry.providers["b"].status = ProviderStatus.UNHEALTHY
+    assert [p.provider_id for p in registry.get_providers_for_protocol("test/v1", "test/echo")] == ["a"]
+    assert registry.select_provider("test/v1", "test/ping") is None
+    
+    registry.providers["b"].status = ProviderStatus.DEGRADED
+    assert registry.select_provider("test/v1", "test/ping").provider_id == "b"
+    
+    await registry.unregister_provider("a")
+    assert [p.provider_id for p in registry.get_providers_for_protocol("test/v1", "test/echo")] == ["b"]
+    
+    response = await registry.execute_request("test/v1", JSONRPCRequest(id="1", method="test/unknown", params={}))
+    assert response.error is not None
+    print("✅ Candidate cache invalidation test passed")
+
+async def test_single_flight_coalescing():
+    """Test identical concurrent requests share one execution when enabled"""
+    registry = make_echo_registry(single_flight_protocols={"test/v1"})
+    provider = SlowProvider("provider-1")
+    registry.register_provider("provider-1", "test/v1", provider, supported_methods={"test/echo"})
+    
+    responses = await asyncio.gather(*[
+        registry.execute_request("test/v1", JSONRPCRequest(id=str(i), method="test/echo", params={"message": "hi"}))
+        for i in range(5)
+    ] + [
+        registry.execute_request("test/v1", JSONRPCRequest(id="other", method="test/echo", params={"message": "bye"}))
+    ])
+    
+    assert provider.call_count == 2
+    assert [r.id for r in responses] == ["0", "1", "2", "3", "4", "other"]
+    assert all(r.result["echo"] == "hi" for r in responses[:5])
+    # Each caller owns its copy of the result
+    responses[1].result["echo"] = "changed"
+    assert responses[0].result["echo"] == "hi"
+    assert registry.get_registry_stats()["coalesced_requests"] == 4
+    assert not registry._in_flight_requests
+    
+    # Sequential requests and disabled protocols are executed every time
+    await registry.execute_request("test/v1", JSONRPCRequest(id="5", method="test/echo", params={"message": "hi"}))
+    assert provider.call_count == 3
+    registry.set_single_flight("test/v1", False)
+    await asyncio.gather(*[
+        registry.execute_request("test/v1", JSONRPCRequest(id=str(i), method="test/echo", params={"message": "hi"}))
+        for i in range(3)
+    ])
+    assert provider.call_count == 6
+    
+    # Requests with large inline payloads (e.g. base64 images) are not keyed
+    registry.set_single_flight("test/v1", True)
+    image = "A" * (SINGLE_FLIGHT_MAX_PAYLOAD_CHARS + 1)
+    await asyncio.gather(*[
+        registry.execute_request("test/v1", JSONRPCRequest(
+            id=str(i), method="test/echo",
+            params={"messages": [{"role": "user", "content": "hi", "images": [image]}]}
+        ))
+        for i in range(3)
+    ])
+    assert provider.call_count == 9
+    print("✅ Single-flight coalescing test passed")
+
 async def main():
     """Run all tests"""
     print("🧪 Testing Provider Registry & Load Balancing")
@@ -240,6 +360,9 @@ async def main():
         await test_multiple_providers()
         await test_provider_selection()
         await test_provider_status()
+        await test_least_outstanding_with_concurrency_limits()
+        await test_candidate_cache_invalidation()
+        await test_single_flight_coalescing()
         
         print("\n✅ All provider registry tests PASSED")
         return 0
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test inline/thread/process execution classes for registered Python functions
+"""
+
+import asyncio
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.errors import ConfigurationError
+from gleitzeit.providers.python_function_provider import PythonFunctionProvider, ExecutionClass
+
+
+def where_am_i(delay: float = 0.0):
+    """Report the process and thread a call ran in"""
+    import time
+    time.sleep(delay)
+    return {"pid": os.getpid(), "thread": threading.current_thread().name}
+
+
+async def call(provider, name, **kwargs):
+    response = await provider.handle_request("python/execute", {"function": name, "kwargs": kwargs})
+    assert response["success"], response
+    return response["result"]
+
+
+async def test_execution_classes():
+    """Test each execution class runs calls where it should"""
+    provider = PythonFunctionProvider("exec-test", thread_pool_size=2, process_pool_size=2)
+    provider.register_function("inline", where_am_i, ExecutionClass.INLINE)
+    provider.register_function("thread", where_am_i)
+    provider.register_function("process", where_am_i, "process")
+
+    try:
+        inline = await call(provider, "inline")
+        threaded = await call(provider, "thread")
+        processed = await call(provider, "process")
+        info = await provider.handle_request("python/info", {"function": "process"})
+    finally:
+        await provider.shutdown()
+
+    assert inline == {"pid": os.getpid(), "thread": threading.current_thread().name}
+    assert threaded["pid"] == os.getpid() and threaded["thread"].startswith("exec-test-fn")
+    assert processed["pid"] != os.getpid()
+    assert info["execution_class"] == "process"
+    print("✅ Execution class routing test passed")
+
+
+async def test_queue_depth_metrics():
+    """Test per-pool metrics count calls waiting for a worker"""
+    provider = PythonFunctionProvider("exec-test", thread_pool_size=2)
+    provider.register_function("slow", where_am_i)
+
+    try:
+        calls = [asyncio.create_task(call(provider, "slow", delay=0.1)) for _ in range(5)]
+        await asyncio.sleep(0.02)
+        during = provider.get_execution_stats()["thread"]
+        await asyncio.gather(*calls)
+    finally:
+        await provider.shutdown()
+
+    assert during["in_flight"] == 5
+    assert during["queue_depth"] == 3
+    after = provider.get_execution_stats()["thread"]
+    assert after["in_flight"] == 0 and after["queue_depth"] == 0
+    assert after["peak_queue_depth"] == 3
+    assert after["completed"] == 5
+    assert after["failed"] == 0
+    print("✅ Queue depth metrics test passed")
+
+
+def fail_loudly():
+    raise ValueError("boom")
+
+
+async def test_failed_calls_counted_separately():
+    """Test raised calls count as failed, not completed"""
+    provider = PythonFunctionProvider("exec-test", thread_pool_size=1)
+    provider.register_function("fail", fail_loudly)
+    provider.register_function("ok", where_am_i)
+
+    try:
+        failed = await provider.handle_request("python/execute", {"function": "fail"})
+        await call(provider, "ok")
+    finally:
+        await provider.shutdown()
+
+    assert failed["success"] is False
+    stats = provider.get_execution_stats()["thread"]
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    print("✅ Failed call metrics test passed")
+
+
+async def test_process_requires_picklable():
+    """Test unpicklable functions are rejected for the process pool"""
+    provider = PythonFunctionProvider("exec-test")
+    try:
+        provider.register_function("lambda", lambda x: x, ExecutionClass.PROCESS)
+        assert False, "Expected ConfigurationError"
+    except ConfigurationError as e:
+        assert "not picklable" in str(e)
+
+    provider.register_module_functions("math", ["factorial"], execution_class="process")
+    assert provider.execution_classes["math.factorial"] == ExecutionClass.PROCESS
+    try:
+        response = await provider.handle_request("python/execute", {"function": "math.factorial", "args": [10]})
+    finally:
+        await provider.shutdown()
+    assert response["result"] == 3628800
+    print("✅ Picklable process function test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Python Execution Classes")
+    print("=" * 50)
+
+    try:
+        await test_execution_classes()
+        await test_queue_depth_metrics()
+        await test_failed_calls_counted_separately()
+        await test_process_requires_picklable()
+
+        print("\n✅ All Python execution class tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
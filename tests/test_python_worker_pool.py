@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test warm Python worker pool used for python/v1 file execution
+"""
+
+import asyncio
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.providers.python_function_provider import PythonFunctionProvider
+from gleitzeit.providers.python_worker_pool import PythonWorkerPool
+
+
+def write_script(directory: str, name: str, code: str) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(code)
+    return path
+
+
+async def test_file_execution_reuses_workers():
+    """Test results, output and context travel over the worker channel"""
+    provider = PythonFunctionProvider("pool-test", worker_pool=PythonWorkerPool(size=1))
+    with tempfile.TemporaryDirectory() as tmp:
+        script = write_script(tmp, "job.py", (
+            "import os\n"
+            "print('hello from', context['name'])\n"
+            "print('{not json')\n"
+            "result = {'pid': os.getpid(), 'doubled': context['value'] * 2}\n"
+        ))
+        scalar = write_script(tmp, "scalar.py", "result = 6 * 7\n")
+        try:
+            first = await provider.handle_request("python/execute", {"file": script, "context": {"name": "a", "value": 2}})
+            second = await provider.handle_request("python/execute", {"file": script, "context": {"name": "b", "value": 5}})
+            third = await provider.handle_request("python/execute", {"file": scalar})
+        finally:
+            await provider.shutdown()
+
+    assert first["success"] and second["success"]
+    assert first["result"]["doubled"] == 4
+    assert second["result"]["doubled"] == 10
+    assert first["output"] == "hello from a\n{not json\n"
+    # Same warm process served both jobs
+    assert first["result"]["pid"] == second["result"]["pid"]
+    assert third["result"] == "42"
+    assert provider.worker_pool.get_stats()["workers_started"] == 1
+    print("✅ Worker reuse test passed")
+
+
+async def test_errors_and_timeouts_replace_workers():
+    """Test failing jobs report errors and hung jobs kill their worker"""
+    pool = PythonWorkerPool(size=1)
+    provider = PythonFunctionProvider("pool-test", worker_pool=pool)
+    with tempfile.TemporaryDirectory() as tmp:
+        failing = write_script(tmp, "fail.py", "print('before')\nraise ValueError('boom')\n")
+        hanging = write_script(tmp, "hang.py", "import time\ntime.sleep(30)\n")
+        crashing = write_script(tmp, "crash.py", "import os\nos._exit(3)\n")
+        ok = write_script(tmp, "ok.py", "result = [1, 2]\n")
+        try:
+            failed = await provider.handle_request("python/execute", {"file": failing})
+            timed_out = await provider.handle_request("python/execute", {"file": hanging, "timeout": 0.5})
+            crashed = await provider.handle_request("python/execute", {"file": crashing})
+            recovered = await provider.handle_request("python/execute", {"file": ok})
+        finally:
+            await provider.shutdown()
+
+    assert failed["success"] is False
+    assert "ValueError: boom" in failed["error"]
+    assert failed["output"] == "before\n"
+    assert timed_out["success"] is False and "timed out" in timed_out["error"]
+    assert crashed["success"] is False and "exited unexpectedly" in crashed["error"]
+    assert recovered["result"] == [1, 2]
+
+    stats = pool.get_stats()
+    assert stats["timeouts"] == 1
+    assert stats["crashes"] == 1
+    # Failing jobs keep their worker; the timeout and crash each needed a new one
+    assert stats["workers_started"] == 3
+    print("✅ Error and timeout handling test passed")
+
+
+async def test_process_state_restored_between_jobs():
+    """Test cwd, environment and sys.path changes do not leak into the next job"""
+    provider = PythonFunctionProvider("pool-test", worker_pool=PythonWorkerPool(size=1))
+    with tempfile.TemporaryDirectory() as tmp:
+        mutate = write_script(tmp, "mutate.py", (
+            "import os, sys\n"
+            "os.chdir(context['dir'])\n"
+            "os.environ['GLEITZEIT_LEAK'] = '1'\n"
+            "sys.path.insert(0, context['dir'])\n"
+            "result = os.getpid()\n"
+        ))
+        inspect = write_script(tmp, "inspect.py", (
+            "import os, sys\n"
+            "result = {'pid': str(os.getpid()), 'cwd': os.getcwd(),\n"
+            "          'leak': os.environ.get('GLEITZEIT_LEAK'), 'path': context['dir'] in sys.path}\n"
+        ))
+        try:
+            before = await provider.handle_request("python/execute", {"file": inspect, "context": {"dir": tmp}})
+            mutated = await provider.handle_request("python/execute", {"file": mutate, "context": {"dir": tmp}})
+            after = await provider.handle_request("python/execute", {"file": inspect, "context": {"dir": tmp}})
+        finally:
+            await provider.shutdown()
+
+    assert mutated["success"]
+    assert after["result"]["pid"] == mutated["result"]
+    assert after["result"] == before["result"]
+    assert after["result"]["leak"] is None
+    print("✅ Process state restore test passed")
+
+
+async def test_workers_recycled():
+    """Test workers are replaced after max_jobs_per_worker jobs or above the memory ceiling"""
+    with tempfile.TemporaryDirectory() as tmp:
+        script = write_script(tmp, "pid.py", "import os\nresult = {'pid': os.getpid()}\n")
+
+        pool = PythonWorkerPool(size=1, max_jobs_per_worker=2)
+        try:
+            pids = [(await pool.execute(script, {}, timeout=10))["result"]["pid"] for _ in range(4)]
+        finally:
+            await pool.shutdown()
+        assert pids[0] == pids[1] and pids[2] == pids[3] and pids[1] != pids[2]
+        assert pool.get_stats()["workers_recycled"] == 2
+
+        tiny = PythonWorkerPool(size=1, max_memory_mb=1)
+        try:
+            pids = [(await tiny.execute(script, {}, timeout=10))["result"]["pid"] for _ in range(2)]
+        finally:
+            await tiny.shutdown()
+        assert pids[0] != pids[1]
+        assert tiny.get_stats()["workers"] == 0
+    print("✅ Worker recycling test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Python Worker Pool")
+    print("=" * 50)
+
+    try:
+        await test_file_execution_reuses_workers()
+        await test_errors_and_timeouts_replace_workers()
+        await test_process_state_restored_between_jobs()
+        await test_workers_recycled()
+
+        print("\n✅ All Python worker pool tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
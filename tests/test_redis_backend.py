@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test Redis persistence backend against an in-process fake Redis server
+"""
+
+import asyncio
+import json
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import fakeredis
+
+from gleitzeit.core.models import Task, TaskResult, TaskStatus
+from gleitzeit.persistence.redis_backend import RedisBackend
+
+
+def make_task(task_id: str, status: TaskStatus = TaskStatus.QUEUED, workflow_id: str = None) -> Task:
+    return Task(
+        id=task_id,
+        name=task_id,
+        protocol="python/v1",
+        method="python/execute",
+        params={},
+        status=status,
+        workflow_id=workflow_id
+    )
+
+
+async def make_backend() -> RedisBackend:
+    backend = RedisBackend(redis_client=fakeredis.FakeAsyncRedis(decode_responses=True))
+    await backend.initialize()
+    return backend
+
+
+async def test_status_transitions_are_indexed():
+    """Test a saved task moves between status sets and publishes events"""
+    backend = await make_backend()
+    redis_client = backend.redis_client
+    pubsub = await backend.subscribe_to_task_events()
+    await pubsub.get_message(timeout=0.1)  # subscribe confirmation
+
+    task = make_task("t1", workflow_id="wf")
+    await backend.save_task(task)
+    task.status = TaskStatus.EXECUTING
+    await backend.save_task(task)
+    await backend.save_task(task)  # unchanged status publishes nothing
+    task.status = TaskStatus.COMPLETED
+    await backend.save_task(task)
+
+    assert await redis_client.smembers(backend._key("tasks:status:queued")) == set()
+    assert await redis_client.smembers(backend._key("tasks:status:executing")) == set()
+    assert await redis_client.smembers(backend._key("tasks:status:completed")) == {"t1"}
+    assert await redis_client.smembers(backend._key("workflow:wf:tasks")) == {"t1"}
+    assert await redis_client.ttl(backend._key("task:t1")) > 0
+
+    events = []
+    while True:
+        message = await pubsub.get_message(timeout=0.1)
+        if message is None:
+            break
+        events.append(json.loads(message["data"]))
+    assert [e["event_type"] for e in events] == [
+        "task:created", "task:status_changed", "task:status_changed"
+    ]
+    assert (events[1]["old_status"], events[1]["new_status"]) == ("queued", "executing")
+    assert (events[2]["old_status"], events[2]["new_status"]) == ("executing", "completed")
+
+    await pubsub.aclose()
+    await backend.shutdown()
+    print("✅ Status transition test passed")
+
+
+async def test_batch_save_and_bulk_reads():
+    """Test pipelined batch saves and bulk lookups by status and workflow"""
+    backend = await make_backend()
+
+    tasks = [make_task(f"t{i}", workflow_id="wf") for i in range(25)]
+    await backend.save_tasks_batch(tasks)
+    tasks[0].status = TaskStatus.EXECUTING
+    await backend.save_tasks_batch([tasks[0], make_task("other", TaskStatus.RETRY_PENDING)])
+
+    queued = await backend.get_tasks_by_status("queued")
+    assert len(queued) == 24
+    assert len(await backend.get_tasks_by_workflow("wf")) == 25
+    assert len(await backend.get_all_queued_tasks()) == 26
+    assert [t.id for t in await backend.get_tasks_by_status("executing")] == ["t0"]
+
+    await backend.save_task_result(TaskResult(task_id="t0", status=TaskStatus.COMPLETED, result=1))
+    results = await backend.get_task_results_batch(["t0", "missing"])
+    assert list(results) == ["t0"] and results["t0"].result == 1
+
+    assert await backend.delete_task("t1")
+    assert not await backend.delete_task("t1")
+    assert len(await backend.get_tasks_by_workflow("wf")) == 24
+
+    await backend.shutdown()
+    print("✅ Batch save and bulk read test passed")
+
+
+async def test_counts_and_indexed_cleanup():
+    """Test SCAN-based counts and cleanup driven by the completion time index"""
+    backend = await make_backend()
+    redis_client = backend.redis_client
+    now = datetime.utcnow()
+
+    for i in range(7):
+        task = make_task(f"old-{i}", TaskStatus.COMPLETED, workflow_id="wf")
+        task.completed_at = now - timedelta(days=10)
+        await backend.save_task(task)
+        await backend.save_task_result(TaskResult(task_id=task.id, status=TaskStatus.COMPLETED))
+    recent = make_task("recent", TaskStatus.FAILED)
+    recent.completed_at = now
+    await backend.save_task(recent)
+    await backend.save_task(make_task("pending"))
+
+    # A retried task leaves the completion index
+    retried = make_task("retried", TaskStatus.FAILED)
+    retried.completed_at = now - timedelta(days=10)
+    await backend.save_task(retried)
+    retried.status = TaskStatus.QUEUED
+    await backend.save_task(retried)
+
+    counts = await backend.get_task_count_by_status()
+    assert counts["completed"] == 7 and counts["failed"] == 1 and counts["queued"] == 2
+
+    progress = []
+    removed = await backend.cleanup_old_data(now - timedelta(days=1), batch_size=3,
+                                             progress_callback=progress.append)
+    assert removed == 7
+    assert progress == [3, 6, 7]
+    assert await backend.get_task("old-0") is None
+    assert await backend.get_task_result("old-0") is None
+    assert await redis_client.smembers(backend._key("workflow:wf:tasks")) == set()
+    assert await redis_client.zrange(backend._key("tasks:completed_at"), 0, -1) == ["recent"]
+
+    counts = await backend.get_task_count_by_status()
+    assert counts.get("completed", 0) == 0 and counts["failed"] == 1
+    assert await backend.cleanup_old_data(now - timedelta(days=1)) == 0
+
+    await backend.shutdown()
+    print("✅ Counts and indexed cleanup test passed")
+
+
+async def test_cleanup_backfills_unindexed_tasks():
+    """Test finished tasks saved before the completion index are still cleaned up"""
+    backend = await make_backend()
+    redis_client = backend.redis_client
+    now = datetime.utcnow()
+    index_key = backend._key("tasks:completed_at")
+
+    for i in range(4):
+        task = make_task(f"legacy-{i}", TaskStatus.COMPLETED)
+        task.completed_at = now - timedelta(days=10)
+        await backend.save_task(task)
+    recent = make_task("legacy-recent", TaskStatus.COMPLETED)
+    recent.completed_at = now
+    await backend.save_task(recent)
+    # Written before the index existed: in the status set only
+    await redis_client.delete(index_key)
+    # And one whose hash has already expired
+    await redis_client.sadd(backend._key("tasks:status:failed"), "expired")
+
+    removed = await backend.cleanup_old_data(now - timedelta(days=1), batch_size=2)
+    assert removed == 5
+    assert await redis_client.zrange(index_key, 0, -1) == ["legacy-recent"]
+    assert await redis_client.smembers(backend._key("tasks:status:failed")) == set()
+    assert await redis_client.exists(backend._key("tasks:completed_at:backfilled"))
+
+    await backend.shutdown()
+    print("✅ Cleanup backfill test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Redis Backend")
+    print("=" * 50)
+
+    try:
+        await test_status_transitions_are_indexed()
+        await test_batch_save_and_bulk_reads()
+        await test_counts_and_indexed_cleanup()
+        await test_cleanup_backfills_unindexed_tasks()
+
+        print("\n✅ All Redis backend tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed provider response cache
+"""
+
+import asyncio
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from aiohttp import web
+
+from gleitzeit.core.streaming import partial_output_handler
+from gleitzeit.core.workflow_loader import load_workflow_from_dict
+from gleitzeit.providers.ollama_provider import OllamaProvider
+from gleitzeit.providers.response_cache import ResponseCache
+from gleitzeit.registry import ProtocolProviderRegistry
+
+
+async def start_fake_ollama(calls):
+    async def fake_chat(request: web.Request) -> web.Response:
+        payload = await request.json()
+        calls.append(payload)
+        return web.json_response({
+            "model": payload["model"],
+            "message": {"role": "assistant", "content": f"answer {len(calls)}"},
+            "done": True,
+            "eval_count": 3
+        })
+
+    async def fake_tags(request: web.Request) -> web.Response:
+        return web.json_response({"models": [{"name": "fake:latest"}]})
+
+    app = web.Application()
+    app.router.add_post("/api/chat", fake_chat)
+    app.router.add_get("/api/tags", fake_tags)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def test_cacheable_rules_and_keys():
+    """Test which requests are cacheable and how they are keyed"""
+    assert ResponseCache.is_cacheable({"temperature": 0})
+    assert ResponseCache.is_cacheable({})
+    assert not ResponseCache.is_cacheable({}, default_temperature=0.7)
+    assert not ResponseCache.is_cacheable({"temperature": 0.5})
+    assert ResponseCache.is_cacheable({"temperature": 0.5, "cache": True})
+    assert not ResponseCache.is_cacheable({"temperature": 0, "cache": False})
+
+    base = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+    key = ResponseCache.make_key("chat", base)
+    # Delivery options and key order do not change the content address
+    assert key == ResponseCache.make_key("chat", dict(reversed(list({**base, "stream": True}.items()))))
+    assert key != ResponseCache.make_key("generate", base)
+    assert key != ResponseCache.make_key("chat", {**base, "model": "other"})
+    print("✅ Cacheable rules and key test passed")
+
+
+async def test_memory_lru_and_ttl():
+    """Test LRU eviction and expiry in the memory tier"""
+    cache = ResponseCache(max_entries=2)
+    await cache.put("a", {"response": "A"})
+    await cache.put("b", {"response": "B"})
+    assert await cache.get("a") == {"response": "A"}
+    await cache.put("c", {"response": "C"})
+
+    # "b" was least recently used
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert cache.evictions == 1
+
+    expiring = ResponseCache(ttl=0.05)
+    await expiring.put("k", {"response": "K"})
+    assert await expiring.get("k") is not None
+    await asyncio.sleep(0.1)
+    assert await expiring.get("k") is None
+
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+    print("✅ Memory LRU and TTL test passed")
+
+
+async def test_disk_tier_survives_restart():
+    """Test responses are served from disk by a fresh cache instance"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache", "responses.db")
+        cache = ResponseCache(disk_path=path)
+        await cache.put("k", {"response": "persisted"})
+        await cache.close()
+
+        reopened = ResponseCache(disk_path=path)
+        assert await reopened.get("k") == {"response": "persisted"}
+        assert reopened.disk_hits == 1
+        # Promoted to memory
+        assert await reopened.get("k") == {"response": "persisted"}
+        assert reopened.memory_hits == 1
+
+        bounded = ResponseCache(disk_path=os.path.join(tmp, "bounded.db"), max_disk_entries=2)
+        for index in range(5):
+            await bounded.put(f"k{index}", {"response": index})
+        await bounded.close()
+        await reopened.close()
+
+        trimmed = ResponseCache(max_entries=1, disk_path=os.path.join(tmp, "bounded.db"))
+        assert await trimmed.get("k0") is None
+        assert await trimmed.get("k4") == {"response": 4}
+        await trimmed.close()
+    print("✅ Disk tier test passed")
+
+
+async def test_disk_errors_are_misses():
+    """Test a broken disk tier degrades to the memory tier instead of failing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        corrupt = os.path.join(tmp, "corrupt.db")
+        with open(corrupt, "wb") as f:
+            f.write(b"not a sqlite database" * 100)
+        cache = ResponseCache(disk_path=corrupt)
+        assert await cache.get("k") is None
+        assert cache.misses == 1
+        await cache.put("k", {"response": "memory only"})
+        assert await cache.get("k") == {"response": "memory only"}
+        await cache.clear()
+        await cache.close()
+
+        # Disk hits defer their access times until the next write or close
+        path = os.path.join(tmp, "responses.db")
+        cache = ResponseCache(disk_path=path)
+        await cache.put("k", {"response": "persisted"})
+        await cache.close()
+        reopened = ResponseCache(disk_path=path)
+        assert await reopened.get("k") == {"response": "persisted"}
+        assert "k" in reopened._pending_access
+        await reopened.close()
+        assert not reopened._pending_access
+    print("✅ Disk error test passed")
+
+
+async def test_shared_cache_closed_once():
+    """Test providers leave a shared cache open and the registry closes it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(disk_path=os.path.join(tmp, "shared.db"))
+        first = OllamaProvider("shared-1", response_cache=cache)
+        second = OllamaProvider("shared-2", response_cache=cache)
+        registry = ProtocolProviderRegistry()
+        registry.provider_instances = {"shared-1": first, "shared-2": second}
+        registry.add_shared_cleanup(cache.close)
+
+        await cache.put("k", {"response": "shared"})
+        await first.shutdown()
+        assert cache._db is not None
+        assert await cache.get("k") == {"response": "shared"}
+
+        await registry.stop()
+        assert cache._db is None
+    print("✅ Shared cache ownership test passed")
+
+
+async def test_provider_uses_cache():
+    """Test the Ollama provider answers repeated deterministic requests from the cache"""
+    calls = []
+    runner, url = await start_fake_ollama(calls)
+    provider = OllamaProvider("cache-test", url, response_cache=ResponseCache())
+    await provider.initialize()
+    request = {"model": "fake:latest", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+
+    try:
+        first = await provider.handle_request("llm/chat", dict(request))
+        second = await provider.handle_request("llm/chat", dict(request))
+        assert len(calls) == 1
+        assert second["response"] == first["response"]
+        assert second["cached"] is True
+
+        # Streaming callers get the cached text as a single chunk
+        chunks = []
+
+        async def on_chunk(chunk, metadata):
+            chunks.append(chunk)
+
+        with partial_output_handler(on_chunk):
+            await provider.handle_request("llm/chat", {**request, "stream": True})
+        assert chunks == [first["response"]]
+        assert len(calls) == 1
+
+        # Sampling requests bypass the cache unless they opt in
+        sampled = {**request, "temperature": 0.9}
+        await provider.handle_request("llm/chat", dict(sampled))
+        await provider.handle_request("llm/chat", dict(sampled))
+        assert len(calls) == 3
+        await provider.handle_request("llm/chat", {**sampled, "cache": True})
+        await provider.handle_request("llm/chat", {**sampled, "cache": True})
+        assert len(calls) == 4
+
+        stats = provider.get_cache_stats()
+        assert stats["memory_hits"] == 3
+        assert stats["misses"] == 2
+    finally:
+        await provider.shutdown()
+        await runner.cleanup()
+    print("✅ Provider cache test passed")
+
+
+async def test_workflow_opt_in():
+    """Test cache_responses opts LLM tasks in without overriding explicit settings"""
+    workflow = load_workflow_from_dict({
+        "name": "Cached",
+        "cache_responses": True,
+        "tasks": [
+            {"name": "a", "protocol": "llm/v1", "method": "llm/chat",
+             "params": {"messages": [{"role": "user", "content": "hi"}]}},
+            {"name": "b", "protocol": "llm/v1", "method": "llm/chat",
+             "params": {"messages": [{"role": "user", "content": "hi"}], "cache": False}},
+            {"name": "c", "protocol": "python/v1", "method": "python/execute",
+             "params": {"code": "result = 1"}}
+        ]
+    })
+    params = {task.name: task.params for task in workflow.tasks}
+    assert params["a"]["cache"] is True
+    assert params["b"]["cache"] is False
+    assert "cache" not in params["c"]
+    assert workflow.metadata["cache_responses"] is True
+    print("✅ Workflow cache opt-in test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Response Cache")
+    print("=" * 50)
+
+    try:
+        await test_cacheable_rules_and_keys()
+        await test_memory_lru_and_ttl()
+        await test_disk_tier_survives_restart()
+        await test_disk_errors_are_misses()
+        await test_shared_cache_closed_once()
+        await test_provider_uses_cache()
+        await test_workflow_opt_in()
+
+        print("\n✅ All response cache tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
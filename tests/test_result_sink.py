@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test streaming batch result sinks
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.batch_processor import BatchResult
+from gleitzeit.core.result_sink import JSONLResultSink, MemoryResultSink, read_jsonl_results
+
+
+def count_lines(path: str) -> int:
+    with open(path) as f:
+        return sum(1 for _ in f)
+
+
+async def test_jsonl_sink_flushes_in_batches():
+    """Test results are buffered and appended in batches"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out", "results.jsonl")
+        sink = JSONLResultSink(path, flush_every=3, flush_interval=3600)
+
+        sink.write("/data/a.txt", {"status": "success", "content": "A"})
+        sink.write("/data/b.txt", {"status": "failed", "error": "boom"})
+        assert count_lines(path) == 0
+        sink.write("/data/c.txt", {"status": "success", "content": "C"})
+        assert count_lines(path) == 3
+
+        sink.write("/data/d.txt", {"status": "success", "content": "D"})
+        # Reading flushes the buffer first
+        assert [file_path for file_path, _ in sink.iter_results()] == [
+            "/data/a.txt", "/data/b.txt", "/data/c.txt", "/data/d.txt"
+        ]
+        sink.close()
+
+        # A line cut short by a crash is skipped
+        with open(path, "a") as f:
+            f.write('{"file": "/data/e.txt", "stat')
+        results = dict(read_jsonl_results(path))
+        assert len(results) == 4
+        assert results["/data/b.txt"] == {"status": "failed", "error": "boom"}
+    print("✅ JSONL sink batching test passed")
+
+
+async def test_batch_result_regenerates_from_sink():
+    """Test BatchResult keeps only counters and rebuilds reports from the sink"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "batch-1.jsonl")
+        batch_result = BatchResult("batch-1", sink=JSONLResultSink(path, flush_every=2))
+        batch_result.total_files = 3
+        batch_result.record("/data/a.txt", {"status": "success", "content": "alpha"})
+        batch_result.record("/data/b.txt", {"status": "failed", "error": "timeout"})
+        batch_result.record("/data/c.txt", {"status": "success", "content": "gamma"})
+        assert (batch_result.successful, batch_result.failed) == (2, 1)
+
+        data = batch_result.to_dict()
+        assert data["results_file"] == path
+        assert data["results"]["/data/c.txt"]["content"] == "gamma"
+        markdown = batch_result.to_markdown()
+        assert "✅ a.txt" in markdown and "Error: timeout" in markdown
+
+        # The saved summary points at the JSONL file instead of inlining results
+        batch_result.close()
+        summary_file = batch_result.save_to_file(Path(tmp) / "summaries")
+        summary = json.loads(summary_file.read_text())
+        assert "results" not in summary
+        assert summary["summary"]["successful"] == 2
+
+        # Counters are recovered from the file alone
+        recovered = BatchResult.from_jsonl(path)
+        assert recovered.batch_id == "batch-1"
+        assert (recovered.total_files, recovered.successful, recovered.failed) == (3, 2, 1)
+        assert recovered.results == data["results"]
+
+    # The default sink keeps the dict behaviour
+    in_memory = BatchResult("batch-2")
+    in_memory.record("/data/x.txt", {"status": "success", "content": "x"})
+    assert isinstance(in_memory.sink, MemoryResultSink)
+    assert in_memory.results == {"/data/x.txt": {"status": "success", "content": "x"}}
+    assert "results_file" not in in_memory.to_dict()
+    print("✅ BatchResult sink regeneration test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Batch Result Sinks")
+    print("=" * 50)
+
+    try:
+        await test_jsonl_sink_flushes_in_batches()
+        await test_batch_result_regenerates_from_sink()
+
+        print("\n✅ All result sink tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
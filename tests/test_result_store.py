@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test bounded Result Store
+"""
+
+import asyncio
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.models import TaskResult, TaskStatus
+from gleitzeit.core.result_store import ResultStore
+from gleitzeit.persistence.base import InMemoryBackend
+
+
+def make_result(task_id: str, workflow_id: str = None, result=None) -> TaskResult:
+    return TaskResult(
+        task_id=task_id,
+        workflow_id=workflow_id,
+        status=TaskStatus.COMPLETED,
+        result=result if result is not None else {"value": task_id}
+    )
+
+
+async def test_lru_eviction():
+    """Test least-recently-used results are evicted over the entry budget"""
+    store = ResultStore(persistence=InMemoryBackend(), max_entries=3)
+
+    for i in range(3):
+        store[f"t{i}"] = make_result(f"t{i}")
+
+    # Touch t0 so t1 becomes the eviction candidate
+    assert store["t0"].task_id == "t0"
+    store["t3"] = make_result("t3")
+
+    assert "t1" not in store
+    assert set(store) == {"t0", "t2", "t3"}
+    assert store.evictions == 1
+    assert dict(store)["t3"].result == {"value": "t3"}
+    print("✅ LRU eviction test passed")
+
+
+async def test_pinned_workflows_survive_until_released():
+    """Test results of running workflows are only evicted after release"""
+    store = ResultStore(persistence=InMemoryBackend(), max_entries=2)
+    store.pin_workflow("wf")
+
+    for i in range(4):
+        store[f"wf-{i}"] = make_result(f"wf-{i}", "wf")
+
+    assert len(store) == 4
+    assert len(store.workflow_results("wf")) == 4
+
+    store.release_workflow("wf")
+    assert len(store) == 2
+    assert store.get_stats()["pinned_results"] == 0
+    print("✅ Pinned workflow test passed")
+
+
+async def test_ttl_and_byte_budget():
+    """Test idle results expire and the byte budget is honoured"""
+    store = ResultStore(persistence=InMemoryBackend(), max_entries=None, ttl=0.05)
+    store["old"] = make_result("old")
+    time.sleep(0.1)
+
+    assert store.get("old") is None
+    assert len(store) == 0
+
+    sized = ResultStore(persistence=InMemoryBackend(), max_entries=None, max_bytes=3000)
+    for i in range(5):
+        sized[f"big-{i}"] = make_result(f"big-{i}", result="x" * 1000)
+
+    assert len(sized) == 2
+    assert sized.get_stats()["approximate_bytes"] <= 3000
+    print("✅ TTL and byte budget test passed")
+
+
+async def test_no_eviction_without_persistence():
+    """Test results are kept when they could not be read back after eviction"""
+    store = ResultStore(max_entries=2, ttl=0.01)
+    store.pin_workflow("wf")
+    for i in range(4):
+        store[f"wf-{i}"] = make_result(f"wf-{i}", "wf")
+    store.release_workflow("wf")
+    time.sleep(0.02)
+
+    assert len(store) == 4
+    assert store.get("wf-0") is not None
+    assert store.evictions == 0
+    print("✅ No eviction without persistence test passed")
+
+
+async def test_fetch_reads_through_persistence():
+    """Test evicted results are served from the persistence backend"""
+    persistence = InMemoryBackend()
+    store = ResultStore(persistence=persistence, max_entries=1)
+
+    for task_id in ("a", "b"):
+        result = make_result(task_id)
+        await persistence.save_task_result(result)
+        store[task_id] = result
+
+    assert "a" not in store
+    fetched = await store.fetch("a")
+    assert fetched.result == {"value": "a"}
+    assert "a" in store
+    assert await store.fetch("missing") is None
+    assert store.hits == 0 and store.misses == 2
+
+    batch = await store.fetch_many(["a", "b", "missing"])
+    assert set(batch) == {"a", "b"}
+    print("✅ Persistence read-through test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Result Store")
+    print("=" * 50)
+
+    try:
+        await test_lru_eviction()
+        await test_pinned_workflows_survive_until_released()
+        await test_ttl_and_byte_budget()
+        await test_no_eviction_without_persistence()
+        await test_fetch_reads_through_persistence()
+
+        print("\n✅ All result store tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
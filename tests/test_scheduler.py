@@ -140,6 +140,75 @@ async def test_event_cancellation():
     await scheduler.stop()
     print("✅ Event cancellation test passed")
 
+async def test_earlier_event_wakes_scheduler():
+    """Test an earlier event interrupts the sleep until a later one"""
+    emitted_events = []
+    
+    async def emit_callback(event_type: str, data: dict):
+        emitted_events.append((data["event_id"], datetime.utcnow()))
+    
+    scheduler = EventScheduler(emit_callback)
+    await scheduler.start()
+    
+    await scheduler.schedule_event(
+        event_type=ScheduledEventType.CLEANUP,
+        delay=timedelta(seconds=10),
+        event_data={},
+        event_id="late"
+    )
+    await asyncio.sleep(0.05)  # scheduler is now sleeping until "late"
+    
+    scheduled_at = datetime.utcnow() + timedelta(seconds=0.05)
+    await scheduler.schedule_event(
+        event_type=ScheduledEventType.TASK_RETRY,
+        delay=timedelta(seconds=0.05),
+        event_data={},
+        event_id="early"
+    )
+    await asyncio.sleep(0.15)
+    
+    assert [event_id for event_id, _ in emitted_events] == ["early"]
+    lateness = (emitted_events[0][1] - scheduled_at).total_seconds()
+    assert 0 <= lateness < 0.05
+    
+    await scheduler.stop()
+    print("✅ Earlier event wake-up test passed")
+
+async def test_cancelled_events_are_compacted():
+    """Test cancelled heap entries are dropped and rescheduling replaces events"""
+    emitted_events = []
+    
+    async def emit_callback(event_type: str, data: dict):
+        emitted_events.append(data["event_id"])
+    
+    scheduler = EventScheduler(emit_callback)
+    
+    for i in range(200):
+        await scheduler.schedule_event(
+            event_type=ScheduledEventType.TASK_RETRY,
+            delay=timedelta(seconds=60),
+            event_data={},
+            event_id=f"event-{i}"
+        )
+    for i in range(150):
+        assert await scheduler.cancel_event(f"event-{i}")
+    assert not await scheduler.cancel_event("event-0")
+    
+    stats = await scheduler.get_stats()
+    assert stats["active_events"] == 50
+    assert stats["total_scheduled"] < 200  # heap was compacted
+    
+    # Rescheduling an ID only emits the latest event
+    await scheduler.schedule_event(ScheduledEventType.TASK_RETRY, timedelta(seconds=60), {}, "again")
+    await scheduler.schedule_event(ScheduledEventType.TASK_RETRY, timedelta(seconds=0.01), {}, "again")
+    await scheduler.start()
+    await asyncio.sleep(0.1)
+    
+    assert emitted_events == ["again"]
+    assert len(await scheduler.get_pending_events()) == 50
+    await scheduler.stop()
+    print("✅ Cancelled event compaction test passed")
+
 async def test_scheduled_event_creation():
     """Test creating scheduled events"""
     event = ScheduledEvent(
@@ -164,6 +233,8 @@ async def main():
         await test_delayed_scheduling()
         await test_multiple_events()
         await test_event_cancellation()
+        await test_earlier_event_wakes_scheduler()
+        await test_cancelled_events_are_compacted()
         await test_scheduled_event_creation()
         
         print("\n✅ All scheduler tests PASSED")
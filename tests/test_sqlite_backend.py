@@ -210,6 +210,109 @@ async def test_delete_task():
         await backend.shutdown()
         print("✅ Task deletion test passed")
 
+async def test_write_behind_buffering():
+    """Test write-behind mode coalesces writes and serves buffered reads"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path, write_behind=True, flush_interval=60)
+        await backend.initialize()
+        
+        cursor = await backend.db.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        
+        task = Task(id="wb-task", name="WB Task", protocol="p", method="m", params={})
+        for status in (TaskStatus.QUEUED, TaskStatus.EXECUTING, TaskStatus.COMPLETED):
+            task.status = status
+            await backend.save_task(task)
+        await backend.save_task_result(TaskResult(
+            task_id="wb-task", status=TaskStatus.COMPLETED, result={"value": 1}
+        ))
+        await backend.save_queue_state("default", {"tasks": []})
+        
+        # Three task saves coalesce into one pending row
+        assert len(backend._pending) == 3
+        
+        # Reads see buffered writes before they are committed
+        assert (await backend.get_task("wb-task")).status == TaskStatus.COMPLETED
+        assert (await backend.get_task_result("wb-task")).result == {"value": 1}
+        assert await backend.get_queue_state("default") == {"tasks": []}
+        
+        await backend.flush()
+        assert backend._pending == {}
+        
+        # A second connection sees the flushed data
+        reader = SQLiteBackend(db_path)
+        await reader.initialize()
+        assert (await reader.get_task("wb-task")).status == TaskStatus.COMPLETED
+        await reader.shutdown()
+        
+        await backend.shutdown()
+        print("✅ Write-behind buffering test passed")
+
+async def test_write_behind_background_flush():
+    """Test buffered writes are committed by batch size, interval and shutdown"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path, write_behind=True, flush_interval=0.01, max_batch_size=10)
+        await backend.initialize()
+        
+        for i in range(25):
+            await backend.save_task(Task(id=f"bg-{i}", name=f"BG {i}", protocol="p", method="m", params={}))
+        await asyncio.sleep(0.1)
+        assert backend._pending == {}
+        
+        # Unbuffered writes commit after earlier buffered writes
+        await backend.save_task(Task(id="late", name="Late", protocol="p", method="m", params={}))
+        assert await backend.delete_task("late")
+        
+        # Shutdown flushes whatever is still buffered
+        backend.flush_interval = 60
+        await backend.save_task(Task(id="last", name="Last", protocol="p", method="m", params={}))
+        await backend.shutdown()
+        
+        reader = SQLiteBackend(db_path)
+        await reader.initialize()
+        counts = await reader.get_task_count_by_status()
+        assert sum(counts.values()) == 26
+        assert await reader.get_task("late") is None
+        await reader.shutdown()
+        print("✅ Write-behind background flush test passed")
+
+async def test_read_pool_and_batch_lookup():
+    """Test pooled read connections and batched result lookups"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path, write_behind=True, flush_interval=60, read_pool_size=3)
+        await backend.initialize()
+        assert len(backend._readers) == 3
+        
+        for i in range(600):
+            await backend.save_task_result(TaskResult(
+                task_id=f"r{i}", status=TaskStatus.COMPLETED, result={"value": i}
+            ))
+        await backend.flush()
+        
+        # One result is still buffered and must be merged into the batch
+        await backend.save_task_result(TaskResult(
+            task_id="buffered", status=TaskStatus.COMPLETED, result={"value": -1}
+        ))
+        
+        ids = [f"r{i}" for i in range(600)] + ["buffered", "missing"]
+        results = await backend.get_task_results_batch(ids)
+        assert len(results) == 601
+        assert results["r599"].result == {"value": 599}
+        assert results["buffered"].result == {"value": -1}
+        assert "missing" not in results
+        
+        # Concurrent lookups are spread over the read connections
+        lookups = await asyncio.gather(*(backend.get_task_result(f"r{i}") for i in range(50)))
+        assert [r.result["value"] for r in lookups] == list(range(50))
+        assert backend._idle_readers.qsize() == 3
+        
+        await backend.shutdown()
+        assert backend._readers == []
+        print("✅ Read pool and batch lookup test passed")
+
 async def main():
     """Run all tests"""
     print("🧪 Testing SQLite Persistence Backend")
@@ -223,6 +326,9 @@ async def main():
         await test_get_tasks_by_status()
         await test_task_result_persistence()
         await test_delete_task()
+        await test_write_behind_buffering()
+        await test_write_behind_background_flush()
+        await test_read_pool_and_batch_lookup()
         
         print("\n✅ All SQLite backend tests PASSED")
         return 0
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Test Task Queue ready/blocked indexing
+"""
+
+import asyncio
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gleitzeit.core.models import Task, Priority
+from gleitzeit.task_queue.task_queue import TaskQueue, QueueManager
+from gleitzeit.persistence.base import InMemoryBackend
+
+
+def make_task(task_id: str, priority: Priority = Priority.NORMAL, dependencies=None) -> Task:
+    return Task(
+        id=task_id,
+        name=task_id,
+        protocol="python/v1",
+        method="python/execute",
+        params={},
+        priority=priority,
+        dependencies=dependencies or []
+    )
+
+
+async def test_priority_and_fifo_ordering():
+    """Test priority ordering with FIFO inside a priority level"""
+    queue = TaskQueue("ordering")
+
+    await queue.enqueue(make_task("low-1", Priority.LOW))
+    await queue.enqueue(make_task("normal-1"))
+    await queue.enqueue(make_task("urgent-1", Priority.URGENT))
+    await queue.enqueue(make_task("normal-2"))
+    await queue.enqueue(make_task("high-1", Priority.HIGH))
+
+    ready = await queue.get_ready_tasks()
+    assert [t.id for t in ready] == ["urgent-1", "high-1", "normal-1", "normal-2", "low-1"]
+
+    limited = await queue.get_ready_tasks(limit=2)
+    assert [t.id for t in limited] == ["urgent-1", "high-1"]
+
+    order = []
+    while not queue.is_empty():
+        order.append((await queue.dequeue()).id)
+
+    assert order == ["urgent-1", "high-1", "normal-1", "normal-2", "low-1"]
+    assert await queue.dequeue() is None
+    print("✅ Priority and FIFO ordering test passed")
+
+
+async def test_blocked_tasks_promoted_on_completion():
+    """Test tasks move to the ready set when their last dependency completes"""
+    queue = TaskQueue("deps")
+
+    await queue.enqueue(make_task("a"))
+    await queue.enqueue(make_task("b"))
+    await queue.enqueue(make_task("c", Priority.URGENT, dependencies=["a", "b"]))
+
+    assert queue.ready_count() == 2
+    assert queue.blocked_count() == 1
+
+    assert (await queue.dequeue()).id == "a"
+    await queue.mark_task_completed("a")
+    assert queue.blocked_count() == 1  # still waiting on b
+
+    assert (await queue.dequeue()).id == "b"
+    assert await queue.dequeue() is None  # c is blocked
+
+    promoted_after = time.perf_counter()
+    await queue.mark_task_completed("b")
+    assert queue.blocked_count() == 0
+    entry = await queue.dequeue_entry()
+    assert entry.task.id == "c"
+    # Ready from its last dependency's completion, not from enqueue
+    assert entry.ready_at >= promoted_after
+
+    # Tasks enqueued after their dependency finished are ready immediately
+    await queue.enqueue(make_task("d", dependencies=["a"]))
+    assert (await queue.dequeue()).id == "d"
+    print("✅ Blocked task promotion test passed")
+
+
+async def test_removed_and_requeued_tasks():
+    """Test stale heap entries are skipped and re-enqueued tasks are served once"""
+    queue = TaskQueue("removal")
+
+    await queue.enqueue(make_task("x"))
+    await queue.enqueue(make_task("y"))
+    await queue.enqueue(make_task("z", dependencies=["x"]))
+
+    assert await queue.remove_task("x")
+    assert await queue.remove_task("z")
+    assert not await queue.remove_task("missing")
+
+    retried = await queue.dequeue()
+    assert retried.id == "y"
+
+    # Simulate a retry re-enqueueing the same task
+    await queue.enqueue(retried)
+    assert [t.id for t in await queue.get_ready_tasks()] == ["y"]
+    assert (await queue.dequeue()).id == "y"
+    assert await queue.dequeue() is None
+
+    # Completing a removed dependency must not resurrect the removed dependent
+    await queue.mark_task_completed("x")
+    assert await queue.dequeue() is None
+    assert queue.size() == 0
+    print("✅ Removed and re-enqueued task test passed")
+
+
+async def test_dequeue_without_dependency_check():
+    """Test blocked tasks are still served when dependency checks are disabled"""
+    queue = TaskQueue("nocheck")
+
+    await queue.enqueue(make_task("blocked", Priority.HIGH, dependencies=["never"]))
+    await queue.enqueue(make_task("ready", Priority.LOW))
+
+    assert (await queue.dequeue(check_dependencies=False)).id == "blocked"
+    assert (await queue.dequeue()).id == "ready"
+    print("✅ Dequeue without dependency check test passed")
+
+
+async def test_stats_unchanged():
+    """Test get_stats keeps its output shape"""
+    queue = TaskQueue("stats")
+
+    await queue.enqueue(make_task("s1", Priority.HIGH))
+    await queue.enqueue(make_task("s2", dependencies=["s1"]))
+    await queue.dequeue()
+    await queue.mark_task_completed("s1")
+
+    stats = await queue.get_stats()
+    assert stats["current_size"] == 1
+    assert stats["total_enqueued"] == 2
+    assert stats["total_dequeued"] == 1
+    assert stats["completed_tasks"] == 1
+    assert stats["priority_breakdown"] == {"low": 0, "normal": 1, "high": 0, "urgent": 0}
+    print("✅ Queue stats test passed")
+
+
+async def test_recovery_respects_completed_dependencies():
+    """Test recovered tasks are indexed against the recovered completed set"""
+    persistence = InMemoryBackend()
+    queue = TaskQueue("recover", persistence)
+    await queue.initialize()
+
+    for i in range(10):
+        await queue.enqueue(make_task(f"r{i}"))
+    await queue.enqueue(make_task("child", dependencies=["r0"]))
+
+    assert (await queue.dequeue()).id == "r0"
+    await queue.mark_task_completed("r0")
+    await queue._save_queue_state()
+
+    recovered = TaskQueue("recover", persistence)
+    await recovered.initialize()
+
+    ready_ids = {t.id for t in await recovered.get_ready_tasks()}
+    assert "child" in ready_ids
+    assert recovered.blocked_count() == 0
+    print("✅ Queue recovery test passed")
+
+
+async def test_queue_manager_picks_best_head():
+    """Test QueueManager dequeues the best task across queues"""
+    manager = QueueManager()
+    manager.create_queue("other")
+
+    await manager.enqueue_task(make_task("default-normal"))
+    await manager.enqueue_task(make_task("other-high", Priority.HIGH), "other")
+
+    assert (await manager.dequeue_next_task()).id == "other-high"
+    assert await manager.dequeue_next_task(["other"]) is None
+    assert (await manager.dequeue_next_task("default")).id == "default-normal"
+    print("✅ QueueManager head selection test passed")
+
+
+async def test_dequeue_scales_with_blocked_backlog():
+    """Test dequeue cost does not grow with the number of blocked tasks"""
+    queue = TaskQueue("scale")
+
+    await queue.enqueue(make_task("root"))
+    for i in range(20000):
+        await queue.enqueue(make_task(f"leaf-{i}", dependencies=["root"]))
+    await queue.enqueue(make_task("free"))
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        await queue.get_ready_tasks(limit=5)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0, f"get_ready_tasks took {elapsed:.3f}s for 1000 calls"
+
+    assert (await queue.dequeue()).id == "root"
+    assert (await queue.dequeue()).id == "free"
+    await queue.mark_task_completed("root")
+    assert queue.ready_count() == 20000
+    print("✅ Blocked backlog scaling test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Task Queue")
+    print("=" * 50)
+
+    try:
+        await test_priority_and_fifo_ordering()
+        await test_blocked_tasks_promoted_on_completion()
+        await test_removed_and_requeued_tasks()
+        await test_dequeue_without_dependency_check()
+        await test_stats_unchanged()
+        await test_recovery_respects_completed_dependencies()
+        await test_queue_manager_picks_best_head()
+        await test_dequeue_scales_with_blocked_backlog()
+
+        print("\n✅ All task queue tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Test multi-process worker mode for the execution engine
+"""
+
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+# Workers import the registry factory from this module, also under pytest
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gleitzeit.core.errors import ConfigurationError
+from gleitzeit.core.execution_engine import ExecutionEngine, ExecutionMode
+from gleitzeit.core.models import Task, TaskStatus, Workflow, WorkflowStatus
+from gleitzeit.core.process_worker_pool import ProcessWorkerPool
+from gleitzeit.core.protocol import ProtocolSpec, MethodSpec
+from gleitzeit.core.jsonrpc import JSONRPCRequest
+from gleitzeit.core.streaming import emit_partial_output, partial_output_handler
+from gleitzeit.persistence.base import InMemoryBackend
+from gleitzeit.providers.base import ProtocolProvider
+from gleitzeit.registry import ProtocolProviderRegistry
+from gleitzeit.task_queue import QueueManager, DependencyResolver
+
+FACTORY = "test_worker_mode:make_registry"
+
+WORKER_PROTOCOL = ProtocolSpec(
+    name="wtest",
+    version="v1",
+    description="Protocol for worker mode tests",
+    methods={
+        "wtest/pid": MethodSpec(name="wtest/pid", description="Report the worker pid"),
+        "wtest/stream": MethodSpec(name="wtest/stream", description="Emit partial output"),
+        "wtest/crash": MethodSpec(name="wtest/crash", description="Exit the worker process"),
+        "wtest/fail": MethodSpec(name="wtest/fail", description="Raise an error"),
+    }
+)
+
+
+class WorkerTestProvider(ProtocolProvider):
+    """Provider running inside the worker processes"""
+
+    def __init__(self, provider_id: str):
+        super().__init__(provider_id=provider_id, protocol_id="wtest/v1")
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health_check(self):
+        return {"status": "healthy"}
+
+    def get_supported_methods(self):
+        return list(WORKER_PROTOCOL.methods)
+
+    async def handle_request(self, method, params):
+        if method == "wtest/stream":
+            for word in params["words"]:
+                await emit_partial_output(word)
+            return {"text": " ".join(params["words"])}
+        if method == "wtest/crash":
+            os._exit(3)
+        if method == "wtest/fail":
+            raise ValueError("bad input")
+        # Hold the request briefly so concurrent tasks spread over workers
+        await asyncio.sleep(0.05)
+        return {"pid": os.getpid(), "value": params.get("value")}
+
+
+def make_registry(provider_id: str = "wtest-1"):
+    """Registry factory called in each worker process"""
+    registry = ProtocolProviderRegistry()
+    registry.register_protocol(WORKER_PROTOCOL)
+    registry.register_provider(provider_id, "wtest/v1", WorkerTestProvider(provider_id))
+    return registry
+
+
+def make_engine(pool: ProcessWorkerPool) -> ExecutionEngine:
+    # The coordinator has no providers of its own
+    return ExecutionEngine(
+        registry=ProtocolProviderRegistry(),
+        queue_manager=QueueManager(),
+        dependency_resolver=DependencyResolver(),
+        persistence=InMemoryBackend(),
+        max_concurrent_tasks=8,
+        worker_pool=pool
+    )
+
+
+async def test_workflow_runs_across_workers():
+    """Test tasks execute in several worker processes with dependencies resolved by the coordinator"""
+    pool = ProcessWorkerPool(workers=2, registry_factory=FACTORY, factory_kwargs={"provider_id": "wtest-x"})
+    engine = make_engine(pool)
+
+    workflow = Workflow(id="spread", name="spread")
+    for i in range(8):
+        workflow.add_task(Task(id=f"t{i}", name=f"t{i}", protocol="wtest/v1", method="wtest/pid", params={"value": i}))
+    workflow.add_task(Task(
+        id="last", name="last", protocol="wtest/v1", method="wtest/pid",
+        params={"value": "${t3.value}"}, dependencies=[f"t{i}" for i in range(8)]
+    ))
+
+    finished = asyncio.Event()
+    engine.add_event_handler("workflow:completed", lambda name, data: finished.set())
+    runner = asyncio.create_task(engine.start(ExecutionMode.EVENT_DRIVEN))
+    try:
+        while not engine.running:
+            await asyncio.sleep(0.01)
+        assert pool.started and pool.handles("wtest/v1")
+
+        await engine.submit_workflow(workflow)
+        await asyncio.wait_for(finished.wait(), 30)
+
+        assert workflow.status == WorkflowStatus.COMPLETED
+        results = {task.id: engine.task_results[task.id].result for task in workflow.tasks}
+        pids = {result["pid"] for result in results.values()}
+        assert len(pids) == 2 and os.getpid() not in pids
+        assert results["last"]["value"] == 3
+
+        stats = engine._get_stats_dict()["workers"]
+        assert stats["requests_completed"] == 9 and stats["crashes"] == 0
+        assert engine.phase_timings.get("wtest/v1", "wtest/pid", "provider").count == 9
+    finally:
+        await engine.stop()
+        await runner
+    assert not pool.started
+    print("✅ Workflow across workers test passed")
+
+
+async def test_streaming_errors_and_restart():
+    """Test partial output streams back, errors keep their codes and crashed workers are replaced"""
+    pool = ProcessWorkerPool(workers=1, registry_factory=FACTORY)
+    engine = make_engine(pool)
+    chunks = []
+    engine.add_event_handler("task:partial_output", lambda name, data: chunks.append(data["data"]["chunk"]))
+
+    try:
+        stream = Task(id="stream", name="stream", protocol="wtest/v1", method="wtest/stream",
+                      params={"words": ["one", "two", "three"]})
+        result = await engine._execute_task(stream)
+        assert result.status == TaskStatus.COMPLETED and result.result == {"text": "one two three"}
+        await engine.flush_events()
+        assert chunks == ["one", "two", "three"]
+
+        failing = Task(id="fail", name="fail", protocol="wtest/v1", method="wtest/fail", params={})
+        result = await engine._execute_task(failing)
+        assert "bad input" in result.error
+
+        first_pid = pool.get_stats()["workers"][0]["pid"]
+        crash = Task(id="crash", name="crash", protocol="wtest/v1", method="wtest/crash", params={})
+        result = await engine._execute_task(crash)
+        assert "exited during the request" in result.error
+        # Lost workers fail with a retryable error
+        assert result.status == TaskStatus.RETRY_PENDING
+
+        for _ in range(100):
+            workers = pool.get_stats()["workers"]
+            if workers[0]["alive"] and workers[0]["pid"] != first_pid:
+                break
+            await asyncio.sleep(0.05)
+        assert pool.crashes == 1 and pool.workers_started == 2
+
+        again = Task(id="again", name="again", protocol="wtest/v1", method="wtest/pid", params={"value": 1})
+        result = await engine._execute_task(again)
+        assert result.result["pid"] != first_pid
+    finally:
+        await pool.shutdown()
+
+    broken = ProcessWorkerPool(workers=1, registry_factory="test_worker_mode:missing_factory")
+    try:
+        await broken.start()
+    except ConfigurationError as e:
+        assert "missing_factory" in str(e)
+    else:
+        raise AssertionError("expected ConfigurationError")
+    print("✅ Streaming, error and restart test passed")
+
+
+async def test_slow_chunk_handler_does_not_stall_reader():
+    """Test a slow partial output subscriber delays only its own request"""
+    pool = ProcessWorkerPool(workers=1, registry_factory=FACTORY)
+    chunks = []
+
+    async def slow_handler(chunk, metadata):
+        await asyncio.sleep(0.2)
+        chunks.append(chunk)
+
+    async def stream():
+        with partial_output_handler(slow_handler):
+            return await pool.execute_request("wtest/v1", JSONRPCRequest(
+                id="stream", method="wtest/stream", params={"words": ["one", "two", "three"]}
+            ))
+
+    try:
+        await pool.start()
+        streaming = asyncio.create_task(stream())
+        await asyncio.sleep(0.05)
+        # Answered while the stream's chunks are still being delivered
+        other = await asyncio.wait_for(pool.execute_request("wtest/v1", JSONRPCRequest(
+            id="other", method="wtest/pid", params={"value": 1}
+        )), 0.4)
+        assert other.result["value"] == 1
+        assert not streaming.done()
+
+        response = await streaming
+        # All partial output is delivered, in order, before the result
+        assert chunks == ["one", "two", "three"]
+        assert response.result == {"text": "one two three"}
+    finally:
+        await pool.shutdown()
+    print("✅ Slow chunk handler test passed")
+
+
+async def test_concurrent_large_requests_and_cli_protocols():
+    """Test large requests sent concurrently over one pipe, and CLI protocol specs on the coordinator"""
+    pool = ProcessWorkerPool(workers=1, registry_factory=FACTORY)
+    engine = make_engine(pool)
+    try:
+        # Frames larger than the pipe buffer, written by many requests at once
+        payload = "x" * (256 * 1024)
+        tasks = [
+            Task(id=f"big{i}", name=f"big{i}", protocol="wtest/v1", method="wtest/pid", params={"value": payload})
+            for i in range(12)
+        ]
+        results = await asyncio.gather(*[engine._execute_task(task) for task in tasks])
+        assert all(result.status == TaskStatus.COMPLETED for result in results)
+        assert all(result.result["value"] == payload for result in results)
+    finally:
+        await pool.shutdown()
+
+    from gleitzeit.cli.gleitzeit_cli import register_protocols
+    registry = ProtocolProviderRegistry()
+    register_protocols(registry, {"providers": {"mcp": {"enabled": False}}})
+    assert set(registry.protocol_providers) == {"llm/v1", "python/v1"}
+    print("✅ Concurrent large requests test passed")
+
+
+async def main():
+    """Run all tests"""
+    print("🧪 Testing Worker Mode")
+    print("=" * 50)
+
+    try:
+        await test_workflow_runs_across_workers()
+        await test_streaming_errors_and_restart()
+        await test_slow_chunk_handler_does_not_stall_reader()
+        await test_concurrent_large_requests_and_cli_protocols()
+
+        print("\n✅ All worker mode tests PASSED")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))